@@ -20,6 +20,11 @@ from discord.ext.commands import Context
 from dotenv import load_dotenv
 
 from database import DatabaseManager
+from helpers.leader_election import HEARTBEAT_SECONDS, SchedulerLease
+from helpers.llm_client import LLMClient
+from helpers.llm_metering import ROLLUP_SECONDS
+from helpers.llm_scheduler import Priority, interaction_deadline, set_request_context
+from helpers.load_shaping import SlotPlanner
 
 load_dotenv()
 
@@ -138,6 +143,20 @@ class DiscordBot(commands.Bot):
         self.database = None
         self.bot_prefix = os.getenv("PREFIX")
         self.invite_link = os.getenv("INVITE_LINK")
+        # Spreads scheduled posts away from popular minutes (see helpers/load_shaping.py)
+        self.slot_planner = SlotPlanner.from_env()
+        # One Anthropic client (and connection pool) shared by every AI cog
+        self.llm_client = LLMClient.from_env()
+        # Only the replica holding this lease runs scheduled jobs (see helpers/leader_election.py)
+        self.scheduler_lease = None
+        # Commands' Claude requests queue ahead of background work (see helpers/llm_scheduler.py)
+        self.before_invoke(self.set_llm_request_context)
+
+    def is_scheduler_leader(self) -> bool:
+        """
+        Check whether this process should run scheduled jobs right now.
+        """
+        return self.scheduler_lease is not None and self.scheduler_lease.is_leader
 
     async def init_db(self) -> None:
         async with aiosqlite.connect(
@@ -181,6 +200,60 @@ class DiscordBot(commands.Bot):
         """
         await self.wait_until_ready()
 
+    async def set_llm_request_context(self, context: Context) -> None:
+        """
+        Queue Claude requests made by a command ahead of background work.
+
+        :param context: The context of the command that is about to run.
+        """
+        set_request_context(
+            Priority.USER,
+            guild_id=context.guild.id if context.guild else None,
+            deadline=interaction_deadline(context.interaction),
+        )
+
+    @tasks.loop(seconds=HEARTBEAT_SECONDS)
+    async def scheduler_lease_task(self) -> None:
+        """
+        Acquire or renew the scheduler lease.
+        """
+        was_leader = self.scheduler_lease.is_leader
+        try:
+            is_leader = await self.scheduler_lease.heartbeat()
+        except aiosqlite.Error as e:
+            self.logger.warning(f"Scheduler lease heartbeat failed: {e}")
+            is_leader = False
+
+        if is_leader and not was_leader:
+            self.logger.info(f"Acquired scheduler lease as {self.scheduler_lease.holder}")
+        elif was_leader and not is_leader:
+            self.logger.warning("Lost scheduler lease, pausing scheduled jobs")
+
+    async def flush_llm_usage(self) -> None:
+        """
+        Store the Claude usage recorded since the last flush in the llm_usage table.
+        """
+        if self.llm_client is None or self.database is None:
+            return
+        meter = self.llm_client.meter
+        count, rows = meter.pending_rollup()
+        if not rows:
+            return
+        try:
+            await self.database.add_llm_usage(rows)
+        except aiosqlite.Error as e:
+            # Kept in memory and retried on the next flush
+            self.logger.warning(f"Could not store LLM usage: {e}")
+            return
+        meter.flushed(count)
+
+    @tasks.loop(seconds=ROLLUP_SECONDS)
+    async def llm_usage_task(self) -> None:
+        """
+        Roll up Claude usage every few minutes. Every replica stores its own requests.
+        """
+        await self.flush_llm_usage()
+
     async def setup_hook(self) -> None:
         """
         This will just be executed when the bot starts the first time.
@@ -192,6 +265,8 @@ class DiscordBot(commands.Bot):
             f"Running on: {platform.system()} {platform.release()} ({os.name})"
         )
         self.logger.info("-------------------")
+        if self.llm_client is not None and os.getenv("ANTHROPIC_BASE_URL"):
+            self.logger.warning(f"Claude API requests go to {self.llm_client.base_url}")
         await self.init_db()
         await self.load_cogs()
         self.status_task.start()
@@ -203,6 +278,28 @@ class DiscordBot(commands.Bot):
         # Configure SQLite for better concurrency
         await self.database.connection.execute("PRAGMA journal_mode=WAL")
         await self.database.connection.execute("PRAGMA busy_timeout=30000")
+        self.scheduler_lease = SchedulerLease.from_env(self.database.connection)
+        self.scheduler_lease_task.start()
+        self.llm_usage_task.start()
+
+    async def close(self) -> None:
+        """
+        Hand the scheduler lease over, store pending LLM usage and close the LLM client before shutting down.
+        """
+        if self.scheduler_lease is not None and self.scheduler_lease.is_leader:
+            self.scheduler_lease_task.cancel()
+            try:
+                await self.scheduler_lease.release()
+            except aiosqlite.Error as e:
+                self.logger.warning(f"Could not release scheduler lease: {e}")
+        if self.llm_client is not None:
+            self.llm_usage_task.cancel()
+            try:
+                await self.flush_llm_usage()
+            except Exception as e:
+                self.logger.warning(f"Could not store LLM usage on shutdown: {e}")
+            await self.llm_client.close()
+        await super().close()
 
     async def on_message(self, message: discord.Message) -> None:
         """
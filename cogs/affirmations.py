@@ -13,7 +13,6 @@ from datetime import datetime, time, timedelta
 from typing import Optional
 
 import discord
-from anthropic import AsyncAnthropic
 from discord import app_commands
 from discord.ext import commands, tasks
 from discord.ext.commands import Context
@@ -21,7 +20,9 @@ from discord.ext.commands import Context
 # Import helpers
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from helpers import scheduling
+from helpers.schedule_batch import ScheduleBatch
 from helpers.claude_cog import ClaudeAICog
+from helpers.llm_scheduler import Priority, set_request_context
 
 
 class Affirmations(ClaudeAICog, name="affirmations"):
@@ -124,35 +125,34 @@ Generate now:"""
                 fallback_quote[1]
             )
 
-    @tasks.loop(minutes=15)
+    @tasks.loop(minutes=1)
     async def daily_affirmation_task(self) -> None:
-        """Background task that checks every 15 minutes for servers needing affirmations."""
+        """Background task that checks every minute for servers needing affirmations."""
+        if not self.bot.is_scheduler_leader():
+            return
+
         try:
             servers = await self.bot.database.get_servers_needing_affirmations()
 
-            for server_data in servers:
-                server_id, channel_id, post_time_str, tz_offset, theme, last_post_date = server_data
-
-                # Parse the post time
-                target_time = scheduling.parse_time_string(post_time_str)
-                if not target_time:
-                    continue
-
-                # Check if already posted today
-                if not scheduling.should_post_today(last_post_date, tz_offset):
-                    continue
-
-                # Check if within posting window
-                if scheduling.should_post_now(target_time, tz_offset, window_minutes=15):
-                    # Time to post!
-                    await self.post_affirmation_to_server(
-                        int(server_id), int(channel_id), theme
-                    )
-                    # Update last post date
-                    current_date = scheduling.get_server_date(tz_offset)
-                    await self.bot.database.update_last_post_date(
-                        int(server_id), current_date
-                    )
+            # Check every server's posting window in one pass
+            batch = ScheduleBatch.from_rows(
+                servers, post_time_col=2, timezone_offset_col=3,
+                last_post_col=5, timezone_col=6, window_minutes=15,
+                feature="affirmations", guild_id_col=0
+            )
+
+            for index, slot_date in batch.due(planner=self.bot.slot_planner):
+                server_id, channel_id, post_time_str, tz_offset, theme, last_post_date, tz_name = servers[index]
+                set_request_context(Priority.BACKGROUND, guild_id=int(server_id))
+
+                # Time to post!
+                await self.post_affirmation_to_server(
+                    int(server_id), int(channel_id), theme
+                )
+                # Update last post date
+                await self.bot.database.update_last_post_date(
+                    int(server_id), slot_date
+                )
 
         except Exception as e:
             self.bot.logger.error(f"Error in daily affirmation task: {e}")
@@ -320,7 +320,8 @@ Generate now:"""
         time="[setup] Time to post (24-hour format, e.g., '09:00' or '14:30')",
         timezone="[setup] Timezone offset from UTC (e.g., -5 for EST, +1 for CET)",
         theme="[setup] Theme for affirmations",
-        enabled="[toggle] Enable or disable daily affirmations"
+        enabled="[toggle] Enable or disable daily affirmations",
+        timezone_name="[setup] IANA timezone, e.g. America/New_York - follows daylight saving (overrides offset)"
     )
     @app_commands.choices(
         action=[
@@ -347,7 +348,8 @@ Generate now:"""
         time: Optional[str] = None,
         timezone: Optional[int] = None,
         theme: Optional[str] = None,
-        enabled: Optional[bool] = None
+        enabled: Optional[bool] = None,
+        timezone_name: Optional[str] = None
     ) -> None:
         """
         Manage daily affirmations for this server.
@@ -359,6 +361,7 @@ Generate now:"""
         :param timezone: Timezone offset for setup action.
         :param theme: Theme for setup action.
         :param enabled: Enable/disable for toggle action.
+        :param timezone_name: IANA timezone name for setup action (overrides the offset).
         """
         # Defer for slash commands
         if ctx.interaction:
@@ -366,7 +369,7 @@ Generate now:"""
 
         # Route to appropriate private method based on action
         if action == "setup":
-            await self._admin_setup(ctx, channel, time, timezone, theme)
+            await self._admin_setup(ctx, channel, time, timezone, theme, timezone_name)
         elif action == "toggle":
             await self._admin_toggle(ctx, enabled)
         elif action == "now":
@@ -387,7 +390,8 @@ Generate now:"""
         channel: Optional[discord.TextChannel],
         time: Optional[str],
         timezone: Optional[int],
-        theme: Optional[str]
+        theme: Optional[str],
+        timezone_name: Optional[str] = None
     ) -> None:
         """
         Configure daily affirmations for this server.
@@ -397,9 +401,10 @@ Generate now:"""
         :param time: Time in 24-hour format (HH:MM).
         :param timezone: Timezone offset from UTC (-12 to +14).
         :param theme: The theme for affirmations.
+        :param timezone_name: IANA timezone name (overrides the offset when given).
         """
         # Validate required parameters
-        if not channel or not time or timezone is None:
+        if not channel or not time or (timezone is None and not timezone_name):
             embed = discord.Embed(
                 title="Missing Parameters",
                 description="Setup requires: channel, time, and timezone parameters.\n\nExample: `/affirmation-admin action:setup channel:#general time:09:00 timezone:-5 theme:motivation`",
@@ -420,6 +425,8 @@ Generate now:"""
             return
 
         # Validate timezone
+        if timezone is None:
+            timezone = 0
         if timezone < -12 or timezone > 14:
             embed = discord.Embed(
                 title="Invalid Timezone",
@@ -429,13 +436,26 @@ Generate now:"""
             await ctx.send(embed=embed)
             return
 
+        if timezone_name and not scheduling.is_valid_timezone(timezone_name):
+            embed = discord.Embed(
+                title="Invalid Timezone",
+                description="Unknown timezone name. Use an IANA name such as `America/New_York` or `Europe/London`.",
+                color=0xE02B2B,
+            )
+            await ctx.send(embed=embed)
+            return
+        timezone_name = timezone_name.strip() if timezone_name else None
+        zone_label = scheduling.format_zone_label(
+            scheduling.resolve_zone_name(timezone_name, timezone)
+        )
+
         # Validate theme
         if not theme or theme not in self.THEMES:
             theme = "motivation"
 
         # Save configuration
         await self.bot.database.set_affirmation_config(
-            ctx.guild.id, channel.id, time, timezone, theme
+            ctx.guild.id, channel.id, time, timezone, theme, timezone_name
         )
 
         # Create confirmation embed
@@ -445,7 +465,7 @@ Generate now:"""
             color=0x2ECC71,
         )
         embed.add_field(name="📍 Channel", value=channel.mention, inline=True)
-        embed.add_field(name="⏰ Time", value=f"`{time}` (UTC{timezone:+d})", inline=True)
+        embed.add_field(name="⏰ Time", value=f"`{time}` ({zone_label})", inline=True)
         embed.add_field(name="🎨 Theme", value=theme.capitalize(), inline=True)
         embed.add_field(
             name="Status",
@@ -577,6 +597,7 @@ Generate now:"""
         status_emoji = "✅" if config["enabled"] else "❌"
         status_text = "Enabled" if config["enabled"] else "Disabled"
         color = 0x2ECC71 if config["enabled"] else 0xE02B2B
+        zone_name = scheduling.resolve_zone_name(config["timezone"], config["timezone_offset"])
 
         embed = discord.Embed(
             title=f"📊 Daily Affirmation Status",
@@ -600,7 +621,7 @@ Generate now:"""
         )
         embed.add_field(
             name="Post Time",
-            value=f"`{config['post_time']}` (UTC{config['timezone_offset']:+d})",
+            value=f"`{config['post_time']}` ({scheduling.format_zone_label(zone_name)})",
             inline=True
         )
         embed.add_field(
@@ -16,7 +16,6 @@ from typing import Optional, Dict, List
 
 import aiohttp
 import discord
-from anthropic import AsyncAnthropic
 from discord import app_commands
 from discord.ext import commands, tasks
 from discord.ext.commands import Context
@@ -24,14 +23,20 @@ from discord.ext.commands import Context
 # Import helpers
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from helpers import thread_manager, scheduling
+from helpers import thread_manager, scheduling, singleflight
+from helpers.schedule_batch import ScheduleBatch
 from helpers.claude_cog import ClaudeAICog
+from helpers.llm_scheduler import Priority, set_request_context
 
 
 class Art(ClaudeAICog, name="art"):
     def __init__(self, bot) -> None:
         super().__init__(bot, cog_name="Art cog")
 
+        # Guilds asking about the same artwork or image at once share one vision request
+        self.story_flights = singleflight.group("art-story")
+        self.analysis_flights = singleflight.group("art-analyze")
+
         # Start the background tasks
         self.daily_art_task.start()
         self.cleanup_threads_task.start()
@@ -172,6 +177,20 @@ class Art(ClaudeAICog, name="art"):
             return None
 
     async def generate_art_story(self, artwork: Dict) -> tuple[str, bool]:
+        """
+        Generate an engaging story about the artwork, sharing the request with
+        concurrent calls for the same artwork.
+
+        :param artwork: Dictionary containing artwork information.
+        :return: Tuple of (story text, vision_success flag).
+        """
+        artwork_url = artwork.get('object_url', '')
+        if not artwork_url:
+            return await self._generate_art_story(artwork)
+        key = singleflight.make_key(singleflight.normalize_url(artwork_url))
+        return await self.story_flights.do(key, lambda: self._generate_art_story(artwork))
+
+    async def _generate_art_story(self, artwork: Dict) -> tuple[str, bool]:
         """
         Generate an engaging story about the artwork using Claude vision analysis.
 
@@ -382,40 +401,39 @@ Focus on what makes this piece interesting or unique visually and historically."
             self.bot.logger.error(f"Error posting artwork: {e}")
             return False
 
-    @tasks.loop(minutes=15)
+    @tasks.loop(minutes=1)
     async def daily_art_task(self) -> None:
-        """Background task that checks every 15 minutes for servers needing art posts."""
+        """Background task that checks every minute for servers needing art posts."""
+        if not self.bot.is_scheduler_leader():
+            return
+
         try:
             servers = await self.bot.database.get_servers_needing_art()
 
-            for server_data in servers:
-                server_id, channel_id, post_time_str, tz_offset, last_post_date = server_data
-
-                # Parse the post time
-                target_time = scheduling.parse_time_string(post_time_str)
-                if not target_time:
-                    continue
-
-                # Check if we've already posted today
-                if not scheduling.should_post_today(last_post_date, tz_offset):
-                    continue
+            # Check every server's posting window (15 minutes) in one pass
+            batch = ScheduleBatch.from_rows(
+                servers, post_time_col=2, timezone_offset_col=3,
+                last_post_col=4, timezone_col=5, window_minutes=15,
+                feature="art", guild_id_col=0
+            )
 
-                # Check if it's time to post (within 15-minute window)
-                if scheduling.should_post_now(target_time, tz_offset, window_minutes=15):
-                    # Time to post! Try different museums
-                    artwork = None
-                    for fetch_func in [self.fetch_met_artwork, self.fetch_art_institute_artwork]:
-                        artwork = await fetch_func()
-                        if artwork:
-                            break
+            for index, slot_date in batch.due(planner=self.bot.slot_planner):
+                server_id, channel_id, post_time_str, tz_offset, last_post_date, tz_name = servers[index]
+                set_request_context(Priority.BACKGROUND, guild_id=int(server_id))
 
+                # Time to post! Try different museums
+                artwork = None
+                for fetch_func in [self.fetch_met_artwork, self.fetch_art_institute_artwork]:
+                    artwork = await fetch_func()
                     if artwork:
-                        await self.post_artwork_to_channel(int(server_id), int(channel_id), artwork)
-                        # Update last post date
-                        current_date = scheduling.get_server_date(tz_offset)
-                        await self.bot.database.update_art_last_post_date(
-                            int(server_id), current_date
-                        )
+                        break
+
+                if artwork:
+                    await self.post_artwork_to_channel(int(server_id), int(channel_id), artwork)
+                    # Update last post date
+                    await self.bot.database.update_art_last_post_date(
+                        int(server_id), slot_date
+                    )
 
         except Exception as e:
             self.bot.logger.error(f"Error in daily art task: {e}")
@@ -462,6 +480,9 @@ Focus on what makes this piece interesting or unique visually and historically."
 
         Runs every hour to check for threads inactive for 24+ hours.
         """
+        if not self.bot.is_scheduler_leader():
+            return
+
         try:
             self.bot.logger.info("Starting thread cleanup task...")
 
@@ -531,6 +552,18 @@ Focus on what makes this piece interesting or unique visually and historically."
         await self.bot.wait_until_ready()
 
     async def analyze_image_with_vision(self, image_url: str, analysis_type: str = "general") -> str:
+        """
+        Analyze an image using Claude's vision capabilities, sharing the request
+        with concurrent analyses of the same image.
+
+        :param image_url: URL of the image to analyze.
+        :param analysis_type: Type of analysis ("general", "beginner", "compare").
+        :return: Analysis text.
+        """
+        key = singleflight.make_key(singleflight.normalize_url(image_url), analysis_type)
+        return await self.analysis_flights.do(key, lambda: self._analyze_image_with_vision(image_url, analysis_type))
+
+    async def _analyze_image_with_vision(self, image_url: str, analysis_type: str = "general") -> str:
         """
         Analyze an image using Claude's vision capabilities.
 
@@ -860,14 +893,16 @@ Be thorough and insightful. Around 300-400 words."""
     @app_commands.describe(
         channel="Channel for daily art posts",
         post_time="Time to post (HH:MM in 24-hour format, e.g., 09:00)",
-        timezone_offset="Timezone offset from UTC (e.g., -5 for EST, 0 for UTC)"
+        timezone_offset="Timezone offset from UTC (e.g., -5 for EST, 0 for UTC)",
+        timezone_name="IANA timezone, e.g. America/New_York - follows daylight saving (overrides offset)"
     )
     async def art_admin_setup(
         self,
         context: Context,
         channel: discord.TextChannel,
         post_time: str,
-        timezone_offset: int = 0
+        timezone_offset: int = 0,
+        timezone_name: Optional[str] = None
     ) -> None:
         """
         Configure daily art posts for the server.
@@ -876,6 +911,7 @@ Be thorough and insightful. Around 300-400 words."""
         :param channel: Channel to post art in.
         :param post_time: Time to post (HH:MM format).
         :param timezone_offset: Hours offset from UTC.
+        :param timezone_name: IANA timezone name (overrides the offset when given).
         """
         # Validate time format
         parsed_time = scheduling.parse_time_string(post_time)
@@ -896,17 +932,30 @@ Be thorough and insightful. Around 300-400 words."""
             await context.send(embed=embed)
             return
 
+        if timezone_name and not scheduling.is_valid_timezone(timezone_name):
+            embed = discord.Embed(
+                description="❌ Unknown timezone! Use an IANA name such as `America/New_York` or `Europe/London`",
+                color=0xE02B2B
+            )
+            await context.send(embed=embed)
+            return
+        timezone_name = timezone_name.strip() if timezone_name else None
+        zone_label = scheduling.format_zone_label(
+            scheduling.resolve_zone_name(timezone_name, timezone_offset)
+        )
+
         # Save configuration
         await self.bot.database.setup_art_config(
             context.guild.id,
             channel.id,
             post_time,
-            timezone_offset
+            timezone_offset,
+            timezone=timezone_name
         )
 
         embed = discord.Embed(
             title="✅ Daily Art Posts Configured!",
-            description=f"Art will be posted daily in {channel.mention} at {post_time} (UTC{timezone_offset:+d})",
+            description=f"Art will be posted daily in {channel.mention} at {post_time} ({zone_label})",
             color=0x2ECC71
         )
         embed.add_field(
@@ -1026,7 +1075,8 @@ Be thorough and insightful. Around 300-400 words."""
             await context.send(embed=embed)
             return
 
-        server_id, channel_id, post_time, tz_offset, enabled, last_post_date, focus_areas, include_contemporary = config
+        server_id, channel_id, post_time, tz_offset, enabled, last_post_date, focus_areas, include_contemporary, tz_name = config
+        zone_name = scheduling.resolve_zone_name(tz_name, tz_offset)
 
         channel = self.bot.get_channel(channel_id)
         channel_mention = channel.mention if channel else f"Unknown Channel ({channel_id})"
@@ -1041,7 +1091,7 @@ Be thorough and insightful. Around 300-400 words."""
 
         embed.add_field(name="Status", value=f"{status_emoji} {status_text}", inline=True)
         embed.add_field(name="Channel", value=channel_mention, inline=True)
-        embed.add_field(name="Post Time", value=f"{post_time} (UTC{tz_offset:+d})", inline=True)
+        embed.add_field(name="Post Time", value=f"{post_time} ({scheduling.format_zone_label(zone_name)})", inline=True)
         embed.add_field(name="Last Posted", value=last_post_date or "Never", inline=True)
         embed.add_field(name="Focus Areas", value=focus_areas or "All", inline=True)
         embed.add_field(name="Include Contemporary", value="Yes" if include_contemporary else "No", inline=True)
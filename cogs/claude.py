@@ -8,11 +8,9 @@ Version: 6.3.0
 
 import os
 import sys
-import time
 import asyncio
 
 import discord
-from anthropic import AsyncAnthropic
 from discord import app_commands
 from discord.ext import commands
 from discord.ext.commands import Context
@@ -20,6 +18,11 @@ from discord.ext.commands import Context
 # Import helpers
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from helpers.claude_cog import ClaudeAICog
+from helpers.conversation_actor import ConversationActors, ConversationBusy
+from helpers import conversation_summary
+from helpers.llm_scheduler import Priority, interaction_deadline, request_context, set_request_context
+from helpers.prompt_cache import ConversationCache, count_tokens
+from helpers.stream_editor import StreamEditor
 
 
 class ExpandableView(discord.ui.View):
@@ -67,6 +70,12 @@ class ExpandableView(discord.ui.View):
 class Claude(ClaudeAICog, name="claude"):
     def __init__(self, bot) -> None:
         super().__init__(bot, cog_name="Claude cog")
+        # Stable history windows and cache usage per conversation (see helpers/prompt_cache.py)
+        self.prompt_cache = ConversationCache()
+        # Running summary refreshes in progress, one per conversation
+        self.summary_refreshes = {}
+        # Turn order and in-memory recent messages per conversation (see helpers/conversation_actor.py)
+        self.conversations = ConversationActors(bot)
 
     @commands.hybrid_command(
         name="ask",
@@ -164,6 +173,14 @@ class Claude(ClaudeAICog, name="claude"):
         if context.interaction:
             await context.defer()
 
+        # Someone is watching this stream: queue ahead of other Claude requests,
+        # and give up if the interaction expires while waiting
+        set_request_context(
+            Priority.INTERACTIVE,
+            guild_id=context.guild.id if context.guild else None,
+            deadline=interaction_deadline(context.interaction),
+        )
+
         if not self.client:
             embed = discord.Embed(
                 title="Error",
@@ -182,199 +199,286 @@ class Claude(ClaudeAICog, name="claude"):
             await context.send(embed=embed)
             return
 
-        # Show typing indicator while processing
-        async with context.channel.typing():
-            try:
-                # Store the user's question FIRST to ensure conversation consistency
-                await self.bot.database.add_claude_message(
-                    context.channel.id, context.author.id, "user", question
-                )
-
-                # Get conversation history for this channel (shared or personal based on mode)
-                user_id_filter = None if shared else context.author.id
-                history = await self.bot.database.get_conversation_history(
-                    context.channel.id, limit=20, user_id=user_id_filter
-                )
-
-                # Build messages array for Claude from the complete history
-                messages = []
-                for role, content in history:
-                    messages.append({"role": role, "content": content})
-
-                # Prepare embed metadata
-                question_display = question[:250] + "..." if len(question) > 250 else question
-                conversation_type = "Shared" if shared else "Personal"
-
-                # Get current message count (will be incremented after response)
-                total_msgs = await self.bot.database.get_total_messages(context.channel.id, user_id=user_id_filter)
-
-                # Create initial embed
-                embed = discord.Embed(
-                    title="Claude's Response",
-                    description="*Thinking...*",
-                    color=0xBEBEFE,
-                )
-                embed.set_author(
-                    name=question_display,
-                    icon_url=context.author.avatar.url if context.author.avatar else None
-                )
-                embed.set_footer(text=f"{conversation_type} conversation: {total_msgs + 1} questions")
-
-                # Send initial message immediately
-                message = await context.send(embed=embed)
-
-                # Stream the response from Claude API
-                accumulated_text = ""
-                last_update = time.time()
-                update_interval = 0.75  # Update every 0.75 seconds to avoid rate limits
+        # One turn at a time per conversation, so every question is followed by its answer
+        user_id_filter = None if shared else context.author.id
+        try:
+            conversation = await self.conversations.acquire(context.channel.id, user_id_filter)
+        except ConversationBusy:
+            embed = discord.Embed(
+                title="Busy",
+                description="Claude is still answering earlier questions in this conversation. Please try again in a moment.",
+                color=0xE02B2B,
+            )
+            await context.send(embed=embed)
+            return
 
+        try:
+            # Show typing indicator while processing
+            async with context.channel.typing():
                 try:
-                    async with self.client.messages.stream(
-                        model="claude-3-5-haiku-20241022",
-                        max_tokens=2048,
-                        messages=messages,
-                    ) as stream:
-                        async for text in stream.text_stream:
-                            accumulated_text += text
-
-                            # Update message periodically to show progress
-                            current_time = time.time()
-                            if current_time - last_update >= update_interval:
-                                # Truncate if getting long (embed limit is 4096)
+                    # Store the user's question FIRST to ensure conversation consistency
+                    await self.conversations.add(context.channel.id, context.author.id, "user", question)
+
+                    # Get conversation history for this channel (shared or personal based on mode)
+                    # from memory, starting where the cached prefix starts so the prompt cache can be reused
+                    history = conversation.history(self.prompt_cache.window_start(context.channel.id, user_id_filter))
+
+                    # Build messages array for Claude with cache breakpoints on the stable prefix
+                    messages = self.prompt_cache.build_messages(context.channel.id, user_id_filter, history)
+
+                    # Turns older than the window are covered by the running summary; fold in
+                    # any that it doesn't cover yet in the background
+                    summary = conversation.summary
+                    window_start = self.prompt_cache.window_start(context.channel.id, user_id_filter)
+                    if window_start and window_start > (summary["through_id"] if summary else 0) + 1:
+                        self.schedule_summary_refresh(context.channel.id, user_id_filter)
+                    stream_options = {}
+                    if summary:
+                        stream_options["system"] = conversation_summary.summary_system_prompt(summary["summary"])
+
+                    # Prepare embed metadata
+                    question_display = question[:250] + "..." if len(question) > 250 else question
+                    conversation_type = "Shared" if shared else "Personal"
+
+                    # Get current message count (will be incremented after response)
+                    total_msgs = conversation.questions
+
+                    # Create initial embed
+                    embed = discord.Embed(
+                        title="Claude's Response",
+                        description="*Thinking...*",
+                        color=0xBEBEFE,
+                    )
+                    embed.set_author(
+                        name=question_display,
+                        icon_url=context.author.avatar.url if context.author.avatar else None
+                    )
+                    embed.set_footer(text=f"{conversation_type} conversation: {total_msgs + 1} questions")
+
+                    # Send initial message immediately
+                    message = await context.send(embed=embed)
+
+                    # Stream the response from Claude API; edits are coalesced and paced to the
+                    # channel's rate limit (shared with other streams in the channel)
+                    accumulated_text = ""
+                    editor = StreamEditor(message)
+
+                    try:
+                        async with self.client.messages.stream(
+                            model="claude-3-5-haiku-20241022",
+                            max_tokens=2048,
+                            messages=messages,
+                            **stream_options,
+                        ) as stream:
+                            async for text in stream.text_stream:
+                                accumulated_text += text
+
+                                # Show progress; only the latest text is sent when the next edit is allowed
                                 display_text = accumulated_text
                                 if len(display_text) > 3900:
+                                    # Truncate if getting long (embed limit is 4096)
                                     display_text = accumulated_text[:3900] + "\n\n*...streaming continues...*"
-
                                 embed.description = display_text
-                                try:
-                                    await message.edit(embed=embed)
-                                    last_update = current_time
-                                except discord.errors.HTTPException:
-                                    # Rate limit hit, skip this update
-                                    pass
-
-                    # Format the complete response for proper Discord markdown rendering
-                    response_text = self._format_for_discord(accumulated_text)
-
-                    # Store the complete response in database
-                    user_id_for_response = 0 if shared else context.author.id
-                    await self.bot.database.add_claude_message(
-                        context.channel.id, user_id_for_response, "assistant", response_text
-                    )
+                                editor.update(embed=embed.copy())
+
+                            # Track prompt cache reads/writes for this channel
+                            final_message = await stream.get_final_message()
+                            usage = self.prompt_cache.record_usage(context.channel.id, final_message.usage)
+                            self.bot.logger.debug(
+                                f"Claude cache in #{context.channel.name}: "
+                                f"read {getattr(final_message.usage, 'cache_read_input_tokens', 0) or 0}, "
+                                f"wrote {getattr(final_message.usage, 'cache_creation_input_tokens', 0) or 0} "
+                                f"(channel hit ratio {usage.hit_ratio:.0%})"
+                            )
+
+                        # Format the complete response for proper Discord markdown rendering
+                        response_text = self._format_for_discord(accumulated_text)
+
+                        # Store the complete response in database
+                        user_id_for_response = 0 if shared else context.author.id
+                        await self.conversations.add(context.channel.id, user_id_for_response, "assistant", response_text)
+
+                        # Final update with formatted response
+                        if len(response_text) <= 4000:
+                            # Check if response should be truncated with expand button
+                            # Show only 1-2 lines (~150 chars) by default
+                            truncation_threshold = 150
+                            min_truncation = 100  # Minimum chars to show (at least 1 line)
+                            conversation_footer = f"{conversation_type} conversation: {total_msgs + 1} questions"
+
+                            if len(response_text) > truncation_threshold:
+                                # Response is long - add truncation with expand button
+                                # Find a good truncation point (prefer end of sentence)
+                                truncate_at = truncation_threshold
+
+                                # Look for sentence ending near threshold
+                                for i in range(truncation_threshold - 50, min(truncation_threshold + 100, len(response_text))):
+                                    if i < len(response_text) and response_text[i] in ['.', '!', '?']:
+                                        truncate_at = i + 1
+                                        break
+
+                                # If no sentence ending found, look for word boundary
+                                if truncate_at == truncation_threshold:
+                                    for i in range(truncation_threshold, min(truncation_threshold + 50, len(response_text))):
+                                        if i < len(response_text) and response_text[i] == ' ':
+                                            truncate_at = i
+                                            break
+
+                                # Ensure minimum truncation length
+                                if truncate_at < min_truncation:
+                                    truncate_at = min(min_truncation, len(response_text))
+
+                                truncated_text = response_text[:truncate_at].strip() + "...\n\n*⬇️ Click button below to read full response*"
+
+                                # Create view with expand button
+                                view = ExpandableView(
+                                    full_text=response_text,
+                                    truncated_text=truncated_text,
+                                    embed=embed,
+                                    question_display=question_display,
+                                    conversation_footer=conversation_footer
+                                )
+
+                                # Update message with truncated text and button
+                                embed.description = truncated_text
+                                embed.set_footer(text=f"{conversation_footer} • Tap button to expand")
+                                await editor.finish(embed=embed, view=view)
+                            else:
+                                # Response is short enough - show normally
+                                embed.description = response_text
+                                await editor.finish(embed=embed)
+                        else:
+                            # Response too long for single embed - send in chunks
+                            chunks = []
+                            remaining_text = response_text
 
-                    # Final update with formatted response
-                    if len(response_text) <= 4000:
-                        # Check if response should be truncated with expand button
-                        # Show only 1-2 lines (~150 chars) by default
-                        truncation_threshold = 150
-                        min_truncation = 100  # Minimum chars to show (at least 1 line)
-                        conversation_footer = f"{conversation_type} conversation: {total_msgs + 1} questions"
-
-                        if len(response_text) > truncation_threshold:
-                            # Response is long - add truncation with expand button
-                            # Find a good truncation point (prefer end of sentence)
-                            truncate_at = truncation_threshold
-
-                            # Look for sentence ending near threshold
-                            for i in range(truncation_threshold - 50, min(truncation_threshold + 100, len(response_text))):
-                                if i < len(response_text) and response_text[i] in ['.', '!', '?']:
-                                    truncate_at = i + 1
+                            while remaining_text:
+                                chunk_limit = 4000 if not chunks else 1900
+
+                                if len(remaining_text) <= chunk_limit:
+                                    chunks.append(remaining_text)
                                     break
 
-                            # If no sentence ending found, look for word boundary
-                            if truncate_at == truncation_threshold:
-                                for i in range(truncation_threshold, min(truncation_threshold + 50, len(response_text))):
-                                    if i < len(response_text) and response_text[i] == ' ':
-                                        truncate_at = i
+                                # Find a good break point
+                                split_point = chunk_limit
+                                for i in range(chunk_limit - 100, chunk_limit):
+                                    if i < len(remaining_text) and remaining_text[i] in ['\n', ' ', '.', '!', '?']:
+                                        split_point = i + 1
                                         break
 
-                            # Ensure minimum truncation length
-                            if truncate_at < min_truncation:
-                                truncate_at = min(min_truncation, len(response_text))
+                                chunks.append(remaining_text[:split_point])
+                                remaining_text = remaining_text[split_point:]
 
-                            truncated_text = response_text[:truncate_at].strip() + "...\n\n*⬇️ Click button below to read full response*"
+                            # Update initial message with first chunk
+                            embed.description = chunks[0]
+                            await editor.finish(embed=embed)
 
-                            # Create view with expand button
-                            view = ExpandableView(
-                                full_text=response_text,
-                                truncated_text=truncated_text,
-                                embed=embed,
-                                question_display=question_display,
-                                conversation_footer=conversation_footer
-                            )
+                            # Send remaining chunks as separate messages
+                            for chunk in chunks[1:]:
+                                await context.send(chunk)
+
+                    except Exception as e:
+                        # Handle streaming errors
+                        self.bot.logger.error(f"Error during Claude streaming: {e}")
+
+                        # If we got some response, show it
+                        if accumulated_text:
+                            response_text = self._format_for_discord(accumulated_text)
+                            embed.description = response_text + "\n\n*⚠️ Stream interrupted - showing partial response*"
+                            await editor.finish(embed=embed)
 
-                            # Update message with truncated text and button
-                            embed.description = truncated_text
-                            embed.set_footer(text=f"{conversation_footer} • Tap button to expand")
-                            await message.edit(embed=embed, view=view)
+                            # Still store partial response
+                            user_id_for_response = 0 if shared else context.author.id
+                            await self.conversations.add(
+                                context.channel.id, user_id_for_response, "assistant", response_text
+                            )
                         else:
-                            # Response is short enough - show normally
-                            embed.description = response_text
-                            await message.edit(embed=embed)
-                    else:
-                        # Response too long for single embed - send in chunks
-                        chunks = []
-                        remaining_text = response_text
-
-                        while remaining_text:
-                            chunk_limit = 4000 if not chunks else 1900
-
-                            if len(remaining_text) <= chunk_limit:
-                                chunks.append(remaining_text)
-                                break
-
-                            # Find a good break point
-                            split_point = chunk_limit
-                            for i in range(chunk_limit - 100, chunk_limit):
-                                if i < len(remaining_text) and remaining_text[i] in ['\n', ' ', '.', '!', '?']:
-                                    split_point = i + 1
-                                    break
+                            # No response received, show error
+                            embed.description = "❌ An error occurred while generating the response. Please try again."
+                            embed.color = 0xE02B2B
+                            await editor.finish(embed=embed)
+                            raise
+
+                    self.bot.logger.info(
+                        f"{context.author} (ID: {context.author.id}) asked Claude in #{context.channel.name}: {question[:50]}..."
+                    )
 
-                            chunks.append(remaining_text[:split_point])
-                            remaining_text = remaining_text[split_point:]
+                except Exception as e:
+                    self.bot.logger.error(f"Error calling Claude API: {e}")
+                    embed = discord.Embed(
+                        title="Error",
+                        description="An error occurred while processing your request. Please try again later.",
+                        color=0xE02B2B,
+                    )
+                    await context.send(embed=embed)
+        finally:
+            conversation.release()
 
-                        # Update initial message with first chunk
-                        embed.description = chunks[0]
-                        await message.edit(embed=embed)
+    def schedule_summary_refresh(self, channel_id: int, user_id: int = None) -> None:
+        """
+        Start refreshing a conversation's running summary in the background unless a refresh is already running.
 
-                        # Send remaining chunks as separate messages
-                        for chunk in chunks[1:]:
-                            await context.send(chunk)
+        :param channel_id: The ID of the channel.
+        :param user_id: User ID for personal conversations, None for shared.
+        """
+        if not self.client:
+            return
+        key = (channel_id, user_id)
+        running = self.summary_refreshes.get(key)
+        if running and not running.done():
+            return
+        self.summary_refreshes[key] = asyncio.create_task(self.refresh_summary(channel_id, user_id))
 
-                except Exception as e:
-                    # Handle streaming errors
-                    self.bot.logger.error(f"Error during Claude streaming: {e}")
+    async def refresh_summary(self, channel_id: int, user_id: int = None) -> bool:
+        """
+        Fold the turns between the running summary and the history window into the summary.
 
-                    # If we got some response, show it
-                    if accumulated_text:
-                        response_text = self._format_for_discord(accumulated_text)
-                        embed.description = response_text + "\n\n*⚠️ Stream interrupted - showing partial response*"
-                        await message.edit(embed=embed)
+        :param channel_id: The ID of the channel.
+        :param user_id: User ID for personal conversations, None for shared.
+        :return: True if the stored summary was updated.
+        """
+        window_start = self.prompt_cache.window_start(channel_id, user_id)
+        if not self.client or not window_start:
+            return False
 
-                        # Still store partial response
-                        user_id_for_response = 0 if shared else context.author.id
-                        await self.bot.database.add_claude_message(
-                            context.channel.id, user_id_for_response, "assistant", response_text
-                        )
-                    else:
-                        # No response received, show error
-                        embed.description = "❌ An error occurred while generating the response. Please try again."
-                        embed.color = 0xE02B2B
-                        await message.edit(embed=embed)
-                        raise
-
-                self.bot.logger.info(
-                    f"{context.author} (ID: {context.author.id}) asked Claude in #{context.channel.name}: {question[:50]}..."
+        # Not user-facing: queue behind interactive requests (the task inherits the /ask context)
+        with request_context(Priority.BACKGROUND):
+            try:
+                summary = await self.bot.database.get_claude_summary(channel_id, user_id)
+                through_id = summary["through_id"] if summary else 0
+                if window_start <= through_id + 1:
+                    return False
+
+                rows = await self.bot.database.get_conversation_range(
+                    channel_id, after_id=through_id, before_id=window_start, user_id=user_id
                 )
+                rows = conversation_summary.select_turns(rows)
+                if not rows:
+                    if not summary:
+                        return False
+                    text = summary["summary"]
+                else:
+                    prompt = conversation_summary.build_summary_prompt(summary["summary"] if summary else None, rows)
+                    message = await self.client.messages.create(
+                        model="claude-3-5-haiku-20241022",
+                        max_tokens=conversation_summary.SUMMARY_MAX_TOKENS,
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+                    text = message.content[0].text.strip()
 
-            except Exception as e:
-                self.bot.logger.error(f"Error calling Claude API: {e}")
-                embed = discord.Embed(
-                    title="Error",
-                    description="An error occurred while processing your request. Please try again later.",
-                    color=0xE02B2B,
+                await self.bot.database.save_claude_summary(
+                    channel_id, user_id, text, window_start - 1, count_tokens(text)
                 )
-                await context.send(embed=embed)
+                self.conversations.set_summary(channel_id, user_id, {
+                    "summary": text, "through_id": window_start - 1, "token_count": count_tokens(text),
+                })
+                self.bot.logger.debug(
+                    f"Claude summary for channel {channel_id} now covers messages up to {window_start - 1}"
+                )
+                return True
+            except Exception as e:
+                self.bot.logger.error(f"Error refreshing Claude conversation summary: {e}")
+                return False
 
     @commands.hybrid_command(
         name="clear",
@@ -394,6 +498,11 @@ class Claude(ClaudeAICog, name="claude"):
 
         user_id_filter = None if shared else context.author.id
         deleted_count = await self.bot.database.clear_conversation(context.channel.id, user_id=user_id_filter)
+        self.prompt_cache.reset(context.channel.id, user_id_filter)
+        self.conversations.invalidate(context.channel.id, user_id_filter)
+        refresh = self.summary_refreshes.pop((context.channel.id, user_id_filter), None)
+        if refresh:
+            refresh.cancel()
 
         conversation_type = "shared channel" if shared else "your personal"
         if deleted_count > 0:
@@ -452,6 +561,18 @@ class Claude(ClaudeAICog, name="claude"):
                 f"Use `{clear_command}` to reset the conversation.",
                 color=0xBEBEFE,
             )
+            usage = self.prompt_cache.usage(context.channel.id)
+            if usage.requests:
+                embed.add_field(
+                    name="Prompt Cache (this channel)",
+                    value=(
+                        f"**Cache reads:** {usage.cache_read_tokens:,} tokens\n"
+                        f"**Cache writes:** {usage.cache_write_tokens:,} tokens\n"
+                        f"**Uncached input:** {usage.input_tokens:,} tokens\n"
+                        f"**Hit ratio:** {usage.hit_ratio:.0%} over {usage.requests} responses"
+                    ),
+                    inline=False,
+                )
 
         await context.send(embed=embed)
 
@@ -14,15 +14,16 @@ from datetime import datetime, time, timedelta
 from typing import Optional, Dict, List, Tuple
 
 import discord
-from anthropic import AsyncAnthropic
 from discord import app_commands
 from discord.ext import commands, tasks
 from discord.ext.commands import Context
 
 # Import helpers
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from helpers import thread_manager
+from helpers import scheduling, thread_manager
+from helpers.schedule_batch import ScheduleBatch
 from helpers.claude_cog import ClaudeAICog
+from helpers.llm_scheduler import Priority, set_request_context
 
 
 class Creative(ClaudeAICog, name="creative"):
@@ -66,11 +67,10 @@ class Creative(ClaudeAICog, name="creative"):
         except Exception:
             return None
 
-    def get_current_date_for_server(self, timezone_offset: int) -> str:
+    def get_current_date_for_server(self, timezone_offset: int, timezone_name: Optional[str] = None) -> str:
         """Get current date string for a server's timezone."""
-        utc_now = datetime.utcnow()
-        server_time = utc_now + timedelta(hours=timezone_offset)
-        return server_time.strftime("%Y-%m-%d")
+        zone_name = scheduling.resolve_zone_name(timezone_name, timezone_offset)
+        return scheduling.get_local_date(zone_name)
 
     # ==================== WRITING PROMPTS ====================
 
@@ -1101,7 +1101,8 @@ Write the next 100-200 words continuing the story naturally. Match the tone and
         channel="Channel for daily prompts (for schedule)",
         time="Post time HH:MM (for schedule)",
         timezone="UTC offset (for schedule)",
-        theme="Monthly theme (for theme)"
+        theme="Monthly theme (for theme)",
+        timezone_name="IANA timezone, e.g., America/New_York (overrides offset, follows DST)"
     )
     @app_commands.choices(action=[
         app_commands.Choice(name="Schedule Daily Prompts", value="schedule"),
@@ -1116,7 +1117,8 @@ Write the next 100-200 words continuing the story naturally. Match the tone and
         channel: Optional[discord.TextChannel] = None,
         time: Optional[str] = None,
         timezone: Optional[int] = None,
-        theme: Optional[str] = None
+        theme: Optional[str] = None,
+        timezone_name: Optional[str] = None
     ) -> None:
         """
         Admin commands for creative studio.
@@ -1127,8 +1129,13 @@ Write the next 100-200 words continuing the story naturally. Match the tone and
         :param time: Post time.
         :param timezone: Timezone offset.
         :param theme: Monthly theme.
+        :param timezone_name: IANA timezone name, takes precedence over the offset.
         """
         if action == "schedule":
+            timezone_name = timezone_name.strip() if timezone_name else None
+            if timezone is None and timezone_name:
+                timezone = 0
+
             if not all([channel, time, timezone is not None]):
                 embed = discord.Embed(
                     description="❌ To schedule, you must provide: channel, time (HH:MM), and timezone offset.",
@@ -1156,15 +1163,28 @@ Write the next 100-200 words continuing the story naturally. Match the tone and
                 await context.send(embed=embed)
                 return
 
+            if timezone_name and not scheduling.is_valid_timezone(timezone_name):
+                embed = discord.Embed(
+                    description="❌ Unknown timezone. Use an IANA name like `America/New_York` or `Europe/London`.",
+                    color=0xE02B2B
+                )
+                await context.send(embed=embed)
+                return
+
+            zone_label = scheduling.format_zone_label(
+                scheduling.resolve_zone_name(timezone_name, timezone)
+            )
+
             try:
                 await self.bot.database.connection.execute(
-                    """INSERT INTO creative_config (server_id, channel_id, post_time, timezone_offset)
-                       VALUES (?, ?, ?, ?)
+                    """INSERT INTO creative_config (server_id, channel_id, post_time, timezone_offset, timezone)
+                       VALUES (?, ?, ?, ?, ?)
                        ON CONFLICT(server_id) DO UPDATE SET
                        channel_id = excluded.channel_id,
                        post_time = excluded.post_time,
-                       timezone_offset = excluded.timezone_offset""",
-                    (context.guild.id, channel.id, time, timezone)
+                       timezone_offset = excluded.timezone_offset,
+                       timezone = excluded.timezone""",
+                    (context.guild.id, channel.id, time, timezone, timezone_name)
                 )
                 await self.bot.database.connection.commit()
 
@@ -1172,7 +1192,7 @@ Write the next 100-200 words continuing the story naturally. Match the tone and
                     title="✅ Creative Prompts Scheduled!",
                     description=(
                         f"Daily creative prompts will be posted in {channel.mention}\n"
-                        f"**Time:** {time} (UTC{timezone:+d})\n"
+                        f"**Time:** {time} ({zone_label})\n"
                         f"**Rotation:** Writing → Music → Art"
                     ),
                     color=0x2ECC71
@@ -1226,7 +1246,7 @@ Write the next 100-200 words continuing the story naturally. Match the tone and
         elif action == "config":
             try:
                 async with self.bot.database.connection.execute(
-                    "SELECT channel_id, post_time, timezone_offset, daily_prompts_enabled, current_month_theme FROM creative_config WHERE server_id = ?",
+                    "SELECT channel_id, post_time, timezone_offset, timezone, daily_prompts_enabled, current_month_theme FROM creative_config WHERE server_id = ?",
                     (context.guild.id,)
                 ) as cursor:
                     result = await cursor.fetchone()
@@ -1240,7 +1260,10 @@ Write the next 100-200 words continuing the story naturally. Match the tone and
                     await context.send(embed=embed)
                     return
 
-                channel_id, post_time, tz_offset, enabled, theme_val = result
+                channel_id, post_time, tz_offset, tz_name, enabled, theme_val = result
+                zone_label = scheduling.format_zone_label(
+                    scheduling.resolve_zone_name(tz_name, tz_offset)
+                )
                 channel_obj = context.guild.get_channel(int(channel_id)) if channel_id else None
                 channel_mention = channel_obj.mention if channel_obj else "Not set"
 
@@ -1253,7 +1276,7 @@ Write the next 100-200 words continuing the story naturally. Match the tone and
                     name="⚙️ Settings",
                     value=(
                         f"**Channel:** {channel_mention}\n"
-                        f"**Time:** {post_time} (UTC{tz_offset:+d})\n"
+                        f"**Time:** {post_time} ({zone_label})\n"
                         f"**Daily Prompts:** {'✅ Enabled' if enabled else '❌ Disabled'}\n"
                         f"**Monthly Theme:** {theme_val or 'None set'}"
                     ),
@@ -1342,39 +1365,44 @@ Write the next 100-200 words continuing the story naturally. Match the tone and
 
     # ==================== BACKGROUND TASKS ====================
 
-    @tasks.loop(minutes=15)
+    @tasks.loop(minutes=1)
     async def check_daily_prompts(self):
         """Check if daily prompts should be posted."""
+        if not self.bot.is_scheduler_leader():
+            return
+
         try:
             async with self.bot.database.connection.execute(
-                "SELECT server_id, channel_id, post_time, timezone_offset, last_daily_post, prompt_rotation FROM creative_config WHERE daily_prompts_enabled = 1"
+                "SELECT server_id, channel_id, post_time, timezone_offset, timezone, last_daily_post, prompt_rotation FROM creative_config WHERE daily_prompts_enabled = 1"
             ) as cursor:
                 configs = await cursor.fetchall()
 
-            for server_id, channel_id, post_time, tz_offset, last_post, rotation in configs:
-                utc_now = datetime.utcnow()
-                server_time = utc_now + timedelta(hours=tz_offset)
-                server_date = server_time.strftime("%Y-%m-%d")
+            # Check every server's posting window (60 minutes) in one pass
+            batch = ScheduleBatch.from_rows(
+                configs, post_time_col=2, timezone_offset_col=3,
+                last_post_col=5, timezone_col=4, window_minutes=60,
+                feature="creative", guild_id_col=0
+            )
 
-                hour, minute = map(int, post_time.split(':'))
-                time_diff = abs((server_time.hour * 60 + server_time.minute) - (hour * 60 + minute))
+            for index, server_date in batch.due(planner=self.bot.slot_planner):
+                server_id, channel_id, post_time, tz_offset, tz_name, last_post, rotation = configs[index]
+                set_request_context(Priority.BACKGROUND, guild_id=int(server_id))
 
-                if time_diff <= 60 and last_post != server_date:
-                    guild = self.bot.get_guild(int(server_id))
-                    if guild:
-                        channel = guild.get_channel(int(channel_id))
-                        if channel:
-                            # Determine which type of prompt to post
-                            next_rotation = {"writing": "music", "music": "art", "art": "writing"}.get(rotation or "writing", "writing")
+                guild = self.bot.get_guild(int(server_id))
+                if guild:
+                    channel = guild.get_channel(int(channel_id))
+                    if channel:
+                        # Determine which type of prompt to post
+                        next_rotation = {"writing": "music", "music": "art", "art": "writing"}.get(rotation or "writing", "writing")
 
-                            await self.post_daily_prompt(guild, channel, rotation or "writing")
+                        await self.post_daily_prompt(guild, channel, rotation or "writing")
 
-                            # Update rotation and last post date
-                            await self.bot.database.connection.execute(
-                                "UPDATE creative_config SET last_daily_post = ?, prompt_rotation = ? WHERE server_id = ?",
-                                (server_date, next_rotation, server_id)
-                            )
-                            await self.bot.database.connection.commit()
+                        # Update rotation and last post date
+                        await self.bot.database.connection.execute(
+                            "UPDATE creative_config SET last_daily_post = ?, prompt_rotation = ? WHERE server_id = ?",
+                            (server_date, next_rotation, server_id)
+                        )
+                        await self.bot.database.connection.commit()
 
         except Exception as e:
             self.bot.logger.error(f"Error in daily prompts task: {e}")
@@ -1430,18 +1458,20 @@ Write the next 100-200 words continuing the story naturally. Match the tone and
     @tasks.loop(minutes=60)
     async def check_weekly_challenges(self):
         """Check if weekly challenges should be posted (Mondays)."""
+        if not self.bot.is_scheduler_leader():
+            return
+
         try:
             utc_now = datetime.utcnow()
             # Post on Mondays
             if utc_now.weekday() == 0:  # Monday
                 async with self.bot.database.connection.execute(
-                    "SELECT server_id, channel_id, timezone_offset, last_weekly_post FROM creative_config WHERE weekly_challenges_enabled = 1"
+                    "SELECT server_id, channel_id, timezone_offset, timezone, last_weekly_post FROM creative_config WHERE weekly_challenges_enabled = 1"
                 ) as cursor:
                     configs = await cursor.fetchall()
 
-                for server_id, channel_id, tz_offset, last_post in configs:
-                    server_time = utc_now + timedelta(hours=tz_offset)
-                    server_date = server_time.strftime("%Y-%m-%d")
+                for server_id, channel_id, tz_offset, tz_name, last_post in configs:
+                    server_date = self.get_current_date_for_server(tz_offset or 0, tz_name)
 
                     # Only post once per week
                     if last_post != server_date:
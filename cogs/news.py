@@ -6,24 +6,55 @@ Description:
 Version: 6.3.0
 """
 
+import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 from discord.ext.commands import Context
-import feedparser
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 import re
 import os
 import sys
-from anthropic import AsyncAnthropic
+import time
 from typing import Literal
 
 # Import helpers
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from helpers import thread_manager, scheduling
+from helpers import feed_stream, html_extract, near_duplicates, thread_manager, scheduling, singleflight
+from helpers.bloom import KeyedBloomFilters
+from helpers.feeds import FeedCache, FeedFetcher
+from helpers.embed_batching import EmbedSender
+from helpers.feed_ingest import ARTICLE_RETENTION, PollSchedule
+from helpers.schedule_batch import ScheduleBatch
 from helpers.claude_cog import ClaudeAICog
+from helpers.llm_scheduler import Priority, set_request_context
 
 
+# Digests use articles up to a day old (by whole days, as fetch_news_from_rss does)
+DIGEST_WINDOW_SECONDS = 2 * 86400
+
+# Stories taken per source for a digest
+ARTICLES_PER_SOURCE = 2
+
+# Articles per summarisation request
+SUMMARY_BATCH = 20
+
+# Cached article summaries are kept this long (seconds)
+SUMMARY_RETENTION = 14 * 86400
+
+# Feed entries normalised per poll
+INGEST_ENTRIES = 50
+
+# How long a digest waits for feeds that haven't been ingested yet
+FIRST_INGEST_TIMEOUT = 10.0
+
+# Posted-article records are kept this long (days); digests only look back DIGEST_WINDOW_SECONDS
+POSTED_RETENTION_DAYS = 30
+
+# How often old posted-article records are removed and the posted filters rebuilt (seconds)
+POSTED_REBUILD_INTERVAL = 6 * 3600
+
 # Default news sources with RSS feeds
 DEFAULT_SOURCES = {
     "BBC World": "https://feeds.bbci.co.uk/news/world/rss.xml",
@@ -67,50 +98,71 @@ class NewsThreadView(discord.ui.View):
 class News(ClaudeAICog, name="news"):
     def __init__(self, bot) -> None:
         super().__init__(bot, cog_name="News cog")
+        # Guilds posting the same headlines at once share one summary request
+        self.summary_flights = singleflight.group("news-summary")
+        # Feeds are downloaded concurrently and parsed off the event loop
+        self.feeds = FeedFetcher.from_env()
+        # Every guild reads from one cached copy of each feed
+        self.feed_cache = FeedCache.from_env(self.feeds)
+        # Feeds are polled in the background; digests read the articles table
+        self.poll_schedule = PollSchedule()
+        # First polls a digest stopped waiting for; they finish in the background
+        self.pending_ingests = set()
+        # Per-guild Bloom filters of posted article IDs; only possible hits are checked in the database
+        self.posted_filters = KeyedBloomFilters()
+        # posted_at of the newest record loaded into the filters (None until they're built)
+        self.posted_synced_at = None
+        self.posted_rebuild_due = 0.0
+        self.ingest_news_task.start()
         self.daily_news_task.start()
+        self.posted_articles_task.start()
 
-    def cog_unload(self) -> None:
+    async def cog_unload(self) -> None:
+        self.ingest_news_task.cancel()
         self.daily_news_task.cancel()
+        self.posted_articles_task.cancel()
+        for task in self.pending_ingests:
+            task.cancel()
+        await self.feeds.close()
 
-    @tasks.loop(minutes=15)
+    @tasks.loop(minutes=1)
     async def daily_news_task(self) -> None:
         """
-        Background task that checks every 15 minutes for servers needing news updates.
+        Background task that checks every minute for servers needing news updates.
         """
+        if not self.bot.is_scheduler_leader():
+            return
+
         try:
             servers = await self.bot.database.get_servers_needing_news()
 
-            for server_data in servers:
-                server_id, channel_id, post_time_str, timezone_offset, last_post_date = server_data
+            # Check every post time in one pass (60-minute window for news)
+            batch = ScheduleBatch.from_rows(
+                servers, post_time_col=2, timezone_offset_col=3,
+                last_post_col=4, timezone_col=5, window_minutes=60,
+                feature="news", guild_id_col=0
+            )
 
-                # Parse the post time
-                target_time = scheduling.parse_time_string(post_time_str)
-                if not target_time:
-                    self.bot.logger.error(
-                        f"Invalid post_time format for server {server_id}: {post_time_str}"
-                    )
-                    continue
+            for index in batch.invalid_indices:
+                server_id, post_time_str = servers[index][0], servers[index][2]
+                self.bot.logger.error(
+                    f"Invalid post_time format for server {server_id}: {post_time_str}"
+                )
 
-                # Check if already posted today
-                if not scheduling.should_post_today(last_post_date, timezone_offset):
-                    self.bot.logger.debug(
-                        f"News already posted today for server {server_id} at {post_time_str}"
-                    )
-                    continue
+            for index, slot_date in batch.due(planner=self.bot.slot_planner):
+                server_id, channel_id, post_time_str, timezone_offset, last_post_date, tz_name = servers[index]
+                set_request_context(Priority.BACKGROUND, guild_id=int(server_id))
 
-                # Check if within posting window (60-minute window for news)
-                if scheduling.should_post_now(target_time, timezone_offset, window_minutes=60):
-                    # Post news update
-                    self.bot.logger.info(
-                        f"Posting news to server {server_id} at {post_time_str} (scheduled time reached)"
-                    )
-                    await self.post_news_to_server(server_id, channel_id)
+                # Post news update
+                self.bot.logger.info(
+                    f"Posting news to server {server_id} at {post_time_str} (scheduled time reached)"
+                )
+                await self.post_news_to_server(server_id, channel_id)
 
-                    # Update last post date
-                    today_str = scheduling.get_server_date(timezone_offset)
-                    await self.bot.database.update_last_news_post(
-                        server_id, post_time_str, today_str
-                    )
+                # Record the slot so this post time doesn't fire again today
+                await self.bot.database.update_last_news_post(
+                    server_id, post_time_str, slot_date
+                )
 
         except Exception as e:
             self.bot.logger.error(f"Error in daily news task: {e}")
@@ -120,6 +172,299 @@ class News(ClaudeAICog, name="news"):
         """Wait until bot is ready before starting the task."""
         await self.bot.wait_until_ready()
 
+    @tasks.loop(minutes=1)
+    async def ingest_news_task(self) -> None:
+        """
+        Background task that polls feeds that are due and stores their new articles.
+        """
+        if not self.bot.is_scheduler_leader():
+            return
+
+        try:
+            urls = list(DEFAULT_SOURCES.values()) + await self.bot.database.get_all_news_source_urls()
+            self.poll_schedule.forget(urls)
+            due = self.poll_schedule.due(urls)
+            if due:
+                await self.ingest_feeds(due)
+                await self.bot.database.cleanup_ingested_articles(int(time.time()) - ARTICLE_RETENTION)
+                await self.bot.database.cleanup_article_summaries(int(time.time()) - SUMMARY_RETENTION)
+        except Exception as e:
+            self.bot.logger.error(f"Error in news ingest task: {e}")
+
+    @ingest_news_task.before_loop
+    async def before_ingest_news_task(self) -> None:
+        """Wait until bot is ready before starting the task."""
+        await self.bot.wait_until_ready()
+
+    @tasks.loop(minutes=1)
+    async def posted_articles_task(self) -> None:
+        """
+        Background task that keeps the posted-article filters current.
+
+        Every replica loads the records other replicas posted since the last run. Every
+        POSTED_REBUILD_INTERVAL the scheduler leader removes records older than
+        POSTED_RETENTION_DAYS, and each replica rebuilds its filters from what's left.
+        """
+        try:
+            if time.time() < self.posted_rebuild_due:
+                await self.sync_posted_filters()
+                return
+            if self.bot.is_scheduler_leader():
+                removed = await self.bot.database.cleanup_old_articles(POSTED_RETENTION_DAYS)
+                if removed:
+                    self.bot.logger.info(f"Removed {removed} posted-article records older than {POSTED_RETENTION_DAYS} days")
+            await self.sync_posted_filters(rebuild=True)
+            self.posted_rebuild_due = time.time() + POSTED_REBUILD_INTERVAL
+        except Exception as e:
+            self.bot.logger.error(f"Error in posted articles task: {e}")
+
+    @posted_articles_task.before_loop
+    async def before_posted_articles_task(self) -> None:
+        """Wait until bot is ready before starting the task."""
+        await self.bot.wait_until_ready()
+
+    async def sync_posted_filters(self, rebuild: bool = False) -> int:
+        """
+        Load posted-article records into the per-guild filters.
+
+        Records are read from the newest one already loaded (inclusive, as posted_at only
+        has whole seconds), so this also picks up articles other replicas posted. A rebuild
+        loads every record into new filters and swaps them in, then catches up on anything
+        posted meanwhile; Bloom filters can't forget, so this is how removed records go.
+
+        :param rebuild: Start from empty filters instead of adding to the current ones.
+        :return: Number of records added.
+        """
+        if rebuild or self.posted_synced_at is None:
+            filters = KeyedBloomFilters()
+            rows = await self.bot.database.get_posted_articles_since()
+            added = sum(filters.add(str(server_id), article_id) for server_id, article_id, _ in rows)
+            self.posted_filters = filters
+            self.posted_synced_at = rows[-1][2] if rows else ""
+            self.bot.logger.info(f"Built posted-article filters from {len(rows)} records")
+        else:
+            added = 0
+        rows = await self.bot.database.get_posted_articles_since(self.posted_synced_at)
+        added += sum(self.posted_filters.add(str(server_id), article_id) for server_id, article_id, _ in rows)
+        if rows:
+            self.posted_synced_at = rows[-1][2]
+        return added
+
+    async def ingest_feeds(self, urls: list) -> int:
+        """
+        Poll feeds and store their new articles.
+
+        Each feed is stored as soon as it arrives, so a slow feed doesn't hold up the others.
+
+        :param urls: The feed URLs to poll.
+        :return: Number of new articles stored.
+        """
+        return sum(await asyncio.gather(*(self.ingest_feed(url) for url in dict.fromkeys(urls))))
+
+    async def ingest_feed(self, url: str) -> int:
+        """
+        Poll one feed, store its new articles and record how the poll went.
+
+        :param url: The feed URL.
+        :return: Number of new articles stored.
+        """
+        start = time.perf_counter()
+        try:
+            # Always revalidate (unchanged feeds cost a 304), and fail rather than reuse an old copy
+            feed = await self.feed_cache.get(url, max_age=0, allow_stale=False)
+        except Exception as e:
+            self.bot.logger.warning(f"Could not poll news feed {url}: {e}")
+            self.poll_schedule.record(url, 0, error=str(e) or type(e).__name__)
+            await self.save_feed_health(url)
+            return 0
+        latency = time.perf_counter() - start
+
+        # Only entries not stored yet are cleaned up and inserted
+        entries = feed.entries[:INGEST_ENTRIES]
+        known = await self.bot.database.get_known_article_ids(url, [self.entry_id(entry) for entry in entries])
+        articles = [self.entry_to_article(entry, feed) for entry in entries if self.entry_id(entry) not in known]
+        new = await self.bot.database.add_articles(url, [article for article in articles if article])
+
+        last_modified = None
+        header = self.feed_cache.last_modified(url)
+        if header:
+            try:
+                last_modified = parsedate_to_datetime(header).timestamp()
+            except (TypeError, ValueError):
+                pass
+        self.poll_schedule.record(url, new, latency=latency, last_modified=last_modified)
+        await self.save_feed_health(url)
+        return new
+
+    async def save_feed_health(self, url: str) -> None:
+        """
+        Store a feed's polling statistics for /news-admin feeds (which may run on another replica).
+
+        :param url: The feed URL.
+        """
+        poll = self.poll_schedule.feeds[url]
+        now = int(time.time())
+        await self.bot.database.save_feed_health(url, {
+            "status": poll.status,
+            "polls": poll.polls,
+            "errors": poll.errors,
+            "failures": poll.failures,
+            "last_error": poll.last_error[:200],
+            "latency_ms": None if poll.latency is None else round(poll.latency * 1000),
+            "update_interval": None if poll.update_interval is None else round(poll.update_interval),
+            "poll_interval": round(poll.interval),
+            "next_poll_at": now + round(poll.next_poll - self.poll_schedule.clock()),
+            "updated_at": now,
+        })
+
+    async def gather_recent_articles(self, server_id: int, sources: list) -> list:
+        """
+        Get the newest stories of each source that haven't been posted to a server.
+
+        :param server_id: The server ID.
+        :param sources: List of (source_name, rss_url) tuples.
+        :return: List of article dictionaries, up to ARTICLES_PER_SOURCE per source and one per story.
+        """
+        urls = [rss_url for _, rss_url in sources]
+
+        # Feeds nobody has polled yet (new source, or just after startup) are polled now, briefly
+        # Feeds still polling when the wait ends are left to finish in the background
+        unseen = [url for url in urls if not self.poll_schedule.seen(url)]
+        if unseen:
+            task = asyncio.ensure_future(self.ingest_feeds(unseen))
+            done, _ = await asyncio.wait({task}, timeout=FIRST_INGEST_TIMEOUT)
+            if not done:
+                self.bot.logger.warning(f"Some of {len(unseen)} new news feeds are slow; the digest won't wait for them")
+                self.pending_ingests.add(task)
+                task.add_done_callback(self._ingest_finished)
+            elif task.exception():
+                self.bot.logger.error(f"Error polling new news feeds: {task.exception()}")
+
+        candidates = await self.bot.database.get_recent_articles(
+            urls, int(time.time()) - DIGEST_WINDOW_SECONDS
+        )
+        # Articles the guild's filter has never seen definitely weren't posted; only the rest are queried
+        if self.posted_synced_at is None:
+            await self.sync_posted_filters()
+        maybe_posted = [
+            article["id"] for article in candidates
+            if self.posted_filters.might_contain(str(server_id), article["id"])
+        ]
+        posted = await self.bot.database.get_posted_article_ids(server_id, maybe_posted) if maybe_posted else set()
+        by_feed = {}
+        for article in candidates:
+            if article["id"] not in posted:
+                by_feed.setdefault(article["feed_url"], []).append(article)
+        self.merge_duplicate_stories(by_feed, {rss_url: source_name for source_name, rss_url in sources})
+
+        all_articles = []
+        for source_name, rss_url in sources:
+            for idx, article in enumerate(by_feed.get(rss_url, [])[:ARTICLES_PER_SOURCE]):
+                # Show the server's name for the source; summaries use the feed's own
+                article = dict(article, source=source_name, feed_source=article["source"])
+                article["article_type"] = "📰 Recent" if idx == 0 else "⭐ Popular"
+                all_articles.append(article)
+        return all_articles
+
+    def _ingest_finished(self, task: asyncio.Task) -> None:
+        """Forget a background first poll, logging how it failed."""
+        self.pending_ingests.discard(task)
+        if not task.cancelled() and task.exception():
+            self.bot.logger.error(f"Error polling new news feeds: {task.exception()}")
+
+    @staticmethod
+    def merge_duplicate_stories(by_feed: dict, names: dict) -> int:
+        """
+        Keep one article per story when several feeds (or one feed, twice) carry it.
+
+        The kept article is the one its feed ranks highest, then one with an image, then
+        the longest description; it gets 'also_covered_by' (the other sources' names) and
+        'duplicate_ids' (the other articles' IDs, so they can be marked posted with it).
+
+        :param by_feed: Feed URL -> candidate articles, best first; edited in place.
+        :param names: Feed URL -> source name shown in the digest.
+        :return: Number of articles removed.
+        """
+        articles = [article for feed_articles in by_feed.values() for article in feed_articles]
+        rank = {id(article): position for feed_articles in by_feed.values()
+                for position, article in enumerate(feed_articles)}
+        removed = set()
+        for members in near_duplicates.cluster([article["title"] for article in articles]):
+            if len(members) == 1:
+                continue
+            stories = [articles[member] for member in members]
+            best = min(stories, key=lambda article: (
+                rank[id(article)], not article.get("image"), -len(article.get("description") or "")
+            ))
+            others = [article for article in stories if article is not best]
+            best_name = names.get(best["feed_url"], best["source"])
+            best["also_covered_by"] = list(dict.fromkeys(
+                name for name in (names.get(article["feed_url"], article["source"]) for article in others)
+                if name != best_name
+            ))
+            best["duplicate_ids"] = [article["id"] for article in others]
+            removed.update(id(article) for article in others)
+
+        for feed_url, feed_articles in by_feed.items():
+            by_feed[feed_url] = [article for article in feed_articles if id(article) not in removed]
+        return len(removed)
+
+    @staticmethod
+    def entry_id(entry) -> str:
+        """
+        Get the identifier of a feed entry (its GUID, or its link).
+
+        :param entry: The feedparser entry.
+        :return: The identifier.
+        """
+        return entry.get("id", entry.get("link", ""))
+
+    def entry_to_article(self, entry, feed) -> dict:
+        """
+        Normalise a feed entry into an article dictionary.
+
+        :param entry: The feedparser entry.
+        :param feed: The feedparser result the entry belongs to.
+        :return: Article dictionary with a Unix published_at, or None if the date can't be parsed.
+        """
+        article = {
+            "title": entry.get("title", "No title"),
+            "link": entry.get("link", ""),
+            "description": entry.get("summary", entry.get("description", "")),
+            "published": entry.get(
+                "published", entry.get("updated", "Unknown date")
+            ),
+            "source": feed.feed.get("title", "Unknown source"),
+            "id": self.entry_id(entry),
+        }
+
+        # Skip if we can't parse the date, to be safe
+        article_date = self.parse_article_date(article["published"])
+        if not article_date:
+            self.bot.logger.debug(
+                f"Skipping article with unparseable date: {article['title'][:50]}"
+            )
+            return None
+
+        # Dates without a timezone are taken as UTC
+        if article_date.tzinfo is None:
+            article_date = article_date.replace(tzinfo=timezone.utc)
+        article["published_at"] = int(article_date.timestamp())
+
+        # Clean HTML tags from the description and find its first image in the same pass,
+        # unless the entry's media fields already have one
+        media_image = self.media_image_from_entry(entry)
+        article["description"], html_image = html_extract.extract(
+            article["description"], base_url=article["link"], image=not media_image
+        )
+        article["image"] = media_image or html_image
+
+        # Truncate description if too long
+        if len(article["description"]) > 300:
+            article["description"] = article["description"][:297] + "..."
+
+        return article
+
     async def fetch_news_from_rss(self, rss_url: str, limit: int = 5, max_age_days: int = 1) -> list:
         """
         Fetch news articles from an RSS feed.
@@ -130,10 +475,10 @@ class News(ClaudeAICog, name="news"):
         :return: List of article dictionaries.
         """
         try:
-            feed = feedparser.parse(rss_url)
+            feed = await self.feed_cache.get(rss_url)
 
             articles = []
-            now = datetime.utcnow()
+            now = time.time()
 
             # Process more entries to account for filtering
             for entry in feed.entries[:limit * 3]:
@@ -141,51 +486,18 @@ class News(ClaudeAICog, name="news"):
                 if len(articles) >= limit:
                     break
 
-                # Extract article data
-                article = {
-                    "title": entry.get("title", "No title"),
-                    "link": entry.get("link", ""),
-                    "description": entry.get("summary", entry.get("description", "")),
-                    "published": entry.get(
-                        "published", entry.get("updated", "Unknown date")
-                    ),
-                    "source": feed.feed.get("title", "Unknown source"),
-                    "id": entry.get("id", entry.get("link", "")),
-                    "image": self.extract_image_from_entry(entry),
-                }
-
-                # Check article age - skip if we can't parse date or if too old
-                article_date = self.parse_article_date(article["published"])
-                if not article_date:
-                    # Can't parse date, skip to be safe
-                    self.bot.logger.debug(
-                        f"Skipping article with unparseable date: {article['title'][:50]}"
-                    )
+                article = self.entry_to_article(entry, feed)
+                if not article:
                     continue
 
-                # Make datetime timezone-aware if needed
-                if article_date.tzinfo is None:
-                    article_date = article_date.replace(tzinfo=None)
-                    age = now - article_date
-                else:
-                    from datetime import timezone
-                    now_aware = now.replace(tzinfo=timezone.utc)
-                    age = now_aware - article_date
-
                 # Skip articles older than max_age_days
-                if age.days > max_age_days:
+                age_days = int(now - article["published_at"]) // 86400
+                if age_days > max_age_days:
                     self.bot.logger.debug(
-                        f"Skipping old article ({age.days} days old): {article['title'][:50]}"
+                        f"Skipping old article ({age_days} days old): {article['title'][:50]}"
                     )
                     continue
 
-                # Clean HTML tags from description
-                article["description"] = self.clean_html(article["description"])
-
-                # Truncate description if too long
-                if len(article["description"]) > 300:
-                    article["description"] = article["description"][:297] + "..."
-
                 articles.append(article)
 
             return articles
@@ -204,9 +516,13 @@ class News(ClaudeAICog, name="news"):
         if not published_str or published_str == "Unknown date":
             return None
 
+        # Precompiled RFC 822 / ISO 8601 patterns cover nearly every feed
+        parsed = feed_stream.parse_date(published_str)
+        if parsed:
+            return parsed
+
         try:
             # Try using email.utils for RFC 2822 dates (most common in RSS)
-            from email.utils import parsedate_to_datetime
             try:
                 return parsedate_to_datetime(published_str)
             except (TypeError, ValueError):
@@ -244,22 +560,16 @@ class News(ClaudeAICog, name="news"):
         :param text: Text with HTML tags.
         :return: Clean text.
         """
-        # Remove HTML tags
-        clean = re.compile("<.*?>")
-        text = re.sub(clean, "", text)
-        # Remove extra whitespace
-        text = " ".join(text.split())
-        return text
+        return html_extract.extract(text, image=False)[0]
 
-    def extract_image_from_entry(self, entry) -> str:
+    @staticmethod
+    def media_image_from_entry(entry) -> str:
         """
-        Extract image URL from RSS feed entry with comprehensive fallback.
+        Get an image URL from an RSS entry's media fields.
 
         :param entry: Feedparser entry object.
-        :return: Image URL string or empty string if no image found.
+        :return: Image URL string or empty string if the entry has no media image.
         """
-        image_url = ""
-
         # 1. Try media_thumbnail first (most common for news feeds)
         if hasattr(entry, 'media_thumbnail') and entry.media_thumbnail:
             try:
@@ -293,37 +603,22 @@ class News(ClaudeAICog, name="news"):
             except (IndexError, KeyError, AttributeError):
                 pass
 
-        # 4. Parse HTML description/summary for <img> tags
-        html_content = entry.get('description', entry.get('summary', ''))
-        if html_content:
-            try:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(html_content, 'html.parser')
-                img = soup.find('img')
-
-                if img:
-                    # Try src first, then data-src (lazy loading), then srcset
-                    image_url = img.get('src') or img.get('data-src', '')
-
-                    # Handle srcset if src not found
-                    if not image_url and img.get('srcset'):
-                        # srcset format: "url1 1x, url2 2x" - take first URL
-                        srcset = img.get('srcset', '').split(',')[0].strip().split()[0]
-                        image_url = srcset
-
-                    # Handle relative URLs
-                    if image_url and image_url.startswith('/'):
-                        from urllib.parse import urlparse
-                        parsed = urlparse(entry.get('link', ''))
-                        if parsed.scheme and parsed.netloc:
-                            image_url = f"{parsed.scheme}://{parsed.netloc}{image_url}"
-
-                    if image_url:
-                        return image_url
-            except Exception as e:
-                self.bot.logger.debug(f"Error parsing HTML for image: {e}")
+        return ""
 
-        return image_url
+    def extract_image_from_entry(self, entry) -> str:
+        """
+        Extract image URL from RSS feed entry with comprehensive fallback.
+
+        :param entry: Feedparser entry object.
+        :return: Image URL string or empty string if no image found.
+        """
+        image_url = self.media_image_from_entry(entry)
+        if image_url:
+            return image_url
+
+        # 4. First <img> of the HTML description/summary
+        html_content = entry.get('description', entry.get('summary', ''))
+        return html_extract.extract(html_content, base_url=entry.get('link', ''), text=False)[1]
 
     def parse_relative_time(self, published_str: str) -> str:
         """
@@ -372,9 +667,22 @@ class News(ClaudeAICog, name="news"):
         except Exception:
             return published_str
 
+    @staticmethod
+    def summary_key(article: dict) -> str:
+        """
+        Hash the text a summary is generated from, so edited articles are summarised again.
+
+        :param article: Article dictionary.
+        :return: Content hash of the title and description.
+        """
+        return singleflight.make_key(article["title"], article["description"])
+
     async def _summarize_and_categorize_articles(self, articles: list) -> list:
         """
-        Use Claude API to generate concise summaries and categorize articles.
+        Add a concise summary and a category to each article.
+
+        Summaries are cached per article and content hash for every server, so
+        only articles nobody has summarised yet are sent to Claude, in batches.
 
         :param articles: List of article dictionaries.
         :return: Articles with added 'summary' and 'category' fields.
@@ -382,26 +690,85 @@ class News(ClaudeAICog, name="news"):
         if not articles:
             return articles
 
+        keys = [(article["id"], self.summary_key(article)) for article in articles]
         try:
-            # Build article list for Claude
-            articles_text = []
-            for idx, article in enumerate(articles):
-                articles_text.append(
-                    f"Article {idx + 1}:\n"
-                    f"Title: {article['title']}\n"
-                    f"Source: {article['source']}\n"
-                    f"Description: {article['description']}\n"
+            cached = await self.bot.database.get_article_summaries(keys)
+        except Exception as e:
+            self.bot.logger.error(f"Error reading cached news summaries: {e}")
+            cached = {}
+
+        for article, key in zip(articles, keys):
+            if key in cached:
+                article["summary"], article["category"] = cached[key]
+
+        # Sorted so servers missing the same articles send identical batches and share them
+        missing = sorted(
+            {key: article for article, key in zip(articles, keys) if key not in cached}.items()
+        )
+        generated = {}
+        if missing and self.client:
+            batches = [missing[start:start + SUMMARY_BATCH] for start in range(0, len(missing), SUMMARY_BATCH)]
+            results = await asyncio.gather(
+                *(self._request_summaries([article for _, article in batch]) for batch in batches),
+                return_exceptions=True,
+            )
+            for batch, result in zip(batches, results):
+                if isinstance(result, Exception):
+                    self.bot.logger.error(f"Error summarizing with Claude: {result}")
+                    continue
+                for index, value in result.items():
+                    generated[batch[index][0]] = value
+
+        if generated:
+            try:
+                await self.bot.database.save_article_summaries(
+                    [(article_id, content_hash, summary, category)
+                     for (article_id, content_hash), (summary, category) in generated.items()]
                 )
+            except Exception as e:
+                self.bot.logger.error(f"Error caching news summaries: {e}")
+
+        for article, key in zip(articles, keys):
+            if key in generated:
+                article["summary"], article["category"] = generated[key]
+            # Fallback: use original descriptions
+            article.setdefault("summary", article["description"][:150])
+            article.setdefault("category", "Other")
+
+        hits = sum(1 for key in keys if key in cached)
+        self.bot.logger.info(
+            f"News summaries: {hits} cached, {len(generated)} generated, "
+            f"{len(missing) - len(generated)} fell back ({hits / len(keys):.0%} cache hit rate)"
+        )
+        return articles
+
+    async def _request_summaries(self, articles: list) -> dict:
+        """
+        Ask Claude to summarise and categorise a batch of articles.
 
-            prompt = (
-                "Analyze these news articles and provide:\n"
-                "1. A concise 1-2 sentence summary for each article\n"
-                "2. A category for each article from: Politics, Business, Technology, Science, World News, US News, Entertainment, Sports, Health, Other\n\n"
-                + "\n".join(articles_text) + "\n\n"
-                "Respond in this exact format for each article:\n"
-                "Article X | Category: [category] | Summary: [1-2 sentence summary]"
+        :param articles: List of article dictionaries.
+        :return: Dictionary mapping article index to (summary, category) for every line that parsed.
+        """
+        # Build article list for Claude
+        articles_text = []
+        for idx, article in enumerate(articles):
+            articles_text.append(
+                f"Article {idx + 1}:\n"
+                f"Title: {article['title']}\n"
+                f"Source: {article.get('feed_source') or article['source']}\n"
+                f"Description: {article['description']}\n"
             )
 
+        prompt = (
+            "Analyze these news articles and provide:\n"
+            "1. A concise 1-2 sentence summary for each article\n"
+            "2. A category for each article from: Politics, Business, Technology, Science, World News, US News, Entertainment, Sports, Health, Other\n\n"
+            + "\n".join(articles_text) + "\n\n"
+            "Respond in this exact format for each article:\n"
+            "Article X | Category: [category] | Summary: [1-2 sentence summary]"
+        )
+
+        async def request_summaries() -> str:
             # Call Claude API with prompt caching
             response = await self.client.messages.create(
                 model="claude-3-5-haiku-20241022",
@@ -420,46 +787,34 @@ class News(ClaudeAICog, name="news"):
                     }
                 ]
             )
+            return response.content[0].text
 
-            # Parse Claude's response
-            response_text = response.content[0].text
-            lines = response_text.strip().split('\n')
+        # The same batch (in the same order) gives the same prompt, so concurrent
+        # guilds share the response; the prompt uses the feed's own source name, not
+        # the one each guild gave it
+        response_text = await self.summary_flights.do(singleflight.make_key(prompt), request_summaries)
 
-            for line in lines:
-                if not line.strip() or '|' not in line:
-                    continue
-
-                try:
-                    # Parse format: "Article X | Category: [category] | Summary: [summary]"
-                    parts = line.split('|')
-                    if len(parts) >= 3:
-                        article_num = int(parts[0].strip().split()[1]) - 1
-                        category = parts[1].split(':')[1].strip()
-                        summary = parts[2].split(':', 1)[1].strip()
-
-                        if 0 <= article_num < len(articles):
-                            articles[article_num]['summary'] = summary
-                            articles[article_num]['category'] = category
-                except (ValueError, IndexError) as e:
-                    self.bot.logger.debug(f"Error parsing Claude response line: {line} - {e}")
-                    continue
+        # Parse Claude's response
+        results = {}
+        for line in response_text.strip().split('\n'):
+            if not line.strip() or '|' not in line:
+                continue
 
-            # Add default summary/category for any that failed
-            for article in articles:
-                if 'summary' not in article:
-                    article['summary'] = article['description'][:150]
-                if 'category' not in article:
-                    article['category'] = 'Other'
+            try:
+                # Parse format: "Article X | Category: [category] | Summary: [summary]"
+                parts = line.split('|')
+                if len(parts) >= 3:
+                    article_num = int(parts[0].strip().split()[1]) - 1
+                    category = parts[1].split(':')[1].strip()
+                    summary = parts[2].split(':', 1)[1].strip()
 
-            return articles
+                    if 0 <= article_num < len(articles):
+                        results[article_num] = (summary, category)
+            except (ValueError, IndexError) as e:
+                self.bot.logger.debug(f"Error parsing Claude response line: {line} - {e}")
+                continue
 
-        except Exception as e:
-            self.bot.logger.error(f"Error summarizing with Claude: {e}")
-            # Fallback: use original descriptions
-            for article in articles:
-                article['summary'] = article['description'][:150]
-                article['category'] = 'Other'
-            return articles
+        return results
 
     def _create_digest_embeds(self, articles: list) -> list:
         """
@@ -505,6 +860,9 @@ class News(ClaudeAICog, name="news"):
                 source = article['source']
                 summary = article.get('summary', article['description'])[:100]  # Limit summary
 
+                if article.get('also_covered_by'):
+                    source += f" (+{len(article['also_covered_by'])})"
+
                 digest_description += f"{article_number}. **{title}** | {source}\n"
                 digest_description += f"   {summary}...\n\n"
 
@@ -527,6 +885,55 @@ class News(ClaudeAICog, name="news"):
 
         return [embed]
 
+    def _create_article_embed(self, article: dict, numbered: bool = False) -> discord.Embed:
+        """
+        Create the thread embed of one article.
+
+        :param article: Article with 'summary', 'category' and 'article_type' fields.
+        :param numbered: Whether to start the title with the number the digest gave the article.
+        :return: Discord embed.
+        """
+        if numbered:
+            # Use the number assigned during digest creation
+            title = f"{article.get('number', '?')}. {article['title'][:250]}"  # Discord limit, include number
+        else:
+            title = article["title"][:256]
+        embed = discord.Embed(
+            title=title,
+            description=article.get("summary", article["description"]),
+            color=0x3498DB,
+            url=article["link"],
+        )
+
+        # Add fields
+        embed.add_field(
+            name="Source", value=article["source"], inline=True
+        )
+        embed.add_field(
+            name="Category", value=article.get("category", "Other"), inline=True
+        )
+        embed.add_field(
+            name="Type", value=article["article_type"], inline=True
+        )
+        embed.add_field(
+            name="Published",
+            value=self.parse_relative_time(article["published"]),
+            inline=True,
+        )
+        if article.get("also_covered_by"):
+            embed.add_field(
+                name="Also covered by",
+                value=", ".join(article["also_covered_by"])[:1024],
+                inline=False,
+            )
+
+        # Add image if available
+        if article.get("image"):
+            embed.set_image(url=article["image"])
+
+        embed.set_footer(text="Click the title to read the full article")
+        return embed
+
     async def post_news_to_server(
         self, server_id: int, channel_id: int
     ) -> None:
@@ -549,19 +956,8 @@ class News(ClaudeAICog, name="news"):
             if not sources:
                 sources = [(name, url) for name, url in DEFAULT_SOURCES.items()]
 
-            all_articles = []
-
-            # Fetch top 2 stories from each source
-            for source_name, rss_url in sources:
-                articles = await self.fetch_news_from_rss(rss_url, limit=2)
-                for idx, article in enumerate(articles):
-                    # Check if article already posted
-                    if not await self.bot.database.is_article_posted(
-                        server_id, article["id"]
-                    ):
-                        article["source"] = source_name  # Override with custom name
-                        article["article_type"] = "📰 Recent" if idx == 0 else "⭐ Popular"
-                        all_articles.append(article)
+            # Top 2 unposted stories from each source, from the ingested articles
+            all_articles = await self.gather_recent_articles(server_id, sources)
 
             if not all_articles:
                 self.bot.logger.info(
@@ -587,18 +983,14 @@ class News(ClaudeAICog, name="news"):
             if len(all_articles) > 3:
                 preview_text += "..."
 
-            # Send header embed
+            # Header and digest (categorized overview) share a message; the thread hangs off it
             header_embed = discord.Embed(
                 title="📰 Daily News Digest",
                 description=f"{len(categories)} categories • {len(all_articles)} articles from {len(sources)} sources\n\n**Top stories:** {preview_text}",
                 color=0x3498DB,
             )
             header_embed.set_footer(text=f"News Update • {datetime.now().strftime('%B %d, %Y')}")
-            header_embed_message = await channel.send(embed=header_embed)
-
-            # Send digest embeds (categorized overview)
-            for digest_embed in digest_embeds:
-                await channel.send(embed=digest_embed)
+            header_embed_message = (await EmbedSender(channel).send_all([header_embed, *digest_embeds]))[0]
 
             # Create thread for full articles
             thread_name = f"📰 Full Articles - {datetime.now().strftime('%B %d, %Y')}"
@@ -615,44 +1007,16 @@ class News(ClaudeAICog, name="news"):
                 )
                 return
 
-            # Post each individual article with AI summary to the thread
-            for article in all_articles:
-                # Use the number assigned during digest creation
-                article_number = article.get('number', '?')
-
-                embed = discord.Embed(
-                    title=f"{article_number}. {article['title'][:250]}",  # Discord limit, include number
-                    description=article.get("summary", article["description"]),
-                    color=0x3498DB,
-                    url=article["link"],
-                )
-
-                # Add fields
-                embed.add_field(
-                    name="Source", value=article["source"], inline=True
-                )
-                embed.add_field(
-                    name="Category", value=article.get("category", "Other"), inline=True
-                )
-                embed.add_field(
-                    name="Type", value=article["article_type"], inline=True
-                )
-                embed.add_field(
-                    name="Published",
-                    value=self.parse_relative_time(article["published"]),
-                    inline=True,
-                )
-
-                # Add image if available
-                if article.get("image"):
-                    embed.set_image(url=article["image"])
-
-                embed.set_footer(text="Click the title to read the full article")
-
-                await thread.send(embed=embed)
-
-                # Mark article as posted
-                await self.bot.database.mark_article_posted(server_id, article["id"])
+            # Post the articles with AI summaries to the thread, up to 10 per message
+            embeds = [self._create_article_embed(article, numbered=True) for article in all_articles]
+            posted = 0
+            async for _, count in EmbedSender(thread).send(embeds):
+                # Mark articles as posted, with the other sources' copies of each story
+                for article in all_articles[posted:posted + count]:
+                    for article_id in [article["id"], *article.get("duplicate_ids", [])]:
+                        await self.bot.database.mark_article_posted(server_id, article_id)
+                        self.posted_filters.add(str(server_id), article_id)
+                posted += count
 
             # Add button to header message after thread is created
             thread_url = thread.jump_url
@@ -680,19 +1044,8 @@ class News(ClaudeAICog, name="news"):
             if not sources:
                 sources = [(name, url) for name, url in DEFAULT_SOURCES.items()]
 
-            all_articles = []
-
-            # Fetch top 2 stories from each source
-            for source_name, rss_url in sources:
-                articles = await self.fetch_news_from_rss(rss_url, limit=2)
-                for idx, article in enumerate(articles):
-                    # Check if article already posted
-                    if not await self.bot.database.is_article_posted(
-                        server_id, article["id"]
-                    ):
-                        article["source"] = source_name
-                        article["article_type"] = "📰 Recent" if idx == 0 else "⭐ Popular"
-                        all_articles.append(article)
+            # Top 2 unposted stories from each source, from the ingested articles
+            all_articles = await self.gather_recent_articles(server_id, sources)
 
             if not all_articles:
                 embed = discord.Embed(
@@ -711,17 +1064,13 @@ class News(ClaudeAICog, name="news"):
             # Count categories
             categories = set(article.get('category', 'Other') for article in all_articles)
 
-            # Send header embed
+            # Header and digest (categorized overview) share a message; the thread hangs off it
             header_embed = discord.Embed(
                 title="📰 Latest News Digest",
                 description=f"{len(categories)} categories • {len(all_articles)} articles from {len(sources)} sources",
                 color=0x3498DB,
             )
-            header_embed_message = await ctx.send(embed=header_embed)
-
-            # Send digest embeds (categorized overview)
-            for digest_embed in digest_embeds:
-                await ctx.send(embed=digest_embed)
+            header_embed_message = (await EmbedSender(ctx).send_all([header_embed, *digest_embeds]))[0]
 
             # Create thread for full articles
             thread_name = f"📰 Full Articles - {datetime.now().strftime('%B %d, %Y')}"
@@ -740,37 +1089,10 @@ class News(ClaudeAICog, name="news"):
                 await ctx.send(error_msg)
                 return
 
-            # Post each individual article with AI summary to the thread
-            for article in all_articles:
-                embed = discord.Embed(
-                    title=article["title"][:256],
-                    description=article.get("summary", article["description"]),
-                    color=0x3498DB,
-                    url=article["link"],
-                )
-
-                embed.add_field(
-                    name="Source", value=article["source"], inline=True
-                )
-                embed.add_field(
-                    name="Category", value=article.get("category", "Other"), inline=True
-                )
-                embed.add_field(
-                    name="Type", value=article["article_type"], inline=True
-                )
-                embed.add_field(
-                    name="Published",
-                    value=self.parse_relative_time(article["published"]),
-                    inline=True,
-                )
-
-                # Add image if available
-                if article.get("image"):
-                    embed.set_image(url=article["image"])
-
-                embed.set_footer(text="Click the title to read the full article")
-
-                await thread.send(embed=embed)
+            # Post the articles with AI summaries to the thread, up to 10 per message
+            await EmbedSender(thread).send_all(
+                [self._create_article_embed(article) for article in all_articles]
+            )
 
         except Exception as e:
             self.bot.logger.error(f"Error fetching news: {e}")
@@ -1085,7 +1407,8 @@ class News(ClaudeAICog, name="news"):
         ctx: Context,
         channel: discord.TextChannel,
         time: str,
-        timezone_offset: int
+        timezone_offset: int,
+        timezone_name: str = None
     ) -> None:
         """Setup daily news posting (Admin only)."""
         # Validate time format
@@ -1107,6 +1430,19 @@ class News(ClaudeAICog, name="news"):
             await ctx.send(embed=embed, ephemeral=True)
             return
 
+        # Validate timezone name (overrides the offset when given)
+        if timezone_name and not scheduling.is_valid_timezone(timezone_name):
+            embed = discord.Embed(
+                description="❌ Unknown timezone. Use an IANA name such as `America/New_York` or `Europe/London`.",
+                color=0xE02B2B,
+            )
+            await ctx.send(embed=embed, ephemeral=True)
+            return
+        timezone_name = timezone_name.strip() if timezone_name else None
+        zone_label = scheduling.format_zone_label(
+            scheduling.resolve_zone_name(timezone_name, timezone_offset)
+        )
+
         try:
             # Check how many times are already configured
             current_count = await self.bot.database.count_news_times(ctx.guild.id)
@@ -1121,7 +1457,7 @@ class News(ClaudeAICog, name="news"):
 
             # Save configuration
             await self.bot.database.set_news_config(
-                ctx.guild.id, channel.id, time, timezone_offset
+                ctx.guild.id, channel.id, time, timezone_offset, timezone_name
             )
 
             # Add default sources if none exist
@@ -1137,7 +1473,7 @@ class News(ClaudeAICog, name="news"):
 
             embed = discord.Embed(
                 title="✅ News Update Time Added",
-                description=f"News will be posted to {channel.mention} at {time} (UTC{timezone_offset:+d})",
+                description=f"News will be posted to {channel.mention} at {time} ({zone_label})",
                 color=0x2ECC71,
             )
 
@@ -1231,8 +1567,9 @@ class News(ClaudeAICog, name="news"):
         times_list = []
         for config in configs:
             enabled_icon = "✅" if config["enabled"] else "❌"
+            zone_name = scheduling.resolve_zone_name(config["timezone"], config["timezone_offset"])
             times_list.append(
-                f"{enabled_icon} {config['post_time']} (UTC{config['timezone_offset']:+d})"
+                f"{enabled_icon} {config['post_time']} ({scheduling.format_zone_label(zone_name)})"
             )
             if config["last_post_date"]:
                 times_list.append(f"   └─ Last posted: {config['last_post_date']}")
@@ -1251,6 +1588,64 @@ class News(ClaudeAICog, name="news"):
 
         await ctx.send(embed=embed)
 
+    @staticmethod
+    def format_interval(seconds: float) -> str:
+        """
+        Format a duration briefly.
+
+        :param seconds: The duration in seconds.
+        :return: E.g. "45s", "12m", "3h" or "2d".
+        """
+        for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+            if seconds >= size:
+                return f"{round(seconds / size)}{unit}"
+        return f"{round(seconds)}s"
+
+    async def _admin_feeds(self, ctx: Context) -> None:
+        """View the health of this server's news feeds (Admin only)."""
+        sources = await self.bot.database.get_news_sources(ctx.guild.id)
+        if not sources:
+            sources = [(name, url) for name, url in DEFAULT_SOURCES.items()]
+        urls = [rss_url for _, rss_url in sources]
+        health = await self.bot.database.get_feed_health(urls)
+        articles = await self.bot.database.count_recent_articles(urls, int(time.time()) - 86400)
+
+        icons = {"ok": "✅", "slow": "⚠️", "failing": "❌"}
+        lines = []
+        for name, rss_url in sources:
+            feed = health.get(rss_url)
+            if feed is None:
+                lines.append(f"⏳ **{name}** - not polled yet")
+                continue
+            details = [
+                "no successful poll" if feed["latency_ms"] is None else f"{feed['latency_ms']} ms",
+                f"{feed['errors'] / feed['polls']:.0%} errors" if feed["polls"] else "0% errors",
+                f"{articles.get(rss_url, 0) / 24:.1f}/h",
+            ]
+            if feed["update_interval"]:
+                details.append(f"updates ~{self.format_interval(feed['update_interval'])}")
+            details.append(f"next poll <t:{feed['next_poll_at']}:R>")
+            lines.append(f"{icons.get(feed['status'], '⚠️')} **{name}** - {' • '.join(details)}")
+            if feed["failures"]:
+                lines.append(f"   └─ {feed['failures']} failed polls in a row: {feed['last_error'][:100]}")
+
+        description = ""
+        for line in lines:
+            if len(description) + len(line) > 4000:
+                description += "…"
+                break
+            description += line + "\n"
+
+        embed = discord.Embed(
+            title="📡 News Feed Health",
+            description=description.strip(),
+            color=0x3498DB,
+        )
+        embed.set_footer(
+            text="Articles per hour over the last day • failing feeds are retried less and less often"
+        )
+        await ctx.send(embed=embed)
+
     async def _admin_remove_time(self, ctx: Context, time: str) -> None:
         """Remove a scheduled news post time (Admin only)."""
         # Validate time format
@@ -1290,31 +1685,34 @@ class News(ClaudeAICog, name="news"):
         description="Admin configuration for news updates",
     )
     @app_commands.describe(
-        action="Action to perform: setup, toggle, status, or remove-time",
+        action="Action to perform: setup, toggle, status, remove-time, or feeds",
         channel="The channel where news will be posted (for setup)",
         time="Time to post news in HH:MM format (for setup/remove-time)",
         timezone_offset="Timezone offset from UTC in hours (for setup)",
+        timezone_name="IANA timezone, e.g. America/New_York - follows daylight saving (for setup, overrides offset)",
         enabled="Enable or disable news updates (for toggle)",
     )
     @commands.guild_only()
     async def news_admin(
         self,
         ctx: Context,
-        action: Literal["setup", "toggle", "status", "remove-time"],
+        action: Literal["setup", "toggle", "status", "remove-time", "feeds"],
         channel: discord.TextChannel = None,
         time: str = None,
         timezone_offset: int = 0,
-        enabled: bool = None
+        enabled: bool = None,
+        timezone_name: str = None
     ) -> None:
         """
         Admin configuration for news updates.
 
         :param ctx: The hybrid command context.
-        :param action: Action to perform - setup, toggle, status, or remove-time.
+        :param action: Action to perform - setup, toggle, status, remove-time, or feeds.
         :param channel: The channel where news will be posted (for setup).
         :param time: Time to post news in HH:MM format (for setup/remove-time).
         :param timezone_offset: Timezone offset from UTC in hours (for setup).
         :param enabled: Enable or disable news updates (for toggle).
+        :param timezone_name: IANA timezone name (for setup, overrides the offset).
         """
         if action == "status":
             await self._admin_status(ctx)
@@ -1337,7 +1735,7 @@ class News(ClaudeAICog, name="news"):
                 await ctx.send(embed=embed, ephemeral=True)
                 return
 
-            await self._admin_setup(ctx, channel, time, timezone_offset)
+            await self._admin_setup(ctx, channel, time, timezone_offset, timezone_name)
 
         elif action == "toggle":
             # Check admin permissions
@@ -1379,6 +1777,18 @@ class News(ClaudeAICog, name="news"):
 
             await self._admin_remove_time(ctx, time)
 
+        elif action == "feeds":
+            # Check admin permissions
+            if not ctx.author.guild_permissions.administrator:
+                embed = discord.Embed(
+                    description="❌ You need administrator permissions to view feed health.",
+                    color=0xE02B2B,
+                )
+                await ctx.send(embed=embed, ephemeral=True)
+                return
+
+            await self._admin_feeds(ctx)
+
 
 async def setup(bot) -> None:
     await bot.add_cog(News(bot))
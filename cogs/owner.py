@@ -6,11 +6,19 @@ Description:
 Version: 6.3.0
 """
 
+import os
+import sys
+import time
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ext.commands import Context
 
+# Import helpers
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from helpers import singleflight
+
 
 class Owner(commands.Cog, name="owner"):
     def __init__(self, bot) -> None:
@@ -215,6 +223,185 @@ class Owner(commands.Cog, name="owner"):
         embed = discord.Embed(description=message, color=0xBEBEFE)
         await context.send(embed=embed)
 
+    @commands.hybrid_command(
+        name="schedule-load",
+        description="Show how full the scheduled post slots are.",
+    )
+    @commands.is_owner()
+    async def schedule_load(self, context: Context) -> None:
+        """
+        Show slot usage of the scheduled post planner.
+
+        :param context: The hybrid command context.
+        """
+        planner = self.bot.slot_planner
+        now = int(time.time())
+        last_day = planner.summary(since=now - 24 * 60 * 60)
+        capacity = f"{planner.capacity}/min" if planner.capacity else "unlimited"
+        jitter = f"{planner.max_jitter_seconds // 60} min" if planner.max_jitter_seconds else "off"
+
+        embed = discord.Embed(title="Scheduled Post Load", color=0xBEBEFE)
+        embed.add_field(
+            name="Settings",
+            value=f"**Capacity:** {capacity}\n**Jitter:** {jitter}",
+            inline=False,
+        )
+        embed.add_field(
+            name="Last 24 hours",
+            value=(
+                f"**Posts planned:** {last_day['planned']} over {last_day['minutes']} minute(s)\n"
+                f"**Peak minute:** {last_day['peak']} post(s)"
+                + (f" ({last_day['peak_fill']:.0%} of capacity)" if planner.capacity else "")
+                + f"\n**Over capacity:** {last_day['overflow']}"
+            ),
+            inline=False,
+        )
+
+        busiest = sorted(
+            planner.slot_metrics(since=now - 60 * 60, until=now + 60 * 60),
+            key=lambda slot: slot["planned"],
+            reverse=True,
+        )[:5]
+        if busiest:
+            embed.add_field(
+                name="Busiest minutes (±1 hour)",
+                value="\n".join(
+                    f"<t:{slot['minute']}:t> - {slot['planned']} post(s)"
+                    + (f", {slot['fill']:.0%} full" if planner.capacity else "")
+                    for slot in busiest
+                ),
+                inline=False,
+            )
+        elif not planner.enabled:
+            embed.set_footer(text="Set SCHEDULE_SLOT_CAPACITY or SCHEDULE_JITTER_MINUTES to spread posts.")
+
+        await context.send(embed=embed)
+
+    @commands.hybrid_command(
+        name="llm-status",
+        description="Show the Claude request queue and rate limits.",
+    )
+    @commands.is_owner()
+    async def llm_status(self, context: Context) -> None:
+        """
+        Show queue depth, wait times and in-flight requests of the shared Claude client.
+
+        :param context: The hybrid command context.
+        """
+        client = self.bot.llm_client
+        if client is None:
+            embed = discord.Embed(
+                description="Claude AI is not configured.", color=0xE02B2B
+            )
+            await context.send(embed=embed)
+            return
+
+        scheduler = client.scheduler
+
+        def budget(bucket) -> str:
+            if bucket is None:
+                return "unlimited"
+            return f"{int(bucket.capacity)}/min ({int(bucket.tokens)} available)"
+
+        embed = discord.Embed(title="Claude Request Queue", color=0xBEBEFE)
+        embed.add_field(
+            name="Rate limits",
+            value=(
+                f"**Requests:** {budget(scheduler.request_bucket)}\n"
+                f"**Tokens:** {budget(scheduler.token_bucket)}"
+            ),
+            inline=False,
+        )
+        for priority, stats in scheduler.stats().items():
+            embed.add_field(
+                name=priority.capitalize(),
+                value=(
+                    f"**Queued:** {stats['queued']}\n"
+                    f"**Sent:** {stats['released']} (expired {stats['expired']})\n"
+                    f"**Wait:** avg {stats['avg_wait']:.1f}s, p95 {stats['p95_wait']:.1f}s, "
+                    f"max {stats['max_wait']:.1f}s"
+                ),
+                inline=True,
+            )
+        models = client.stats()
+        if models:
+            embed.add_field(
+                name="Models",
+                value="\n".join(
+                    f"`{model}` - {entry['in_flight']}/{entry['limit']} in flight, {entry['waiting']} waiting"
+                    for model, entry in models.items()
+                ),
+                inline=False,
+            )
+        flights = {name: entry for name, entry in singleflight.stats().items() if entry["started"]}
+        if flights:
+            embed.add_field(
+                name="Shared generations",
+                value="\n".join(
+                    f"`{name}` - {entry['started']} sent, {entry['coalesced']} coalesced, "
+                    f"{entry['in_flight']} in flight"
+                    for name, entry in flights.items()
+                ),
+                inline=False,
+            )
+
+        await context.send(embed=embed)
+
+    @commands.hybrid_command(
+        name="llm-usage",
+        description="Show Claude latency and token spend per feature.",
+    )
+    @commands.is_owner()
+    async def llm_usage(self, context: Context) -> None:
+        """
+        Show per-feature latency percentiles and token spend for the last hour and day.
+
+        :param context: The hybrid command context.
+        """
+        client = self.bot.llm_client
+        if client is None:
+            embed = discord.Embed(
+                description="Claude AI is not configured.", color=0xE02B2B
+            )
+            await context.send(embed=embed)
+            return
+
+        # Latencies come from this replica's buffer, tokens from every replica's rollups
+        await self.bot.flush_llm_usage()
+        now = int(time.time())
+        embed = discord.Embed(title="Claude Usage", color=0xBEBEFE)
+        for label, seconds in (("hour", 3600), ("day", 86400)):
+            latencies = client.meter.summary(seconds)
+            tokens = await self.bot.database.get_llm_usage_totals(now - seconds)
+            lines = []
+            for feature in sorted(set(latencies) | set(tokens)):
+                line = f"`{feature}`"
+                if feature in latencies:
+                    entry = latencies[feature]
+                    line += (
+                        f" - {entry['requests']} req, p50 {entry['p50']:.1f}s, p95 {entry['p95']:.1f}s, "
+                        f"first byte p95 {entry['first_byte_p95']:.1f}s, {entry['errors']} failed"
+                    )
+                if feature in tokens:
+                    spend = tokens[feature]
+                    line += (
+                        f"\n  {spend['input_tokens']:,} in / {spend['output_tokens']:,} out / "
+                        f"{spend['cache_read_tokens']:,} cached tokens"
+                    )
+                lines.append(line)
+            embed.add_field(
+                name=f"Last {label}",
+                value="\n".join(lines)[:1024] or "No requests.",
+                inline=False,
+            )
+        meter = client.meter
+        if meter.guild_daily_tokens:
+            embed.set_footer(
+                text=f"Background quota {meter.guild_daily_tokens:,} tokens per guild per day, "
+                f"{meter.rejected} requests refused"
+            )
+        await context.send(embed=embed)
+
 
 async def setup(bot) -> None:
     await bot.add_cog(Owner(bot))
@@ -10,18 +10,19 @@ import os
 import sys
 import json
 import random
-from datetime import datetime, time, timedelta
 from typing import Optional, Dict
 
 import discord
-from anthropic import AsyncAnthropic
 from discord import app_commands
 from discord.ext import commands, tasks
 from discord.ext.commands import Context
 
 # Import helpers
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from helpers import scheduling
+from helpers.schedule_batch import ScheduleBatch
 from helpers.claude_cog import ClaudeAICog
+from helpers.llm_scheduler import Priority, set_request_context
 
 
 class ExpandableRecipeView(discord.ui.View):
@@ -483,7 +484,8 @@ Rules:
         post_time="[daily-setup] Post time in HH:MM format (24-hour)",
         timezone_offset="[daily-setup] Timezone offset from UTC (e.g., -5 for EST)",
         cuisine="[daily-setup] Preferred cuisine (optional)",
-        dietary="[daily-setup] Preferred dietary restriction (optional)"
+        dietary="[daily-setup] Preferred dietary restriction (optional)",
+        timezone_name="[daily-setup] IANA timezone, e.g. America/New_York - follows daylight saving (overrides offset)"
     )
     @app_commands.choices(
         action=[
@@ -505,7 +507,8 @@ Rules:
         post_time: Optional[str] = None,
         timezone_offset: Optional[int] = 0,
         cuisine: Optional[str] = "random",
-        dietary: Optional[str] = "none"
+        dietary: Optional[str] = "none",
+        timezone_name: Optional[str] = None
     ) -> None:
         """
         Manage recipes and daily recipe settings.
@@ -519,13 +522,14 @@ Rules:
         :param timezone_offset: Timezone offset for daily posts.
         :param cuisine: Cuisine preference for daily posts.
         :param dietary: Dietary preference for daily posts.
+        :param timezone_name: IANA timezone name for daily posts (overrides the offset).
         """
         if action == "book":
             await self._manage_book(context, page)
         elif action == "delete":
             await self._manage_delete(context, recipe_id)
         elif action == "daily-setup":
-            await self._manage_daily_setup(context, channel, post_time, timezone_offset, cuisine, dietary)
+            await self._manage_daily_setup(context, channel, post_time, timezone_offset, cuisine, dietary, timezone_name)
         elif action == "daily-disable":
             await self._manage_daily_disable(context)
         else:
@@ -632,7 +636,8 @@ Rules:
         post_time: Optional[str],
         timezone_offset: int,
         cuisine: str,
-        dietary: str
+        dietary: str,
+        timezone_name: Optional[str] = None
     ) -> None:
         """
         Setup daily recipe posts for the server.
@@ -643,6 +648,7 @@ Rules:
         :param timezone_offset: Timezone offset from UTC.
         :param cuisine: Preferred cuisine.
         :param dietary: Preferred dietary restriction.
+        :param timezone_name: IANA timezone name (overrides the offset when given).
         """
         # Check admin permissions
         if not context.author.guild_permissions.administrator:
@@ -690,6 +696,20 @@ Rules:
             await context.send(embed=embed)
             return
 
+        # Validate timezone name
+        if timezone_name and not scheduling.is_valid_timezone(timezone_name):
+            embed = discord.Embed(
+                title="❌ Invalid Timezone",
+                description="Please use an IANA timezone name, e.g., America/New_York or Europe/London",
+                color=0xE02B2B
+            )
+            await context.send(embed=embed)
+            return
+        timezone_name = timezone_name.strip() if timezone_name else None
+        zone_label = scheduling.format_zone_label(
+            scheduling.resolve_zone_name(timezone_name, timezone_offset)
+        )
+
         # Save configuration
         await self.bot.database.set_recipe_daily_config(
             server_id=context.guild.id,
@@ -697,12 +717,13 @@ Rules:
             post_time=post_time,
             timezone_offset=timezone_offset,
             cuisine_preference=cuisine,
-            dietary_preference=dietary
+            dietary_preference=dietary,
+            timezone=timezone_name
         )
 
         embed = discord.Embed(
             title="✅ Daily Recipes Configured",
-            description=f"Daily recipes will be posted in {channel.mention} at {post_time} (UTC{timezone_offset:+d})",
+            description=f"Daily recipes will be posted in {channel.mention} at {post_time} ({zone_label})",
             color=0x2ecc71
         )
 
@@ -748,38 +769,31 @@ Rules:
 
         await context.send(embed=embed)
 
-    @tasks.loop(minutes=15)
+    @tasks.loop(minutes=1)
     async def check_daily_recipes(self) -> None:
         """Background task to check for servers needing daily recipe posts."""
+        if not self.bot.is_scheduler_leader():
+            return
+
         try:
             servers = await self.bot.database.get_servers_needing_recipe_post()
 
-            for server_data in servers:
+            # Post where the 15-minute window is open and this slot hasn't been posted
+            batch = ScheduleBatch.from_rows(
+                servers, post_time_col=2, timezone_offset_col=3,
+                last_post_col=6, timezone_col=7, window_minutes=15,
+                feature="recipe", guild_id_col=0
+            )
+
+            for index, slot_date in batch.due(planner=self.bot.slot_planner):
+                server_data = servers[index]
                 server_id = int(server_data[0])
+                set_request_context(Priority.BACKGROUND, guild_id=server_id)
                 channel_id = int(server_data[1])
-                post_time_str = server_data[2]
-                timezone_offset = server_data[3]
                 cuisine_pref = server_data[4]
                 dietary_pref = server_data[5]
-                last_post_date = server_data[6]
-
-                # Parse post time
-                hour, minute = map(int, post_time_str.split(':'))
-                post_time_obj = time(hour, minute)
-
-                # Get current time in server's timezone
-                utc_now = datetime.utcnow()
-                server_now = utc_now + timedelta(hours=timezone_offset)
-                current_time = server_now.time()
-                current_date = server_now.strftime('%Y-%m-%d')
-
-                # Check if we're within 15 minutes of post time
-                post_datetime = datetime.combine(server_now.date(), post_time_obj)
-                time_diff = abs((server_now - post_datetime).total_seconds() / 60)
 
-                # Post if within 15-minute window and haven't posted today
-                if time_diff <= 15 and last_post_date != current_date:
-                    await self.post_daily_recipe(server_id, channel_id, cuisine_pref, dietary_pref, current_date)
+                await self.post_daily_recipe(server_id, channel_id, cuisine_pref, dietary_pref, slot_date)
 
         except Exception as e:
             self.bot.logger.error(f"Error in daily recipe check: {e}")
@@ -10,11 +10,11 @@ import os
 import sys
 import re
 import random
-from datetime import datetime, time, timedelta
+import asyncio
+from datetime import datetime, time
 from typing import Optional, Tuple, Dict, List
 
 import discord
-from anthropic import AsyncAnthropic
 from discord import app_commands
 from discord.ext import commands, tasks
 from discord.ext.commands import Context
@@ -22,6 +22,9 @@ from discord.ext.commands import Context
 # Import helpers
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from helpers.claude_cog import ClaudeAICog
+from helpers.llm_scheduler import Priority, request_context, set_request_context
+from helpers import scheduling, trivia_bank
+from helpers.schedule_batch import ScheduleBatch
 
 
 class TriviaView(discord.ui.View):
@@ -142,6 +145,10 @@ class Trivia(ClaudeAICog, name="trivia"):
     def __init__(self, bot) -> None:
         super().__init__(bot, cog_name="Trivia cog")
         self.check_trivia_schedule.start()
+        self.refill_trivia_bank.start()
+
+        # In-progress bank refills, one per (category, difficulty)
+        self.bank_refills: Dict[Tuple[str, str], asyncio.Task] = {}
 
         # Category definitions
         self.CATEGORIES = {
@@ -198,6 +205,112 @@ class Trivia(ClaudeAICog, name="trivia"):
     def cog_unload(self) -> None:
         """Clean up when cog is unloaded."""
         self.check_trivia_schedule.cancel()
+        self.refill_trivia_bank.cancel()
+        for task in self.bank_refills.values():
+            task.cancel()
+
+    @property
+    def bank_categories(self) -> List[str]:
+        """Categories kept in the question bank ("random" draws from all of them)."""
+        return [category for category in self.CATEGORIES if category != "random"]
+
+    async def get_question(self, category: str = "general", difficulty: str = "medium") -> Optional[Dict]:
+        """
+        Get a trivia question from the bank, generating one directly if the bank is empty.
+
+        :param category: The category for the question.
+        :param difficulty: The difficulty level (easy, medium, hard).
+        :return: Dictionary with question data or None if failed.
+        """
+        pool = random.choice(self.bank_categories) if category == "random" else category
+
+        try:
+            question_data = await self.bot.database.pop_trivia_bank_question(pool, difficulty)
+            remaining = await self.bot.database.count_trivia_bank_pool(pool, difficulty)
+        except Exception as e:
+            self.bot.logger.error(f"Error reading trivia bank: {e}")
+            question_data, remaining = None, 0
+
+        if remaining < trivia_bank.LOW_WATER_MARK:
+            self.schedule_bank_refill(pool, difficulty)
+
+        if question_data:
+            return question_data
+        return await self.generate_question(category, difficulty)
+
+    def schedule_bank_refill(self, category: str, difficulty: str) -> None:
+        """
+        Start refilling a bank pool in the background unless a refill is already running.
+
+        :param category: The trivia category.
+        :param difficulty: The difficulty level.
+        """
+        if not self.client:
+            return
+        key = (category, difficulty)
+        running = self.bank_refills.get(key)
+        if running and not running.done():
+            return
+        self.bank_refills[key] = asyncio.create_task(self.fill_bank_pool(category, difficulty))
+
+    async def fill_bank_pool(self, category: str, difficulty: str) -> int:
+        """
+        Generate a batch of questions for one category and difficulty and store the new ones.
+
+        :param category: The trivia category.
+        :param difficulty: The difficulty level.
+        :return: Number of questions added to the bank.
+        """
+        if not self.client:
+            return 0
+
+        try:
+            recent = await self.bot.database.get_recent_trivia_bank_questions(
+                category, difficulty, limit=trivia_bank.AVOID_EXAMPLES
+            )
+            prompt = trivia_bank.build_batch_prompt(
+                self.CATEGORIES.get(category, self.CATEGORIES["general"]), difficulty, avoid=recent
+            )
+            # The bank is shared, so the batch is not charged to the guild that triggered it
+            with request_context(Priority.BACKGROUND):
+                message = await self.client.messages.create(
+                    model="claude-3-5-haiku-20241022",
+                    max_tokens=4096,
+                    messages=[{"role": "user", "content": prompt}]
+                )
+
+            questions = trivia_bank.parse_question_batch(message.content[0].text, category, difficulty)
+            added = await self.bot.database.add_trivia_bank_questions(questions)
+            self.bot.logger.info(
+                f"Trivia bank {category}/{difficulty}: {added} new of {len(questions)} generated"
+            )
+            return added
+
+        except Exception as e:
+            self.bot.logger.error(f"Error refilling trivia bank {category}/{difficulty}: {e}")
+            return 0
+
+    @tasks.loop(minutes=30)
+    async def refill_trivia_bank(self) -> None:
+        """Background task that tops up every question bank pool below the low-water mark."""
+        if not self.client or not self.bot.is_scheduler_leader():
+            return
+
+        try:
+            counts = await self.bot.database.count_trivia_bank()
+            for category in self.bank_categories:
+                for difficulty in trivia_bank.DIFFICULTIES:
+                    if counts.get((category, difficulty), 0) < trivia_bank.LOW_WATER_MARK:
+                        # Shares the refill task with on-demand refills of the same pool
+                        self.schedule_bank_refill(category, difficulty)
+                        await self.bank_refills[(category, difficulty)]
+        except Exception as e:
+            self.bot.logger.error(f"Error in trivia bank refill task: {e}")
+
+    @refill_trivia_bank.before_loop
+    async def before_refill_trivia_bank(self) -> None:
+        """Wait until the bot is ready before starting the task."""
+        await self.bot.wait_until_ready()
 
     async def generate_question(self, category: str = "general", difficulty: str = "medium") -> Optional[Dict]:
         """
@@ -454,9 +567,9 @@ Rules:
         if difficulty not in ["easy", "medium", "hard"]:
             difficulty = "medium"
 
-        # Generate question
+        # Serve a banked question (falls back to generating one)
         await context.defer()
-        question_data = await self.generate_question(category, difficulty)
+        question_data = await self.get_question(category, difficulty)
 
         if not question_data:
             embed = discord.Embed(
@@ -684,7 +797,8 @@ Rules:
         channel="Channel for scheduled trivia (schedule action)",
         time="Time in HH:MM format (schedule action)",
         timezone="UTC offset, e.g., -5 for EST (schedule action)",
-        enabled="Enable or disable (toggle action)"
+        enabled="Enable or disable (toggle action)",
+        timezone_name="IANA timezone, e.g., America/New_York (overrides offset, follows DST)"
     )
     @commands.has_permissions(administrator=True)
     async def trivia_admin(
@@ -694,7 +808,8 @@ Rules:
         channel: Optional[discord.TextChannel] = None,
         time: Optional[str] = None,
         timezone: Optional[int] = None,
-        enabled: Optional[bool] = None
+        enabled: Optional[bool] = None,
+        timezone_name: Optional[str] = None
     ) -> None:
         """
         Admin commands for trivia management.
@@ -705,11 +820,12 @@ Rules:
         :param time: Time in HH:MM format.
         :param timezone: UTC offset.
         :param enabled: Enable/disable flag.
+        :param timezone_name: IANA timezone name, takes precedence over the offset.
         """
         action = action.lower()
 
         if action == "schedule":
-            await self._admin_schedule(context, channel, time, timezone)
+            await self._admin_schedule(context, channel, time, timezone, timezone_name)
         elif action == "toggle":
             await self._admin_toggle(context, enabled)
         elif action == "config":
@@ -722,8 +838,13 @@ Rules:
             await context.send(embed=embed)
 
     async def _admin_schedule(self, context: Context, channel: Optional[discord.TextChannel],
-                              time: Optional[str], timezone: Optional[int]):
+                              time: Optional[str], timezone: Optional[int],
+                              timezone_name: Optional[str] = None):
         """Schedule daily trivia games."""
+        timezone_name = timezone_name.strip() if timezone_name else None
+        if timezone is None and timezone_name:
+            timezone = 0
+
         if not channel or not time or timezone is None:
             embed = discord.Embed(
                 description="❌ Missing required parameters. Usage:\n`/trivia-admin schedule [channel] [time] [timezone]`",
@@ -751,17 +872,30 @@ Rules:
             await context.send(embed=embed)
             return
 
+        if timezone_name and not scheduling.is_valid_timezone(timezone_name):
+            embed = discord.Embed(
+                description="❌ Unknown timezone. Use an IANA name like `America/New_York` or `Europe/London`.",
+                color=0xE02B2B
+            )
+            await context.send(embed=embed)
+            return
+
+        zone_label = scheduling.format_zone_label(
+            scheduling.resolve_zone_name(timezone_name, timezone)
+        )
+
         try:
             # Insert or update configuration
             await self.bot.database.connection.execute(
-                """INSERT INTO trivia_config (server_id, channel_id, post_time, timezone_offset, enabled)
-                   VALUES (?, ?, ?, ?, 1)
+                """INSERT INTO trivia_config (server_id, channel_id, post_time, timezone_offset, timezone, enabled)
+                   VALUES (?, ?, ?, ?, ?, 1)
                    ON CONFLICT(server_id) DO UPDATE SET
                    channel_id = excluded.channel_id,
                    post_time = excluded.post_time,
                    timezone_offset = excluded.timezone_offset,
+                   timezone = excluded.timezone,
                    enabled = excluded.enabled""",
-                (context.guild.id, channel.id, time, timezone)
+                (context.guild.id, channel.id, time, timezone, timezone_name)
             )
             await self.bot.database.connection.commit()
 
@@ -769,7 +903,7 @@ Rules:
                 title="✅ Trivia Scheduled!",
                 description=(
                     f"Daily trivia will be posted in {channel.mention}\n"
-                    f"**Time:** {time} (UTC{timezone:+d})\n"
+                    f"**Time:** {time} ({zone_label})\n"
                     f"**Status:** Enabled"
                 ),
                 color=0x2ECC71
@@ -839,7 +973,7 @@ Rules:
         """View current trivia configuration."""
         try:
             async with self.bot.database.connection.execute(
-                "SELECT channel_id, post_time, timezone_offset, enabled, questions_per_game, difficulty FROM trivia_config WHERE server_id = ?",
+                "SELECT channel_id, post_time, timezone_offset, timezone, enabled, questions_per_game, difficulty FROM trivia_config WHERE server_id = ?",
                 (context.guild.id,)
             ) as cursor:
                 result = await cursor.fetchone()
@@ -853,7 +987,10 @@ Rules:
                 await context.send(embed=embed)
                 return
 
-            channel_id, post_time, tz_offset, enabled, questions, difficulty = result
+            channel_id, post_time, tz_offset, tz_name, enabled, questions, difficulty = result
+            zone_label = scheduling.format_zone_label(
+                scheduling.resolve_zone_name(tz_name, tz_offset)
+            )
             channel = context.guild.get_channel(int(channel_id))
             channel_mention = channel.mention if channel else f"<#{channel_id}> (deleted)"
             status = "✅ Enabled" if enabled else "❌ Disabled"
@@ -867,7 +1004,7 @@ Rules:
                 name="⚙️ Settings",
                 value=(
                     f"**Channel:** {channel_mention}\n"
-                    f"**Time:** {post_time} (UTC{tz_offset:+d})\n"
+                    f"**Time:** {post_time} ({zone_label})\n"
                     f"**Status:** {status}\n"
                     f"**Questions per Game:** {questions}\n"
                     f"**Difficulty:** {difficulty.title()}"
@@ -959,44 +1096,45 @@ Rules:
         await context.send(embed=embed)
 
     # ==================== BACKGROUND TASKS ====================
-    @tasks.loop(minutes=15)
+    @tasks.loop(minutes=1)
     async def check_trivia_schedule(self):
         """Background task to check if trivia should be posted."""
+        if not self.bot.is_scheduler_leader():
+            return
+
         try:
             # Get all enabled servers
             async with self.bot.database.connection.execute(
-                "SELECT server_id, channel_id, post_time, timezone_offset, last_post_date, questions_per_game, difficulty FROM trivia_config WHERE enabled = 1"
+                "SELECT server_id, channel_id, post_time, timezone_offset, timezone, last_post_date, questions_per_game, difficulty FROM trivia_config WHERE enabled = 1"
             ) as cursor:
                 configs = await cursor.fetchall()
 
-            for server_id, channel_id, post_time, tz_offset, last_post_date, questions, difficulty in configs:
-                # Check if it's time to post
-                utc_now = datetime.utcnow()
-                server_time = utc_now + timedelta(hours=tz_offset)
-                server_date = server_time.strftime("%Y-%m-%d")
-
-                # Parse post time
-                hour, minute = map(int, post_time.split(':'))
-
-                # Check if within posting window (60 minutes) and not posted today
-                time_diff = abs((server_time.hour * 60 + server_time.minute) - (hour * 60 + minute))
-
-                if time_diff <= 60 and last_post_date != server_date:
-                    # Time to post!
-                    guild = self.bot.get_guild(int(server_id))
-                    if guild:
-                        channel = guild.get_channel(int(channel_id))
-                        if channel:
-                            await self.post_scheduled_trivia(guild, channel, questions or 5, difficulty or "medium")
-
-                            # Update last post date
-                            await self.bot.database.connection.execute(
-                                "UPDATE trivia_config SET last_post_date = ? WHERE server_id = ?",
-                                (server_date, server_id)
-                            )
-                            await self.bot.database.connection.commit()
-
-                            self.bot.logger.info(f"Posted scheduled trivia to guild {server_id}")
+            # Check if within posting window (60 minutes) and not posted for this slot
+            batch = ScheduleBatch.from_rows(
+                configs, post_time_col=2, timezone_offset_col=3,
+                last_post_col=5, timezone_col=4, window_minutes=60,
+                feature="trivia", guild_id_col=0
+            )
+
+            for index, server_date in batch.due(planner=self.bot.slot_planner):
+                server_id, channel_id, post_time, tz_offset, tz_name, last_post_date, questions, difficulty = configs[index]
+                set_request_context(Priority.BACKGROUND, guild_id=int(server_id))
+
+                # Time to post!
+                guild = self.bot.get_guild(int(server_id))
+                if guild:
+                    channel = guild.get_channel(int(channel_id))
+                    if channel:
+                        await self.post_scheduled_trivia(guild, channel, questions or 5, difficulty or "medium")
+
+                        # Update last post date
+                        await self.bot.database.connection.execute(
+                            "UPDATE trivia_config SET last_post_date = ? WHERE server_id = ?",
+                            (server_date, server_id)
+                        )
+                        await self.bot.database.connection.commit()
+
+                        self.bot.logger.info(f"Posted scheduled trivia to guild {server_id}")
 
         except Exception as e:
             self.bot.logger.error(f"Error in trivia schedule task: {e}")
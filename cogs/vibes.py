@@ -9,12 +9,12 @@ Version: 6.3.0
 import os
 import re
 import sys
+import time
 import traceback
 from datetime import datetime, timedelta, time as dt_time
 from typing import Optional, Tuple
 
 import discord
-from anthropic import AsyncAnthropic
 from discord import app_commands
 from discord.ext import commands, tasks
 from discord.ext.commands import Context
@@ -22,7 +22,13 @@ from discord.ext.commands import Context
 # Import helpers
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from helpers import scheduling
+from helpers.schedule_batch import ScheduleBatch
 from helpers.claude_cog import ClaudeAICog
+from helpers.llm_scheduler import Priority, set_request_context
+
+
+# Seconds between throwbacks in a server
+THROWBACK_INTERVAL = 86400
 
 
 class Vibes(ClaudeAICog, name="vibes"):
@@ -740,42 +746,41 @@ Just provide the question, nothing else."""
             self.bot.logger.error(traceback.format_exc())
             return (False, error)
 
-    @tasks.loop(minutes=15)
+    @tasks.loop(minutes=1)
     async def qotd_task(self) -> None:
-        """Background task that checks every 15 minutes for servers needing QOTD posts."""
+        """Background task that checks every minute for servers needing QOTD posts."""
+        if not self.bot.is_scheduler_leader():
+            return
+
         try:
-            self.bot.logger.info("QOTD task running - checking for servers needing posts...")
+            self.bot.logger.debug("QOTD task running - checking for servers needing posts...")
             servers = await self.bot.database.get_servers_needing_qotd()
-            self.bot.logger.info(f"Found {len(servers)} server(s) with QOTD configured")
+            self.bot.logger.debug(f"Found {len(servers)} server(s) with QOTD configured")
 
-            for server_data in servers:
-                server_id, channel_id, post_time_str, tz_offset, last_post_date = server_data
+            # Check every server's posting window in one pass
+            batch = ScheduleBatch.from_rows(
+                servers, post_time_col=2, timezone_offset_col=3,
+                last_post_col=4, timezone_col=5, window_minutes=15,
+                feature="qotd", guild_id_col=0
+            )
 
-                # Parse the post time
-                target_time = scheduling.parse_time_string(post_time_str)
-                if not target_time:
-                    continue
+            for index, slot_date in batch.due(planner=self.bot.slot_planner):
+                server_id, channel_id, post_time_str, tz_offset, last_post_date, tz_name = servers[index]
+                set_request_context(Priority.BACKGROUND, guild_id=int(server_id))
 
-                # Check if already posted today
-                if not scheduling.should_post_today(last_post_date, tz_offset):
-                    continue
+                # Time to post!
+                self.bot.logger.info(
+                    f"Posting QOTD to server {server_id} at {post_time_str}"
+                )
+                success, error_msg = await self.post_qotd_to_server(int(server_id), int(channel_id))
 
-                # Check if within posting window
-                if scheduling.should_post_now(target_time, tz_offset, window_minutes=15):
-                    # Time to post!
-                    self.bot.logger.info(
-                        f"Posting QOTD to server {server_id} at {post_time_str}"
+                if success:
+                    # Update last post date
+                    await self.bot.database.update_qotd_last_post(
+                        int(server_id), slot_date
                     )
-                    success, error_msg = await self.post_qotd_to_server(int(server_id), int(channel_id))
-
-                    if success:
-                        # Update last post date
-                        current_date = scheduling.get_server_date(tz_offset)
-                        await self.bot.database.update_qotd_last_post(
-                            int(server_id), current_date
-                        )
-                    else:
-                        self.bot.logger.error(f"Failed to post scheduled QOTD to server {server_id}: {error_msg}")
+                else:
+                    self.bot.logger.error(f"Failed to post scheduled QOTD to server {server_id}: {error_msg}")
 
         except Exception as e:
             self.bot.logger.error(f"Error in QOTD task: {e}")
@@ -786,21 +791,30 @@ Just provide the question, nothing else."""
         """Wait for bot to be ready before starting task."""
         self.bot.logger.info("QOTD task waiting for bot to be ready...")
         await self.bot.wait_until_ready()
-        self.bot.logger.info("Bot ready! QOTD task will start running every 15 minutes.")
+        self.bot.logger.info("Bot ready! QOTD task will start running every minute.")
 
-    @tasks.loop(hours=24)
+    @tasks.loop(minutes=1)
     async def throwback_task(self) -> None:
-        """Post random memory throwbacks."""
+        """
+        Background task that posts a random memory throwback to each server once a day.
+
+        When each server last had a throwback is stored in the database, so a replica that
+        becomes scheduler leader picks up the servers that are due within a minute.
+        """
+        if not self.bot.is_scheduler_leader():
+            return
+
         try:
-            self.bot.logger.info("Throwback task running...")
-            # Get all guilds with throwback enabled
-            # For now, we'll just check if vibes_config exists and throwback is enabled
-            # This would need a proper query method, but for simplicity:
-            for guild in self.bot.guilds:
-                config = await self.bot.database.get_vibes_config(guild.id)
-                if not config or not config["throwback_enabled"]:
+            now = int(time.time())
+            server_ids = await self.bot.database.get_servers_needing_throwback(now - THROWBACK_INTERVAL)
+            for server_id in server_ids:
+                guild = self.bot.get_guild(int(server_id))
+                if not guild:
                     continue
 
+                # Claim today's throwback first so a failed post isn't retried every minute
+                await self.bot.database.update_last_throwback(server_id, now)
+
                 # Get a random old memory (at least 30 days old)
                 memory = await self.bot.database.get_random_memory(guild.id)
                 if not memory:
@@ -855,7 +869,7 @@ Just provide the question, nothing else."""
         """Wait for bot to be ready before starting task."""
         self.bot.logger.info("Throwback task waiting for bot to be ready...")
         await self.bot.wait_until_ready()
-        self.bot.logger.info("Bot ready! Throwback task will run daily.")
+        self.bot.logger.info("Bot ready! Throwback task will start running every minute.")
 
     async def qotd_task_error(self, error: Exception) -> None:
         """Handle errors in QOTD task."""
@@ -927,6 +941,7 @@ Just provide the question, nothing else."""
 
         config = await self.bot.database.get_vibes_config(ctx.guild.id)
         qotd_enabled = config["qotd_enabled"] if config else False
+        zone_name = scheduling.resolve_zone_name(schedule["timezone"], schedule["timezone_offset"])
 
         embed = discord.Embed(
             title="💬 Question of the Day Status",
@@ -939,7 +954,7 @@ Just provide the question, nothing else."""
         embed.add_field(name="Channel", value=f"<#{schedule['channel_id']}>", inline=True)
         embed.add_field(
             name="Post Time",
-            value=f"{schedule['post_time']} (UTC{schedule['timezone_offset']:+d})",
+            value=f"{schedule['post_time']} ({scheduling.format_zone_label(zone_name)})",
             inline=True,
         )
 
@@ -1048,6 +1063,7 @@ Just provide the question, nothing else."""
         time="QOTD time in HH:MM format (for 'setup qotd_schedule')",
         timezone="Timezone offset from UTC (for 'setup qotd_schedule')",
         enabled="Enable or disable (for 'toggle' action)",
+        timezone_name="IANA timezone, e.g. America/New_York - follows daylight saving (for 'setup qotd_schedule', overrides offset)",
     )
     @app_commands.choices(action=[
         app_commands.Choice(name="Setup features", value="setup"),
@@ -1072,6 +1088,7 @@ Just provide the question, nothing else."""
         time: str = None,
         timezone: int = 0,
         enabled: bool = None,
+        timezone_name: str = None,
     ) -> None:
         """
         Admin operations for vibes features: setup, toggle, or view status.
@@ -1084,12 +1101,13 @@ Just provide the question, nothing else."""
         :param time: QOTD time (for setup qotd_schedule).
         :param timezone: Timezone offset (for setup qotd_schedule).
         :param enabled: Enable or disable (for toggle action).
+        :param timezone_name: IANA timezone name (for setup qotd_schedule, overrides the offset).
         """
         if ctx.interaction:
             await ctx.defer()
 
         if action == "setup":
-            await self._admin_setup(ctx, feature, emoji, channel, time, timezone)
+            await self._admin_setup(ctx, feature, emoji, channel, time, timezone, timezone_name)
         elif action == "toggle":
             await self._admin_toggle(ctx, feature, enabled)
         elif action == "status":
@@ -1103,6 +1121,7 @@ Just provide the question, nothing else."""
         channel: discord.TextChannel,
         time: str,
         timezone: int,
+        timezone_name: str = None,
     ) -> None:
         """Setup vibes features."""
         if not feature:
@@ -1166,6 +1185,18 @@ Just provide the question, nothing else."""
                 await ctx.send(embed=embed)
                 return
 
+            if timezone_name and not scheduling.is_valid_timezone(timezone_name):
+                embed = discord.Embed(
+                    description="❌ Unknown timezone. Use an IANA name such as `America/New_York` or `Europe/London`.",
+                    color=0xE02B2B,
+                )
+                await ctx.send(embed=embed)
+                return
+            timezone_name = timezone_name.strip() if timezone_name else None
+            zone_label = scheduling.format_zone_label(
+                scheduling.resolve_zone_name(timezone_name, timezone)
+            )
+
             # Validate bot can access and post to channel
             self.bot.logger.info(f"Validating channel access: {channel.name} (ID: {channel.id})")
             permissions = channel.permissions_for(ctx.guild.me)
@@ -1192,10 +1223,10 @@ Just provide the question, nothing else."""
 
             # Save schedule
             await self.bot.database.set_qotd_schedule(
-                ctx.guild.id, channel.id, time, timezone
+                ctx.guild.id, channel.id, time, timezone, timezone_name
             )
 
-            self.bot.logger.info(f"QOTD configured successfully for {ctx.guild.name}: #{channel.name} at {time} UTC{timezone:+d}")
+            self.bot.logger.info(f"QOTD configured successfully for {ctx.guild.name}: #{channel.name} at {time} {zone_label}")
 
             embed = discord.Embed(
                 title="✅ Question of the Day Configured!",
@@ -1203,7 +1234,7 @@ Just provide the question, nothing else."""
                 color=0x2ECC71,
             )
             embed.add_field(name="Channel", value=channel.mention, inline=True)
-            embed.add_field(name="Time", value=f"{time} (UTC{timezone:+d})", inline=True)
+            embed.add_field(name="Time", value=f"{time} ({zone_label})", inline=True)
             embed.add_field(
                 name="Commands",
                 value="• `/vibes-qotd now` - Post question now\n• `/vibes-qotd suggest` - Add your own questions\n• `/vibes-admin toggle` - Enable/disable",
@@ -1305,9 +1336,10 @@ Just provide the question, nothing else."""
         # QOTD status
         if config and qotd_schedule:
             qotd_status = "✅ Enabled" if config["qotd_enabled"] else "❌ Disabled"
+            zone_name = scheduling.resolve_zone_name(qotd_schedule["timezone"], qotd_schedule["timezone_offset"])
             embed.add_field(
                 name="💬 Question of the Day",
-                value=f"Status: {qotd_status}\nChannel: <#{qotd_schedule['channel_id']}>\nTime: {qotd_schedule['post_time']} (UTC{qotd_schedule['timezone_offset']:+d})",
+                value=f"Status: {qotd_status}\nChannel: <#{qotd_schedule['channel_id']}>\nTime: {qotd_schedule['post_time']} ({scheduling.format_zone_label(zone_name)})",
                 inline=True,
             )
         else:
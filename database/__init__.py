@@ -316,8 +316,8 @@ class DatabaseManager:
     # ===== CLAUDE CONVERSATION METHODS =====
 
     async def add_claude_message(
-        self, channel_id: int, user_id: int, role: str, content: str
-    ) -> None:
+        self, channel_id: int, user_id: int, role: str, content: str, token_count: int = None
+    ) -> int:
         """
         Add a message to the Claude conversation history.
         Conversation history is shared across all users in a channel.
@@ -326,12 +326,15 @@ class DatabaseManager:
         :param user_id: The ID of the user who sent the message.
         :param role: The role ('user' or 'assistant').
         :param content: The message content.
+        :param token_count: Optional token count of the content, used to budget the history.
+        :return: The row ID of the new message.
         """
-        await self.connection.execute(
-            "INSERT INTO claude_conversations (channel_id, user_id, role, content) VALUES (?, ?, ?, ?)",
-            (channel_id, user_id, role, content),
+        cursor = await self.connection.execute(
+            "INSERT INTO claude_conversations (channel_id, user_id, role, content, token_count) VALUES (?, ?, ?, ?, ?)",
+            (channel_id, user_id, role, content, token_count),
         )
         await self.connection.commit()
+        return cursor.lastrowid
 
     async def get_conversation_history(self, channel_id: int, limit: int = 20, user_id: int = None) -> list:
         """
@@ -360,6 +363,96 @@ class DatabaseManager:
             # Reverse to get chronological order (oldest first)
             return list(reversed(result))
 
+    async def get_conversation_window(
+        self, channel_id: int, start_id: int = None, limit: int = 200, user_id: int = None
+    ) -> list:
+        """
+        Get the newest conversation messages at or after a starting message.
+        Returns messages in chronological order (oldest first).
+
+        :param channel_id: The ID of the channel.
+        :param start_id: Optional row ID of the first message to include. If None, starts from the newest messages.
+        :param limit: Maximum number of messages to retrieve.
+        :param user_id: Optional user ID for personal conversation history. If None, returns shared channel history.
+        :return: List of tuples (id, role, content, token_count).
+        """
+        query = "SELECT id, role, content, token_count FROM claude_conversations WHERE channel_id=?"
+        params = [channel_id]
+        if user_id is not None:
+            query += " AND user_id=?"
+            params.append(user_id)
+        if start_id is not None:
+            query += " AND id>=?"
+            params.append(start_id)
+        rows = await self.connection.execute(query + " ORDER BY id DESC LIMIT ?", (*params, limit))
+        async with rows as cursor:
+            result = await cursor.fetchall()
+            return list(reversed(result))
+
+    async def get_conversation_range(
+        self, channel_id: int, after_id: int, before_id: int, limit: int = 200, user_id: int = None
+    ) -> list:
+        """
+        Get the newest conversation messages between two row IDs (both excluded).
+        Returns messages in chronological order (oldest first).
+
+        :param channel_id: The ID of the channel.
+        :param after_id: Row ID after which messages are included.
+        :param before_id: Row ID before which messages are included.
+        :param limit: Maximum number of messages to retrieve.
+        :param user_id: Optional user ID for personal conversation history. If None, returns shared channel history.
+        :return: List of tuples (id, role, content, token_count).
+        """
+        query = "SELECT id, role, content, token_count FROM claude_conversations WHERE channel_id=? AND id>? AND id<?"
+        params = [channel_id, after_id, before_id]
+        if user_id is not None:
+            query += " AND user_id=?"
+            params.append(user_id)
+        rows = await self.connection.execute(query + " ORDER BY id DESC LIMIT ?", (*params, limit))
+        async with rows as cursor:
+            result = await cursor.fetchall()
+            return list(reversed(result))
+
+    async def get_claude_summary(self, channel_id: int, user_id: int = None) -> dict:
+        """
+        Get the running summary of a conversation's older turns.
+
+        :param channel_id: The ID of the channel.
+        :param user_id: Optional user ID for personal conversations. If None, returns the shared channel summary.
+        :return: Dictionary with summary, through_id and token_count, or None if there is no summary yet.
+        """
+        rows = await self.connection.execute(
+            "SELECT summary, through_id, token_count FROM claude_summaries WHERE channel_id=? AND user_id=?",
+            (channel_id, user_id or 0),
+        )
+        async with rows as cursor:
+            result = await cursor.fetchone()
+            if result:
+                return {"summary": result[0], "through_id": result[1], "token_count": result[2]}
+            return None
+
+    async def save_claude_summary(
+        self, channel_id: int, user_id: int, summary: str, through_id: int, token_count: int
+    ) -> None:
+        """
+        Store the running summary of a conversation's older turns.
+
+        :param channel_id: The ID of the channel.
+        :param user_id: User ID for personal conversations, None (or 0) for the shared channel summary.
+        :param summary: The summary text.
+        :param through_id: Row ID of the newest message the summary covers.
+        :param token_count: Token count of the summary text.
+        """
+        await self.connection.execute(
+            """INSERT INTO claude_summaries (channel_id, user_id, summary, through_id, token_count)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(channel_id, user_id) DO UPDATE SET
+                   summary=excluded.summary, through_id=excluded.through_id,
+                   token_count=excluded.token_count, updated_at=CURRENT_TIMESTAMP""",
+            (channel_id, user_id or 0, summary, through_id, token_count),
+        )
+        await self.connection.commit()
+
     async def clear_conversation(self, channel_id: int, user_id: int = None) -> int:
         """
         Clear conversation history for a channel.
@@ -380,8 +473,13 @@ class DatabaseManager:
                 "DELETE FROM claude_conversations WHERE channel_id=?",
                 (channel_id,),
             )
+        deleted = cursor.rowcount
+        await self.connection.execute(
+            "DELETE FROM claude_summaries WHERE channel_id=? AND user_id=?",
+            (channel_id, user_id or 0),
+        )
         await self.connection.commit()
-        return cursor.rowcount
+        return deleted
 
     async def get_total_messages(self, channel_id: int, user_id: int = None) -> int:
         """
@@ -418,7 +516,7 @@ class DatabaseManager:
         :return: Dictionary with configuration or None if not found.
         """
         rows = await self.connection.execute(
-            "SELECT channel_id, post_time, timezone_offset, enabled, theme, last_post_date FROM affirmation_config WHERE server_id=?",
+            "SELECT channel_id, post_time, timezone_offset, enabled, theme, last_post_date, timezone FROM affirmation_config WHERE server_id=?",
             (server_id,),
         )
         async with rows as cursor:
@@ -431,11 +529,18 @@ class DatabaseManager:
                     "enabled": bool(result[3]),
                     "theme": result[4],
                     "last_post_date": result[5],
+                    "timezone": result[6],
                 }
             return None
 
     async def set_affirmation_config(
-        self, server_id: int, channel_id: int, post_time: str, timezone_offset: int, theme: str = "motivation"
+        self,
+        server_id: int,
+        channel_id: int,
+        post_time: str,
+        timezone_offset: int,
+        theme: str = "motivation",
+        timezone: str = None,
     ) -> None:
         """
         Set affirmation configuration for a server.
@@ -445,10 +550,11 @@ class DatabaseManager:
         :param post_time: Time to post (HH:MM format).
         :param timezone_offset: Timezone offset from UTC.
         :param theme: Theme for affirmations.
+        :param timezone: Optional IANA timezone name (takes precedence over the offset).
         """
         await self.connection.execute(
-            "INSERT OR REPLACE INTO affirmation_config (server_id, channel_id, post_time, timezone_offset, enabled, theme) VALUES (?, ?, ?, ?, 1, ?)",
-            (server_id, channel_id, post_time, timezone_offset, theme),
+            "INSERT OR REPLACE INTO affirmation_config (server_id, channel_id, post_time, timezone_offset, enabled, theme, timezone) VALUES (?, ?, ?, ?, 1, ?, ?)",
+            (server_id, channel_id, post_time, timezone_offset, theme, timezone),
         )
         await self.connection.commit()
 
@@ -484,10 +590,10 @@ class DatabaseManager:
         """
         Get list of servers that have affirmations enabled.
 
-        :return: List of tuples (server_id, channel_id, post_time, timezone_offset, theme, last_post_date).
+        :return: List of tuples (server_id, channel_id, post_time, timezone_offset, theme, last_post_date, timezone).
         """
         rows = await self.connection.execute(
-            "SELECT server_id, channel_id, post_time, timezone_offset, theme, last_post_date FROM affirmation_config WHERE enabled=1"
+            "SELECT server_id, channel_id, post_time, timezone_offset, theme, last_post_date, timezone FROM affirmation_config WHERE enabled=1"
         )
         async with rows as cursor:
             result = await cursor.fetchall()
@@ -501,7 +607,7 @@ class DatabaseManager:
         :return: List of dictionaries with news configuration, or empty list if not configured.
         """
         rows = await self.connection.execute(
-            "SELECT channel_id, post_time, timezone_offset, enabled, last_post_date FROM news_config WHERE server_id=?",
+            "SELECT channel_id, post_time, timezone_offset, enabled, last_post_date, timezone FROM news_config WHERE server_id=?",
             (server_id,),
         )
         async with rows as cursor:
@@ -514,11 +620,17 @@ class DatabaseManager:
                     "timezone_offset": result[2],
                     "enabled": bool(result[3]),
                     "last_post_date": result[4],
+                    "timezone": result[5],
                 })
             return configs
 
     async def set_news_config(
-        self, server_id: int, channel_id: int, post_time: str, timezone_offset: int = 0
+        self,
+        server_id: int,
+        channel_id: int,
+        post_time: str,
+        timezone_offset: int = 0,
+        timezone: str = None,
     ) -> None:
         """
         Set or update news configuration for a server.
@@ -527,10 +639,11 @@ class DatabaseManager:
         :param channel_id: The channel ID where news will be posted.
         :param post_time: Time to post news in HH:MM format (24-hour).
         :param timezone_offset: Timezone offset in hours from UTC.
+        :param timezone: Optional IANA timezone name (takes precedence over the offset).
         """
         await self.connection.execute(
-            "INSERT OR REPLACE INTO news_config (server_id, channel_id, post_time, timezone_offset, enabled) VALUES (?, ?, ?, ?, 1)",
-            (server_id, channel_id, post_time, timezone_offset),
+            "INSERT OR REPLACE INTO news_config (server_id, channel_id, post_time, timezone_offset, enabled, timezone) VALUES (?, ?, ?, ?, 1, ?)",
+            (server_id, channel_id, post_time, timezone_offset, timezone),
         )
         await self.connection.commit()
 
@@ -597,10 +710,10 @@ class DatabaseManager:
         """
         Get list of servers that have news updates enabled.
 
-        :return: List of tuples (server_id, channel_id, post_time, timezone_offset, last_post_date).
+        :return: List of tuples (server_id, channel_id, post_time, timezone_offset, last_post_date, timezone).
         """
         rows = await self.connection.execute(
-            "SELECT server_id, channel_id, post_time, timezone_offset, last_post_date FROM news_config WHERE enabled=1"
+            "SELECT server_id, channel_id, post_time, timezone_offset, last_post_date, timezone FROM news_config WHERE enabled=1"
         )
         async with rows as cursor:
             result = await cursor.fetchall()
@@ -679,17 +792,288 @@ class DatabaseManager:
         )
         await self.connection.commit()
 
-    async def cleanup_old_articles(self, days: int = 30) -> None:
+    async def get_posted_article_ids(self, server_id: int, article_ids: list) -> set:
+        """
+        Find which of some articles have already been posted to a server.
+
+        :param server_id: The server ID.
+        :param article_ids: The article identifiers to check.
+        :return: Set of the identifiers that have been posted.
+        """
+        posted = set()
+        ids = list(dict.fromkeys(article_ids))
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = await self.connection.execute(
+                f"SELECT article_id FROM posted_articles WHERE server_id=? AND article_id IN ({','.join('?' * len(chunk))})",
+                (server_id, *chunk),
+            )
+            async with rows as cursor:
+                posted.update(row[0] for row in await cursor.fetchall())
+        return posted
+
+    async def get_posted_articles_since(self, since: str = "") -> list:
+        """
+        Get the articles posted to any server at or after a point in time.
+
+        :param since: posted_at value (UTC, 'YYYY-MM-DD HH:MM:SS'); empty for every record.
+        :return: List of (server_id, article_id, posted_at) tuples, oldest first.
+        """
+        rows = await self.connection.execute(
+            "SELECT server_id, article_id, posted_at FROM posted_articles WHERE posted_at >= ? ORDER BY posted_at",
+            (since,),
+        )
+        async with rows as cursor:
+            return await cursor.fetchall()
+
+    async def get_all_news_source_urls(self) -> list:
+        """
+        Get every RSS feed URL configured by any server.
+
+        :return: List of distinct feed URLs.
+        """
+        rows = await self.connection.execute("SELECT DISTINCT rss_url FROM news_sources")
+        async with rows as cursor:
+            result = await cursor.fetchall()
+            return [row[0] for row in result]
+
+    async def add_articles(self, feed_url: str, articles: list) -> int:
+        """
+        Store ingested feed articles, skipping ones already stored for the feed.
+
+        :param feed_url: The feed the articles came from.
+        :param articles: Article dictionaries with id, title, link, description, image, source, published
+            and published_at (Unix timestamp).
+        :return: Number of new articles stored.
+        """
+        if not articles:
+            return 0
+        before = self.connection.total_changes
+        await self.connection.executemany(
+            """
+            INSERT OR IGNORE INTO articles(feed_url, article_id, title, link, description, image, source,
+                published, published_at, ingested_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+            """,
+            [
+                (
+                    feed_url, article["id"], article["title"], article["link"], article["description"],
+                    article["image"], article["source"], article["published"], article["published_at"],
+                )
+                for article in articles
+            ],
+        )
+        await self.connection.commit()
+        return self.connection.total_changes - before
+
+    async def get_known_article_ids(self, feed_url: str, article_ids: list) -> set:
+        """
+        Find which of a feed's articles have already been ingested.
+
+        :param feed_url: The feed URL.
+        :param article_ids: The article identifiers to check.
+        :return: Set of the identifiers already stored.
+        """
+        known = set()
+        ids = list(dict.fromkeys(article_ids))
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = await self.connection.execute(
+                f"SELECT article_id FROM articles WHERE feed_url=? AND article_id IN ({','.join('?' * len(chunk))})",
+                (feed_url, *chunk),
+            )
+            async with rows as cursor:
+                known.update(row[0] for row in await cursor.fetchall())
+        return known
+
+    async def get_recent_articles(self, feed_urls: list, since: int, per_feed: int = 10) -> list:
+        """
+        Get the newest ingested articles of some feeds.
+
+        :param feed_urls: The feeds to read.
+        :param since: Unix timestamp; older articles are left out.
+        :param per_feed: Maximum number of articles per feed.
+        :return: List of article dictionaries (with feed_url), newest first within each feed.
+        """
+        if not feed_urls:
+            return []
+        urls = list(dict.fromkeys(feed_urls))
+        rows = await self.connection.execute(
+            f"""
+            SELECT feed_url, article_id, title, link, description, image, source, published, published_at
+            FROM (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY feed_url ORDER BY published_at DESC, id DESC) AS position
+                FROM articles WHERE feed_url IN ({','.join('?' * len(urls))}) AND published_at >= ?
+            )
+            WHERE position <= ? ORDER BY feed_url, position
+            """,
+            (*urls, since, per_feed),
+        )
+        async with rows as cursor:
+            result = await cursor.fetchall()
+            return [
+                {
+                    "feed_url": row[0],
+                    "id": row[1],
+                    "title": row[2],
+                    "link": row[3],
+                    "description": row[4],
+                    "image": row[5],
+                    "source": row[6],
+                    "published": row[7],
+                    "published_at": row[8],
+                }
+                for row in result
+            ]
+
+    async def cleanup_ingested_articles(self, before: int) -> int:
+        """
+        Remove ingested articles published before a point in time.
+
+        :param before: Unix timestamp.
+        :return: Number of articles removed.
+        """
+        result = await self.connection.execute("DELETE FROM articles WHERE published_at < ?", (before,))
+        await self.connection.commit()
+        return result.rowcount
+
+    async def count_recent_articles(self, feed_urls: list, since: int) -> dict:
+        """
+        Count the ingested articles each feed published since a point in time.
+
+        :param feed_urls: The feeds to count.
+        :param since: Unix timestamp.
+        :return: Dictionary mapping feed URL to article count (feeds without articles are left out).
+        """
+        if not feed_urls:
+            return {}
+        urls = list(dict.fromkeys(feed_urls))
+        rows = await self.connection.execute(
+            f"""
+            SELECT feed_url, COUNT(*) FROM articles
+            WHERE feed_url IN ({','.join('?' * len(urls))}) AND published_at >= ? GROUP BY feed_url
+            """,
+            (*urls, since),
+        )
+        async with rows as cursor:
+            return {row[0]: row[1] for row in await cursor.fetchall()}
+
+    async def save_feed_health(self, feed_url: str, health: dict) -> None:
+        """
+        Store the latest polling statistics of a feed.
+
+        :param feed_url: The feed URL.
+        :param health: Dictionary with status, polls, errors, failures, last_error, latency_ms,
+            update_interval, poll_interval, next_poll_at and updated_at (unix timestamps for the last two).
+        """
+        await self.connection.execute(
+            """
+            INSERT OR REPLACE INTO feed_health(feed_url, status, polls, errors, failures, last_error, latency_ms,
+                update_interval, poll_interval, next_poll_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                feed_url, health["status"], health["polls"], health["errors"], health["failures"],
+                health["last_error"], health["latency_ms"], health["update_interval"], health["poll_interval"],
+                health["next_poll_at"], health["updated_at"],
+            ),
+        )
+        await self.connection.commit()
+
+    async def get_feed_health(self, feed_urls: list) -> dict:
+        """
+        Get the latest polling statistics of some feeds.
+
+        :param feed_urls: The feeds to read.
+        :return: Dictionary mapping feed URL to the dictionary given to save_feed_health, for the feeds
+            polled so far.
+        """
+        if not feed_urls:
+            return {}
+        urls = list(dict.fromkeys(feed_urls))
+        rows = await self.connection.execute(
+            f"""
+            SELECT feed_url, status, polls, errors, failures, last_error, latency_ms, update_interval,
+                poll_interval, next_poll_at, updated_at
+            FROM feed_health WHERE feed_url IN ({','.join('?' * len(urls))})
+            """,
+            urls,
+        )
+        async with rows as cursor:
+            return {
+                row[0]: {
+                    "status": row[1],
+                    "polls": row[2],
+                    "errors": row[3],
+                    "failures": row[4],
+                    "last_error": row[5],
+                    "latency_ms": row[6],
+                    "update_interval": row[7],
+                    "poll_interval": row[8],
+                    "next_poll_at": row[9],
+                    "updated_at": row[10],
+                }
+                for row in await cursor.fetchall()
+            }
+
+    async def get_article_summaries(self, keys: list) -> dict:
+        """
+        Get cached summaries of articles.
+
+        :param keys: List of (article_id, content_hash) tuples.
+        :return: Dictionary mapping (article_id, content_hash) to (summary, category) for the cached ones.
+        """
+        found = {}
+        keys = list(dict.fromkeys(keys))
+        for start in range(0, len(keys), 400):
+            chunk = keys[start:start + 400]
+            rows = await self.connection.execute(
+                "SELECT article_id, content_hash, summary, category FROM article_summaries "
+                f"WHERE (article_id, content_hash) IN (VALUES {','.join('(?, ?)' for _ in chunk)})",
+                [value for key in chunk for value in key],
+            )
+            async with rows as cursor:
+                for article_id, content_hash, summary, category in await cursor.fetchall():
+                    found[(article_id, content_hash)] = (summary, category)
+        return found
+
+    async def save_article_summaries(self, summaries: list) -> None:
+        """
+        Cache generated article summaries.
+
+        :param summaries: List of (article_id, content_hash, summary, category) tuples.
+        """
+        await self.connection.executemany(
+            "INSERT OR REPLACE INTO article_summaries(article_id, content_hash, summary, category, created_at) "
+            "VALUES (?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))",
+            summaries,
+        )
+        await self.connection.commit()
+
+    async def cleanup_article_summaries(self, before: int) -> int:
+        """
+        Remove cached article summaries created before a point in time.
+
+        :param before: Unix timestamp.
+        :return: Number of summaries removed.
+        """
+        result = await self.connection.execute("DELETE FROM article_summaries WHERE created_at < ?", (before,))
+        await self.connection.commit()
+        return result.rowcount
+
+    async def cleanup_old_articles(self, days: int = 30) -> int:
         """
         Remove article tracking records older than specified days.
 
         :param days: Number of days to keep article records (default 30).
+        :return: Number of records removed.
         """
-        await self.connection.execute(
+        result = await self.connection.execute(
             "DELETE FROM posted_articles WHERE posted_at < datetime('now', '-' || ? || ' days')",
             (days,),
         )
         await self.connection.commit()
+        return result.rowcount
 
     # ===== VIBES (MEMORIES + QOTD) METHODS =====
 
@@ -902,6 +1286,36 @@ class DatabaseManager:
                 }
             return None
 
+    async def get_servers_needing_throwback(self, before: int) -> list:
+        """
+        Get the servers with throwbacks enabled that haven't had one since a point in time.
+
+        :param before: Unix timestamp; servers whose last throwback is at or before it are due.
+        :return: List of server IDs.
+        """
+        rows = await self.connection.execute(
+            """SELECT v.server_id FROM vibes_config v
+               LEFT JOIN throwback_posts t ON t.server_id = v.server_id
+               WHERE v.throwback_enabled = 1 AND (t.last_post_at IS NULL OR t.last_post_at <= ?)""",
+            (before,),
+        )
+        async with rows as cursor:
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def update_last_throwback(self, server_id: int, posted_at: int) -> None:
+        """
+        Record when a server last had a throwback.
+
+        :param server_id: The server ID.
+        :param posted_at: Unix timestamp.
+        """
+        await self.connection.execute(
+            """INSERT INTO throwback_posts (server_id, last_post_at) VALUES (?, ?)
+               ON CONFLICT(server_id) DO UPDATE SET last_post_at=excluded.last_post_at""",
+            (server_id, posted_at),
+        )
+        await self.connection.commit()
+
     async def get_memory_stats(self, server_id: int) -> dict:
         """
         Get statistics about memories for a server.
@@ -974,7 +1388,12 @@ class DatabaseManager:
     # QOTD Methods
 
     async def set_qotd_schedule(
-        self, server_id: int, channel_id: int, post_time: str, timezone_offset: int
+        self,
+        server_id: int,
+        channel_id: int,
+        post_time: str,
+        timezone_offset: int,
+        timezone: str = None,
     ) -> None:
         """
         Set or update QOTD schedule for a server.
@@ -983,18 +1402,21 @@ class DatabaseManager:
         :param channel_id: The channel to post questions in.
         :param post_time: Time in HH:MM format.
         :param timezone_offset: Timezone offset from UTC.
+        :param timezone: Optional IANA timezone name (takes precedence over the offset).
         """
         await self.connection.execute(
-            "INSERT INTO qotd_schedule (server_id, channel_id, post_time, timezone_offset) VALUES (?, ?, ?, ?) "
-            "ON CONFLICT(server_id) DO UPDATE SET channel_id=?, post_time=?, timezone_offset=?",
+            "INSERT INTO qotd_schedule (server_id, channel_id, post_time, timezone_offset, timezone) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(server_id) DO UPDATE SET channel_id=?, post_time=?, timezone_offset=?, timezone=?",
             (
                 server_id,
                 channel_id,
                 post_time,
                 timezone_offset,
+                timezone,
                 channel_id,
                 post_time,
                 timezone_offset,
+                timezone,
             ),
         )
         await self.connection.commit()
@@ -1010,7 +1432,7 @@ class DatabaseManager:
         :return: Schedule dict or None if not configured.
         """
         rows = await self.connection.execute(
-            "SELECT channel_id, post_time, timezone_offset, last_post_date FROM qotd_schedule WHERE server_id=?",
+            "SELECT channel_id, post_time, timezone_offset, last_post_date, timezone FROM qotd_schedule WHERE server_id=?",
             (server_id,),
         )
         async with rows as cursor:
@@ -1021,6 +1443,7 @@ class DatabaseManager:
                     "post_time": result[1],
                     "timezone_offset": result[2],
                     "last_post_date": result[3],
+                    "timezone": result[4],
                 }
             return None
 
@@ -1028,10 +1451,10 @@ class DatabaseManager:
         """
         Get all servers that need QOTD posts (enabled and within time window).
 
-        :return: List of (server_id, channel_id, post_time, timezone_offset, last_post_date) tuples.
+        :return: List of (server_id, channel_id, post_time, timezone_offset, last_post_date, timezone) tuples.
         """
         rows = await self.connection.execute(
-            """SELECT q.server_id, q.channel_id, q.post_time, q.timezone_offset, q.last_post_date
+            """SELECT q.server_id, q.channel_id, q.post_time, q.timezone_offset, q.last_post_date, q.timezone
                FROM qotd_schedule q
                JOIN vibes_config v ON q.server_id = v.server_id
                WHERE v.qotd_enabled = 1"""
@@ -1216,7 +1639,7 @@ class DatabaseManager:
         :return: Dictionary with configuration or None if not found.
         """
         rows = await self.connection.execute(
-            "SELECT channel_id, post_time, timezone_offset, enabled, cuisine_preference, dietary_preference, last_post_date FROM recipe_daily_config WHERE server_id=?",
+            "SELECT channel_id, post_time, timezone_offset, enabled, cuisine_preference, dietary_preference, last_post_date, timezone FROM recipe_daily_config WHERE server_id=?",
             (server_id,),
         )
         async with rows as cursor:
@@ -1230,6 +1653,7 @@ class DatabaseManager:
                     "cuisine_preference": result[4],
                     "dietary_preference": result[5],
                     "last_post_date": result[6],
+                    "timezone": result[7],
                 }
             return None
 
@@ -1241,6 +1665,7 @@ class DatabaseManager:
         timezone_offset: int = 0,
         cuisine_preference: str = "random",
         dietary_preference: str = "none",
+        timezone: str = None,
     ) -> None:
         """
         Set daily recipe configuration for a server.
@@ -1251,9 +1676,10 @@ class DatabaseManager:
         :param timezone_offset: Timezone offset from UTC.
         :param cuisine_preference: Preferred cuisine type.
         :param dietary_preference: Preferred dietary restriction.
+        :param timezone: Optional IANA timezone name (takes precedence over the offset).
         """
         await self.connection.execute(
-            "INSERT OR REPLACE INTO recipe_daily_config (server_id, channel_id, post_time, timezone_offset, enabled, cuisine_preference, dietary_preference) VALUES (?, ?, ?, ?, 1, ?, ?)",
+            "INSERT OR REPLACE INTO recipe_daily_config (server_id, channel_id, post_time, timezone_offset, enabled, cuisine_preference, dietary_preference, timezone) VALUES (?, ?, ?, ?, 1, ?, ?, ?)",
             (
                 server_id,
                 channel_id,
@@ -1261,6 +1687,7 @@ class DatabaseManager:
                 timezone_offset,
                 cuisine_preference,
                 dietary_preference,
+                timezone,
             ),
         )
         await self.connection.commit()
@@ -1297,10 +1724,10 @@ class DatabaseManager:
         """
         Get list of servers that have daily recipe posts enabled.
 
-        :return: List of tuples (server_id, channel_id, post_time, timezone_offset, cuisine_preference, dietary_preference, last_post_date).
+        :return: List of tuples (server_id, channel_id, post_time, timezone_offset, cuisine_preference, dietary_preference, last_post_date, timezone).
         """
         rows = await self.connection.execute(
-            "SELECT server_id, channel_id, post_time, timezone_offset, cuisine_preference, dietary_preference, last_post_date FROM recipe_daily_config WHERE enabled=1"
+            "SELECT server_id, channel_id, post_time, timezone_offset, cuisine_preference, dietary_preference, last_post_date, timezone FROM recipe_daily_config WHERE enabled=1"
         )
         async with rows as cursor:
             result = await cursor.fetchall()
@@ -1316,7 +1743,7 @@ class DatabaseManager:
         :return: Tuple with configuration or None if not found.
         """
         rows = await self.connection.execute(
-            "SELECT server_id, channel_id, post_time, timezone_offset, enabled, last_post_date, focus_areas, include_contemporary FROM art_config WHERE server_id=?",
+            "SELECT server_id, channel_id, post_time, timezone_offset, enabled, last_post_date, focus_areas, include_contemporary, timezone FROM art_config WHERE server_id=?",
             (server_id,),
         )
         async with rows as cursor:
@@ -1331,6 +1758,7 @@ class DatabaseManager:
         timezone_offset: int = 0,
         focus_areas: str = "all",
         include_contemporary: bool = True,
+        timezone: str = None,
     ) -> None:
         """
         Setup or update art configuration for a server.
@@ -1341,9 +1769,10 @@ class DatabaseManager:
         :param timezone_offset: Timezone offset from UTC.
         :param focus_areas: Focus areas for art selection.
         :param include_contemporary: Whether to include contemporary art.
+        :param timezone: Optional IANA timezone name (takes precedence over the offset).
         """
         await self.connection.execute(
-            "INSERT OR REPLACE INTO art_config (server_id, channel_id, post_time, timezone_offset, enabled, focus_areas, include_contemporary) VALUES (?, ?, ?, ?, 1, ?, ?)",
+            "INSERT OR REPLACE INTO art_config (server_id, channel_id, post_time, timezone_offset, enabled, focus_areas, include_contemporary, timezone) VALUES (?, ?, ?, ?, 1, ?, ?, ?)",
             (
                 server_id,
                 channel_id,
@@ -1351,6 +1780,7 @@ class DatabaseManager:
                 timezone_offset,
                 focus_areas,
                 int(include_contemporary),
+                timezone,
             ),
         )
         await self.connection.commit()
@@ -1386,10 +1816,10 @@ class DatabaseManager:
         """
         Get list of servers that have daily art posts enabled.
 
-        :return: List of tuples (server_id, channel_id, post_time, timezone_offset, last_post_date).
+        :return: List of tuples (server_id, channel_id, post_time, timezone_offset, last_post_date, timezone).
         """
         rows = await self.connection.execute(
-            "SELECT server_id, channel_id, post_time, timezone_offset, last_post_date FROM art_config WHERE enabled=1"
+            "SELECT server_id, channel_id, post_time, timezone_offset, last_post_date, timezone FROM art_config WHERE enabled=1"
         )
         async with rows as cursor:
             result = await cursor.fetchall()
@@ -1521,3 +1951,157 @@ class DatabaseManager:
             (artwork_url,),
         )
         await self.connection.commit()
+
+    # ===== TRIVIA BANK METHODS =====
+
+    async def add_trivia_bank_questions(self, questions: list) -> int:
+        """
+        Store generated trivia questions, skipping any already in the bank.
+
+        :param questions: List of dicts with category, difficulty, question_hash, question, options (A-D), correct and explanation.
+        :return: Number of new questions stored.
+        """
+        before = self.connection.total_changes
+        await self.connection.executemany(
+            "INSERT OR IGNORE INTO trivia_bank (category, difficulty, question_hash, question, option_a, option_b, option_c, option_d, correct, explanation) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    q["category"], q["difficulty"], q["question_hash"], q["question"],
+                    q["options"]["A"], q["options"]["B"], q["options"]["C"], q["options"]["D"],
+                    q["correct"], q.get("explanation", ""),
+                )
+                for q in questions
+            ],
+        )
+        await self.connection.commit()
+        return self.connection.total_changes - before
+
+    async def pop_trivia_bank_question(self, category: str, difficulty: str) -> dict:
+        """
+        Take the oldest unserved question for a category and difficulty.
+
+        :param category: The trivia category.
+        :param difficulty: The difficulty level.
+        :return: Dictionary with question data or None if the bank is empty.
+        """
+        rows = await self.connection.execute(
+            """UPDATE trivia_bank SET served_at=CURRENT_TIMESTAMP
+               WHERE id = (SELECT id FROM trivia_bank WHERE category=? AND difficulty=? AND served_at IS NULL ORDER BY id LIMIT 1)
+               RETURNING question, option_a, option_b, option_c, option_d, correct, explanation""",
+            (category, difficulty),
+        )
+        async with rows as cursor:
+            result = await cursor.fetchone()
+        await self.connection.commit()
+        if result is None:
+            return None
+        return {
+            "question": result[0],
+            "options": {"A": result[1], "B": result[2], "C": result[3], "D": result[4]},
+            "correct": result[5],
+            "category": category,
+            "difficulty": difficulty,
+            "explanation": result[6] or "",
+        }
+
+    async def count_trivia_bank(self) -> dict:
+        """
+        Count unserved questions per category and difficulty.
+
+        :return: Dictionary mapping (category, difficulty) to the number of unserved questions.
+        """
+        rows = await self.connection.execute(
+            "SELECT category, difficulty, COUNT(*) FROM trivia_bank WHERE served_at IS NULL GROUP BY category, difficulty"
+        )
+        async with rows as cursor:
+            result = await cursor.fetchall()
+            return {(category, difficulty): count for category, difficulty, count in result}
+
+    async def count_trivia_bank_pool(self, category: str, difficulty: str) -> int:
+        """
+        Count unserved questions in one category and difficulty.
+
+        :param category: The trivia category.
+        :param difficulty: The difficulty level.
+        :return: Number of unserved questions.
+        """
+        rows = await self.connection.execute(
+            "SELECT COUNT(*) FROM trivia_bank WHERE category=? AND difficulty=? AND served_at IS NULL",
+            (category, difficulty),
+        )
+        async with rows as cursor:
+            result = await cursor.fetchone()
+            return result[0]
+
+    async def get_recent_trivia_bank_questions(self, category: str, difficulty: str, limit: int = 25) -> list:
+        """
+        Get the most recently generated questions for a category and difficulty.
+
+        :param category: The trivia category.
+        :param difficulty: The difficulty level.
+        :param limit: Maximum number of questions to return.
+        :return: List of question texts, newest first.
+        """
+        rows = await self.connection.execute(
+            "SELECT question FROM trivia_bank WHERE category=? AND difficulty=? ORDER BY id DESC LIMIT ?",
+            (category, difficulty, limit),
+        )
+        async with rows as cursor:
+            result = await cursor.fetchall()
+            return [row[0] for row in result]
+
+    async def add_llm_usage(self, rows: list) -> None:
+        """
+        Add rolled-up Claude usage, merging with rows already stored for the same period.
+
+        :param rows: (period_start, feature, guild_id, model, requests, errors, input_tokens, output_tokens,
+            cache_read_tokens, cache_write_tokens, latency_ms_total, latency_ms_max) tuples.
+        """
+        await self.connection.executemany(
+            """
+            INSERT INTO llm_usage(period_start, feature, guild_id, model, requests, errors, input_tokens,
+                output_tokens, cache_read_tokens, cache_write_tokens, latency_ms_total, latency_ms_max)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(period_start, feature, guild_id, model) DO UPDATE SET
+                requests = requests + excluded.requests,
+                errors = errors + excluded.errors,
+                input_tokens = input_tokens + excluded.input_tokens,
+                output_tokens = output_tokens + excluded.output_tokens,
+                cache_read_tokens = cache_read_tokens + excluded.cache_read_tokens,
+                cache_write_tokens = cache_write_tokens + excluded.cache_write_tokens,
+                latency_ms_total = latency_ms_total + excluded.latency_ms_total,
+                latency_ms_max = MAX(latency_ms_max, excluded.latency_ms_max)
+            """,
+            [(row[0], row[1], str(row[2])) + tuple(row[3:]) for row in rows],
+        )
+        await self.connection.commit()
+
+    async def get_llm_usage_totals(self, since: int) -> dict:
+        """
+        Get Claude usage per feature since a point in time.
+
+        :param since: Unix timestamp; rollup periods starting at or after it are counted.
+        :return: Dictionary mapping feature to a dict with requests, errors, input_tokens, output_tokens,
+            cache_read_tokens and cache_write_tokens.
+        """
+        rows = await self.connection.execute(
+            """
+            SELECT feature, SUM(requests), SUM(errors), SUM(input_tokens), SUM(output_tokens),
+                SUM(cache_read_tokens), SUM(cache_write_tokens)
+            FROM llm_usage WHERE period_start >= ? GROUP BY feature ORDER BY feature
+            """,
+            (since,),
+        )
+        async with rows as cursor:
+            result = await cursor.fetchall()
+            return {
+                row[0]: {
+                    "requests": row[1],
+                    "errors": row[2],
+                    "input_tokens": row[3],
+                    "output_tokens": row[4],
+                    "cache_read_tokens": row[5],
+                    "cache_write_tokens": row[6],
+                }
+                for row in result
+            }
@@ -0,0 +1,86 @@
+"""
+Migration script to add IANA timezone names to scheduled feature configs.
+
+Existing rows only store an integer `timezone_offset` in hours. This adds a
+`timezone` column to every schedule table and backfills it with the matching
+fixed-offset zone (e.g. -5 becomes "Etc/GMT+5"), so scheduling behaves exactly
+as before until an admin re-runs setup with a real zone like "America/New_York".
+
+Run this script once to add the new column without affecting existing data.
+"""
+
+import asyncio
+import os
+import sys
+
+import aiosqlite
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from helpers.scheduling import offset_to_zone_name
+
+SCHEDULE_TABLES = [
+    "affirmation_config",
+    "news_config",
+    "qotd_schedule",
+    "trivia_config",
+    "creative_config",
+    "recipe_daily_config",
+    "art_config",
+]
+
+
+async def migrate():
+    """Add and backfill the timezone column on all schedule tables."""
+    print("Starting timezone migration...")
+
+    async with aiosqlite.connect("database/database.db") as db:
+        for table in SCHEDULE_TABLES:
+            # Skip tables from features that were never migrated in
+            cursor = await db.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+                (table,),
+            )
+            if not await cursor.fetchone():
+                print(f"⚠️  Table {table} does not exist, skipping.")
+                continue
+
+            cursor = await db.execute(f"PRAGMA table_info(`{table}`)")
+            columns = [row[1] for row in await cursor.fetchall()]
+
+            if "timezone" not in columns:
+                print(f"Adding timezone column to {table}...")
+                await db.execute(
+                    f"ALTER TABLE `{table}` ADD COLUMN `timezone` varchar(64) DEFAULT NULL"
+                )
+            else:
+                print(f"⚠️  {table} already has a timezone column.")
+
+            # Backfill rows that only have an offset
+            cursor = await db.execute(
+                f"SELECT DISTINCT timezone_offset FROM `{table}` WHERE timezone IS NULL"
+            )
+            offsets = [row[0] for row in await cursor.fetchall()]
+            for offset in offsets:
+                zone_name = offset_to_zone_name(offset or 0)
+                if offset is None:
+                    await db.execute(
+                        f"UPDATE `{table}` SET timezone=? WHERE timezone IS NULL AND timezone_offset IS NULL",
+                        (zone_name,),
+                    )
+                else:
+                    await db.execute(
+                        f"UPDATE `{table}` SET timezone=? WHERE timezone IS NULL AND timezone_offset=?",
+                        (zone_name, offset),
+                    )
+            if offsets:
+                print(f"  Backfilled {len(offsets)} offset(s) in {table}")
+
+        await db.commit()
+
+        print("✅ Migration completed successfully!")
+        print("\nSchedules now support IANA timezones with daylight saving time.")
+        print("Re-run a feature's setup command with timezone_name (e.g. America/New_York) to switch a server over.")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,67 @@
+"""
+Migration script to add token counts to Claude conversation history.
+
+/ask now builds its history to a token budget instead of a fixed number of
+messages. This adds a `token_count` column to `claude_conversations` and
+backfills existing rows with the same estimate the bot uses for new messages,
+and creates the `claude_summaries` table for the running conversation summary.
+
+Run this script once to add the new column without affecting existing data.
+"""
+
+import asyncio
+import os
+import sys
+
+import aiosqlite
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from helpers.prompt_cache import CHARS_PER_TOKEN
+
+
+async def migrate():
+    """Add and backfill the token_count column and create the summaries table."""
+    print("Starting token count migration...")
+
+    async with aiosqlite.connect("database/database.db") as db:
+        cursor = await db.execute("PRAGMA table_info(`claude_conversations`)")
+        columns = [row[1] for row in await cursor.fetchall()]
+
+        if not columns:
+            print("⚠️  Table claude_conversations does not exist, skipping.")
+        else:
+            if "token_count" not in columns:
+                print("Adding token_count column to claude_conversations...")
+                await db.execute(
+                    "ALTER TABLE `claude_conversations` ADD COLUMN `token_count` int DEFAULT NULL"
+                )
+            else:
+                print("⚠️  claude_conversations already has a token_count column.")
+
+            cursor = await db.execute(
+                "UPDATE `claude_conversations` SET token_count = length(content) / ? + 1 WHERE token_count IS NULL",
+                (CHARS_PER_TOKEN,),
+            )
+            print(f"  Backfilled {cursor.rowcount} message(s)")
+
+        print("Creating claude_summaries table...")
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS `claude_summaries` (
+              `channel_id` varchar(20) NOT NULL,
+              `user_id` varchar(20) NOT NULL,
+              `summary` TEXT NOT NULL,
+              `through_id` int NOT NULL,
+              `token_count` int NOT NULL DEFAULT 0,
+              `updated_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+              PRIMARY KEY (`channel_id`, `user_id`)
+            )
+        """)
+
+        await db.commit()
+
+        print("✅ Migration completed successfully!")
+        print("\nConversation history is now limited by tokens, with older turns kept in a running summary.")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
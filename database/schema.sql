@@ -30,14 +30,28 @@ CREATE TABLE IF NOT EXISTS `claude_conversations` (
   `user_id` varchar(20) NOT NULL,
   `role` varchar(10) NOT NULL,
   `content` TEXT NOT NULL,
+  `token_count` int DEFAULT NULL,
   `created_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Running summary of the conversation turns that left the history window
+-- (user_id 0 = shared channel conversation)
+CREATE TABLE IF NOT EXISTS `claude_summaries` (
+  `channel_id` varchar(20) NOT NULL,
+  `user_id` varchar(20) NOT NULL,
+  `summary` TEXT NOT NULL,
+  `through_id` int NOT NULL,
+  `token_count` int NOT NULL DEFAULT 0,
+  `updated_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`channel_id`, `user_id`)
+);
+
 CREATE TABLE IF NOT EXISTS `affirmation_config` (
   `server_id` varchar(20) NOT NULL PRIMARY KEY,
   `channel_id` varchar(20) NOT NULL,
   `post_time` varchar(5) NOT NULL,
   `timezone_offset` int DEFAULT 0,
+  `timezone` varchar(64) DEFAULT NULL,
   `enabled` boolean NOT NULL DEFAULT 1,
   `theme` varchar(50) DEFAULT 'motivation',
   `last_post_date` varchar(10) DEFAULT NULL
@@ -48,6 +62,7 @@ CREATE TABLE IF NOT EXISTS `news_config` (
   `channel_id` varchar(20) NOT NULL,
   `post_time` varchar(5) NOT NULL,
   `timezone_offset` int DEFAULT 0,
+  `timezone` varchar(64) DEFAULT NULL,
   `enabled` boolean NOT NULL DEFAULT 1,
   `last_post_date` varchar(10) DEFAULT NULL,
   PRIMARY KEY (`server_id`, `post_time`)
@@ -68,6 +83,8 @@ CREATE TABLE IF NOT EXISTS `posted_articles` (
   PRIMARY KEY (`article_id`, `server_id`)
 );
 
+CREATE INDEX IF NOT EXISTS idx_posted_articles_posted_at ON posted_articles(posted_at);
+
 CREATE TABLE IF NOT EXISTS `vibes_config` (
   `server_id` varchar(20) NOT NULL PRIMARY KEY,
   `memory_emoji` varchar(100) DEFAULT '💾',
@@ -76,6 +93,11 @@ CREATE TABLE IF NOT EXISTS `vibes_config` (
   `auto_suggest_memories` boolean NOT NULL DEFAULT 1
 );
 
+CREATE TABLE IF NOT EXISTS `throwback_posts` (
+  `server_id` varchar(20) NOT NULL PRIMARY KEY,
+  `last_post_at` int NOT NULL
+);
+
 CREATE TABLE IF NOT EXISTS `memories` (
   `id` INTEGER PRIMARY KEY AUTOINCREMENT,
   `server_id` varchar(20) NOT NULL,
@@ -99,6 +121,7 @@ CREATE TABLE IF NOT EXISTS `qotd_schedule` (
   `channel_id` varchar(20) NOT NULL,
   `post_time` varchar(5) NOT NULL,
   `timezone_offset` int DEFAULT 0,
+  `timezone` varchar(64) DEFAULT NULL,
   `last_post_date` varchar(10) DEFAULT NULL
 );
 
@@ -120,6 +143,7 @@ CREATE TABLE IF NOT EXISTS `trivia_config` (
   `channel_id` varchar(20) NOT NULL,
   `post_time` varchar(5) NOT NULL,
   `timezone_offset` int DEFAULT 0,
+  `timezone` varchar(64) DEFAULT NULL,
   `enabled` boolean NOT NULL DEFAULT 1,
   `last_post_date` varchar(10) DEFAULT NULL,
   `questions_per_game` int DEFAULT 5,
@@ -157,6 +181,7 @@ CREATE TABLE IF NOT EXISTS `creative_config` (
   `channel_id` varchar(20) NOT NULL,
   `post_time` varchar(5) NOT NULL,
   `timezone_offset` int DEFAULT 0,
+  `timezone` varchar(64) DEFAULT NULL,
   `daily_prompts_enabled` boolean NOT NULL DEFAULT 1,
   `weekly_challenges_enabled` boolean NOT NULL DEFAULT 1,
   `last_daily_post` varchar(10) DEFAULT NULL,
@@ -246,6 +271,7 @@ CREATE TABLE IF NOT EXISTS `recipe_daily_config` (
   `channel_id` varchar(20) NOT NULL,
   `post_time` varchar(5) NOT NULL,
   `timezone_offset` int DEFAULT 0,
+  `timezone` varchar(64) DEFAULT NULL,
   `enabled` boolean NOT NULL DEFAULT 1,
   `cuisine_preference` varchar(50) DEFAULT 'random',
   `dietary_preference` varchar(50) DEFAULT 'none',
@@ -257,6 +283,7 @@ CREATE TABLE IF NOT EXISTS `art_config` (
   `channel_id` varchar(20) NOT NULL,
   `post_time` varchar(5) NOT NULL,
   `timezone_offset` int DEFAULT 0,
+  `timezone` varchar(64) DEFAULT NULL,
   `enabled` boolean NOT NULL DEFAULT 1,
   `last_post_date` varchar(10) DEFAULT NULL,
   `focus_areas` TEXT DEFAULT 'all',
@@ -288,4 +315,88 @@ CREATE TABLE IF NOT EXISTS `art_analysis_cache` (
   `last_used_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_artwork_url ON art_analysis_cache(artwork_url);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_artwork_url ON art_analysis_cache(artwork_url);
+
+CREATE TABLE IF NOT EXISTS `scheduler_lease` (
+  `name` varchar(50) NOT NULL PRIMARY KEY,
+  `holder` varchar(100) NOT NULL,
+  `expires_at` int NOT NULL,
+  `acquired_at` int NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS `trivia_bank` (
+  `id` INTEGER PRIMARY KEY AUTOINCREMENT,
+  `category` varchar(20) NOT NULL,
+  `difficulty` varchar(10) NOT NULL,
+  `question_hash` varchar(16) NOT NULL UNIQUE,
+  `question` TEXT NOT NULL,
+  `option_a` TEXT NOT NULL,
+  `option_b` TEXT NOT NULL,
+  `option_c` TEXT NOT NULL,
+  `option_d` TEXT NOT NULL,
+  `correct` varchar(1) NOT NULL,
+  `explanation` TEXT,
+  `created_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `served_at` timestamp DEFAULT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_trivia_bank_unserved ON trivia_bank(category, difficulty, id) WHERE served_at IS NULL;
+
+CREATE TABLE IF NOT EXISTS `llm_usage` (
+  `period_start` int NOT NULL,
+  `feature` varchar(32) NOT NULL,
+  `guild_id` varchar(20) NOT NULL,
+  `model` varchar(64) NOT NULL,
+  `requests` int NOT NULL DEFAULT 0,
+  `errors` int NOT NULL DEFAULT 0,
+  `input_tokens` int NOT NULL DEFAULT 0,
+  `output_tokens` int NOT NULL DEFAULT 0,
+  `cache_read_tokens` int NOT NULL DEFAULT 0,
+  `cache_write_tokens` int NOT NULL DEFAULT 0,
+  `latency_ms_total` int NOT NULL DEFAULT 0,
+  `latency_ms_max` int NOT NULL DEFAULT 0,
+  PRIMARY KEY (`period_start`, `feature`, `guild_id`, `model`)
+);
+
+CREATE TABLE IF NOT EXISTS `articles` (
+  `id` INTEGER PRIMARY KEY AUTOINCREMENT,
+  `feed_url` TEXT NOT NULL,
+  `article_id` TEXT NOT NULL,
+  `title` TEXT NOT NULL,
+  `link` TEXT NOT NULL DEFAULT '',
+  `description` TEXT NOT NULL DEFAULT '',
+  `image` TEXT,
+  `source` TEXT,
+  `published` TEXT,
+  `published_at` int NOT NULL,
+  `ingested_at` int NOT NULL,
+  UNIQUE (`feed_url`, `article_id`)
+);
+
+CREATE INDEX IF NOT EXISTS idx_articles_feed_published ON articles(feed_url, published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_at);
+
+CREATE TABLE IF NOT EXISTS `article_summaries` (
+  `article_id` TEXT NOT NULL,
+  `content_hash` varchar(32) NOT NULL,
+  `summary` TEXT NOT NULL,
+  `category` varchar(32) NOT NULL,
+  `created_at` int NOT NULL,
+  PRIMARY KEY (`article_id`, `content_hash`)
+);
+
+CREATE INDEX IF NOT EXISTS idx_article_summaries_created ON article_summaries(created_at);
+
+CREATE TABLE IF NOT EXISTS `feed_health` (
+  `feed_url` TEXT NOT NULL PRIMARY KEY,
+  `status` varchar(16) NOT NULL,
+  `polls` int NOT NULL DEFAULT 0,
+  `errors` int NOT NULL DEFAULT 0,
+  `failures` int NOT NULL DEFAULT 0,
+  `last_error` TEXT NOT NULL DEFAULT '',
+  `latency_ms` int,
+  `update_interval` int,
+  `poll_interval` int NOT NULL,
+  `next_poll_at` int NOT NULL,
+  `updated_at` int NOT NULL
+);
@@ -0,0 +1,158 @@
+"""
+Bloom filters for "has this been seen?" checks that usually answer no.
+
+The news cog checks every digest candidate against `posted_articles`, and
+nearly all of them have never been posted. A Bloom filter answers "definitely
+not seen" from memory; only the few "maybe seen" answers (items that were
+added, plus about ERROR_RATE of the rest) need the database.
+
+BloomFilter is a fixed-size filter. KeyedBloomFilters keeps a growing filter
+per key (a guild): when a guild's newest filter is full, another one twice
+the size is added. A lookup checks every stage, so their false positive rates
+add up; each stage is built for half the previous one's rate, starting at
+ERROR_RATE / 2, so the rates sum to less than ERROR_RATE however many items
+a guild collects. Items can't be removed, so owners rebuild the filters from
+their source of truth after deleting old rows.
+"""
+
+import hashlib
+import math
+from typing import Dict, Hashable, List, Tuple
+
+# Share of unseen items reported as "maybe seen"
+ERROR_RATE = 0.01
+
+# Items the first filter of a key is sized for
+MIN_CAPACITY = 1024
+
+
+def _hash(item: str) -> Tuple[int, int]:
+    """Two 64-bit hashes of an item; a filter's positions are derived from them (double hashing)."""
+    digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter of strings.
+
+    Attributes:
+        capacity: Items it is sized for at error_rate
+        count: Items added
+    """
+
+    def __init__(self, capacity: int = MIN_CAPACITY, error_rate: float = ERROR_RATE) -> None:
+        """
+        Initialize an empty filter.
+
+        Args:
+            capacity: Items to size the filter for
+            error_rate: False positive rate at capacity
+        """
+        self.capacity = max(capacity, 1)
+        self.bits = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / self.capacity * math.log(2)))
+        self._array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, hashes: Tuple[int, int]) -> List[int]:
+        """Bit positions for an item's hashes."""
+        first, second = hashes
+        return [(first + number * second) % self.bits for number in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        """
+        Add an item.
+
+        Args:
+            item: The item
+        """
+        self._add(_hash(item))
+
+    def _add(self, hashes: Tuple[int, int]) -> None:
+        for position in self._positions(hashes):
+            self._array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """Whether the item may have been added (False means it definitely wasn't)."""
+        return self._contains(_hash(item))
+
+    def _contains(self, hashes: Tuple[int, int]) -> bool:
+        # Unseen items usually miss on the first position or two, so positions are computed as needed
+        first, second = hashes
+        array, bits = self._array, self.bits
+        for number in range(self.hashes):
+            position = (first + number * second) % bits
+            if not array[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def full(self) -> bool:
+        """Whether the filter holds as many items as it was sized for."""
+        return self.count >= self.capacity
+
+
+class KeyedBloomFilters:
+    """Growing Bloom filters, one per key, whose stages' false positive rates sum to under error_rate."""
+
+    def __init__(self, capacity: int = MIN_CAPACITY, error_rate: float = ERROR_RATE) -> None:
+        """
+        Initialize with no keys.
+
+        Args:
+            capacity: Items the first filter of each key is sized for
+            error_rate: False positive rate of all of a key's filters together
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filters: Dict[Hashable, List[BloomFilter]] = {}
+
+    def add(self, key: Hashable, item: str) -> bool:
+        """
+        Add an item under a key.
+
+        Items the key may already hold aren't added again, so adding the same
+        item repeatedly doesn't use up capacity.
+
+        Args:
+            key: E.g. a guild ID
+            item: The item
+
+        Returns:
+            Whether the item was added
+        """
+        hashes = _hash(item)
+        filters = self._filters.setdefault(key, [BloomFilter(self.capacity, self.error_rate / 2)])
+        if any(bloom._contains(hashes) for bloom in filters):
+            return False
+        if filters[-1].full:
+            filters.append(BloomFilter(filters[-1].capacity * 2, self.error_rate / 2 ** (len(filters) + 1)))
+        filters[-1]._add(hashes)
+        return True
+
+    def might_contain(self, key: Hashable, item: str) -> bool:
+        """
+        Check whether an item may have been added under a key.
+
+        Args:
+            key: E.g. a guild ID
+            item: The item
+
+        Returns:
+            False if it definitely wasn't added, True if it may have been
+        """
+        filters = self._filters.get(key)
+        if not filters:
+            return False
+        hashes = _hash(item)
+        return any(bloom._contains(hashes) for bloom in filters)
+
+    def clear(self) -> None:
+        """Forget every item."""
+        self._filters.clear()
+
+    def __len__(self) -> int:
+        """Items added under all keys."""
+        return sum(bloom.count for filters in self._filters.values() for bloom in filters)
@@ -5,12 +5,12 @@ This module provides a base class for cogs that use Claude AI,
 eliminating duplicate initialization code across multiple cogs.
 """
 
-import os
 from typing import Optional
 
-from anthropic import AsyncAnthropic
 from discord.ext import commands
 
+from helpers.llm_client import LLMClient
+
 
 class ClaudeAICog(commands.Cog):
     """
@@ -18,8 +18,10 @@ class ClaudeAICog(commands.Cog):
 
     This class handles the boilerplate of initializing the Claude AI client,
     checking for API keys, and logging initialization status. Inheriting cogs
-    automatically get `self.client` set to an AsyncAnthropic instance (or None
-    if the API key is not configured).
+    automatically get `self.client` set to the bot's shared LLMClient (or None
+    if the API key is not configured). The client is owned and closed by the
+    bot, so every cog shares one connection pool and one set of per-model
+    concurrency limits; each cog's requests are metered under its name.
 
     Usage:
         class MyCog(ClaudeAICog, name="mycog"):
@@ -29,7 +31,7 @@ class ClaudeAICog(commands.Cog):
 
     Attributes:
         bot: The Discord bot instance
-        client: AsyncAnthropic client instance (or None if API key not found)
+        client: Shared LLMClient instance (or None if API key not found)
     """
 
     def __init__(self, bot, cog_name: Optional[str] = None):
@@ -44,19 +46,20 @@ class ClaudeAICog(commands.Cog):
         self.bot = bot
         self.client = self._init_claude_client(cog_name)
 
-    def _init_claude_client(self, cog_name: Optional[str] = None) -> Optional[AsyncAnthropic]:
+    def _init_claude_client(self, cog_name: Optional[str] = None) -> Optional[LLMClient]:
         """
-        Initialize Claude AI client with error handling.
+        Get the bot's shared Claude AI client with error handling.
 
         Args:
             cog_name: Human-readable name for logging messages
 
         Returns:
-            AsyncAnthropic client instance if API key is configured, None otherwise
+            A view of the shared LLMClient metered under this cog's name if the
+            API key is configured, None otherwise
         """
-        api_key = os.getenv("ANTHROPIC_API_KEY")
+        client = getattr(self.bot, "llm_client", None)
 
-        if not api_key:
+        if not client:
             # Determine name for logging
             name = cog_name or self.__class__.__name__
 
@@ -69,4 +72,6 @@ class ClaudeAICog(commands.Cog):
         if cog_name:
             self.bot.logger.info(f"{cog_name} initialized with Claude AI.")
 
-        return AsyncAnthropic(api_key=api_key)
+        if isinstance(client, LLMClient):
+            return client.for_feature(self.qualified_name)
+        return client
@@ -0,0 +1,265 @@
+"""
+Serialised Claude conversations with their recent turns kept in memory.
+
+Each conversation scope (a channel's shared conversation, or one user's
+personal conversation in a channel) gets a ConversationActor. /ask takes the
+actor for its whole turn: storing the question, building the history,
+streaming the answer and storing it. Concurrent questions in one conversation
+therefore run one after another in arrival order, and a question never sees
+another question without its answer. At most QUEUE_LIMIT questions wait per
+conversation; more raise ConversationBusy.
+
+The actor holds the conversation's newest BUFFER_ROWS messages in a deque,
+loaded from the database the first time the conversation is used and then
+written through: every new message is stored in the database and appended to
+each loaded actor whose history query would return it. Building the history
+for a request therefore needs no database reads.
+"""
+
+import asyncio
+import bisect
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from helpers.prompt_cache import count_tokens
+
+# Messages kept in memory per conversation (matches the history query limit)
+BUFFER_ROWS = 200
+
+# Questions that may wait for a busy conversation before new ones are turned away
+QUEUE_LIMIT = 3
+
+# Conversations unused for this long are dropped from memory
+IDLE_SECONDS = 3600
+
+Row = Tuple[int, str, str, Optional[int]]
+
+
+class ConversationBusy(Exception):
+    """Raised when too many questions are already waiting for a conversation."""
+
+
+class ConversationActor:
+    """One conversation's turn lock and recent messages."""
+
+    def __init__(self, channel_id: int, user_id: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize the actor.
+
+        Args:
+            channel_id: Discord channel ID
+            user_id: User ID for personal conversations, None for shared
+            clock: Monotonic clock used for idle expiry
+        """
+        self.channel_id = channel_id
+        self.user_id = user_id
+        self.clock = clock
+        self.lock = asyncio.Lock()
+        self.waiting = 0
+        self.rows: deque = deque(maxlen=BUFFER_ROWS)
+        self.questions = 0
+        self.summary: Optional[Dict] = None
+        self.loaded = False
+        self.last_used = clock()
+
+    @property
+    def busy(self) -> bool:
+        """Whether a turn is running or waiting."""
+        return self.lock.locked() or self.waiting > 0
+
+    def history(self, start_id: Optional[int] = None) -> List[Row]:
+        """
+        Get the buffered messages at or after a starting message.
+
+        Args:
+            start_id: Row ID of the first message to include, or None for all
+
+        Returns:
+            (row ID, role, content, token count) tuples, oldest first
+        """
+        if start_id is None:
+            return list(self.rows)
+        return [row for row in self.rows if row[0] >= start_id]
+
+    def append(self, row: Row) -> None:
+        """
+        Add a newly stored message in row ID order (ignored if it is already buffered).
+
+        Turns of different conversations in a channel hold different locks, so their
+        messages can arrive here in a different order than they were stored.
+
+        Args:
+            row: (row ID, role, content, token count)
+        """
+        if not self.rows or row[0] > self.rows[-1][0]:
+            self.rows.append(row)
+        else:
+            index = bisect.bisect_left([buffered[0] for buffered in self.rows], row[0])
+            if self.rows[index][0] == row[0]:
+                return
+            if len(self.rows) == self.rows.maxlen:
+                if index == 0:
+                    return  # older than every buffered message, so outside the window
+                self.rows.popleft()
+                index -= 1
+            self.rows.insert(index, row)
+        if row[1] == "user":
+            self.questions += 1
+
+    def invalidate(self) -> None:
+        """Forget the buffered messages so the next turn reloads them."""
+        self.rows.clear()
+        self.questions = 0
+        self.summary = None
+        self.loaded = False
+
+    def release(self) -> None:
+        """End the current turn."""
+        self.last_used = self.clock()
+        self.lock.release()
+
+    async def load(self, database) -> None:
+        """
+        Load the recent messages, question count and summary if not loaded yet.
+
+        Args:
+            database: DatabaseManager
+        """
+        if self.loaded:
+            return
+        fetched = await database.get_conversation_window(self.channel_id, limit=BUFFER_ROWS, user_id=self.user_id)
+        questions = await database.get_total_messages(self.channel_id, user_id=self.user_id)
+        summary = await database.get_claude_summary(self.channel_id, self.user_id)
+
+        # Keep messages written by other conversations while the queries ran
+        newest = fetched[-1][0] if fetched else 0
+        written = [row for row in self.rows if row[0] > newest]
+        self.rows = deque(list(fetched) + written, maxlen=BUFFER_ROWS)
+        self.questions = questions + sum(1 for row in written if row[1] == "user")
+        self.summary = summary
+        self.loaded = True
+
+
+class ConversationActors:
+    """Conversation actors per scope, with write-through message storage."""
+
+    def __init__(self, bot, queue_limit: int = QUEUE_LIMIT,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            bot: Bot instance (its database is used once it is connected)
+            queue_limit: Questions that may wait per conversation
+            clock: Monotonic clock used for idle expiry
+        """
+        self.bot = bot
+        self.queue_limit = queue_limit
+        self.clock = clock
+        self._actors: Dict[Tuple[int, Optional[int]], ConversationActor] = {}
+
+    def get(self, channel_id: int, user_id: Optional[int] = None) -> ConversationActor:
+        """
+        Get a conversation's actor, creating it if needed.
+
+        Args:
+            channel_id: Discord channel ID
+            user_id: User ID for personal conversations, None for shared
+
+        Returns:
+            The conversation's actor
+        """
+        now = self.clock()
+        idle = [key for key, actor in self._actors.items()
+                if not actor.busy and now - actor.last_used > IDLE_SECONDS]
+        for key in idle:
+            del self._actors[key]
+
+        key = (channel_id, user_id)
+        if key not in self._actors:
+            self._actors[key] = ConversationActor(channel_id, user_id, self.clock)
+        return self._actors[key]
+
+    async def acquire(self, channel_id: int, user_id: Optional[int] = None) -> ConversationActor:
+        """
+        Wait for a conversation's turn; call release() on the actor when done.
+
+        Args:
+            channel_id: Discord channel ID
+            user_id: User ID for personal conversations, None for shared
+
+        Returns:
+            The conversation's actor, loaded and locked
+
+        Raises:
+            ConversationBusy: If queue_limit questions are already waiting
+        """
+        actor = self.get(channel_id, user_id)
+        if actor.lock.locked() and actor.waiting >= self.queue_limit:
+            raise ConversationBusy(f"{actor.waiting} questions already waiting")
+
+        actor.waiting += 1
+        try:
+            await actor.lock.acquire()
+        finally:
+            actor.waiting -= 1
+        try:
+            await actor.load(self.bot.database)
+        except BaseException:
+            actor.release()
+            raise
+        return actor
+
+    async def add(self, channel_id: int, user_id: int, role: str, content: str) -> Row:
+        """
+        Store a message and add it to every loaded conversation that includes it.
+
+        Args:
+            channel_id: Discord channel ID
+            user_id: User ID stored with the message (0 for shared answers)
+            role: 'user' or 'assistant'
+            content: Message text
+
+        Returns:
+            The stored (row ID, role, content, token count)
+        """
+        token_count = count_tokens(content)
+        row_id = await self.bot.database.add_claude_message(channel_id, user_id, role, content, token_count)
+        row = (row_id, role, content, token_count)
+
+        # Shared history is every message in the channel; personal history is the user's
+        for key in ((channel_id, None), (channel_id, user_id)):
+            actor = self._actors.get(key)
+            if actor:
+                actor.append(row)
+        return row
+
+    def invalidate(self, channel_id: int, user_id: Optional[int] = None) -> None:
+        """
+        Forget buffered messages after history was deleted.
+
+        Args:
+            channel_id: Discord channel ID
+            user_id: User whose personal history was cleared, or None if the
+                     whole channel was cleared
+        """
+        for (actor_channel, actor_user), actor in self._actors.items():
+            if actor_channel != channel_id:
+                continue
+            if user_id is None or actor_user in (None, user_id):
+                actor.invalidate()
+
+    def set_summary(self, channel_id: int, user_id: Optional[int], summary: Dict) -> None:
+        """
+        Update a loaded conversation's running summary.
+
+        Args:
+            channel_id: Discord channel ID
+            user_id: User ID for personal conversations, None for shared
+            summary: Dictionary with summary, through_id and token_count
+        """
+        actor = self._actors.get((channel_id, user_id))
+        if actor and actor.loaded:
+            actor.summary = summary
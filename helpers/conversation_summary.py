@@ -0,0 +1,84 @@
+"""
+Helpers for the running summary of long Claude conversations.
+
+The /ask history is built to a token budget (see helpers/prompt_cache.py).
+Turns that fall out of the window are not dropped: they are folded into a
+short running summary, stored per conversation in `claude_summaries` and sent
+as the system prompt. The summary records the newest row it covers
+(`through_id`), so each refresh only reads the turns between that row and the
+start of the current window.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from helpers.prompt_cache import count_tokens
+
+# Most older-turn tokens read by one refresh (the newest turns are kept)
+SUMMARY_INPUT_TOKENS = 12000
+
+# Output limit for a summary
+SUMMARY_MAX_TOKENS = 600
+
+# Longest single message quoted to the summariser, in characters
+MESSAGE_CHARS = 4000
+
+
+def select_turns(rows: Sequence[Tuple[int, str, str, Optional[int]]],
+                 budget: int = SUMMARY_INPUT_TOKENS) -> List[Tuple[int, str, str, Optional[int]]]:
+    """
+    Keep the newest turns that fit the summariser's input budget.
+
+    Args:
+        rows: (row ID, role, content, token count or None), oldest first
+        budget: Token budget
+
+    Returns:
+        The newest rows whose tokens fit in the budget, oldest first
+    """
+    kept = []
+    total = 0
+    for row in reversed(rows):
+        tokens = row[3] if row[3] is not None else count_tokens(row[2])
+        if kept and total + tokens > budget:
+            break
+        kept.append(row)
+        total += tokens
+    return list(reversed(kept))
+
+
+def build_summary_prompt(previous: Optional[str],
+                         rows: Sequence[Tuple[int, str, str, Optional[int]]]) -> str:
+    """
+    Build the prompt that folds older turns into the running summary.
+
+    Args:
+        previous: Current summary text, or None for the first summary
+        rows: Turns to fold in, oldest first
+
+    Returns:
+        Prompt text
+    """
+    transcript = "\n\n".join(
+        f"{'User' if role == 'user' else 'Assistant'}: {content[:MESSAGE_CHARS]}"
+        for _, role, content, _ in rows
+    )
+    previous_block = f"Current summary:\n{previous}\n\n" if previous else ""
+    return f"""You maintain a running summary of a Discord conversation with an AI assistant.
+
+{previous_block}Earlier turns to add to the summary:
+{transcript}
+
+Write an updated summary in under 300 words. Keep names, facts, decisions, preferences and open questions that later turns may refer back to, and drop small talk. Respond with ONLY the summary text."""
+
+
+def summary_system_prompt(summary: str) -> str:
+    """
+    Wrap a stored summary for the system prompt of an /ask request.
+
+    Args:
+        summary: Summary text
+
+    Returns:
+        System prompt text
+    """
+    return f"Summary of the earlier part of this conversation (older messages are not shown):\n{summary}"
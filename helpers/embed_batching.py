@@ -0,0 +1,128 @@
+"""
+Sending many embeds in as few messages as possible.
+
+A news digest used to post every article as its own message, so a 40-article
+digest cost 40+ REST calls and ran into the channel's rate limit (about five
+messages per five seconds), which stretched delivery out to most of a minute.
+A message can carry up to MAX_EMBEDS embeds as long as their combined text
+(titles, descriptions, field names and values, footers and author names) stays
+within MAX_CHARACTERS. pack() groups embeds into such messages without
+reordering them, and EmbedSender sends the groups one after another.
+
+discord.py already waits for a bucket to reset when the X-RateLimit headers
+say it is exhausted. When a send still fails with 429 Too Many Requests,
+EmbedSender waits as long as the Retry-After header asks and sends the same
+message again, up to SEND_ATTEMPTS times.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Sequence, Tuple
+
+import discord
+
+from helpers.stream_editor import rate_limit_delay
+
+# Discord's limits for one message
+MAX_EMBEDS = 10
+MAX_CHARACTERS = 6000
+
+# Attempts per message before a rate-limited send is given up
+SEND_ATTEMPTS = 3
+
+
+def pack(embeds: Sequence[discord.Embed], max_embeds: int = MAX_EMBEDS,
+         max_characters: int = MAX_CHARACTERS) -> List[List[discord.Embed]]:
+    """
+    Group embeds into messages, keeping their order.
+
+    Args:
+        embeds: Embeds to send
+        max_embeds: Embeds per message
+        max_characters: Combined embed text per message (len(embed) counts it the way Discord does)
+
+    Returns:
+        One list of embeds per message. An embed that is over max_characters on its own gets a message to itself.
+    """
+    messages: List[List[discord.Embed]] = []
+    current: List[discord.Embed] = []
+    size = 0
+    for embed in embeds:
+        length = len(embed)
+        if current and (len(current) >= max_embeds or size + length > max_characters):
+            messages.append(current)
+            current, size = [], 0
+        current.append(embed)
+        size += length
+    if current:
+        messages.append(current)
+    return messages
+
+
+class EmbedSender:
+    """
+    Sends embeds to one channel, thread or context in as few messages as possible.
+
+    Attributes:
+        messages: Messages sent
+        retries: Sends repeated after a rate limit
+    """
+
+    def __init__(self, destination: Any, attempts: int = SEND_ATTEMPTS,
+                 sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep) -> None:
+        """
+        Initialize the sender.
+
+        Args:
+            destination: Anything with send(embeds=...) (a channel, thread or command context)
+            attempts: Tries per message when rate limited
+            sleep: Coroutine used to wait out a rate limit
+        """
+        self.destination = destination
+        self.attempts = max(attempts, 1)
+        self._sleep = sleep
+        self.messages = 0
+        self.retries = 0
+
+    async def send(self, embeds: Sequence[discord.Embed]) -> AsyncIterator[Tuple[discord.Message, int]]:
+        """
+        Send embeds in order, packed into messages.
+
+        Args:
+            embeds: Embeds to send
+
+        Yields:
+            (message, number of embeds it carries) after each message is sent, so callers can
+            record progress even if a later message fails
+
+        Raises:
+            discord.HTTPException: If a send failed for a reason other than a rate limit,
+                or was still rate limited after the last attempt
+        """
+        for batch in pack(embeds):
+            yield await self._send(batch), len(batch)
+
+    async def send_all(self, embeds: Sequence[discord.Embed]) -> List[discord.Message]:
+        """
+        Send embeds in order, packed into messages.
+
+        Args:
+            embeds: Embeds to send
+
+        Returns:
+            The messages sent
+        """
+        return [message async for message, _ in self.send(embeds)]
+
+    async def _send(self, batch: List[discord.Embed]) -> discord.Message:
+        """Send one message, waiting and retrying when rate limited."""
+        for attempt in range(self.attempts):
+            try:
+                message = await self.destination.send(embeds=batch)
+                self.messages += 1
+                return message
+            except (discord.HTTPException, discord.RateLimited) as e:
+                delay = rate_limit_delay(e)
+                if delay is None or attempt == self.attempts - 1:
+                    raise
+                self.retries += 1
+                await self._sleep(delay)
@@ -0,0 +1,169 @@
+"""
+Adaptive polling schedule for background feed ingestion.
+
+The news cog polls every configured feed in the background and stores new
+entries in the `articles` table, so building a digest is a database query
+instead of a round of downloads. Feeds publish at very different rates, so
+each one gets its own poll interval: a poll that finds new articles halves
+the interval (down to MIN_INTERVAL), and one that finds nothing stretches it
+by half (up to MAX_INTERVAL), but not past the feed's usual gap between
+updates as measured from its Last-Modified header. A poll that fails doubles
+the interval (up to MAX_BACKOFF), so a dead feed is soon polled only a few
+times a day; the first successful poll brings it back within MAX_INTERVAL.
+
+Each feed also keeps the statistics shown by /news-admin feeds: fetch
+latency (a moving average of successful polls), error count, consecutive
+failures and the last error.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Poll interval bounds and starting point (seconds)
+MIN_INTERVAL = 300.0
+MAX_INTERVAL = 3600.0
+START_INTERVAL = 900.0
+
+# Longest wait before retrying a failing feed (seconds)
+MAX_BACKOFF = 6 * 3600.0
+
+# Weight of the newest sample in the latency and update cadence averages
+AVERAGE_WEIGHT = 0.3
+
+# Consecutive failures after which a feed is reported as failing
+FAILING_AFTER = 3
+
+# Average fetch latency (seconds) above which a feed is reported as slow
+SLOW_FEED_SECONDS = 5.0
+
+# Ingested articles are kept this long (seconds); digests only use the last two days
+ARTICLE_RETENTION = 7 * 86400
+
+
+@dataclass
+class FeedPoll:
+    """Polling state of one feed."""
+
+    interval: float = START_INTERVAL
+    next_poll: float = 0.0
+    polls: int = 0
+    new_articles: int = 0
+    errors: int = 0
+    failures: int = 0  # consecutive
+    last_error: str = ""
+    latency: Optional[float] = None  # seconds, average of successful polls
+    last_modified: Optional[float] = None  # Last-Modified of the last poll with new articles (unix time)
+    update_interval: Optional[float] = None  # average seconds between those Last-Modified times
+
+    @property
+    def error_rate(self) -> float:
+        """Share of polls that failed."""
+        return self.errors / self.polls if self.polls else 0.0
+
+    @property
+    def status(self) -> str:
+        """"failing", "slow" or "ok"."""
+        if self.failures >= FAILING_AFTER:
+            return "failing"
+        if self.failures or (self.latency is not None and self.latency > SLOW_FEED_SECONDS):
+            return "slow"
+        return "ok"
+
+
+def _average(current: Optional[float], sample: float) -> float:
+    return sample if current is None else current + AVERAGE_WEIGHT * (sample - current)
+
+
+class PollSchedule:
+    """Per-feed poll intervals that follow how often each feed has new articles."""
+
+    def __init__(self, min_interval: float = MIN_INTERVAL, max_interval: float = MAX_INTERVAL,
+                 max_backoff: float = MAX_BACKOFF, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize the schedule.
+
+        Args:
+            min_interval: Shortest poll interval in seconds
+            max_interval: Longest poll interval in seconds for a working feed
+            max_backoff: Longest poll interval in seconds for a failing feed
+            clock: Monotonic clock
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_backoff = max(max_backoff, max_interval)
+        self.start_interval = min(max(START_INTERVAL, min_interval), max_interval)
+        self.clock = clock
+        self.feeds: Dict[str, FeedPoll] = {}
+
+    def seen(self, url: str) -> bool:
+        """Whether a feed has been polled since startup."""
+        poll = self.feeds.get(url)
+        return poll is not None and poll.polls > 0
+
+    def due(self, urls: Iterable[str]) -> List[str]:
+        """
+        Get the feeds that should be polled now.
+
+        Args:
+            urls: Every configured feed
+
+        Returns:
+            Feeds never polled or whose interval has passed, in the given order
+        """
+        now = self.clock()
+        return [url for url in dict.fromkeys(urls) if url not in self.feeds or self.feeds[url].next_poll <= now]
+
+    def record(self, url: str, new_articles: int, latency: Optional[float] = None,
+               error: Optional[str] = None, last_modified: Optional[float] = None) -> float:
+        """
+        Record a poll and schedule the next one.
+
+        Args:
+            url: Feed URL
+            new_articles: Articles the poll added (0 when it failed)
+            latency: Seconds the fetch took
+            error: Why the poll failed (None if it succeeded)
+            last_modified: The feed's Last-Modified time (unix time), if it sent one
+
+        Returns:
+            Seconds until the next poll
+        """
+        poll = self.feeds.setdefault(url, FeedPoll(interval=self.start_interval))
+        if error is not None:
+            poll.errors += 1
+            poll.failures += 1
+            poll.last_error = error
+            poll.interval = min(self.max_backoff, max(poll.interval, self.min_interval) * 2)
+        else:
+            poll.failures = 0
+            if latency is not None:
+                poll.latency = _average(poll.latency, latency)
+            # Only polls with new articles count as updates; some servers send "now" as Last-Modified
+            if new_articles > 0 and last_modified is not None:
+                if poll.last_modified is not None and last_modified > poll.last_modified:
+                    poll.update_interval = _average(poll.update_interval, last_modified - poll.last_modified)
+                poll.last_modified = last_modified
+
+            if new_articles > 0:
+                poll.interval = poll.interval / 2
+            else:
+                poll.interval = poll.interval * 1.5
+                if poll.update_interval is not None:
+                    poll.interval = min(poll.interval, poll.update_interval)
+            poll.interval = min(self.max_interval, max(self.min_interval, poll.interval))
+        poll.polls += 1
+        poll.new_articles += new_articles
+        poll.next_poll = self.clock() + poll.interval
+        return poll.interval
+
+    def forget(self, keep: Iterable[str]) -> None:
+        """
+        Drop feeds that are no longer configured.
+
+        Args:
+            keep: Feeds still configured
+        """
+        keep = set(keep)
+        for url in [url for url in self.feeds if url not in keep]:
+            del self.feeds[url]
@@ -0,0 +1,381 @@
+"""
+Non-blocking RSS/Atom feed fetching.
+
+`feedparser.parse(url)` downloads and parses a feed synchronously, so calling
+it from a coroutine freezes the event loop (gateway heartbeats included) for
+as long as the slowest news source takes to answer. FeedFetcher downloads
+feeds with one shared aiohttp session instead, many at once but only a few
+per host and always under a timeout, and parses the downloaded bytes in a
+small thread pool so parsing never runs on the event loop. Well-formed feeds
+go through helpers/feed_stream.py, which stops after the first PARSE_ENTRIES
+entries; anything it can't handle falls back to feedparser.
+
+Most guilds read the same default sources, so FeedCache keeps one parsed copy
+of each feed for the whole process and serves every guild from it for
+FEED_CACHE_SECONDS. Refreshes are conditional GETs (If-None-Match /
+If-Modified-Since), so a feed that hasn't changed costs a 304 with no body,
+and concurrent refreshes of one feed share a single download.
+
+Settings (all optional):
+    FEED_MAX_CONNECTIONS: Feed downloads in flight at once (default 20)
+    FEED_CONNECTIONS_PER_HOST: Downloads in flight per host (default 2)
+    FEED_TIMEOUT_SECONDS: Time allowed for one download (default 20)
+    FEED_CACHE_SECONDS: How long a fetched feed is served without checking it (default 600)
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+import aiohttp
+import feedparser
+
+from helpers import feed_stream
+from helpers.singleflight import SingleFlight, normalize_url
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_CONNECTIONS_PER_HOST = 2
+DEFAULT_TIMEOUT_SECONDS = 20.0
+
+# Threads parsing downloaded feeds
+PARSE_WORKERS = 2
+
+# Entries parsed per feed (the news cog reads at most 50)
+PARSE_ENTRIES = 50
+
+DEFAULT_CACHE_SECONDS = 600.0
+
+# Feeds kept by FeedCache (least recently used are dropped first)
+MAX_CACHED_FEEDS = 500
+
+# Feeds larger than this are refused rather than parsed
+MAX_FEED_BYTES = 5 * 1024 * 1024
+
+USER_AGENT = f"Lumbergh/1.0 (Discord news bot; feedparser {feedparser.__version__})"
+ACCEPT = "application/rss+xml, application/atom+xml, application/rdf+xml, application/xml;q=0.9, text/xml;q=0.9, */*;q=0.1"
+
+
+class FeedError(Exception):
+    """Raised when a feed can't be downloaded."""
+
+
+class FeedFetcher:
+    """
+    Shared downloader and parser for news feeds.
+
+    Attributes:
+        max_connections: Downloads in flight at once
+        connections_per_host: Downloads in flight per host
+        timeout: Seconds allowed for one download
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        connections_per_host: int = DEFAULT_CONNECTIONS_PER_HOST,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    ) -> None:
+        """
+        Initialize the fetcher. The HTTP session is opened on first use.
+
+        Args:
+            max_connections: Downloads in flight at once
+            connections_per_host: Downloads in flight per host
+            timeout: Seconds allowed for one download
+        """
+        self.max_connections = max(max_connections, 1)
+        self.connections_per_host = max(connections_per_host, 1)
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="feed-parse")
+
+    @classmethod
+    def from_env(cls) -> "FeedFetcher":
+        """Create the fetcher from FEED_* environment settings."""
+        try:
+            max_connections = int(os.getenv("FEED_MAX_CONNECTIONS", str(DEFAULT_MAX_CONNECTIONS)))
+            per_host = int(os.getenv("FEED_CONNECTIONS_PER_HOST", str(DEFAULT_CONNECTIONS_PER_HOST)))
+            timeout = float(os.getenv("FEED_TIMEOUT_SECONDS", str(DEFAULT_TIMEOUT_SECONDS)))
+        except ValueError:
+            max_connections, per_host, timeout = (
+                DEFAULT_MAX_CONNECTIONS, DEFAULT_CONNECTIONS_PER_HOST, DEFAULT_TIMEOUT_SECONDS
+            )
+        return cls(max_connections, per_host, timeout)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.connections_per_host),
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=min(self.timeout, 10.0)),
+                headers={"User-Agent": USER_AGENT, "Accept": ACCEPT},
+            )
+        return self._session
+
+    async def download(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes, Mapping[str, str]]:
+        """
+        Download a feed.
+
+        Args:
+            url: Feed URL
+            headers: Extra request headers (e.g. for a conditional GET)
+
+        Returns:
+            (HTTP status, body bytes, case-insensitive response headers); the body
+            is empty for a 304
+
+        Raises:
+            FeedError: On HTTP errors, timeouts, connection failures and oversized feeds
+        """
+        try:
+            async with self._get_session().get(url, headers=headers) as response:
+                if response.status >= 400:
+                    raise FeedError(f"{url} returned HTTP {response.status}")
+                if response.status == 304:
+                    return 304, b"", response.headers.copy()
+                if (response.content_length or 0) > MAX_FEED_BYTES:
+                    raise FeedError(f"{url} is larger than {MAX_FEED_BYTES} bytes")
+                body = await response.content.read(MAX_FEED_BYTES + 1)
+                if len(body) > MAX_FEED_BYTES:
+                    raise FeedError(f"{url} is larger than {MAX_FEED_BYTES} bytes")
+                return response.status, body, response.headers.copy()
+        except asyncio.TimeoutError:
+            raise FeedError(f"{url} timed out after {self.timeout:.0f}s") from None
+        except aiohttp.ClientError as e:
+            raise FeedError(f"{url} failed: {e}") from e
+
+    async def parse(self, body: bytes, url: str = "", headers: Optional[Mapping[str, str]] = None) -> Any:
+        """
+        Parse a downloaded feed in the worker thread pool.
+
+        Args:
+            body: Feed document
+            url: Feed URL (used to resolve relative links)
+            headers: Response headers (used to detect the encoding)
+
+        Returns:
+            feedparser-style result with the first PARSE_ENTRIES entries
+        """
+        response_headers = {key.lower(): value for key, value in (headers or {}).items()}
+        response_headers.setdefault("content-location", url)
+
+        def parse_feed():
+            try:
+                return feed_stream.parse(body, PARSE_ENTRIES, url, response_headers)
+            except feed_stream.StreamParseError:
+                return feedparser.parse(body, response_headers=response_headers)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, parse_feed)
+
+    async def fetch(self, url: str) -> Any:
+        """
+        Download and parse a feed.
+
+        Args:
+            url: Feed URL
+
+        Returns:
+            feedparser result
+
+        Raises:
+            FeedError: If the feed can't be downloaded
+        """
+        _, body, headers = await self.download(url)
+        return await self.parse(body, url, headers)
+
+    async def fetch_many(self, urls: Iterable[str]) -> Dict[str, Any]:
+        """
+        Download and parse several feeds concurrently.
+
+        Args:
+            urls: Feed URLs
+
+        Returns:
+            {url: feedparser result, or the exception raised for it}
+        """
+        unique = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(self.fetch(url) for url in unique), return_exceptions=True)
+        return dict(zip(unique, results))
+
+    async def close(self) -> None:
+        """Close the HTTP session and stop the parser threads."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._executor.shutdown(wait=False)
+
+
+@dataclass
+class CachedFeed:
+    """A parsed feed and the validators needed to refresh it."""
+
+    feed: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    size: int  # bytes of the last full download
+    checked_at: float  # monotonic time of the last successful check
+
+
+class FeedCache:
+    """
+    Process-wide cache of parsed feeds, refreshed with conditional GETs.
+
+    Attributes:
+        ttl: Seconds a feed is served before it is checked again
+        hits: Requests served from the cache without a check
+        misses: Requests that downloaded the whole feed
+        not_modified: Checks answered with 304 Not Modified
+        stale: Requests served an old copy because the refresh failed
+        bytes_downloaded: Feed bytes downloaded
+        bytes_saved: Bytes not downloaded thanks to 304s
+    """
+
+    def __init__(self, fetcher: FeedFetcher, ttl: float = DEFAULT_CACHE_SECONDS,
+                 max_feeds: int = MAX_CACHED_FEEDS, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            fetcher: Downloads and parses feeds
+            ttl: Seconds a feed is served before it is checked again
+            max_feeds: Feeds kept at most
+            clock: Monotonic clock
+        """
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self.max_feeds = max(max_feeds, 1)
+        self.clock = clock
+        self._feeds: "OrderedDict[str, CachedFeed]" = OrderedDict()
+        self._refreshes = SingleFlight("feed-refresh")
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.stale = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+
+    @classmethod
+    def from_env(cls, fetcher: FeedFetcher) -> "FeedCache":
+        """Create the cache with FEED_CACHE_SECONDS."""
+        try:
+            ttl = float(os.getenv("FEED_CACHE_SECONDS", str(DEFAULT_CACHE_SECONDS)))
+        except ValueError:
+            ttl = DEFAULT_CACHE_SECONDS
+        return cls(fetcher, ttl=max(ttl, 0.0))
+
+    async def get(self, url: str, max_age: Optional[float] = None, allow_stale: bool = True) -> Any:
+        """
+        Get a parsed feed, checking it at most once per ttl.
+
+        If a refresh fails and an older copy is cached, the old copy is served.
+
+        Args:
+            url: Feed URL
+            max_age: Check the feed if the cached copy is older than this many
+                seconds instead of ttl (0 always sends a conditional GET)
+            allow_stale: Whether to serve the old copy when the refresh fails
+                (if False the FeedError is raised)
+
+        Returns:
+            feedparser result (shared between callers, treat it as read-only)
+
+        Raises:
+            FeedError: If the feed can't be downloaded and nothing is cached
+        """
+        key = normalize_url(url)
+        cached = self._feeds.get(key)
+        max_age = self.ttl if max_age is None else max_age
+        if cached is not None and self.clock() - cached.checked_at < max_age:
+            self._feeds.move_to_end(key)
+            self.hits += 1
+            return cached.feed
+
+        try:
+            return await self._refreshes.do(key, lambda: self._refresh(key, url))
+        except FeedError:
+            cached = self._feeds.get(key)
+            if cached is None or not allow_stale:
+                raise
+            self.stale += 1
+            return cached.feed
+
+    async def _refresh(self, key: str, url: str) -> Any:
+        """Check a feed with a conditional GET and store the result."""
+        cached = self._feeds.get(key)
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        status, body, response_headers = await self.fetcher.download(url, headers=headers)
+        if status == 304 and cached is not None:
+            self.not_modified += 1
+            self.bytes_saved += cached.size
+            cached.checked_at = self.clock()
+            self._feeds.move_to_end(key)
+            return cached.feed
+
+        self.misses += 1
+        self.bytes_downloaded += len(body)
+        feed = await self.fetcher.parse(body, url, response_headers)
+        self._feeds[key] = CachedFeed(
+            feed=feed,
+            etag=response_headers.get("ETag"),
+            last_modified=response_headers.get("Last-Modified"),
+            size=len(body),
+            checked_at=self.clock(),
+        )
+        self._feeds.move_to_end(key)
+        while len(self._feeds) > self.max_feeds:
+            self._feeds.popitem(last=False)
+        return feed
+
+    def last_modified(self, url: str) -> Optional[str]:
+        """
+        Get the Last-Modified header of a cached feed.
+
+        Args:
+            url: Feed URL
+
+        Returns:
+            The header from the last full download, or None if the feed isn't cached or sent none
+        """
+        cached = self._feeds.get(normalize_url(url))
+        return cached.last_modified if cached is not None else None
+
+    async def get_many(self, urls: Iterable[str], max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get several feeds concurrently.
+
+        Args:
+            urls: Feed URLs
+            max_age: As for get()
+
+        Returns:
+            {url: feedparser result, or the exception raised for it}
+        """
+        unique = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(self.get(url, max_age) for url in unique), return_exceptions=True)
+        return dict(zip(unique, results))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report cache counters.
+
+        Returns:
+            {"feeds", "hits", "misses", "not_modified", "stale", "bytes_downloaded", "bytes_saved"}
+        """
+        return {
+            "feeds": len(self._feeds),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "stale": self.stale,
+            "bytes_downloaded": self.bytes_downloaded,
+            "bytes_saved": self.bytes_saved,
+        }
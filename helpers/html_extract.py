@@ -0,0 +1,126 @@
+"""
+Single-pass text and image extraction for feed entry HTML.
+
+Feed descriptions are small HTML fragments. The news cog used to strip their
+tags with one regex and then build a full BeautifulSoup tree of the same
+fragment just to find the first <img>. extract() walks the fragment once
+with a precompiled tag scanner and returns both the visible text and the
+first usable image URL. It skips <script>/<style> content, decodes entities
+and resolves relative image URLs against the article link. Once an image has
+been found, later <img> tags are not inspected; when only the image is
+wanted, the scan stops at the first usable one.
+"""
+
+import html
+import re
+from typing import Tuple
+from urllib.parse import urljoin
+
+# One tag (with quoted attribute values that may contain ">") or a comment. Each character
+# of a tag matches one alternative only, and unquoted "<" ends the attempt, so a fragment
+# cut off mid-tag fails in linear time instead of backtracking
+_TOKEN = re.compile(
+    r"<!--.*?(?:-->|$)|<(/?)([a-zA-Z][a-zA-Z0-9:-]*)((?:[^<>\"']|\"[^\"]*\"|'[^']*')*)>",
+    re.S,
+)
+_ATTRIBUTE = re.compile(r"([a-zA-Z_:][-a-zA-Z0-9_:.]*)\s*=\s*(\"[^\"]*\"|'[^']*'|[^\s\"'=<>`]+)")
+
+# Tags whose content is not visible text
+_HIDDEN = frozenset({"script", "style", "noscript", "template", "head", "title"})
+
+# Tags that separate words ("<p>a</p><p>b</p>" reads "a b", "<b>a</b>b" reads "ab")
+_BREAKS = frozenset({
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption", "figure",
+    "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "img", "li", "ol", "p", "pre", "section",
+    "table", "td", "th", "tr", "ul",
+})
+
+
+def _unescape(text: str) -> str:
+    return html.unescape(text) if "&" in text else text
+
+
+def _attributes(source: str) -> dict:
+    """Parse a tag's attributes (names lowercased, values unquoted and unescaped)."""
+    attributes = {}
+    for name, value in _ATTRIBUTE.findall(source):
+        if value[:1] in ("'", '"'):
+            value = value[1:-1]
+        attributes.setdefault(name.lower(), _unescape(value.strip()))
+    return attributes
+
+
+def image_url(attributes: dict, base_url: str = "") -> str:
+    """
+    Pick the usable image URL of an <img> tag.
+
+    Args:
+        attributes: The tag's attributes
+        base_url: URL relative image paths are resolved against
+
+    Returns:
+        Absolute http(s) URL from src, data-src or the first srcset entry, or ""
+        (data: URIs, unresolvable relative paths and 1x1 tracking pixels are not usable)
+    """
+    if attributes.get("width") in ("0", "1") or attributes.get("height") in ("0", "1"):
+        return ""  # tracking pixel
+    srcset = attributes.get("srcset", "").split(",")[0].split()
+    for candidate in (attributes.get("src"), attributes.get("data-src"), srcset[0] if srcset else None):
+        if not candidate or candidate.startswith("data:"):
+            continue
+        url = urljoin(base_url, candidate) if base_url else candidate
+        if url.startswith(("http://", "https://")):
+            return url
+    return ""
+
+
+def extract(fragment: str, base_url: str = "", text: bool = True, image: bool = True) -> Tuple[str, str]:
+    """
+    Get the visible text and the first usable image of an HTML fragment in one pass.
+
+    Args:
+        fragment: HTML (or plain text)
+        base_url: URL relative image paths are resolved against, e.g. the article link
+        text: Whether to collect the text (if False the scan stops at the first image)
+        image: Whether to look for an image
+
+    Returns:
+        (text with entities decoded and whitespace collapsed, image URL or "")
+    """
+    if not fragment:
+        return "", ""
+    if "<" not in fragment:
+        return (" ".join(_unescape(fragment).split()) if text else ""), ""
+
+    parts = []
+    found = ""
+    hidden = None
+    position = 0
+    for match in _TOKEN.finditer(fragment):
+        if text and hidden is None and match.start() > position:
+            parts.append(fragment[position:match.start()])
+        position = match.end()
+
+        name = match.group(2)
+        if name is None:
+            continue  # comment
+        name = name.lower()
+        closing = match.group(1) == "/"
+        if hidden is not None:
+            if closing and name == hidden:
+                hidden = None
+            continue
+        if name in _HIDDEN and not closing and not match.group(3).rstrip().endswith("/"):
+            hidden = name
+            continue
+        if name in _BREAKS:
+            parts.append(" ")
+        if name == "img" and image and not found and not closing:
+            found = image_url(_attributes(match.group(3)), base_url)
+            if found and not text:
+                break
+    else:
+        if text and hidden is None:
+            parts.append(fragment[position:])
+
+    return (" ".join(_unescape("".join(parts)).split()) if text else ""), found
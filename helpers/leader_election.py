@@ -0,0 +1,147 @@
+"""
+Lease-based leader election for scheduled jobs.
+
+Several bot processes can share one database (horizontal scaling, or the old
+and new process overlapping during a deploy). Only one of them may run the
+scheduled loops, otherwise every daily post is sent once per process.
+
+The leader holds a row in the `scheduler_lease` table with an expiry time and
+renews it on every heartbeat. Any process may take the lease once it has
+expired, so when the leader dies a follower takes over within one lease
+period plus one heartbeat. Taking or renewing the lease is a single UPSERT,
+which SQLite applies atomically even across processes.
+
+A process only considers itself leader until a local deadline that is set
+before each renewal is sent and ends a safety margin before the stored
+expiry, so a stalled leader stops scheduling before anyone else can start.
+"""
+
+import os
+import socket
+import time
+import uuid
+from typing import Optional, Tuple
+
+import aiosqlite
+
+# Default lease length and heartbeat interval, in seconds
+LEASE_SECONDS = 15
+HEARTBEAT_SECONDS = 5
+
+# Stop acting as leader this long before the stored lease runs out
+SAFETY_MARGIN_SECONDS = 2
+
+
+def default_instance_id() -> str:
+    """Identify this process as host:pid plus a random suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SchedulerLease:
+    """
+    One process's view of a named lease.
+
+    Call heartbeat() every HEARTBEAT_SECONDS; check is_leader before running
+    a scheduled job.
+    """
+
+    def __init__(
+        self,
+        connection: aiosqlite.Connection,
+        name: str = "scheduler",
+        holder: Optional[str] = None,
+        lease_seconds: int = LEASE_SECONDS,
+    ) -> None:
+        """
+        Initialize the lease.
+
+        Args:
+            connection: Database connection (shared with other processes via the file)
+            name: Lease name, one per group of jobs that must not run twice
+            holder: Unique ID of this process (default: host, PID and random suffix)
+            lease_seconds: How long a renewal keeps the lease
+        """
+        self.connection = connection
+        self.name = name
+        self.holder = holder or default_instance_id()
+        self.lease_seconds = max(lease_seconds, SAFETY_MARGIN_SECONDS + 1)
+        self._valid_until = 0.0
+
+    @classmethod
+    def from_env(cls, connection: aiosqlite.Connection) -> "SchedulerLease":
+        """Create a lease using SCHEDULER_INSTANCE_ID and SCHEDULER_LEASE_SECONDS."""
+        try:
+            lease_seconds = int(os.getenv("SCHEDULER_LEASE_SECONDS", str(LEASE_SECONDS)))
+        except ValueError:
+            lease_seconds = LEASE_SECONDS
+        return cls(
+            connection,
+            holder=os.getenv("SCHEDULER_INSTANCE_ID") or None,
+            lease_seconds=lease_seconds,
+        )
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process currently holds the lease."""
+        return time.monotonic() < self._valid_until
+
+    async def heartbeat(self, now: Optional[int] = None) -> bool:
+        """
+        Acquire the lease if it is free or expired, or renew it if we hold it.
+
+        Args:
+            now: Current Unix timestamp (default: the system clock)
+
+        Returns:
+            True if this process is the leader after the heartbeat
+        """
+        if now is None:
+            now = int(time.time())
+        # Start the local deadline before the write so a slow write can only shorten it
+        deadline = time.monotonic() + self.lease_seconds - SAFETY_MARGIN_SECONDS
+
+        try:
+            cursor = await self.connection.execute(
+                """INSERT INTO scheduler_lease (name, holder, expires_at, acquired_at)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(name) DO UPDATE SET
+                       holder = excluded.holder,
+                       expires_at = excluded.expires_at,
+                       acquired_at = CASE WHEN scheduler_lease.holder = excluded.holder
+                                          THEN scheduler_lease.acquired_at
+                                          ELSE excluded.acquired_at END
+                   WHERE scheduler_lease.holder = excluded.holder
+                      OR scheduler_lease.expires_at <= ?""",
+                (self.name, self.holder, now + self.lease_seconds, now, now),
+            )
+            acquired = cursor.rowcount == 1
+            await self.connection.commit()
+        except aiosqlite.Error:
+            # Can't confirm the lease (e.g. database locked): stop scheduling
+            self._valid_until = 0.0
+            raise
+
+        self._valid_until = deadline if acquired else 0.0
+        return acquired
+
+    async def release(self) -> None:
+        """Give up the lease so a follower can take over immediately."""
+        self._valid_until = 0.0
+        await self.connection.execute(
+            "DELETE FROM scheduler_lease WHERE name = ? AND holder = ?",
+            (self.name, self.holder),
+        )
+        await self.connection.commit()
+
+    async def current_holder(self) -> Optional[Tuple[str, int, int]]:
+        """
+        Get the stored lease.
+
+        Returns:
+            (holder, expires_at, acquired_at) or None if nobody has taken it
+        """
+        async with self.connection.execute(
+            "SELECT holder, expires_at, acquired_at FROM scheduler_lease WHERE name = ?",
+            (self.name,),
+        ) as cursor:
+            return await cursor.fetchone()
@@ -0,0 +1,319 @@
+"""
+Process-wide Anthropic client.
+
+Every Claude-powered cog used to create its own AsyncAnthropic instance, so
+the bot kept one HTTP connection pool (and one set of TLS handshakes) per cog
+and had no overall view of how many requests were in flight. LLMClient owns a
+single AsyncAnthropic with a tuned connection pool and is attached to the bot
+as `bot.llm_client`; ClaudeAICog hands it to every cog as `self.client`.
+
+Calls go through `client.messages.create(...)` and `client.messages.stream(...)`
+exactly like AsyncAnthropic, but each request first waits for its turn in the
+LLMScheduler (priority, fair queuing and rate limits, see
+helpers/llm_scheduler.py) and then for a slot under its model's concurrency
+limit, so a burst of scheduled posts can't open hundreds of simultaneous
+requests or crowd out interactive users.
+
+Every request is also recorded in a UsageMeter (helpers/llm_metering.py) with
+its tokens, latency and outcome. Cogs get a view from for_feature() so their
+requests are attributed to them; the guild comes from the request context.
+
+Settings (all optional):
+    LLM_MAX_CONNECTIONS: Connection pool size (default 20)
+    LLM_KEEPALIVE_SECONDS: How long idle connections are kept open (default 60)
+    LLM_MODEL_CONCURRENCY: Requests in flight per model, either one number for
+        every model or "model=limit" pairs, e.g. "8,claude-3-5-haiku-20241022=16"
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from anthropic import DEFAULT_CONNECTION_LIMITS, AsyncAnthropic, DefaultAsyncHttpxClient, Timeout
+
+from helpers.llm_metering import ERROR, EXPIRED, OK, QUOTA, LLMQuotaExceeded, UsageMeter
+from helpers.llm_scheduler import (
+    LLMRequestExpired, LLMScheduler, Priority, RequestContext, current_context, estimate_tokens
+)
+
+# anthropic re-exports its HTTP library's Timeout but not Limits
+Limits = type(DEFAULT_CONNECTION_LIMITS)
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_SECONDS = 60.0
+DEFAULT_MODEL_CONCURRENCY = 8
+
+# Generous read timeout for long generations; fail fast when connecting
+REQUEST_TIMEOUT = Timeout(120.0, connect=10.0)
+
+
+def parse_model_limits(value: Optional[str]) -> Tuple[int, Dict[str, int]]:
+    """
+    Parse an LLM_MODEL_CONCURRENCY setting.
+
+    Args:
+        value: Setting such as "8" or "8,claude-3-5-haiku-20241022=16"
+
+    Returns:
+        (default limit, {model: limit}); malformed entries are ignored
+    """
+    default = DEFAULT_MODEL_CONCURRENCY
+    limits: Dict[str, int] = {}
+    for part in (value or "").split(","):
+        model, _, limit = part.strip().rpartition("=")
+        try:
+            number = int(limit)
+        except ValueError:
+            continue
+        if number < 1:
+            continue
+        if model:
+            limits[model.strip()] = number
+        else:
+            default = number
+    return default, limits
+
+
+class _Messages:
+    """Concurrency-limited, metered stand-in for AsyncAnthropic.messages."""
+
+    def __init__(self, owner: "LLMClient", feature: Optional[str] = None) -> None:
+        self._owner = owner
+        self._feature = feature
+
+    def _check_quota(self, model: str) -> RequestContext:
+        """Refuse the request if its guild has used its background quota."""
+        context = current_context()
+        try:
+            self._owner.meter.check_quota(context.guild_id, context.priority == Priority.BACKGROUND)
+        except LLMQuotaExceeded:
+            self._record(context, model, None, None, 0.0, QUOTA)
+            raise
+        return context
+
+    def _record(self, context: RequestContext, model: str, usage: Any, first_byte: Optional[float],
+                latency: float, outcome: str) -> None:
+        self._owner.meter.record(
+            model, self._feature, context.guild_id, usage, first_byte, latency, outcome,
+            background=context.priority == Priority.BACKGROUND,
+        )
+
+    async def create(self, **kwargs: Any) -> Any:
+        """Create a message once the scheduler and the model's limit allow it."""
+        model = kwargs.get("model", "")
+        context = self._check_quota(model)
+        started = time.monotonic()
+        outcome, usage = ERROR, None
+        try:
+            async with self._owner.scheduler.turn(estimate_tokens(kwargs)) as ticket:
+                async with self._owner.slot(model):
+                    response = await self._owner.anthropic.messages.create(**kwargs)
+                usage = getattr(response, "usage", None)
+                ticket.settle(usage)
+                outcome = OK
+                return response
+        except LLMRequestExpired:
+            outcome = EXPIRED
+            raise
+        finally:
+            latency = time.monotonic() - started
+            self._record(context, model, usage, latency if outcome == OK else None, latency, outcome)
+
+    @asynccontextmanager
+    async def stream(self, **kwargs: Any) -> AsyncIterator[Any]:
+        """Stream a message; the model slot is held until the stream is closed."""
+        model = kwargs.get("model", "")
+        context = self._check_quota(model)
+        started = time.monotonic()
+        outcome, stream, first_byte = ERROR, None, None
+        try:
+            async with self._owner.scheduler.turn(estimate_tokens(kwargs)) as ticket:
+                async with self._owner.slot(model):
+                    async with self._owner.anthropic.messages.stream(**kwargs) as stream:
+                        first_byte = time.monotonic() - started
+                        yield stream
+                    ticket.settle(getattr(stream.current_message_snapshot, "usage", None))
+                    outcome = OK
+        except LLMRequestExpired:
+            outcome = EXPIRED
+            raise
+        finally:
+            snapshot = getattr(stream, "current_message_snapshot", None)
+            self._record(context, model, getattr(snapshot, "usage", None), first_byte,
+                         time.monotonic() - started, outcome)
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything else (count_tokens, batches, ...) goes straight through
+        return getattr(self._owner.anthropic.messages, name)
+
+
+class _FeatureClient:
+    """View of an LLMClient whose requests are metered under one feature."""
+
+    def __init__(self, owner: "LLMClient", feature: str) -> None:
+        self._owner = owner
+        self.feature = feature
+        self.messages = _Messages(owner, feature)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._owner, name)
+
+
+class LLMClient:
+    """
+    Shared Anthropic client with a connection pool and per-model limits.
+
+    Attributes:
+        anthropic: The underlying AsyncAnthropic instance
+        messages: Drop-in replacement for AsyncAnthropic.messages
+        scheduler: LLMScheduler every request waits in
+        meter: UsageMeter every request is recorded in
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        keepalive_seconds: float = DEFAULT_KEEPALIVE_SECONDS,
+        default_concurrency: int = DEFAULT_MODEL_CONCURRENCY,
+        model_concurrency: Optional[Dict[str, int]] = None,
+        scheduler: Optional[LLMScheduler] = None,
+        meter: Optional[UsageMeter] = None,
+        **client_options: Any,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            api_key: Anthropic API key
+            max_connections: Connection pool size
+            keepalive_seconds: How long idle connections stay open
+            default_concurrency: Requests in flight per model unless overridden
+            model_concurrency: Per-model overrides of default_concurrency
+            scheduler: Request scheduler (default: unlimited, priority order only)
+            meter: Usage meter (default: no quotas)
+            client_options: Extra AsyncAnthropic arguments (e.g. base_url)
+        """
+        self.anthropic = AsyncAnthropic(
+            api_key=api_key,
+            timeout=REQUEST_TIMEOUT,
+            http_client=DefaultAsyncHttpxClient(
+                limits=Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=keepalive_seconds,
+                ),
+                timeout=REQUEST_TIMEOUT,
+            ),
+            **client_options,
+        )
+        self.messages = _Messages(self)
+        self.scheduler = scheduler or LLMScheduler()
+        self.meter = meter or UsageMeter()
+        self.default_concurrency = max(default_concurrency, 1)
+        self.model_concurrency = dict(model_concurrency or {})
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._waiting: Dict[str, int] = {}
+        self._closed = False
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMClient"]:
+        """Create the client from environment settings, or None without an API key."""
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            return None
+
+        default, limits = parse_model_limits(os.getenv("LLM_MODEL_CONCURRENCY"))
+        try:
+            max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", str(DEFAULT_MAX_CONNECTIONS)))
+            keepalive = float(os.getenv("LLM_KEEPALIVE_SECONDS", str(DEFAULT_KEEPALIVE_SECONDS)))
+        except ValueError:
+            max_connections, keepalive = DEFAULT_MAX_CONNECTIONS, DEFAULT_KEEPALIVE_SECONDS
+
+        # ANTHROPIC_BASE_URL points the bot at another endpoint, e.g. tests/simulation/fake_anthropic.py
+        options: Dict[str, Any] = {}
+        if os.getenv("ANTHROPIC_BASE_URL"):
+            options["base_url"] = os.getenv("ANTHROPIC_BASE_URL")
+        if os.getenv("LLM_MAX_RETRIES", "").isdigit():
+            options["max_retries"] = int(os.getenv("LLM_MAX_RETRIES"))
+        return cls(
+            api_key,
+            max_connections=max(max_connections, 1),
+            keepalive_seconds=keepalive,
+            default_concurrency=default,
+            model_concurrency=limits,
+            scheduler=LLMScheduler.from_env(),
+            meter=UsageMeter.from_env(),
+            **options,
+        )
+
+    @property
+    def base_url(self) -> str:
+        """The API endpoint requests are sent to."""
+        return str(self.anthropic.base_url)
+
+    def for_feature(self, feature: str) -> "_FeatureClient":
+        """
+        Get a view of this client whose requests are metered under a feature.
+
+        Args:
+            feature: Feature name, e.g. the cog's name
+
+        Returns:
+            Client sharing this one's pool, limits and scheduler
+        """
+        return _FeatureClient(self, feature)
+
+    def limit_for(self, model: str) -> int:
+        """Get the concurrency limit for a model."""
+        return self.model_concurrency.get(model, self.default_concurrency)
+
+    @asynccontextmanager
+    async def slot(self, model: str) -> AsyncIterator[None]:
+        """Hold one of the model's concurrency slots."""
+        semaphore = self._semaphores.get(model)
+        if semaphore is None:
+            semaphore = self._semaphores[model] = asyncio.Semaphore(self.limit_for(model))
+
+        self._waiting[model] = self._waiting.get(model, 0) + 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting[model] -= 1
+
+        self._in_flight[model] = self._in_flight.get(model, 0) + 1
+        try:
+            yield
+        finally:
+            self._in_flight[model] -= 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Report requests per model.
+
+        Returns:
+            {model: {"in_flight", "waiting", "limit"}} for every model used so far
+        """
+        return {
+            model: {
+                "in_flight": self._in_flight.get(model, 0),
+                "waiting": self._waiting.get(model, 0),
+                "limit": self.limit_for(model),
+            }
+            for model in self._semaphores
+        }
+
+    @property
+    def is_closed(self) -> bool:
+        """Whether close() has been called."""
+        return self._closed
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if not self._closed:
+            self._closed = True
+            await self.anthropic.close()
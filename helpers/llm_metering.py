@@ -0,0 +1,274 @@
+"""
+Usage metering for Claude requests.
+
+LLMClient records every request in a UsageMeter: model, feature (the cog
+that made it), guild, input/output/cached tokens, time to first byte, total
+latency and outcome. Records are kept in a fixed-size ring buffer, which
+answers latency percentiles for the owner `llm-usage` command, and are
+rolled up every few minutes into the `llm_usage` table (one row per 5-minute
+period, feature, guild and model) for token spend over longer windows.
+
+Optional per-guild quotas stop runaway background jobs: once a guild's
+background requests have used LLM_GUILD_DAILY_TOKENS tokens in the current
+UTC day, further background requests for it raise LLMQuotaExceeded before
+anything is sent. Commands and conversations are never limited. The daily
+counters are in memory, so a restart starts the day's count again.
+
+Settings (all optional):
+    LLM_USAGE_BUFFER: Requests kept for percentiles (default 20000)
+    LLM_GUILD_DAILY_TOKENS: Background tokens per guild per UTC day (default 0, no limit)
+"""
+
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Requests kept in the ring buffer
+DEFAULT_BUFFER = 20000
+
+# Length of one rollup period in the llm_usage table
+ROLLUP_SECONDS = 300
+
+OK = "ok"
+ERROR = "error"
+EXPIRED = "expired"
+QUOTA = "quota"
+
+
+class LLMQuotaExceeded(Exception):
+    """Raised when a guild has used its daily background token quota."""
+
+
+class UsageRecord(NamedTuple):
+    """One Claude request."""
+
+    timestamp: float
+    model: str
+    feature: str
+    guild_id: int  # 0 when not made for a guild
+    input_tokens: int
+    output_tokens: int
+    cache_read_tokens: int
+    cache_write_tokens: int
+    first_byte: Optional[float]  # seconds until the response started, None if it never did
+    latency: float
+    outcome: str
+
+    @property
+    def tokens(self) -> int:
+        """All tokens of the request (cached prompt tokens included)."""
+        return self.input_tokens + self.output_tokens + self.cache_read_tokens + self.cache_write_tokens
+
+
+def percentile(values: List[float], share: float) -> float:
+    """
+    Get a percentile of a list of numbers.
+
+    Args:
+        values: Numbers (any order)
+        share: Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        The value at that rank, or 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def usage_tokens(usage: Any) -> Tuple[int, int, int, int]:
+    """
+    Read the token counts of a response's usage object.
+
+    Args:
+        usage: Response usage (missing fields count as 0)
+
+    Returns:
+        (input, output, cache read, cache write) tokens
+    """
+    return (
+        getattr(usage, "input_tokens", 0) or 0,
+        getattr(usage, "output_tokens", 0) or 0,
+        getattr(usage, "cache_read_input_tokens", 0) or 0,
+        getattr(usage, "cache_creation_input_tokens", 0) or 0,
+    )
+
+
+def rollup(records: Iterable[UsageRecord]) -> List[Tuple]:
+    """
+    Aggregate records into llm_usage rows.
+
+    Args:
+        records: Requests to aggregate
+
+    Returns:
+        (period_start, feature, guild_id, model, requests, errors, input_tokens,
+        output_tokens, cache_read_tokens, cache_write_tokens, latency_ms_total,
+        latency_ms_max) tuples
+    """
+    totals: Dict[Tuple, List[int]] = {}
+    for record in records:
+        period = int(record.timestamp) // ROLLUP_SECONDS * ROLLUP_SECONDS
+        row = totals.setdefault((period, record.feature, record.guild_id, record.model), [0] * 8)
+        latency_ms = int(record.latency * 1000)
+        row[0] += 1
+        row[1] += record.outcome != OK
+        row[2] += record.input_tokens
+        row[3] += record.output_tokens
+        row[4] += record.cache_read_tokens
+        row[5] += record.cache_write_tokens
+        row[6] += latency_ms
+        row[7] = max(row[7], latency_ms)
+    return [key + tuple(values) for key, values in totals.items()]
+
+
+class UsageMeter:
+    """Ring buffer of recent requests, rollups and per-guild quotas."""
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER, guild_daily_tokens: int = 0,
+                 clock: Callable[[], float] = time.time) -> None:
+        """
+        Initialize the meter.
+
+        Args:
+            capacity: Requests kept in the ring buffer
+            guild_daily_tokens: Background tokens per guild per UTC day (0 = no limit)
+            clock: Wall clock (Unix time)
+        """
+        self.records: deque = deque(maxlen=max(capacity, 1))
+        self.guild_daily_tokens = guild_daily_tokens
+        self.clock = clock
+        self._unflushed: List[UsageRecord] = []
+        self._day = -1
+        self._guild_tokens: Dict[int, int] = {}
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "UsageMeter":
+        """Create the meter from LLM_USAGE_BUFFER and LLM_GUILD_DAILY_TOKENS."""
+        try:
+            capacity = int(os.getenv("LLM_USAGE_BUFFER", str(DEFAULT_BUFFER)))
+            quota = int(os.getenv("LLM_GUILD_DAILY_TOKENS", "0"))
+        except ValueError:
+            capacity, quota = DEFAULT_BUFFER, 0
+        return cls(capacity=capacity, guild_daily_tokens=max(quota, 0))
+
+    def _today(self) -> None:
+        """Start new daily guild counters at UTC midnight."""
+        day = int(self.clock()) // 86400
+        if day != self._day:
+            self._day = day
+            self._guild_tokens = {}
+
+    def guild_tokens_today(self, guild_id: int) -> int:
+        """Get the background tokens a guild has used in the current UTC day."""
+        self._today()
+        return self._guild_tokens.get(guild_id, 0)
+
+    def check_quota(self, guild_id: Optional[int], background: bool) -> None:
+        """
+        Refuse a background request for a guild that has used its daily quota.
+
+        Args:
+            guild_id: Guild the request is for, or None
+            background: Whether the request is background work
+
+        Raises:
+            LLMQuotaExceeded: If the guild's quota is used up
+        """
+        if not self.guild_daily_tokens or not background or guild_id is None:
+            return
+        used = self.guild_tokens_today(guild_id)
+        if used >= self.guild_daily_tokens:
+            self.rejected += 1
+            raise LLMQuotaExceeded(
+                f"Guild {guild_id} used {used} of {self.guild_daily_tokens} background tokens today"
+            )
+
+    def record(self, model: str, feature: Optional[str], guild_id: Optional[int], usage: Any,
+               first_byte: Optional[float], latency: float, outcome: str, background: bool = False) -> UsageRecord:
+        """
+        Record a finished request.
+
+        Args:
+            model: Model name
+            feature: Feature (cog) that made the request, None if unknown
+            guild_id: Guild the request was for, or None
+            usage: Response usage object, or None if there was no response
+            first_byte: Seconds until the response started, None if it never did
+            latency: Total seconds
+            outcome: OK, ERROR, EXPIRED or QUOTA
+            background: Whether the request counts towards the guild's quota
+
+        Returns:
+            The stored record
+        """
+        record = UsageRecord(
+            self.clock(), model or "", feature or "other", guild_id or 0,
+            *usage_tokens(usage), first_byte, latency, outcome,
+        )
+        self.records.append(record)
+        self._unflushed.append(record)
+        if background and guild_id is not None:
+            self._today()
+            self._guild_tokens[guild_id] = self._guild_tokens.get(guild_id, 0) + record.tokens
+        return record
+
+    def pending_rollup(self) -> Tuple[int, List[Tuple]]:
+        """
+        Aggregate the requests recorded since the last flush.
+
+        Returns:
+            (number of requests covered, llm_usage rows); pass the number to
+            flushed() once the rows are stored
+        """
+        return len(self._unflushed), rollup(self._unflushed)
+
+    def flushed(self, count: int) -> None:
+        """
+        Forget requests whose rollup has been stored.
+
+        Args:
+            count: Number returned by pending_rollup
+        """
+        del self._unflushed[:count]
+
+    def summary(self, seconds: float) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarise the buffered requests of the last `seconds` per feature.
+
+        Args:
+            seconds: Window length
+
+        Returns:
+            {feature: {"requests", "errors", "p50", "p95", "first_byte_p95",
+            "input_tokens", "output_tokens", "cached_tokens"}}; latencies in seconds
+        """
+        since = self.clock() - seconds
+        grouped: Dict[str, List[UsageRecord]] = {}
+        for record in self.records:
+            if record.timestamp >= since:
+                grouped.setdefault(record.feature, []).append(record)
+
+        result = {}
+        for feature, records in sorted(grouped.items()):
+            latencies = [record.latency for record in records if record.outcome == OK]
+            first_bytes = [record.first_byte for record in records if record.first_byte is not None]
+            result[feature] = {
+                "requests": len(records),
+                "errors": sum(1 for record in records if record.outcome != OK),
+                "p50": percentile(latencies, 0.5),
+                "p95": percentile(latencies, 0.95),
+                "first_byte_p95": percentile(first_bytes, 0.95),
+                "input_tokens": sum(record.input_tokens for record in records),
+                "output_tokens": sum(record.output_tokens for record in records),
+                "cached_tokens": sum(record.cache_read_tokens for record in records),
+            }
+        return result
+
+    @property
+    def oldest(self) -> Optional[float]:
+        """Timestamp of the oldest buffered request."""
+        return self.records[0].timestamp if self.records else None
@@ -0,0 +1,413 @@
+"""
+Priority scheduling and rate limiting for Claude API requests.
+
+Interactive /ask streams, user-triggered generation and background jobs
+(news summaries, art stories, trivia, QOTD) all share one API rate limit. The
+LLMScheduler queues every request made through the shared LLMClient and
+releases them:
+
+- by priority: INTERACTIVE before USER before BACKGROUND;
+- fairly: within a priority, guilds take turns (round robin), so one busy
+  server can't hold up everyone else;
+- within budget: token buckets cap requests per minute and (estimated)
+  tokens per minute, so a scheduled burst waits in the queue instead of
+  hitting the API's rate limit.
+
+The priority, guild and deadline of a request come from a context variable
+set with request_context() (or set_request_context() in command hooks), so
+code deep inside a cog does not need extra arguments. Requests made outside
+any context are BACKGROUND. A request whose deadline passes while queued
+(e.g. the Discord interaction token expired) raises LLMRequestExpired.
+
+Settings (all optional, 0 = unlimited):
+    LLM_REQUESTS_PER_MINUTE: Requests released per minute
+    LLM_TOKENS_PER_MINUTE: Estimated input + output tokens released per minute
+"""
+
+import asyncio
+import contextvars
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Optional
+
+# Interaction tokens can be used for follow-ups for 15 minutes
+INTERACTION_LIFETIME = timedelta(minutes=15)
+
+# Rough characters per token for request size estimates
+CHARS_PER_TOKEN = 4
+
+# Waits kept per priority for percentiles
+WAIT_SAMPLES = 500
+
+
+class Priority(IntEnum):
+    """Request classes, most urgent first."""
+
+    INTERACTIVE = 0  # someone is watching a response stream in
+    USER = 1  # generation started by a command
+    BACKGROUND = 2  # scheduled posts and other unattended work
+
+
+class LLMRequestExpired(Exception):
+    """A queued request's deadline passed before it could be sent."""
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """Scheduling details for the requests made in the current task."""
+
+    priority: Priority = Priority.BACKGROUND
+    guild_id: Optional[int] = None
+    deadline: Optional[float] = None  # Unix timestamp
+
+
+_current: contextvars.ContextVar[RequestContext] = contextvars.ContextVar(
+    "llm_request_context", default=RequestContext()
+)
+
+
+def current_context() -> RequestContext:
+    """Get the scheduling context of the current task."""
+    return _current.get()
+
+
+def set_request_context(
+    priority: Priority, guild_id: Optional[int] = None, deadline: Optional[float] = None
+) -> contextvars.Token:
+    """
+    Set the scheduling context for the rest of the current task.
+
+    Args:
+        priority: Request class
+        guild_id: Guild the request is made for (used for fair queuing)
+        deadline: Unix timestamp after which queued requests are dropped
+
+    Returns:
+        Token that can be passed to ContextVar.reset
+    """
+    return _current.set(RequestContext(priority, guild_id, deadline))
+
+
+@contextmanager
+def request_context(
+    priority: Priority, guild_id: Optional[int] = None, deadline: Optional[float] = None
+) -> Iterator[RequestContext]:
+    """Set the scheduling context for requests made inside the block."""
+    token = set_request_context(priority, guild_id, deadline)
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def interaction_deadline(interaction: Any) -> Optional[float]:
+    """
+    Get when an interaction's token expires.
+
+    Args:
+        interaction: discord.Interaction (or None for prefix commands)
+
+    Returns:
+        Unix timestamp, or None if there is no interaction
+    """
+    created_at: Optional[datetime] = getattr(interaction, "created_at", None)
+    if interaction is None or created_at is None:
+        return None
+    return (created_at + INTERACTION_LIFETIME).timestamp()
+
+
+def estimate_tokens(request: Dict[str, Any]) -> int:
+    """
+    Estimate the tokens a Messages API request will use.
+
+    Args:
+        request: messages.create keyword arguments
+
+    Returns:
+        Approximate input tokens plus max_tokens
+    """
+    chars = len(_text_of(request.get("system")))
+    for message in request.get("messages") or []:
+        chars += len(_text_of(message.get("content")))
+    return chars // CHARS_PER_TOKEN + int(request.get("max_tokens") or 0)
+
+
+def _text_of(content: Any) -> str:
+    """Flatten a string or list of content blocks to its text."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            block.get("text", "") if isinstance(block, dict) else str(block) for block in content
+        )
+    return ""
+
+
+class TokenBucket:
+    """Refills continuously at a per-minute rate; holds at most one minute's worth."""
+
+    def __init__(self, per_minute: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until `amount` is available (0.0 if it is now)."""
+        self._refill()
+        needed = min(amount, self.capacity) - self.tokens
+        return max(needed / self.rate, 0.0) if needed > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        """Remove `amount`, capped at the bucket size."""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) a correction; may go into debt."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+@dataclass(eq=False)
+class _Waiter:
+    """One queued request."""
+
+    context: RequestContext
+    tokens: int
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class Ticket:
+    """Handed to a released request so its actual usage can be settled."""
+
+    def __init__(self, scheduler: "LLMScheduler", estimated_tokens: int) -> None:
+        self._scheduler = scheduler
+        self.estimated_tokens = estimated_tokens
+
+    def settle(self, usage: Any) -> None:
+        """
+        Correct the token bucket with a response's actual usage.
+
+        Args:
+            usage: Response usage object with input_tokens / output_tokens
+        """
+        bucket = self._scheduler.token_bucket
+        if bucket is None or usage is None:
+            return
+        try:
+            actual = int(usage.input_tokens) + int(usage.output_tokens)
+        except (AttributeError, TypeError, ValueError):
+            return
+        bucket.adjust(actual - self.estimated_tokens)
+
+
+class _PriorityStats:
+    """Queue and wait-time counters for one priority."""
+
+    def __init__(self) -> None:
+        self.queued = 0
+        self.released = 0
+        self.expired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+
+    def record(self, wait: float) -> None:
+        self.released += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.recent.append(wait)
+
+    def as_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.recent)
+        return {
+            "queued": self.queued,
+            "released": self.released,
+            "expired": self.expired,
+            "avg_wait": self.total_wait / self.released if self.released else 0.0,
+            "p95_wait": ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] if ordered else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class LLMScheduler:
+    """
+    Queue of Claude requests released by priority, guild and rate budget.
+
+    Usage:
+        async with scheduler.turn(tokens=estimate_tokens(kwargs)) as ticket:
+            response = await client.messages.create(**kwargs)
+            ticket.settle(response.usage)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            requests_per_minute: Request budget (0 = unlimited)
+            tokens_per_minute: Token budget (0 = unlimited)
+            clock: Monotonic clock used for the buckets and wait times
+        """
+        self.request_bucket = TokenBucket(requests_per_minute, clock) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute, clock) if tokens_per_minute > 0 else None
+        self._clock = clock
+        self._queues: Dict[Priority, "OrderedDict[Optional[int], Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self._stats = {priority: _PriorityStats() for priority in Priority}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @classmethod
+    def from_env(cls) -> "LLMScheduler":
+        """Create a scheduler from LLM_REQUESTS_PER_MINUTE and LLM_TOKENS_PER_MINUTE."""
+        return cls(
+            requests_per_minute=_int_env("LLM_REQUESTS_PER_MINUTE"),
+            tokens_per_minute=_int_env("LLM_TOKENS_PER_MINUTE"),
+        )
+
+    @asynccontextmanager
+    async def turn(self, tokens: int = 0) -> AsyncIterator[Ticket]:
+        """
+        Wait until the current context's request may be sent.
+
+        Args:
+            tokens: Estimated tokens the request will use
+
+        Yields:
+            Ticket for settling the actual usage
+
+        Raises:
+            LLMRequestExpired: If the context's deadline passes while queued
+        """
+        context = current_context()
+        stats = self._stats[context.priority]
+        remaining = None
+        if context.deadline is not None:
+            remaining = context.deadline - time.time()
+            if remaining <= 0:
+                stats.expired += 1
+                raise LLMRequestExpired("Request deadline passed before it was queued")
+
+        waiter = _Waiter(context, tokens, asyncio.get_running_loop().create_future(), self._clock())
+        self._enqueue(waiter)
+        self._pump()
+        try:
+            await asyncio.wait_for(waiter.future, timeout=remaining)
+        except asyncio.TimeoutError:
+            self._remove(waiter)
+            stats.expired += 1
+            raise LLMRequestExpired("Request deadline passed while queued") from None
+        except asyncio.CancelledError:
+            self._remove(waiter)
+            raise
+
+        yield Ticket(self, tokens)
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        guilds = self._queues[waiter.context.priority]
+        guilds.setdefault(waiter.context.guild_id, deque()).append(waiter)
+        self._stats[waiter.context.priority].queued += 1
+
+    def _remove(self, waiter: _Waiter) -> None:
+        """Drop a waiter that gave up (no-op if it was already released)."""
+        guilds = self._queues[waiter.context.priority]
+        queue = guilds.get(waiter.context.guild_id)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        if not queue:
+            del guilds[waiter.context.guild_id]
+        self._stats[waiter.context.priority].queued -= 1
+        # The head may have changed
+        self._pump()
+
+    def _peek(self) -> Optional[_Waiter]:
+        """Next waiter: most urgent priority, then the guild whose turn it is."""
+        for priority in Priority:
+            guilds = self._queues[priority]
+            if guilds:
+                return next(iter(guilds.values()))[0]
+        return None
+
+    def _delay(self, tokens: int) -> float:
+        delay = self.request_bucket.delay(1) if self.request_bucket else 0.0
+        if self.token_bucket and tokens:
+            delay = max(delay, self.token_bucket.delay(tokens))
+        return delay
+
+    def _pump(self) -> None:
+        """Release every waiter the budgets allow, then wait for the next refill."""
+        while True:
+            waiter = self._peek()
+            if waiter is None:
+                return
+
+            # Timed out or cancelled, and its task hasn't run _remove yet
+            abandoned = waiter.future.done()
+            delay = 0.0 if abandoned else self._delay(waiter.tokens)
+            if delay > 0:
+                if self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+                return
+
+            guilds = self._queues[waiter.context.priority]
+            queue = guilds[waiter.context.guild_id]
+            queue.popleft()
+            if queue:
+                guilds.move_to_end(waiter.context.guild_id)
+            else:
+                del guilds[waiter.context.guild_id]
+
+            stats = self._stats[waiter.context.priority]
+            stats.queued -= 1
+            if abandoned:
+                continue
+
+            if self.request_bucket:
+                self.request_bucket.take(1)
+            if self.token_bucket and waiter.tokens:
+                self.token_bucket.take(waiter.tokens)
+
+            stats.record(self._clock() - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._pump()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report queue depth and wait times.
+
+        Returns:
+            {priority name: {"queued", "released", "expired", "avg_wait",
+            "p95_wait", "max_wait"}}, waits in seconds
+        """
+        return {priority.name.lower(): self._stats[priority].as_dict() for priority in Priority}
+
+
+def _int_env(name: str) -> int:
+    """Read a non-negative integer setting, treating missing or bad values as 0."""
+    try:
+        return max(int(os.getenv(name, "0")), 0)
+    except ValueError:
+        return 0
@@ -0,0 +1,229 @@
+"""
+Load shaping for scheduled daily posts.
+
+Most guilds pick round post times such as 09:00 or 12:00, so every daily
+feature would otherwise call the Anthropic API, the RSS sources and the
+Discord REST API in the same minute. The SlotPlanner spreads that work over
+each schedule's posting window:
+
+- Jitter: every guild gets a fixed delay derived from its ID (blake2b hash),
+  bounded by SCHEDULE_JITTER_MINUTES and by the feature's window.
+- Capacity: with SCHEDULE_SLOT_CAPACITY set, each UTC minute accepts at most
+  that many starts across all features; the rest move to the next free
+  minute. A post is never pushed past the end of its window, so when a window
+  is full the least loaded minute in it is used and counted as overflow.
+
+Assignments are made the first time a schedule's window is seen open and are
+kept until the window has passed, so a post keeps the same start minute on
+every loop tick.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# The daily loops tick once a minute; a start must leave at least one tick
+# before the window closes.
+TICK_SECONDS = 60
+
+# How long slot metrics are kept
+SLOT_RETENTION_SECONDS = 24 * 60 * 60
+
+
+def guild_jitter(guild_id: int, max_seconds: int, feature: str = "") -> int:
+    """
+    Get a deterministic per-guild delay.
+
+    Args:
+        guild_id: Discord guild ID (or any stable integer key)
+        max_seconds: Largest delay to return
+        feature: Optional salt so features don't all pick the same delay
+
+    Returns:
+        Delay in whole seconds between 0 and max_seconds (inclusive)
+    """
+    if max_seconds <= 0:
+        return 0
+    digest = hashlib.blake2b(f"{feature}:{guild_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % (max_seconds + 1)
+
+
+@dataclass
+class SlotStats:
+    """Planned starts for one UTC minute."""
+
+    minute: int
+    planned: int = 0
+    overflow: int = 0
+
+    def fill(self, capacity: int) -> float:
+        """Fraction of capacity used (0.0 when capacity is unlimited)."""
+        return self.planned / capacity if capacity > 0 else 0.0
+
+
+class SlotPlanner:
+    """
+    Assign start instants to scheduled posts inside their posting windows.
+
+    With no jitter and no capacity configured every post starts as soon as its
+    window is seen open, which is the behaviour of an unshaped schedule; slot
+    metrics are still recorded.
+    """
+
+    def __init__(self, capacity_per_minute: int = 0, max_jitter_minutes: int = 0) -> None:
+        """
+        Initialize the planner.
+
+        Args:
+            capacity_per_minute: Target starts per UTC minute (0 = unlimited)
+            max_jitter_minutes: Largest per-guild delay (0 = no jitter)
+        """
+        self.capacity = max(capacity_per_minute, 0)
+        self.max_jitter_seconds = max(max_jitter_minutes, 0) * 60
+        self._assignments: Dict[Tuple[str, int, int], Tuple[int, int]] = {}
+        self._slots: Dict[int, SlotStats] = {}
+        self._last_prune = 0
+
+    @classmethod
+    def from_env(cls) -> "SlotPlanner":
+        """Create a planner from SCHEDULE_SLOT_CAPACITY and SCHEDULE_JITTER_MINUTES."""
+        return cls(
+            capacity_per_minute=_int_env("SCHEDULE_SLOT_CAPACITY"),
+            max_jitter_minutes=_int_env("SCHEDULE_JITTER_MINUTES"),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the planner changes start times at all."""
+        return self.capacity > 0 or self.max_jitter_seconds > 0
+
+    def plan(self, entries: Iterable[Tuple[str, int, int, int]], now: int) -> List[int]:
+        """
+        Get the start instant for each open schedule, assigning new ones.
+
+        New entries are placed in order of their jitter, so with a capacity
+        set the guilds with the smallest delay get the earliest minutes.
+
+        Args:
+            entries: (feature, guild ID, fire instant, window seconds) tuples
+                     for schedules whose window is currently open
+            now: Current Unix timestamp
+
+        Returns:
+            Start instant (Unix timestamp) for each entry, in input order
+        """
+        self._prune(now)
+        starts: List[Optional[int]] = []
+        pending = []
+        for index, (feature, guild_id, fire, window_seconds) in enumerate(entries):
+            assignment = self._assignments.get((feature, guild_id, fire))
+            if assignment:
+                starts.append(assignment[0])
+                continue
+
+            latest = fire + max(window_seconds - TICK_SECONDS, 0)
+            jitter = guild_jitter(guild_id, min(self.max_jitter_seconds, latest - fire), feature)
+            pending.append((fire + jitter, feature, guild_id, index, fire, window_seconds, latest))
+            starts.append(None)
+
+        for earliest, feature, guild_id, index, fire, window_seconds, latest in sorted(pending):
+            start = self._reserve(max(earliest, min(now, latest)), latest)
+            self._assignments[(feature, guild_id, fire)] = (start, fire + window_seconds)
+            starts[index] = start
+
+        return starts
+
+    def _reserve(self, earliest: int, latest: int) -> int:
+        """Book the first minute in [earliest, latest] with spare capacity."""
+        first_minute, last_minute = earliest // 60, latest // 60
+        chosen = None
+        if self.capacity > 0:
+            for minute in range(first_minute, last_minute + 1):
+                if self._slot(minute).planned < self.capacity:
+                    chosen = minute
+                    break
+            if chosen is None:
+                # Window is full: keep the post inside it, on the least loaded minute
+                chosen = min(
+                    range(first_minute, last_minute + 1),
+                    key=lambda minute: self._slot(minute).planned
+                )
+                self._slot(chosen).overflow += 1
+        else:
+            chosen = first_minute
+
+        self._slot(chosen).planned += 1
+        return min(max(chosen * 60, earliest), latest)
+
+    def _slot(self, minute: int) -> SlotStats:
+        """Get (or create) the stats for a UTC minute."""
+        stats = self._slots.get(minute)
+        if stats is None:
+            stats = self._slots[minute] = SlotStats(minute)
+        return stats
+
+    def _prune(self, now: int) -> None:
+        """Drop expired assignments and old slot metrics, at most once a minute."""
+        if now - self._last_prune < 60:
+            return
+        self._last_prune = now
+        self._assignments = {
+            key: value for key, value in self._assignments.items() if value[1] >= now
+        }
+        cutoff = (now - SLOT_RETENTION_SECONDS) // 60
+        self._slots = {minute: stats for minute, stats in self._slots.items() if minute >= cutoff}
+
+    def slot_metrics(self, since: Optional[int] = None, until: Optional[int] = None) -> List[dict]:
+        """
+        Report how full each planned minute is.
+
+        Args:
+            since: Only include minutes starting at or after this timestamp
+            until: Only include minutes starting before this timestamp
+
+        Returns:
+            List of dicts (minute start, planned, overflow, capacity, fill) sorted by minute
+        """
+        metrics = []
+        for minute in sorted(self._slots):
+            start = minute * 60
+            if (since is not None and start < since) or (until is not None and start >= until):
+                continue
+            stats = self._slots[minute]
+            metrics.append({
+                "minute": start,
+                "planned": stats.planned,
+                "overflow": stats.overflow,
+                "capacity": self.capacity,
+                "fill": stats.fill(self.capacity),
+            })
+        return metrics
+
+    def summary(self, since: Optional[int] = None) -> dict:
+        """
+        Summarise slot usage.
+
+        Args:
+            since: Only include minutes starting at or after this timestamp
+
+        Returns:
+            Dict with busy minutes, total starts, peak starts per minute,
+            overflow count and peak fill
+        """
+        metrics = self.slot_metrics(since=since)
+        return {
+            "minutes": len(metrics),
+            "planned": sum(entry["planned"] for entry in metrics),
+            "peak": max((entry["planned"] for entry in metrics), default=0),
+            "overflow": sum(entry["overflow"] for entry in metrics),
+            "peak_fill": max((entry["fill"] for entry in metrics), default=0.0),
+        }
+
+
+def _int_env(name: str) -> int:
+    """Read a non-negative integer setting, treating missing or bad values as 0."""
+    try:
+        return max(int(os.getenv(name, "0")), 0)
+    except ValueError:
+        return 0
@@ -0,0 +1,158 @@
+"""
+Near-duplicate detection for news headlines.
+
+BBC, Reuters, AP, CNN and the rest often run the same story under slightly
+different headlines, so a digest can spend several of its slots (and their
+summarisation tokens) on one event. cluster() groups headlines that describe
+the same story so only one of them needs to be posted.
+
+Each headline is reduced to a set of shingles: its words, lowercased, with
+stop words dropped and a light suffix stemming ("kills"/"killed" -> "kill").
+Headlines are short and outlets reorder them freely ("Earthquake kills 100
+in Turkey" / "Turkey earthquake: 100 killed"), so single-word shingles match
+far better than multi-word ones. A MinHash signature of the set goes into an
+LSH index (BANDS bands of ROWS values), which makes only headlines sharing a
+band candidates for comparison; candidates are confirmed by the exact Jaccard
+similarity of their shingle sets. Clustering takes tens of microseconds per
+headline, cheap enough to run on every digest before any LLM call.
+"""
+
+import random
+import re
+import zlib
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+import numpy as np
+
+# Jaccard similarity at which two headlines count as the same story
+THRESHOLD = 0.5
+
+# LSH banding: headlines with a Jaccard similarity of 0.5 share a band ~99% of the time
+BANDS = 16
+ROWS = 2
+
+# Multiply-shift hash functions ((a * x + b) mod 2**64) >> 32, one per signature value,
+# from a fixed seed so signatures are the same in every process
+_rng = random.Random(0x5EED)
+_MULTIPLIERS = np.array([_rng.getrandbits(64) | 1 for _ in range(BANDS * ROWS)], dtype=np.uint64)
+_OFFSETS = np.array([_rng.getrandbits(64) for _ in range(BANDS * ROWS)], dtype=np.uint64)
+_SHIFT = np.uint64(32)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SUFFIXES = ("ing", "ed", "es", "s")
+STOP_WORDS = frozenset({
+    "a", "about", "after", "against", "all", "an", "and", "are", "as", "at", "be", "been", "before", "but",
+    "by", "can", "could", "did", "do", "does", "for", "from", "had", "has", "have", "he", "her", "his", "how",
+    "in", "into", "is", "it", "its", "new", "not", "of", "on", "or", "over", "says", "say", "said", "she", "so",
+    "than", "that", "the", "their", "them", "they", "this", "to", "up", "was", "we", "were", "what", "when",
+    "where", "which", "who", "why", "will", "with", "would", "you",
+})
+
+
+def _stem(word: str) -> str:
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def shingles(title: str) -> FrozenSet[str]:
+    """
+    Get the shingles of a headline.
+
+    Args:
+        title: Headline text
+
+    Returns:
+        Stemmed words of the headline, without stop words and single letters
+    """
+    return frozenset(
+        _stem(word) for word in _WORD.findall(title.lower()) if len(word) > 1 and word not in STOP_WORDS
+    )
+
+
+def signature(shingle_set: FrozenSet[str]) -> Tuple[int, ...]:
+    """
+    Get the MinHash signature of a shingle set.
+
+    Args:
+        shingle_set: Shingles from shingles()
+
+    Returns:
+        BANDS * ROWS minimum hash values (all zero for an empty set)
+    """
+    if not shingle_set:
+        return (0,) * (BANDS * ROWS)
+    hashes = np.fromiter((zlib.crc32(shingle.encode()) for shingle in shingle_set), np.uint64, len(shingle_set))
+    # uint64 arithmetic wraps, which is the mod 2**64 of the hash family
+    return tuple(((hashes[:, None] * _MULTIPLIERS + _OFFSETS) >> _SHIFT).min(axis=0).tolist())
+
+
+def jaccard(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    """Jaccard similarity of two shingle sets (0.0 when either is empty)."""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+class LSHIndex:
+    """Banded MinHash index returning the items that could be similar to a new one."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+
+    def add(self, item: int, minhash: Tuple[int, ...]) -> List[int]:
+        """
+        Add an item.
+
+        Args:
+            item: Item number
+            minhash: Its signature from signature()
+
+        Returns:
+            Items added earlier that share at least one band with it
+        """
+        candidates = {}
+        for band in range(BANDS):
+            bucket = self.buckets.setdefault((band, minhash[band * ROWS:(band + 1) * ROWS]), [])
+            candidates.update(dict.fromkeys(bucket))
+            bucket.append(item)
+        return list(candidates)
+
+
+def cluster(titles: Sequence[str], threshold: float = THRESHOLD) -> List[List[int]]:
+    """
+    Group headlines that describe the same story.
+
+    Args:
+        titles: Headlines
+        threshold: Jaccard similarity of the shingle sets at which two headlines match
+
+    Returns:
+        Clusters of indexes into titles, each in input order, ordered by their first index.
+        Matching is transitive, and headlines without shingles are never grouped.
+    """
+    parents = list(range(len(titles)))
+
+    def root(item: int) -> int:
+        while parents[item] != item:
+            parents[item] = parents[parents[item]]
+            item = parents[item]
+        return item
+
+    index = LSHIndex()
+    sets = []
+    for item, title in enumerate(titles):
+        shingle_set = shingles(title)
+        sets.append(shingle_set)
+        if not shingle_set:
+            continue
+        for other in index.add(item, signature(shingle_set)):
+            if jaccard(shingle_set, sets[other]) >= threshold:
+                parents[root(item)] = root(other)
+
+    clusters: Dict[int, List[int]] = {}
+    for item in range(len(titles)):
+        clusters.setdefault(root(item), []).append(item)
+    return list(clusters.values())
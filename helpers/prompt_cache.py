@@ -0,0 +1,186 @@
+"""
+Prompt caching and token-budgeted history for Claude conversations.
+
+/ask sends the conversation history with every question. Anthropic prompt
+caching only helps if the start of the prompt stays byte-for-byte the same
+between turns, but a "last N messages" window drops the oldest message on
+every turn and so changes the prefix each time.
+
+ConversationCache keeps a fixed starting message per conversation scope
+(channel, or channel + user for personal conversations). New turns are added
+to the end, and the window only moves forward once its messages add up to
+more than MAX_WINDOW_TOKENS. It then restarts with the latest messages that
+fit in WINDOW_TOKENS, so the history sent with a request stays between the
+two budgets however long the individual messages are. Moving the window costs
+one cache write. Each request gets two cache breakpoints: one on the newest
+message (writes the prefix for the next turn) and one where the previous
+request ended (reads the prefix already cached).
+
+Messages that leave the window are folded into the conversation's running
+summary (see cogs/claude.py), which is sent as the system prompt.
+
+Cache read/write token counts from the API responses are kept per channel.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# History tokens kept when a window starts (or restarts)
+WINDOW_TOKENS = 3000
+
+# Largest window before it moves forward
+MAX_WINDOW_TOKENS = 6000
+
+# Rough characters per token, used when no stored count is available
+CHARS_PER_TOKEN = 4
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the tokens in a message.
+
+    Args:
+        text: Message text
+
+    Returns:
+        Approximate token count (at least 1)
+    """
+    return len(text or "") // CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class CacheUsage:
+    """Token usage of the requests made for one channel."""
+
+    requests: int = 0
+    input_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    output_tokens: int = 0
+
+    def record(self, usage: Any) -> None:
+        """Add a response's usage (missing fields count as 0)."""
+        self.requests += 1
+        self.input_tokens += getattr(usage, "input_tokens", 0) or 0
+        self.cache_read_tokens += getattr(usage, "cache_read_input_tokens", 0) or 0
+        self.cache_write_tokens += getattr(usage, "cache_creation_input_tokens", 0) or 0
+        self.output_tokens += getattr(usage, "output_tokens", 0) or 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of prompt tokens that were read from the cache."""
+        total = self.input_tokens + self.cache_read_tokens + self.cache_write_tokens
+        return self.cache_read_tokens / total if total else 0.0
+
+
+@dataclass
+class _ScopeState:
+    """Where a conversation's window starts and where the last request ended."""
+
+    window_start: int
+    breakpoint: Optional[int] = None
+
+
+class ConversationCache:
+    """Stable history windows and cache breakpoints per conversation scope."""
+
+    def __init__(self, window_tokens: int = WINDOW_TOKENS, max_window_tokens: int = MAX_WINDOW_TOKENS) -> None:
+        """
+        Initialize the cache tracker.
+
+        Args:
+            window_tokens: History tokens kept when a window starts
+            max_window_tokens: History tokens at which the window moves forward
+        """
+        self.window_tokens = window_tokens
+        self.max_window_tokens = max(max_window_tokens, window_tokens)
+        self._scopes: Dict[Tuple[int, Optional[int]], _ScopeState] = {}
+        self._usage: Dict[int, CacheUsage] = {}
+
+    def window_start(self, channel_id: int, user_id: Optional[int] = None) -> Optional[int]:
+        """
+        Get the first message ID of a conversation's current window.
+
+        Args:
+            channel_id: Discord channel ID
+            user_id: User ID for personal conversations, None for shared
+
+        Returns:
+            Message row ID, or None if the window hasn't started yet
+        """
+        state = self._scopes.get((channel_id, user_id))
+        return state.window_start if state else None
+
+    def build_messages(self, channel_id: int, user_id: Optional[int],
+                       rows: Sequence[Tuple[int, str, str, Optional[int]]]) -> List[Dict[str, Any]]:
+        """
+        Build the Messages API history with cache breakpoints.
+
+        Args:
+            channel_id: Discord channel ID
+            user_id: User ID for personal conversations, None for shared
+            rows: (row ID, role, content, token count or None) from the window
+                  start, oldest first; more than max_window_tokens makes the
+                  window move forward
+
+        Returns:
+            Messages list for messages.create / messages.stream
+        """
+        if not rows:
+            return []
+
+        key = (channel_id, user_id)
+        state = self._scopes.get(key)
+        tokens = [count if count is not None else count_tokens(content) for _, _, content, count in rows]
+        if state is None or sum(tokens) > self.max_window_tokens or rows[0][0] != state.window_start:
+            # Keep the newest messages that fit the budget (always at least the newest one)
+            keep, total = 1, tokens[-1]
+            while keep < len(rows) and total + tokens[-keep - 1] <= self.window_tokens:
+                keep += 1
+                total += tokens[-keep]
+            rows = rows[-keep:]
+            state = self._scopes[key] = _ScopeState(window_start=rows[0][0])
+
+        breakpoints = {rows[-1][0]}
+        if state.breakpoint is not None:
+            breakpoints.add(state.breakpoint)
+        state.breakpoint = rows[-1][0]
+
+        messages = []
+        for row_id, role, content, _ in rows:
+            block: Dict[str, Any] = {"type": "text", "text": content}
+            if row_id in breakpoints:
+                block["cache_control"] = CACHE_CONTROL
+            messages.append({"role": role, "content": [block]})
+        return messages
+
+    def reset(self, channel_id: int, user_id: Optional[int] = None) -> None:
+        """
+        Forget a conversation's window (e.g. after its history was cleared).
+
+        Args:
+            channel_id: Discord channel ID
+            user_id: User ID for personal conversations, None for shared
+        """
+        self._scopes.pop((channel_id, user_id), None)
+
+    def record_usage(self, channel_id: int, usage: Any) -> CacheUsage:
+        """
+        Add a response's token usage to its channel's totals.
+
+        Args:
+            channel_id: Discord channel ID
+            usage: Response usage object
+
+        Returns:
+            The channel's updated totals
+        """
+        totals = self._usage.setdefault(channel_id, CacheUsage())
+        totals.record(usage)
+        return totals
+
+    def usage(self, channel_id: int) -> CacheUsage:
+        """Get a channel's token usage totals."""
+        return self._usage.get(channel_id, CacheUsage())
@@ -0,0 +1,358 @@
+"""
+Batched due-schedule evaluation for Discord bot daily tasks.
+
+Checking every schedule row with scheduling.get_due_slot is fine for a few
+hundred guilds, but every daily loop pays that per-row Python cost on every
+tick. ScheduleBatch loads the rows of one or more features into NumPy arrays
+(post minute of day, zone, last-post day number, window) and computes the due
+mask for all of them in a single vectorised pass.
+
+Post times, timezones and last-post dates are deduplicated with np.unique, so
+string parsing and zone resolution run once per distinct value. At evaluation
+time each zone is checked once for a UTC offset change around "now"; zones
+with a steady offset (almost all of them, almost every day) are handled with
+plain array arithmetic, and only rows in a zone that is crossing a DST
+transition fall back to the cached scheduling.get_fire_schedule lookup.
+
+An optional load_shaping.SlotPlanner can delay rows inside their window to
+spread work away from popular post times; see helpers/load_shaping.py.
+"""
+
+from bisect import bisect_right
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from helpers import scheduling
+from helpers.load_shaping import SlotPlanner
+
+MINUTES_PER_DAY = 1440
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Legacy offsets span -12..+14, shifted to a non-negative code when building zone keys
+_OFFSET_SHIFT = 32
+_OFFSET_SPAN = 64
+
+
+@lru_cache(maxsize=4096)
+def get_steady_offset(zone_name: str, utc_day: int) -> Optional[int]:
+    """
+    Get a zone's UTC offset if it does not change around a given day.
+
+    The checked span runs from two days before `utc_day` to two days after,
+    which covers the most recent fire instant for any post time.
+
+    Args:
+        zone_name: IANA timezone name
+        utc_day: UTC day number (Unix timestamp // 86400)
+
+    Returns:
+        Offset in seconds, or None if the zone changes offset within the span
+    """
+    zone = scheduling.get_zone(zone_name) or scheduling.get_zone("UTC")
+    start = (utc_day - 2) * scheduling.SECONDS_PER_DAY
+    offsets = {
+        int(datetime.fromtimestamp(start + hour * 3600, zone).utcoffset().total_seconds())
+        for hour in range(4 * 24 + 1)
+    }
+    return offsets.pop() if len(offsets) == 1 else None
+
+
+class ScheduleBatch:
+    """
+    Due-state of many daily schedules, evaluated together.
+
+    Rows keep their position, so indices returned by due() and
+    due_by_feature() point back into the rows the batch was built from.
+    """
+
+    def __init__(
+        self,
+        post_times: Sequence[Optional[str]],
+        timezone_offsets: Sequence[Optional[int]],
+        timezone_names: Sequence[Optional[str]],
+        last_post_dates: Sequence[Optional[str]],
+        window_minutes: Union[int, Sequence[int]] = 15,
+        feature: str = "default",
+        guild_ids: Optional[Sequence[int]] = None
+    ) -> None:
+        """
+        Build the batch arrays from column values.
+
+        Args:
+            post_times: Local post times in "HH:MM" format
+            timezone_offsets: Legacy hour offsets from UTC
+            timezone_names: Stored IANA timezone names (None for offset-only rows)
+            last_post_dates: Last recorded slot dates ("YYYY-MM-DD"), or None
+            window_minutes: Posting window, either one value or one per row
+            feature: Name of the feature these rows belong to
+            guild_ids: Guild ID per row, used to spread load (default: row index)
+        """
+        count = len(post_times)
+
+        # Post minute of day, parsing each distinct "HH:MM" string once
+        time_values, time_codes = np.unique(
+            np.array([value or "" for value in post_times], dtype=str),
+            return_inverse=True
+        )
+        time_minutes = np.array(
+            [_parse_minute(value) for value in time_values.tolist()], dtype=np.int64
+        )
+        minutes = time_minutes[time_codes.reshape(-1)] if count else np.zeros(0, dtype=np.int64)
+        self.valid = minutes >= 0
+        self.minutes = np.maximum(minutes, 0)
+
+        # Zone per row, resolving each distinct (name, offset) combination once
+        name_values, name_codes = np.unique(
+            np.array([value or "" for value in timezone_names], dtype=str),
+            return_inverse=True
+        )
+        offsets = np.array([value or 0 for value in timezone_offsets], dtype=np.int64)
+        zone_keys = name_codes.reshape(-1).astype(np.int64) * _OFFSET_SPAN + (offsets + _OFFSET_SHIFT)
+        zone_key_values, key_codes = np.unique(zone_keys, return_inverse=True)
+
+        self.zones: List[str] = []
+        zone_lookup: Dict[str, int] = {}
+        key_zones = np.empty(len(zone_key_values), dtype=np.int64)
+        for index, key in enumerate(zone_key_values.tolist()):
+            name_code, offset_code = divmod(key, _OFFSET_SPAN)
+            zone_name = scheduling.resolve_zone_name(
+                str(name_values[name_code]) or None, offset_code - _OFFSET_SHIFT
+            )
+            # A named zone resolves the same whatever its legacy offset says
+            if zone_name not in zone_lookup:
+                zone_lookup[zone_name] = len(self.zones)
+                self.zones.append(zone_name)
+            key_zones[index] = zone_lookup[zone_name]
+        self.zone_codes = key_zones[key_codes.reshape(-1)]
+
+        # Last posted slot as a date ordinal, -1 when never posted
+        date_values, date_codes = np.unique(
+            np.array([value or "" for value in last_post_dates], dtype=str),
+            return_inverse=True
+        )
+        date_ordinals = np.array(
+            [scheduling.date_str_to_ordinal(value) if value else -1 for value in date_values.tolist()],
+            dtype=np.int64
+        )
+        self.last_post = date_ordinals[date_codes.reshape(-1)] if count else np.zeros(0, dtype=np.int64)
+
+        self.window_seconds = np.broadcast_to(
+            np.asarray(window_minutes, dtype=np.int64) * 60, (count,)
+        ).copy()
+
+        self.features: List[str] = [feature]
+        self.feature_codes = np.zeros(count, dtype=np.int64)
+        self.row_index = np.arange(count, dtype=np.int64)
+        self.guild_ids = (
+            np.array([int(value) for value in guild_ids], dtype=np.int64)
+            if guild_ids is not None else self.row_index.copy()
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Sequence],
+        post_time_col: int,
+        timezone_offset_col: int,
+        last_post_col: int,
+        timezone_col: int,
+        window_minutes: int = 15,
+        feature: str = "default",
+        guild_id_col: Optional[int] = None
+    ) -> "ScheduleBatch":
+        """
+        Build a batch from database result tuples.
+
+        Args:
+            rows: Result tuples, e.g. from get_servers_needing_news()
+            post_time_col: Index of the "HH:MM" post time in each row
+            timezone_offset_col: Index of the legacy hour offset
+            last_post_col: Index of the last recorded slot date
+            timezone_col: Index of the IANA timezone name
+            window_minutes: Posting window for this feature
+            feature: Name of the feature these rows belong to
+            guild_id_col: Index of the guild ID, used to spread load
+
+        Returns:
+            ScheduleBatch with one entry per row
+        """
+        return cls(
+            [row[post_time_col] for row in rows],
+            [row[timezone_offset_col] for row in rows],
+            [row[timezone_col] for row in rows],
+            [row[last_post_col] for row in rows],
+            window_minutes=window_minutes,
+            feature=feature,
+            guild_ids=[row[guild_id_col] for row in rows] if guild_id_col is not None else None,
+        )
+
+    @classmethod
+    def combine(cls, batches: Sequence["ScheduleBatch"]) -> "ScheduleBatch":
+        """
+        Merge several single-feature batches so they evaluate in one pass.
+
+        Args:
+            batches: Batches to merge (row indices stay relative to each source)
+
+        Returns:
+            A new ScheduleBatch covering every row of every input batch
+        """
+        combined = cls([], [], [], [])
+        combined.features = []
+        zone_lookup: Dict[str, int] = {}
+        zone_codes, feature_codes = [], []
+
+        for batch in batches:
+            # Remap zone codes so each zone is checked once across all features
+            remap = np.array(
+                [zone_lookup.setdefault(zone_name, len(zone_lookup)) for zone_name in batch.zones],
+                dtype=np.int64
+            )
+            zone_codes.append(remap[batch.zone_codes] if len(remap) else batch.zone_codes)
+            feature_codes.append(batch.feature_codes + len(combined.features))
+            combined.features.extend(batch.features)
+
+        combined.zones = list(zone_lookup)
+
+        if batches:
+            combined.zone_codes = np.concatenate(zone_codes)
+            combined.feature_codes = np.concatenate(feature_codes)
+            for name in ("valid", "minutes", "last_post", "window_seconds", "row_index", "guild_ids"):
+                setattr(combined, name, np.concatenate([getattr(batch, name) for batch in batches]))
+        return combined
+
+    def __len__(self) -> int:
+        return len(self.zone_codes)
+
+    @property
+    def invalid_indices(self) -> List[int]:
+        """Row indices whose post time could not be parsed."""
+        return self.row_index[~self.valid].tolist()
+
+    def evaluate(
+        self, now: Optional[int] = None, planner: Optional[SlotPlanner] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the due mask for every row.
+
+        Args:
+            now: Unix timestamp to evaluate at (default: current time)
+            planner: Optional planner that may delay rows within their window
+
+        Returns:
+            Tuple of (boolean due mask, slot date ordinal per row)
+        """
+        if now is None:
+            now = scheduling.utc_timestamp()
+        day = scheduling.SECONDS_PER_DAY
+        utc_day = now // day
+
+        zone_offsets = [get_steady_offset(zone_name, utc_day) for zone_name in self.zones]
+        zone_steady = np.array([offset is not None for offset in zone_offsets], dtype=bool)
+        zone_seconds = np.array([offset or 0 for offset in zone_offsets], dtype=np.int64)
+
+        # Steady zones: latest local fire time at or before local now
+        row_offsets = zone_seconds[self.zone_codes]
+        local_now = now + row_offsets
+        local_fire = (local_now // day) * day + self.minutes * 60
+        local_fire -= np.where(local_fire > local_now, day, 0)
+        latest_fire = local_fire - row_offsets
+        slots = local_fire // day + EPOCH_ORDINAL
+
+        # Zones crossing a DST transition: look up each (zone, minute) pair once
+        shifting = np.flatnonzero(~zone_steady[self.zone_codes])
+        if len(shifting):
+            pair_values, pair_codes = np.unique(
+                self.zone_codes[shifting] * MINUTES_PER_DAY + self.minutes[shifting],
+                return_inverse=True
+            )
+            pair_fire = np.empty(len(pair_values), dtype=np.int64)
+            pair_slots = np.empty(len(pair_values), dtype=np.int64)
+            for index, key in enumerate(pair_values.tolist()):
+                zone_code, minute = divmod(key, MINUTES_PER_DAY)
+                instants, first_ordinal = scheduling.get_fire_schedule(
+                    self.zones[zone_code], minute, utc_day
+                )
+                position = max(bisect_right(instants, now) - 1, 0)
+                pair_fire[index] = instants[position]
+                pair_slots[index] = first_ordinal + position
+            latest_fire[shifting] = pair_fire[pair_codes.reshape(-1)]
+            slots[shifting] = pair_slots[pair_codes.reshape(-1)]
+
+        elapsed = now - latest_fire
+        mask = (
+            self.valid
+            & (elapsed >= 0)
+            & (elapsed <= self.window_seconds)
+            & (slots > self.last_post)
+        )
+
+        if planner is not None:
+            open_rows = np.flatnonzero(mask)
+            starts = planner.plan(
+                zip(
+                    [self.features[code] for code in self.feature_codes[open_rows].tolist()],
+                    self.guild_ids[open_rows].tolist(),
+                    latest_fire[open_rows].tolist(),
+                    self.window_seconds[open_rows].tolist(),
+                ),
+                now
+            )
+            mask[open_rows] = np.array(starts, dtype=np.int64) <= now
+
+        return mask, slots
+
+    def due(
+        self, now: Optional[int] = None, planner: Optional[SlotPlanner] = None
+    ) -> List[Tuple[int, str]]:
+        """
+        List the rows whose posting window is open and not yet used.
+
+        Args:
+            now: Unix timestamp to evaluate at (default: current time)
+            planner: Optional planner that may delay rows within their window
+
+        Returns:
+            List of (row index, slot date "YYYY-MM-DD") tuples
+        """
+        mask, slots = self.evaluate(now, planner)
+        due_rows = np.flatnonzero(mask)
+        return [
+            (index, scheduling.ordinal_to_date_str(slot))
+            for index, slot in zip(self.row_index[due_rows].tolist(), slots[due_rows].tolist())
+        ]
+
+    def due_by_feature(
+        self, now: Optional[int] = None, planner: Optional[SlotPlanner] = None
+    ) -> Dict[str, List[Tuple[int, str]]]:
+        """
+        Group due rows by feature after a single evaluation pass.
+
+        Args:
+            now: Unix timestamp to evaluate at (default: current time)
+            planner: Optional planner that may delay rows within their window
+
+        Returns:
+            Mapping of feature name to (row index, slot date) tuples
+        """
+        mask, slots = self.evaluate(now, planner)
+        grouped: Dict[str, List[Tuple[int, str]]] = {feature: [] for feature in self.features}
+        due_rows = np.flatnonzero(mask)
+        for feature_code, index, slot in zip(
+            self.feature_codes[due_rows].tolist(),
+            self.row_index[due_rows].tolist(),
+            slots[due_rows].tolist()
+        ):
+            grouped[self.features[feature_code]].append(
+                (index, scheduling.ordinal_to_date_str(slot))
+            )
+        return grouped
+
+
+def _parse_minute(value: str) -> int:
+    """Convert an "HH:MM" string to minutes after midnight (-1 if invalid)."""
+    parsed = scheduling.parse_time_string(value) if value else None
+    return parsed.hour * 60 + parsed.minute if parsed else -1
@@ -3,11 +3,33 @@ Scheduling utilities for Discord bot daily tasks.
 
 This module provides utilities for managing daily scheduled tasks,
 including time parsing, timezone conversions, and posting window checks.
+
+Schedules are stored as a local "HH:MM" post time plus an IANA timezone name
+(e.g. "America/New_York"). Rows created before timezone names existed only
+carry an integer hour offset; those map onto the fixed-offset "Etc/GMT" zones.
+Each (zone, post time) pair is expanded into a sorted tuple of UTC fire
+instants covering the next few local days, so a due check is a bisect and a
+couple of integer comparisons instead of per-call datetime arithmetic.
 """
 
 import re
-from datetime import datetime, time, timedelta
-from typing import Optional
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Valid range for legacy integer UTC offsets (hours)
+MIN_UTC_OFFSET = -12
+MAX_UTC_OFFSET = 14
+
+# Number of local days covered by one cached fire schedule. The schedule starts
+# two days before the current UTC day so the most recent fire instant is always
+# included, whatever the zone's offset.
+FIRE_SCHEDULE_DAYS = 7
+
+SECONDS_PER_DAY = 86400
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
 
 
 def parse_time_string(time_str: str) -> Optional[time]:
@@ -107,14 +129,12 @@ def should_post_now(
     """
     current_time = get_server_time(timezone_offset)
 
-    # Convert both times to datetime objects for comparison
-    # Use a fixed date since we only care about time difference
-    today = datetime.today()
-    target_datetime = datetime.combine(today, target_time)
-    current_datetime = datetime.combine(today, current_time)
-
-    # Calculate difference in minutes
-    time_diff_minutes = abs((current_datetime - target_datetime).total_seconds() / 60)
+    # Compare minutes of the day on a 24-hour circle so windows that cross
+    # midnight (e.g. target 23:55, current 00:05) are measured correctly
+    current_minutes = current_time.hour * 60 + current_time.minute + current_time.second / 60
+    target_minutes = target_time.hour * 60 + target_time.minute
+    time_diff_minutes = abs(current_minutes - target_minutes) % 1440
+    time_diff_minutes = min(time_diff_minutes, 1440 - time_diff_minutes)
 
     return time_diff_minutes <= window_minutes
 
@@ -138,3 +158,266 @@ def should_post_today(
 
     current_date = get_server_date(timezone_offset)
     return last_post_date != current_date
+
+
+# ===== TIMEZONE-AWARE SCHEDULING =====
+
+
+def utc_timestamp() -> int:
+    """
+    Get the current UTC time as whole seconds since the Unix epoch.
+
+    This is the single clock used by the timezone-aware helpers, so tests and
+    simulations can move time by patching one function.
+
+    Returns:
+        Current Unix timestamp in seconds
+    """
+    return int(datetime.now(timezone.utc).timestamp())
+
+
+def offset_to_zone_name(timezone_offset: int) -> str:
+    """
+    Map a legacy integer hour offset onto a fixed-offset IANA zone name.
+
+    Args:
+        timezone_offset: Hours offset from UTC (e.g., -5 for EST)
+
+    Returns:
+        "UTC" for a zero offset, otherwise an "Etc/GMT" zone name
+
+    Examples:
+        >>> offset_to_zone_name(-5)
+        'Etc/GMT+5'
+        >>> offset_to_zone_name(9)
+        'Etc/GMT-9'
+    """
+    if not timezone_offset:
+        return "UTC"
+    # POSIX-style "Etc/GMT" names invert the sign: Etc/GMT+5 is UTC-5
+    return f"Etc/GMT{-int(timezone_offset):+d}"
+
+
+@lru_cache(maxsize=None)
+def get_zone(zone_name: str) -> Optional[ZoneInfo]:
+    """
+    Load an IANA timezone, caching one ZoneInfo per zone name.
+
+    Args:
+        zone_name: IANA timezone name (e.g., "Europe/London")
+
+    Returns:
+        ZoneInfo instance, or None if the name is not a known timezone
+    """
+    try:
+        return ZoneInfo(zone_name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        return None
+
+
+def is_valid_timezone(zone_name: Optional[str]) -> bool:
+    """
+    Check whether a string is a known IANA timezone name.
+
+    Args:
+        zone_name: Timezone name to check
+
+    Returns:
+        True if the zone can be loaded, False otherwise
+    """
+    return bool(zone_name) and get_zone(zone_name.strip()) is not None
+
+
+def resolve_zone_name(zone_name: Optional[str], timezone_offset: int = 0) -> str:
+    """
+    Pick the zone a schedule should run in.
+
+    A stored IANA zone name wins; rows without one (or with an unknown name)
+    fall back to the fixed-offset zone for their legacy hour offset.
+
+    Args:
+        zone_name: Stored IANA timezone name, or None
+        timezone_offset: Legacy hours offset from UTC
+
+    Returns:
+        A loadable IANA timezone name
+    """
+    zone_name = zone_name.strip() if zone_name else None
+    if zone_name and get_zone(zone_name) is not None:
+        return zone_name
+    return offset_to_zone_name(timezone_offset or 0)
+
+
+def format_zone_label(zone_name: str) -> str:
+    """
+    Format a zone name for display in embeds.
+
+    Fixed-offset zones are shown the way the bot always showed offsets
+    ("UTC-5"); real IANA zones are shown by name.
+
+    Args:
+        zone_name: IANA timezone name
+
+    Returns:
+        Human-readable label
+    """
+    if zone_name == "UTC":
+        return "UTC+0"
+    match = re.match(r'^Etc/GMT([+-]\d+)$', zone_name)
+    if match:
+        return f"UTC{-int(match.group(1)):+d}"
+    return zone_name
+
+
+@lru_cache(maxsize=8192)
+def get_fire_schedule(
+    zone_name: str,
+    post_minute: int,
+    utc_day: int,
+    days: int = FIRE_SCHEDULE_DAYS
+) -> Tuple[Tuple[int, ...], int]:
+    """
+    Expand a daily post time into sorted UTC fire instants.
+
+    The schedule covers `days` consecutive local dates starting two days before
+    `utc_day`. Local times that fall into a DST gap resolve forward (02:30 on a
+    spring-forward day fires at 03:30 local); ambiguous times fire on their
+    first occurrence.
+
+    Args:
+        zone_name: IANA timezone name
+        post_minute: Local post time as minutes after midnight (0-1439)
+        utc_day: Current UTC day number (Unix timestamp // 86400)
+        days: Number of local days to expand
+
+    Returns:
+        Tuple of (fire instants as Unix timestamps, date ordinal of the first instant)
+    """
+    zone = get_zone(zone_name) or get_zone("UTC")
+    hour, minute = divmod(post_minute, 60)
+    first_ordinal = utc_day + _EPOCH_ORDINAL - 2
+
+    instants = []
+    for index in range(days):
+        local_date = date.fromordinal(first_ordinal + index)
+        local_fire = datetime(
+            local_date.year, local_date.month, local_date.day, hour, minute, tzinfo=zone
+        )
+        instants.append(int(local_fire.timestamp()))
+
+    return tuple(instants), first_ordinal
+
+
+@lru_cache(maxsize=4096)
+def date_str_to_ordinal(date_str: str) -> int:
+    """
+    Convert a stored date string to a proleptic Gregorian ordinal.
+
+    Args:
+        date_str: Date string in format "YYYY-MM-DD"
+
+    Returns:
+        Date ordinal, or -1 if the string is empty or malformed
+    """
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date().toordinal()
+    except (TypeError, ValueError):
+        return -1
+
+
+@lru_cache(maxsize=4096)
+def ordinal_to_date_str(ordinal: int) -> str:
+    """
+    Convert a date ordinal back to the stored date format.
+
+    Args:
+        ordinal: Proleptic Gregorian ordinal (see date.toordinal)
+
+    Returns:
+        Date string in format "YYYY-MM-DD"
+    """
+    return date.fromordinal(ordinal).strftime("%Y-%m-%d")
+
+
+def get_due_slot(
+    target_time: time,
+    zone_name: str,
+    last_post_date: Optional[str],
+    window_minutes: int = 15,
+    now: Optional[int] = None
+) -> Optional[str]:
+    """
+    Check whether a daily schedule is due and return the slot to record.
+
+    The posting window opens at the most recent fire instant and stays open
+    for `window_minutes`. A slot is identified by the local date it was
+    scheduled for, so a 23:55 post that runs at 00:05 still records the
+    previous day and cannot fire twice.
+
+    Args:
+        target_time: The scheduled local posting time
+        zone_name: IANA timezone name (see resolve_zone_name)
+        last_post_date: The last recorded slot date ("YYYY-MM-DD"), or None
+        window_minutes: How long after the fire instant posting is allowed
+        now: Unix timestamp to evaluate at (default: current time)
+
+    Returns:
+        The slot date string ("YYYY-MM-DD") if a post is due, None otherwise
+    """
+    if now is None:
+        now = utc_timestamp()
+
+    instants, first_ordinal = get_fire_schedule(
+        zone_name, target_time.hour * 60 + target_time.minute, now // SECONDS_PER_DAY
+    )
+    index = bisect_right(instants, now) - 1
+    if index < 0 or now - instants[index] > window_minutes * 60:
+        return None
+
+    slot_ordinal = first_ordinal + index
+    if last_post_date and date_str_to_ordinal(last_post_date) >= slot_ordinal:
+        return None
+
+    return ordinal_to_date_str(slot_ordinal)
+
+
+def get_next_fire_time(
+    target_time: time,
+    zone_name: str,
+    now: Optional[int] = None
+) -> int:
+    """
+    Get the next UTC fire instant for a daily schedule.
+
+    Args:
+        target_time: The scheduled local posting time
+        zone_name: IANA timezone name
+        now: Unix timestamp to evaluate at (default: current time)
+
+    Returns:
+        Unix timestamp of the next fire instant strictly after `now`
+    """
+    if now is None:
+        now = utc_timestamp()
+
+    instants, _ = get_fire_schedule(
+        zone_name, target_time.hour * 60 + target_time.minute, now // SECONDS_PER_DAY
+    )
+    return instants[bisect_right(instants, now)]
+
+
+def get_local_date(zone_name: str, now: Optional[int] = None) -> str:
+    """
+    Get the current local date in a timezone.
+
+    Args:
+        zone_name: IANA timezone name
+        now: Unix timestamp to evaluate at (default: current time)
+
+    Returns:
+        Date string in format "YYYY-MM-DD"
+    """
+    if now is None:
+        now = utc_timestamp()
+    zone = get_zone(zone_name) or get_zone("UTC")
+    return datetime.fromtimestamp(now, zone).strftime("%Y-%m-%d")
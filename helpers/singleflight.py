@@ -0,0 +1,147 @@
+"""
+Singleflight deduplication for identical concurrent generations.
+
+Scheduled posts for many guilds often ask Claude for the same thing at the
+same moment (the story for today's artwork, an analysis of the same image,
+a summary of the same headlines). A SingleFlight runs one call per key: the
+first caller starts it, and callers that arrive with the same key while it is
+still running wait for that call and get the same result (or exception).
+Nothing is cached once the call finishes.
+
+The shared call runs as its own task, so one caller being cancelled does not
+cancel it for the others. Results are shared, so they should be treated as
+read-only. The task keeps the first caller's priority and deadline but no
+guild: the call is made for every caller, so its tokens aren't charged to
+(and it isn't refused by) the daily quota of whichever guild came first.
+
+Groups are created by name with group(), which also makes their counters
+available to stats() (shown by the llm-status owner command).
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+from urllib.parse import urlsplit, urlunsplit
+
+from helpers.llm_scheduler import current_context, request_context
+
+T = TypeVar("T")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalise a URL so equivalent spellings share a key.
+
+    Args:
+        url: URL
+
+    Returns:
+        URL with surrounding whitespace and the fragment removed, and the
+        scheme and host lowercased
+    """
+    parts = urlsplit((url or "").strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ""))
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Build a compact key from JSON-serialisable parts.
+
+    Args:
+        *parts: Values that identify the request (strings, numbers, lists, dicts)
+
+    Returns:
+        32 hex characters (blake2b of the parts' canonical JSON)
+    """
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
+class SingleFlight:
+    """One in-flight call per key; concurrent callers share it."""
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize the group.
+
+        Args:
+            name: Name shown in stats
+        """
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run call() unless a call with the same key is running, then share its result.
+
+        Args:
+            key: Request key (see make_key)
+            call: Coroutine function that performs the request
+
+        Returns:
+            The call's result
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.started += 1
+            task = asyncio.ensure_future(self._shared(call))
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    @staticmethod
+    async def _shared(call: Callable[[], Awaitable[T]]) -> T:
+        """Run a call for every caller: in the first caller's priority and deadline, for no guild."""
+        context = current_context()
+        with request_context(context.priority, None, context.deadline):
+            return await call()
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a finished call so the next request with its key starts a new one."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.failed += 1
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently running."""
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the group's counters."""
+        return {
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+        }
+
+
+_GROUPS: Dict[str, SingleFlight] = {}
+
+
+def group(name: str) -> SingleFlight:
+    """
+    Get the shared group with this name, creating it if needed.
+
+    Args:
+        name: Group name (e.g. "art-story")
+
+    Returns:
+        The group
+    """
+    if name not in _GROUPS:
+        _GROUPS[name] = SingleFlight(name)
+    return _GROUPS[name]
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    """Get the counters of every group."""
+    return {name: flight.stats() for name, flight in _GROUPS.items()}
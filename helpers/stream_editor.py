@@ -0,0 +1,255 @@
+"""
+Rate-limit-aware message edits for streamed responses.
+
+Discord limits message edits per channel (about five per five seconds), and
+that budget is shared by every stream in the channel. Editing on a fixed timer
+wastes requests on edits that get rate limited, and stalls while discord.py
+waits out the limit.
+
+StreamEditor coalesces updates instead: update() only records the latest
+state, and a single background task sends it whenever the channel's pacer
+allows, so intermediate states are skipped rather than queued. The pacer
+is shared per channel (through EditPacers), so concurrent streams in one
+channel split its budget. The edit interval doubles when Discord rate limits
+an edit, or when an edit was slow because discord.py held it back, and then
+shrinks back towards EDIT_INTERVAL. finish() waits for any edit in flight and
+then sends the final state, retrying after rate limits, so the message always
+ends up showing the complete response.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import discord
+
+# Seconds between edits in one channel when nothing is being rate limited
+EDIT_INTERVAL = 1.0
+
+# Longest interval after repeated rate limits
+MAX_INTERVAL = 8.0
+
+# Edits slower than this were held back by discord.py's rate-limit handling
+SLOW_EDIT_SECONDS = 1.5
+
+# Attempts for the final edit before giving up
+FINAL_ATTEMPTS = 3
+
+# Channels without edits for this long are forgotten
+IDLE_SECONDS = 600
+
+
+def rate_limit_delay(error: Exception) -> Optional[float]:
+    """
+    Get how long to wait after a failed edit, if it failed because of a rate limit.
+
+    Args:
+        error: Exception raised by Message.edit
+
+    Returns:
+        Seconds to wait, or None if the error was not a rate limit
+    """
+    if isinstance(error, discord.RateLimited):
+        return error.retry_after
+    if isinstance(error, discord.HTTPException) and error.status == 429:
+        headers = getattr(error.response, "headers", None) or {}
+        try:
+            return float(headers.get("Retry-After", EDIT_INTERVAL))
+        except (TypeError, ValueError):
+            return EDIT_INTERVAL
+    return None
+
+
+class ChannelPacer:
+    """Edit budget of one channel, shared by all streams in it."""
+
+    def __init__(self, interval: float = EDIT_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize the pacer.
+
+        Args:
+            interval: Seconds between edits when not rate limited
+            clock: Monotonic clock
+        """
+        self.base_interval = interval
+        self.interval = interval
+        self.clock = clock
+        self.next_at = 0.0
+        self.last_used = clock()
+        self.rate_limited = 0
+
+    def reserve(self) -> float:
+        """
+        Reserve the channel's next edit slot.
+
+        Returns:
+            Seconds to wait before editing
+        """
+        now = self.clock()
+        start = max(now, self.next_at)
+        self.next_at = start + self.interval
+        self.last_used = now
+        return start - now
+
+    def edited(self, elapsed: float) -> None:
+        """
+        Record a successful edit.
+
+        Args:
+            elapsed: Seconds the edit took
+        """
+        if elapsed >= SLOW_EDIT_SECONDS:
+            self.slow_down()
+        else:
+            self.interval = max(self.base_interval, self.interval * 0.8)
+
+    def slow_down(self, retry_after: Optional[float] = None) -> None:
+        """
+        Back off after a rate limit.
+
+        Args:
+            retry_after: Seconds Discord asked to wait, if known
+        """
+        self.rate_limited += 1
+        self.interval = min(self.interval * 2, MAX_INTERVAL)
+        if retry_after:
+            self.next_at = max(self.next_at, self.clock() + retry_after)
+
+
+class EditPacers:
+    """Pacers per channel."""
+
+    def __init__(self, interval: float = EDIT_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            interval: Seconds between edits when not rate limited
+            clock: Monotonic clock
+        """
+        self.interval = interval
+        self.clock = clock
+        self._pacers: Dict[int, ChannelPacer] = {}
+
+    def get(self, channel_id: int) -> ChannelPacer:
+        """
+        Get a channel's pacer, creating it if needed.
+
+        Args:
+            channel_id: Discord channel ID
+
+        Returns:
+            The channel's pacer
+        """
+        now = self.clock()
+        for idle_id in [key for key, pacer in self._pacers.items() if now - pacer.last_used > IDLE_SECONDS]:
+            del self._pacers[idle_id]
+        if channel_id not in self._pacers:
+            self._pacers[channel_id] = ChannelPacer(self.interval, self.clock)
+        return self._pacers[channel_id]
+
+    def stats(self) -> Dict[int, float]:
+        """Get the current edit interval of each active channel."""
+        return {channel_id: pacer.interval for channel_id, pacer in self._pacers.items()}
+
+
+# Shared by every StreamEditor that isn't given its own pacer
+PACERS = EditPacers()
+
+
+class StreamEditor:
+    """Coalesced, paced edits of one message while a response streams in."""
+
+    def __init__(self, message: discord.Message, pacer: Optional[ChannelPacer] = None,
+                 sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep) -> None:
+        """
+        Initialize the editor.
+
+        Args:
+            message: Message to edit
+            pacer: Edit budget to use (default: the channel's shared pacer)
+            sleep: Coroutine used to wait for an edit slot
+        """
+        self.message = message
+        self.pacer = pacer or PACERS.get(message.channel.id)
+        self._sleep = sleep
+        self._pending: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._editing = False
+        self.sent = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def update(self, **fields: Any) -> None:
+        """
+        Record the latest state to show; it replaces any state not sent yet.
+
+        Args:
+            **fields: Keyword arguments for Message.edit (e.g. embed=...)
+        """
+        if self._pending is not None:
+            self.coalesced += 1
+        self._pending = fields
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush())
+
+    async def finish(self, **fields: Any) -> None:
+        """
+        Send the final state after any edit in flight.
+
+        Args:
+            **fields: Keyword arguments for Message.edit
+
+        Raises:
+            discord.HTTPException: If the final edit failed for a reason other
+                than a rate limit, or was still rate limited after FINAL_ATTEMPTS
+        """
+        self._pending = None
+        if self._task and not self._task.done():
+            if self._editing:
+                await self._task
+            else:
+                self._task.cancel()
+
+        for attempt in range(FINAL_ATTEMPTS):
+            delay = self.pacer.reserve()
+            if delay > 0:
+                await self._sleep(delay)
+            try:
+                await self._edit(fields)
+                return
+            except (discord.HTTPException, discord.RateLimited) as e:
+                delay = rate_limit_delay(e)
+                if delay is None or attempt == FINAL_ATTEMPTS - 1:
+                    raise
+                self.pacer.slow_down(delay)
+
+    async def _flush(self) -> None:
+        """Send the latest pending state until nothing new is pending."""
+        while self._pending is not None:
+            delay = self.pacer.reserve()
+            if delay > 0:
+                await self._sleep(delay)
+            fields, self._pending = self._pending, None
+            if fields is None:
+                break
+            self._editing = True
+            try:
+                await self._edit(fields)
+            except (discord.HTTPException, discord.RateLimited) as e:
+                # Intermediate states can be skipped; the next update or finish() catches up
+                self.failed += 1
+                delay = rate_limit_delay(e)
+                if delay is not None:
+                    self.pacer.slow_down(delay)
+            finally:
+                self._editing = False
+
+    async def _edit(self, fields: Dict[str, Any]) -> None:
+        """Edit the message and let the pacer know how long it took."""
+        started = self.pacer.clock()
+        await self.message.edit(**fields)
+        self.pacer.edited(self.pacer.clock() - started)
+        self.sent += 1
@@ -0,0 +1,139 @@
+"""
+Helpers for the pre-generated trivia question bank.
+
+Questions are generated in batches (one Claude call returns BATCH_SIZE
+questions for a category and difficulty), stored in the `trivia_bank` table
+and served oldest first. Each question is keyed by a hash of its normalised
+text, so rewordings that only differ in case, punctuation or spacing are
+stored once, and questions that were already served are never stored again.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+# Questions requested per Claude call
+BATCH_SIZE = 20
+
+# Refill a pool when fewer unserved questions than this remain
+LOW_WATER_MARK = 8
+
+# Previously generated questions shown to Claude so it avoids repeats
+AVOID_EXAMPLES = 25
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_question(text: str) -> str:
+    """
+    Normalise question text for duplicate detection.
+
+    Args:
+        text: Question text
+
+    Returns:
+        Lowercase text with punctuation removed and whitespace collapsed
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def question_hash(text: str) -> str:
+    """
+    Get the duplicate-detection key for a question.
+
+    Args:
+        text: Question text
+
+    Returns:
+        16 hex characters (blake2b of the normalised text)
+    """
+    return hashlib.blake2b(normalize_question(text).encode(), digest_size=8).hexdigest()
+
+
+def build_batch_prompt(category_description: str, difficulty: str, count: int = BATCH_SIZE,
+                       avoid: Optional[List[str]] = None) -> str:
+    """
+    Build the prompt for a batch of questions.
+
+    Args:
+        category_description: Description of the category (e.g. "science, physics, ...")
+        difficulty: Difficulty level (easy, medium, hard)
+        count: Number of questions to ask for
+        avoid: Existing questions that must not be repeated
+
+    Returns:
+        Prompt text
+    """
+    avoid_block = ""
+    if avoid:
+        listed = "\n".join(f"- {question}" for question in avoid[:AVOID_EXAMPLES])
+        avoid_block = f"\n\nDo not repeat or rephrase any of these existing questions:\n{listed}"
+
+    return f"""Generate {count} different {difficulty} difficulty trivia questions about {category_description}.
+
+Respond with ONLY a JSON array, no other text. Each element must look exactly like this:
+{{"question": "question text, clear and unambiguous, under 200 characters", "options": {{"A": "...", "B": "...", "C": "...", "D": "..."}}, "correct": "A", "explanation": "one sentence explaining why the answer is correct"}}
+
+Rules:
+- All options must be plausible but only one correct, each under 100 characters
+- Options should be similar length
+- Vary which letter is correct
+- Every question must cover a different fact
+- Difficulty: easy = common knowledge, medium = educated guess possible, hard = specialized knowledge
+- No questions about current events after 2024{avoid_block}"""
+
+
+def parse_question_batch(response: str, category: str, difficulty: str) -> List[Dict]:
+    """
+    Parse a batch response into question dicts, dropping invalid or repeated entries.
+
+    Args:
+        response: Claude's response text (a JSON array, possibly wrapped in prose)
+        category: Category the batch was generated for
+        difficulty: Difficulty the batch was generated for
+
+    Returns:
+        List of question dicts (question, options, correct, category,
+        difficulty, explanation, question_hash)
+    """
+    start, end = response.find("["), response.rfind("]")
+    if start == -1 or end <= start:
+        return []
+    try:
+        items = json.loads(response[start:end + 1])
+    except json.JSONDecodeError:
+        return []
+
+    questions = []
+    seen = set()
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        text = str(item.get("question") or "").strip()
+        options = item.get("options")
+        correct = str(item.get("correct") or "").strip().upper()
+        if not text or not isinstance(options, dict) or correct not in ("A", "B", "C", "D"):
+            continue
+        options = {letter: str(options.get(letter) or "").strip() for letter in "ABCD"}
+        if not all(options.values()):
+            continue
+
+        key = question_hash(text)
+        if key in seen:
+            continue
+        seen.add(key)
+        questions.append({
+            "question": text[:250],
+            "options": {letter: option[:100] for letter, option in options.items()},
+            "correct": correct,
+            "category": category,
+            "difficulty": difficulty,
+            "explanation": str(item.get("explanation") or "").strip(),
+            "question_hash": key,
+        })
+    return questions
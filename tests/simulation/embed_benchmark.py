@@ -0,0 +1,195 @@
+"""
+Benchmark of news digest delivery: one message per article against embeds
+packed into as few messages as possible (helpers/embed_batching.py).
+
+Discord is simulated on a virtual clock. Every REST call takes LATENCY
+seconds, and each channel or thread accepts at most RATE_LIMIT messages per
+RATE_WINDOW seconds; like discord.py reading the X-RateLimit headers, a send
+that would exceed the limit waits for the window to move on. The "after"
+side runs the real News.post_news_to_server (with articles and summaries
+stubbed), the "before" side replays the cog's previous posting loop, and both
+build the same article embeds.
+
+Usage:
+    python -m tests.simulation.embed_benchmark --articles 40
+"""
+
+import argparse
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Deque, Dict, List
+from unittest.mock import AsyncMock, Mock, patch
+
+from discord.ext import tasks
+
+from cogs import news
+from cogs.news import News
+
+# Seconds per REST call
+LATENCY = 0.15
+
+# Messages per channel per window, as Discord allows for bots
+RATE_LIMIT = 5
+RATE_WINDOW = 5.0
+
+SOURCES = ["BBC World", "CNN Top Stories", "Associated Press", "Reuters World", "NPR News",
+           "The Guardian", "The New York Times", "Washington Post", "Al Jazeera", "Sky News"]
+CATEGORIES = ["World News", "Politics", "Business", "Technology", "Science", "Health"]
+
+
+class SimulatedDiscord:
+    """Virtual clock and REST call counter shared by the simulated channels."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.calls = 0
+        self.messages = 0
+        self._sent: Dict[int, Deque[float]] = {}
+
+    async def call(self) -> None:
+        """One REST call."""
+        self.calls += 1
+        self.now += LATENCY
+        await asyncio.sleep(0)
+
+    async def post(self, channel_id: int) -> None:
+        """One message sent to a channel, waiting for its rate limit first."""
+        sent = self._sent.setdefault(channel_id, deque())
+        while sent and sent[0] <= self.now - RATE_WINDOW:
+            sent.popleft()
+        if len(sent) >= RATE_LIMIT:
+            self.now = sent.popleft() + RATE_WINDOW
+        sent.append(self.now)
+        self.messages += 1
+        await self.call()
+
+
+class SimulatedChannel:
+    """Channel or thread that records sends on the simulated clock."""
+
+    def __init__(self, discord_: SimulatedDiscord, channel_id: int) -> None:
+        self.discord = discord_
+        self.id = channel_id
+        self.jump_url = f"https://discord.com/channels/1/{channel_id}"
+
+    async def send(self, content=None, embed=None, embeds=None, view=None):
+        await self.discord.post(self.id)
+
+        async def edit(**kwargs):
+            await self.discord.call()
+
+        return Mock(channel=self, edit=edit)
+
+
+def sample_articles(count: int) -> List[dict]:
+    """Summarised digest articles as post_news_to_server gets them."""
+    published = datetime.now(timezone.utc) - timedelta(hours=2)
+    return [
+        {
+            "id": f"article-{number}",
+            "title": f"Story {number}: officials respond as the situation develops across the region today",
+            "link": f"https://news.example.org/2025/story-{number}",
+            "description": "A longer description of what happened. " * 6,
+            "summary": "A two-sentence summary of the story written for the digest, covering the key facts "
+                       "and why they matter to readers following the news today.",
+            "category": CATEGORIES[number % len(CATEGORIES)],
+            "source": SOURCES[number % len(SOURCES)],
+            "article_type": "📰 Recent" if number % 2 == 0 else "⭐ Popular",
+            "published": published.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+            "image": f"https://static.example.org/{number}.jpg",
+        }
+        for number in range(count)
+    ]
+
+
+def make_cog(discord_: SimulatedDiscord, articles: List[dict]) -> News:
+    """News cog posting to a simulated channel, with its articles and summaries stubbed."""
+    bot = Mock()
+    bot.logger = Mock()
+    bot.database = Mock(get_news_sources=AsyncMock(return_value=[(name, "") for name in SOURCES]),
+                        mark_article_posted=AsyncMock())
+    bot.get_channel = lambda channel_id: SimulatedChannel(discord_, 1)
+    with patch.object(tasks.Loop, "start", Mock()):
+        cog = News(bot)
+    cog.gather_recent_articles = AsyncMock(return_value=[dict(article) for article in articles])
+    cog._summarize_and_categorize_articles = AsyncMock(side_effect=lambda items: items)
+    return cog
+
+
+async def create_thread(discord_: SimulatedDiscord, **kwargs) -> SimulatedChannel:
+    await discord_.call()
+    return SimulatedChannel(discord_, 2)
+
+
+async def legacy_post(cog: News, discord_: SimulatedDiscord, articles: List[dict]) -> None:
+    """The cog's previous delivery: header, each digest embed, then one thread message per article."""
+    channel = SimulatedChannel(discord_, 1)
+    articles = [dict(article) for article in articles]
+    digest_embeds = cog._create_digest_embeds(articles)
+    header_message = await channel.send(embed=Mock())
+    for digest_embed in digest_embeds:
+        await channel.send(embed=digest_embed)
+    thread = await create_thread(discord_)
+    for article in articles:
+        await thread.send(embed=cog._create_article_embed(article, numbered=True))
+        await cog.bot.database.mark_article_posted(1, article["id"])
+    await header_message.edit(view=None)
+
+
+async def measure(articles: List[dict], legacy: bool) -> dict:
+    """REST calls, messages and simulated seconds for one digest."""
+    discord_ = SimulatedDiscord()
+    cog = make_cog(discord_, articles)
+    with patch.object(news.thread_manager, "create_bot_thread", partial(create_thread, discord_)):
+        if legacy:
+            await legacy_post(cog, discord_, articles)
+        else:
+            await cog.post_news_to_server(1, 1)
+    await cog.feeds.close()
+    assert cog.bot.database.mark_article_posted.await_count == len(articles)
+    return {"calls": discord_.calls, "messages": discord_.messages, "seconds": discord_.now}
+
+
+def run(count: int = 40) -> dict:
+    """
+    Deliver one digest both ways.
+
+    Returns:
+        {"articles", "legacy_calls", "legacy_messages", "legacy_seconds",
+         "batched_calls", "batched_messages", "batched_seconds"}
+    """
+    articles = sample_articles(count)
+
+    async def both():
+        return await measure(articles, legacy=True), await measure(articles, legacy=False)
+
+    before, after = asyncio.run(both())
+    return {
+        "articles": count,
+        "legacy_calls": before["calls"],
+        "legacy_messages": before["messages"],
+        "legacy_seconds": before["seconds"],
+        "batched_calls": after["calls"],
+        "batched_messages": after["messages"],
+        "batched_seconds": after["seconds"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark news digest delivery.")
+    parser.add_argument("--articles", type=int, default=40)
+    args = parser.parse_args()
+
+    result = run(args.articles)
+    print(f"{result['articles']} articles, {LATENCY * 1000:.0f} ms per call, "
+          f"{RATE_LIMIT} messages per {RATE_WINDOW:.0f}s per channel")
+    print(f"one message per article: {result['legacy_calls']:3d} REST calls "
+          f"({result['legacy_messages']} messages), {result['legacy_seconds']:5.1f} s")
+    print(f"packed embeds:           {result['batched_calls']:3d} REST calls "
+          f"({result['batched_messages']} messages), {result['batched_seconds']:5.1f} s")
+
+
+if __name__ == "__main__":
+    main()
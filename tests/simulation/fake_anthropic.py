@@ -0,0 +1,306 @@
+"""
+Local stand-in for the Anthropic Messages API.
+
+An aiohttp server that answers POST /v1/messages like the real API (JSON or
+server-sent events when "stream" is true), with configurable time to first
+token, streaming speed and injected 429/529 errors. Responses are canned but
+follow each cog's prompt format, so the cogs parse them like real output:
+trivia questions and question batches, recipes, news digest lines, running
+summaries, vision stories and free text for everything else.
+
+Point the bot (or any LLMClient) at it with ANTHROPIC_BASE_URL:
+
+    python -m tests.simulation.fake_anthropic --port 8765 --latency 0.4 --tokens-per-second 80 --rate-429 0.02
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=fake python bot.py
+
+GET /stats returns request counts by status and the number of requests in
+flight; tests/simulation/llm_benchmark.py drives the shared client against it.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+# Characters per token for usage numbers (same estimate as the scheduler)
+CHARS_PER_TOKEN = 4
+
+WORDS = (
+    "the museum light color history garden recipe morning question story river city music "
+    "ancient modern bright quiet bold simple careful friendly curious warm patient wonderful"
+).split()
+
+
+@dataclass
+class FakeConfig:
+    """Behaviour of the fake API."""
+
+    latency: float = 0.3
+    jitter: float = 0.1
+    tokens_per_second: float = 100.0
+    rate_429: float = 0.0
+    rate_529: float = 0.0
+    retry_after: float = 1.0
+    seed: Optional[int] = None
+
+
+@dataclass
+class FakeStats:
+    """Requests served by the fake API."""
+
+    statuses: Dict[int, int] = field(default_factory=dict)
+    streams: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "streams": self.streams,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+        }
+
+
+def request_text(body: Dict[str, Any]) -> Tuple[str, bool]:
+    """Get the text of the last user message and whether the request includes an image."""
+    messages = body.get("messages") or []
+    content = messages[-1].get("content", "") if messages else ""
+    if isinstance(content, str):
+        return content, False
+    text = "\n".join(block.get("text", "") for block in content if block.get("type") == "text")
+    return text, any(block.get("type") == "image" for block in content)
+
+
+def count_input_tokens(body: Dict[str, Any]) -> int:
+    """Rough input token count of a request."""
+    return len(json.dumps(body.get("messages", [])) + json.dumps(body.get("system", ""))) // CHARS_PER_TOKEN
+
+
+def filler(rng: random.Random, words: int) -> str:
+    """Plausible-looking sentences."""
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(8, 16))
+        sentence = " ".join(rng.choice(WORDS) for _ in range(length))
+        sentences.append(sentence.capitalize() + ".")
+        words -= length
+    return " ".join(sentences)
+
+
+def trivia_item(rng: random.Random, n: int) -> Dict[str, Any]:
+    """One trivia question in the batch JSON format."""
+    token = uuid.UUID(int=rng.getrandbits(128)).hex[:8]
+    return {
+        "question": f"Which answer matches fake fact {token} number {n}?",
+        "options": {letter: f"Option {letter} {token}" for letter in "ABCD"},
+        "correct": rng.choice("ABCD"),
+        "explanation": "The fake API says so.",
+    }
+
+
+def canned_response(body: Dict[str, Any], rng: random.Random) -> str:
+    """
+    Build a response in the format the prompt asks for.
+
+    Args:
+        body: Messages API request body
+        rng: Random source
+
+    Returns:
+        Response text
+    """
+    prompt, has_image = request_text(body)
+    max_tokens = int(body.get("max_tokens") or 256)
+
+    if "Respond with ONLY a JSON array" in prompt:
+        match = re.search(r"Generate (\d+) different", prompt)
+        count = int(match.group(1)) if match else 10
+        return json.dumps([trivia_item(rng, n) for n in range(count)])
+    if "QUESTION: [" in prompt:
+        item = trivia_item(rng, 0)
+        options = "\n".join(f"{letter}: {text}" for letter, text in item["options"].items())
+        return f"QUESTION: {item['question']}\n{options}\nCORRECT: {item['correct']}\nEXPLANATION: {item['explanation']}"
+    if "RECIPE_NAME:" in prompt:
+        difficulty = re.search(r"DIFFICULTY: (\w+)", prompt)
+        return (
+            "RECIPE_NAME: Fake Garden Pasta\nDESCRIPTION: A quick pasta from the fake kitchen.\n"
+            "SERVINGS: 4\nPREP_TIME: 10 min\nCOOK_TIME: 20 min\n"
+            f"DIFFICULTY: {difficulty.group(1) if difficulty else 'medium'}\n"
+            "INGREDIENTS:\n- 400 g pasta\n- 2 tbsp olive oil\n- 3 cloves garlic\n- 200 g cherry tomatoes\n- Salt to taste\n"
+            "INSTRUCTIONS:\n1. Boil the pasta.\n2. Fry the garlic in the oil.\n3. Add the tomatoes and toss with the pasta.\n"
+            "TIPS: Save a cup of pasta water for the sauce."
+        )
+    if "Article X | Category:" in prompt:
+        articles = sorted({int(n) for n in re.findall(r"^Article (\d+):", prompt, re.MULTILINE)})
+        return "\n".join(
+            f"Article {n} | Category: {rng.choice(['Technology', 'Science', 'World News', 'Business'])} | "
+            f"Summary: {filler(rng, 20)}"
+            for n in articles
+        )
+    if "running summary" in prompt:
+        return filler(rng, min(120, max_tokens // 2))
+    if has_image:
+        return "\n\n".join(filler(rng, 60) for _ in range(3))
+    return filler(rng, max(10, min(max_tokens // 2, rng.randint(40, 400))))
+
+
+class FakeAnthropic:
+    """aiohttp application serving the fake Messages API."""
+
+    def __init__(self, config: Optional[FakeConfig] = None) -> None:
+        self.config = config or FakeConfig()
+        self.rng = random.Random(self.config.seed)
+        self.stats = FakeStats()
+        self._cached_prefixes: set = set()
+        self.app = web.Application()
+        self.app.router.add_post("/v1/messages", self.messages)
+        self.app.router.add_get("/stats", self.get_stats)
+
+    def _count(self, status: int) -> None:
+        self.stats.statuses[status] = self.stats.statuses.get(status, 0) + 1
+
+    def _error(self, status: int, kind: str, message: str) -> web.Response:
+        self._count(status)
+        headers = {"retry-after": str(self.config.retry_after)} if status == 429 else {}
+        return web.json_response(
+            {"type": "error", "error": {"type": kind, "message": message}}, status=status, headers=headers
+        )
+
+    def _cache_usage(self, body: Dict[str, Any]) -> Tuple[int, int]:
+        """Cache read/write tokens: a prefix ending at a cache_control block is cached once seen."""
+        read = written = 0
+        prefix = json.dumps(body.get("system", ""))
+        for message in body.get("messages", []):
+            content = message.get("content")
+            for block in content if isinstance(content, list) else []:
+                prefix += json.dumps(block)
+                if "cache_control" in block:
+                    key = hashlib.blake2b(prefix.encode(), digest_size=16).digest()
+                    tokens = len(prefix) // CHARS_PER_TOKEN
+                    if key in self._cached_prefixes:
+                        read = max(read, tokens)
+                    else:
+                        self._cached_prefixes.add(key)
+                        written = max(written, tokens)
+        return read, max(0, written - read)
+
+    def _usage(self, body: Dict[str, Any], output_tokens: int) -> Dict[str, int]:
+        read, written = self._cache_usage(body)
+        return {
+            "input_tokens": max(1, count_input_tokens(body) - read - written),
+            "cache_read_input_tokens": read,
+            "cache_creation_input_tokens": written,
+            "output_tokens": output_tokens,
+        }
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats.as_dict())
+
+    async def messages(self, request: web.Request) -> web.StreamResponse:
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            return self._error(400, "invalid_request_error", "Body is not JSON")
+        if not body.get("model") or not body.get("messages") or not body.get("max_tokens"):
+            return self._error(400, "invalid_request_error", "model, messages and max_tokens are required")
+
+        roll = self.rng.random()
+        if roll < self.config.rate_429:
+            return self._error(429, "rate_limit_error", "Fake rate limit")
+        if roll < self.config.rate_429 + self.config.rate_529:
+            return self._error(529, "overloaded_error", "Fake overload")
+
+        self.stats.in_flight += 1
+        self.stats.max_in_flight = max(self.stats.max_in_flight, self.stats.in_flight)
+        try:
+            await asyncio.sleep(max(0.0, self.config.latency + self.rng.uniform(-1, 1) * self.config.jitter))
+            text = canned_response(body, self.rng)
+            if body.get("stream"):
+                return await self._stream(request, body, text)
+            self._count(200)
+            return web.json_response(self._message(body, text, "end_turn"))
+        finally:
+            self.stats.in_flight -= 1
+
+    def _message(self, body: Dict[str, Any], text: str, stop_reason: Optional[str]) -> Dict[str, Any]:
+        return {
+            "id": f"msg_fake_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "text", "text": text}] if text else [],
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": self._usage(body, len(text) // CHARS_PER_TOKEN + 1 if text else 0),
+        }
+
+    async def _stream(self, request: web.Request, body: Dict[str, Any], text: str) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+        self.stats.streams += 1
+
+        async def send(event: str, data: Dict[str, Any]) -> None:
+            await response.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+
+        start = self._message(body, "", None)
+        start["usage"]["output_tokens"] = 1
+        await send("message_start", {"type": "message_start", "message": start})
+        await send("content_block_start", {
+            "type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""},
+        })
+        await send("ping", {"type": "ping"})
+
+        # A delta of about five tokens at a time, paced to tokens_per_second
+        chunks = re.findall(r"\S+\s*", text)
+        delay = 5 / self.config.tokens_per_second if self.config.tokens_per_second > 0 else 0
+        for index in range(0, len(chunks), 5):
+            await send("content_block_delta", {
+                "type": "content_block_delta", "index": 0,
+                "delta": {"type": "text_delta", "text": "".join(chunks[index:index + 5])},
+            })
+            if delay:
+                await asyncio.sleep(delay)
+
+        await send("content_block_stop", {"type": "content_block_stop", "index": 0})
+        await send("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": len(text) // CHARS_PER_TOKEN + 1},
+        })
+        await send("message_stop", {"type": "message_stop"})
+        await response.write_eof()
+        self._count(200)
+        return response
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a fake Anthropic Messages API for load testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--jitter", type=float, default=0.1, help="+/- seconds added to the latency")
+    parser.add_argument("--tokens-per-second", type=float, default=100.0, help="streaming speed")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--rate-529", type=float, default=0.0, help="share of requests answered with 529")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="retry-after header on 429s")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        latency=args.latency, jitter=args.jitter, tokens_per_second=args.tokens_per_second,
+        rate_429=args.rate_429, rate_529=args.rate_529, retry_after=args.retry_after, seed=args.seed,
+    )
+    print(f"Fake Anthropic API on http://{args.host}:{args.port} ({config})")
+    web.run_app(FakeAnthropic(config).app, host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
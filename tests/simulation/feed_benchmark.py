@@ -0,0 +1,162 @@
+"""
+Benchmark of feed parsing: feedparser on the whole document against
+helpers/feed_stream.py stopping after the entries the news cog reads.
+
+The news cog reads at most PARSE_ENTRIES entries of a feed (and
+fetch_news_from_rss only limit * 3), but feedparser builds every entry of
+the document. By default this runs on a generated homepage-style feed of a
+few hundred entries with image media and HTML descriptions; pass saved feed
+documents to measure real feeds instead:
+
+    curl -s https://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml -o nyt.xml
+    python -m tests.simulation.feed_benchmark nyt.xml
+
+It also times parse_article_date's old path (email.utils, then a series of
+strptime formats) against the precompiled fast path on the entries' dates.
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, List, Optional
+
+import feedparser
+
+from helpers import feed_stream
+from helpers.feeds import PARSE_ENTRIES
+
+LEGACY_FORMATS = [
+    "%a, %d %b %Y %H:%M:%S %z",
+    "%a, %d %b %Y %H:%M:%S %Z",
+    "%a, %d %b %Y %H:%M:%S GMT",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+]
+
+
+def sample_feed(items: int = 300) -> bytes:
+    """A large RSS 2.0 homepage feed: media thumbnails, HTML descriptions, RFC 822 and ISO dates."""
+    now = 1_736_000_000
+    body = []
+    for number in range(items):
+        date = (formatdate(now - number * 600, usegmt=True) if number % 2
+                else datetime.fromtimestamp(now - number * 600, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
+        date_tag = f"<pubDate>{date}</pubDate>" if number % 2 else f"<dc:date>{date}</dc:date>"
+        body.append(
+            f"<item><title>Story number {number} about something that happened today</title>"
+            f"<link>https://news.example.org/2025/01/story-{number}.html</link>"
+            f'<guid isPermaLink="false">story-{number}</guid>{date_tag}'
+            f'<media:thumbnail url="https://static.example.org/images/{number}.jpg" width="240" height="135"/>'
+            f"<description>&lt;p&gt;{'A paragraph of the story with &lt;a href=&quot;https://example.org&quot;&gt;a link&lt;/a&gt;. ' * 6}&lt;/p&gt;</description>"
+            f"<category>World</category><dc:creator>Staff</dc:creator></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        "<channel><title>Example News</title><link>https://news.example.org/</link>"
+        + "".join(body) + "</channel></rss>"
+    ).encode()
+
+
+def load_feeds(paths: List[str]) -> List[bytes]:
+    """Saved feed documents, or the generated sample."""
+    if not paths:
+        return [sample_feed()]
+    feeds = []
+    for path in paths:
+        with open(path, "rb") as file:
+            feeds.append(file.read())
+    return feeds
+
+
+def legacy_date(value: str) -> Optional[datetime]:
+    """parse_article_date before the fast path."""
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        pass
+    for fmt in LEGACY_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def fast_date(value: str) -> Optional[datetime]:
+    """parse_article_date's fast path, falling back to the old one."""
+    return feed_stream.parse_date(value) or legacy_date(value)
+
+
+def best_time(function: Callable, repeat: int) -> float:
+    """Best-of-three seconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best
+
+
+def run(feeds: List[bytes], limit: int = PARSE_ENTRIES, repeat: int = 5) -> dict:
+    """
+    Time both parsers and both date paths.
+
+    Returns:
+        {"feeds", "bytes", "entries", "feedparser_ms", "streaming_all_ms", "streaming_ms", "speedup",
+         "dates", "legacy_date_us", "fast_date_us", "date_speedup"}
+    """
+    full = best_time(lambda: [feedparser.parse(feed) for feed in feeds], repeat)
+    streamed_all = best_time(lambda: [feed_stream.parse(feed, len(feed)) for feed in feeds], repeat)
+    streamed = best_time(lambda: [feed_stream.parse(feed, limit) for feed in feeds], repeat)
+
+    dates = [
+        entry.get("published") or entry.get("updated")
+        for feed in feeds for entry in feedparser.parse(feed).entries
+    ]
+    dates = [date for date in dates if date]
+    date_repeat = max(repeat * 20, 1)
+    old = best_time(lambda: [legacy_date(date) for date in dates], date_repeat) / max(len(dates), 1)
+    new = best_time(lambda: [fast_date(date) for date in dates], date_repeat) / max(len(dates), 1)
+    return {
+        "feeds": len(feeds),
+        "bytes": sum(len(feed) for feed in feeds),
+        "entries": limit,
+        "feedparser_ms": full * 1e3,
+        "streaming_all_ms": streamed_all * 1e3,
+        "streaming_ms": streamed * 1e3,
+        "speedup": full / streamed,
+        "dates": len(dates),
+        "legacy_date_us": old * 1e6,
+        "fast_date_us": new * 1e6,
+        "date_speedup": old / new if new else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark feed parsing and date parsing.")
+    parser.add_argument("feeds", nargs="*", help="saved RSS/Atom documents (default: generated sample)")
+    parser.add_argument("--limit", type=int, default=PARSE_ENTRIES, help="entries the streaming parser reads")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    result = run(load_feeds(args.feeds), args.limit, args.repeat)
+    print(f"{result['feeds']} feeds, {result['bytes'] / 1024:.0f} KB, first {result['entries']} entries")
+    print(f"feedparser (whole document): {result['feedparser_ms']:8.1f} ms")
+    print(f"streaming (whole document):  {result['streaming_all_ms']:8.1f} ms")
+    print(f"streaming (stops early):     {result['streaming_ms']:8.1f} ms")
+    print(f"speedup:                     {result['speedup']:8.1f}x")
+    print(f"{result['dates']} dates")
+    print(f"email.utils + strptime:      {result['legacy_date_us']:8.1f} us/date")
+    print(f"precompiled fast path:       {result['fast_date_us']:8.1f} us/date")
+    print(f"speedup:                     {result['date_speedup']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+"""
+Scheduler simulation harness.
+
+Builds N synthetic guilds with daily schedules across every scheduled feature,
+stores them in a real in-memory SQLite database created from schema.sql, and
+drives the real task loop bodies through a virtual clock. Zones include DST
+changes, half-hour offsets and legacy integer offsets.
+
+What is real: the cogs, their loop bodies, the database queries and last-post
+updates, scheduling/ScheduleBatch/SlotPlanner. What is mocked: Discord
+(guilds and channels are mocks), the Anthropic client, and each cog's
+"post" method, which is replaced by a recorder that logs the delivery time
+(and reproduces the database write where the real post method does it).
+
+The report covers missed posts, duplicate posts, posts outside their window,
+the lateness distribution and the CPU time spent in the loops per simulated
+day, so scheduler changes can be measured offline.
+
+Usage:
+    python -m tests.simulation.harness --guilds 10000 --days 3 --start 2025-03-08
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import os
+import random
+import sys
+import time as clock
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from unittest.mock import AsyncMock, Mock, patch
+
+import aiosqlite
+from discord.ext import tasks
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+from database import DatabaseManager
+from helpers import scheduling
+from helpers.load_shaping import SlotPlanner
+
+# Zone mix: DST in both hemispheres, half-hour and 30-minute-DST zones, and
+# offset-only rows (zone None) as left behind by the timezone migration.
+ZONES = [
+    None, None,
+    "America/New_York", "America/Los_Angeles", "America/Sao_Paulo",
+    "Europe/London", "Europe/Berlin", "Asia/Kolkata", "Asia/Tokyo",
+    "Australia/Sydney", "Australia/Lord_Howe", "Pacific/Auckland",
+]
+
+# Round times most admins pick
+POPULAR_TIMES = ["08:00", "09:00", "09:00", "12:00", "18:00"]
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """How to seed, run and observe one scheduled feature."""
+
+    name: str
+    module: str
+    cog_class: str
+    loop: str
+    table: str
+    window_minutes: int
+    post_method: str
+    guild_arg: Callable[[tuple], int]
+    last_post_column: str = "last_post_date"
+    extra_columns: Tuple[Tuple[str, object], ...] = ()
+    post_result: object = None
+    after_post: Optional[str] = None
+
+
+FEATURES: Dict[str, FeatureSpec] = {
+    spec.name: spec for spec in [
+        FeatureSpec("affirmations", "cogs.affirmations", "Affirmations", "daily_affirmation_task",
+                    "affirmation_config", 15, "post_affirmation_to_server",
+                    lambda args: int(args[0]), post_result=True),
+        FeatureSpec("news", "cogs.news", "News", "daily_news_task",
+                    "news_config", 60, "post_news_to_server", lambda args: int(args[0])),
+        FeatureSpec("qotd", "cogs.vibes", "Vibes", "qotd_task",
+                    "qotd_schedule", 15, "post_qotd_to_server",
+                    lambda args: int(args[0]), post_result=(True, None)),
+        FeatureSpec("art", "cogs.art", "Art", "daily_art_task",
+                    "art_config", 15, "post_artwork_to_channel",
+                    lambda args: int(args[0]), post_result=True),
+        FeatureSpec("recipe", "cogs.recipe", "Recipe", "check_daily_recipes",
+                    "recipe_daily_config", 15, "post_daily_recipe",
+                    lambda args: int(args[0]), after_post="update_recipe_last_post"),
+        FeatureSpec("trivia", "cogs.trivia", "Trivia", "check_trivia_schedule",
+                    "trivia_config", 60, "post_scheduled_trivia", lambda args: int(args[0].id)),
+        FeatureSpec("creative", "cogs.creative", "Creative", "check_daily_prompts",
+                    "creative_config", 60, "post_daily_prompt", lambda args: int(args[0].id),
+                    last_post_column="last_daily_post",
+                    extra_columns=(("weekly_challenges_enabled", 0),)),
+    ]
+}
+
+
+@dataclass
+class Schedule:
+    """One synthetic schedule row and its expected fire instants."""
+
+    feature: str
+    guild_id: int
+    post_time: str
+    timezone_offset: int
+    zone: Optional[str]
+    fires: List[int] = field(default_factory=list)
+
+
+@dataclass
+class SimulationReport:
+    """Outcome of one simulation run."""
+
+    guilds: int
+    schedules: int
+    days: int
+    tick_seconds: int
+    expected: int = 0
+    delivered: int = 0
+    missed: int = 0
+    duplicates: int = 0
+    outside_window: int = 0
+    task_errors: int = 0
+    lateness: List[int] = field(default_factory=list)
+    cpu_seconds_per_day: List[float] = field(default_factory=list)
+    per_feature: Dict[str, Counter] = field(default_factory=dict)
+
+    def lateness_percentile(self, percentile: float) -> int:
+        """Lateness in seconds at a percentile (0-100) of delivered posts."""
+        if not self.lateness:
+            return 0
+        ordered = sorted(self.lateness)
+        return ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+
+    def format(self) -> str:
+        """Render the report as plain text."""
+        lines = [
+            f"{self.guilds:,} guilds, {self.schedules:,} schedules, {self.days} day(s), "
+            f"{self.tick_seconds}s ticks",
+            f"  expected posts   : {self.expected:,}",
+            f"  delivered        : {self.delivered:,}",
+            f"  missed           : {self.missed:,}",
+            f"  duplicates       : {self.duplicates:,}",
+            f"  outside window   : {self.outside_window:,}",
+            f"  task errors      : {self.task_errors:,}",
+            "  lateness (s)     : "
+            f"p50={self.lateness_percentile(50)} p95={self.lateness_percentile(95)} "
+            f"p99={self.lateness_percentile(99)} max={max(self.lateness, default=0)}",
+            "  CPU per day (s)  : " + ", ".join(f"{value:.2f}" for value in self.cpu_seconds_per_day),
+        ]
+        for name, counts in sorted(self.per_feature.items()):
+            lines.append(
+                f"    {name:<13} expected={counts['expected']:,} missed={counts['missed']:,} "
+                f"duplicates={counts['duplicates']:,}"
+            )
+        return "\n".join(lines)
+
+
+class VirtualClock:
+    """Unix-seconds clock that only moves when told to."""
+
+    def __init__(self, start: int) -> None:
+        self.now = start
+
+    def __call__(self) -> int:
+        return self.now
+
+
+class _CountingHandler(logging.Handler):
+    """Counts log records per level without printing them."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.DEBUG)
+        self.counts: Counter = Counter()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.counts[record.levelno] += 1
+
+
+class SimulatedBot:
+    """The parts of DiscordBot the scheduled loops touch."""
+
+    def __init__(self, database: DatabaseManager, planner: SlotPlanner) -> None:
+        self.database = database
+        self.slot_planner = planner
+        self.llm_client = _mock_llm_client()
+        self.log_counter = _CountingHandler()
+        self.logger = logging.getLogger("lumbergh.simulation")
+        self.logger.handlers = [self.log_counter]
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.wait_until_ready = AsyncMock()
+        self.user = Mock(id=1, name="SimulatedBot")
+
+    def is_scheduler_leader(self) -> bool:
+        return True
+
+    def get_guild(self, guild_id: int) -> Mock:
+        guild = Mock(id=guild_id)
+        guild.get_channel = lambda channel_id: Mock(id=channel_id, guild=guild)
+        return guild
+
+    def get_channel(self, channel_id: int) -> Mock:
+        return Mock(id=channel_id)
+
+
+def local_fire(zone_name: str, local_date: date, post_time: str) -> int:
+    """Independent oracle: the UTC instant of a local post time on a local date."""
+    hour, minute = map(int, post_time.split(":"))
+    zone = scheduling.get_zone(zone_name)
+    return int(datetime(local_date.year, local_date.month, local_date.day,
+                        hour, minute, tzinfo=zone).timestamp())
+
+
+def build_schedules(guilds: int, start: int, days: int, seed: int = 1,
+                    features: Optional[List[str]] = None, feature_share: float = 0.6) -> List[Schedule]:
+    """Generate schedules and the fire instants expected within the run."""
+    rng = random.Random(seed)
+    names = features or list(FEATURES)
+    start_day = datetime.fromtimestamp(start, timezone.utc).date()
+    schedules = []
+
+    for guild_id in range(1, guilds + 1):
+        for name in names:
+            if rng.random() > feature_share:
+                continue
+            post_time = (
+                rng.choice(POPULAR_TIMES) if rng.random() < 0.5
+                else f"{rng.randrange(24):02d}:{rng.randrange(0, 60, 5):02d}"
+            )
+            offset = rng.randint(-12, 14)
+            zone = rng.choice(ZONES)
+            schedule = Schedule(name, guild_id, post_time, offset, zone)
+            zone_name = scheduling.resolve_zone_name(zone, offset)
+            schedule.fires = sorted(
+                local_fire(zone_name, start_day + timedelta(days=delta), post_time)
+                for delta in range(-2, days + 2)
+            )
+            schedules.append(schedule)
+    return schedules
+
+
+async def seed_database(database: DatabaseManager, schedules: List[Schedule], start: int) -> None:
+    """Insert schedule rows, marking the slot before the run as already posted."""
+    by_feature: Dict[str, list] = defaultdict(list)
+    for schedule in schedules:
+        spec = FEATURES[schedule.feature]
+        previous = [fire for fire in schedule.fires if fire < start]
+        zone_name = scheduling.resolve_zone_name(schedule.zone, schedule.timezone_offset)
+        last_post = scheduling.get_local_date(zone_name, now=previous[-1]) if previous else None
+        by_feature[spec.name].append((
+            schedule.guild_id, schedule.guild_id * 10, schedule.post_time,
+            schedule.timezone_offset, schedule.zone, last_post,
+        ) + tuple(value for _, value in spec.extra_columns))
+
+    connection = database.connection
+    for name, rows in by_feature.items():
+        spec = FEATURES[name]
+        columns = ["server_id", "channel_id", "post_time", "timezone_offset", "timezone",
+                   spec.last_post_column] + [column for column, _ in spec.extra_columns]
+        await connection.executemany(
+            f"INSERT INTO {spec.table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            rows,
+        )
+        if name == "qotd":
+            await connection.executemany(
+                "INSERT INTO vibes_config (server_id, qotd_enabled) VALUES (?, 1)",
+                [(row[0],) for row in rows],
+            )
+    await connection.commit()
+
+
+def load_cogs(bot: SimulatedBot, names: List[str]) -> Dict[str, object]:
+    """Instantiate the cogs without starting their real background loops."""
+    cogs = {}
+    with patch.object(tasks.Loop, "start", Mock()):
+        for name in names:
+            spec = FEATURES[name]
+            cog_class = getattr(importlib.import_module(spec.module), spec.cog_class)
+            if cog_class not in [type(cog) for cog in cogs.values()]:
+                cog = cog_class(bot)
+            else:
+                cog = next(cog for cog in cogs.values() if type(cog) is cog_class)
+            cogs[name] = cog
+    return cogs
+
+
+def _mock_llm_client() -> AsyncMock:
+    """Anthropic client stand-in returning a canned response."""
+    client = AsyncMock()
+    client.messages.create = AsyncMock(return_value=Mock(content=[Mock(text="Simulated response.")]))
+    return client
+
+
+def install_recorders(bot: SimulatedBot, cogs: Dict[str, object], clock_: VirtualClock,
+                      deliveries: Dict[Tuple[str, int], List[int]]) -> None:
+    """Replace each cog's post method with one that records the delivery time."""
+    for name, cog in cogs.items():
+        spec = FEATURES[name]
+
+        async def recorder(*args, _spec=spec, **kwargs):
+            deliveries[(_spec.name, _spec.guild_arg(args))].append(clock_.now)
+            if _spec.after_post:
+                # Reproduce the database write the real post method makes
+                await getattr(bot.database, _spec.after_post)(args[0], args[-1])
+            return _spec.post_result
+
+        setattr(cog, spec.post_method, recorder)
+        if name == "art":
+            cog.fetch_met_artwork = AsyncMock(return_value={"title": "Simulated artwork"})
+            cog.fetch_art_institute_artwork = AsyncMock(return_value=None)
+
+
+def analyse(report: SimulationReport, schedules: List[Schedule],
+            deliveries: Dict[Tuple[str, int], List[int]], start: int, end: int) -> None:
+    """Match deliveries to expected fire instants."""
+    for schedule in schedules:
+        spec = FEATURES[schedule.feature]
+        window = spec.window_minutes * 60
+        counts = report.per_feature.setdefault(schedule.feature, Counter())
+        expected = [fire for fire in schedule.fires if fire >= start and fire + window <= end]
+        per_fire: Counter = Counter()
+
+        for delivered_at in deliveries.get((schedule.feature, schedule.guild_id), []):
+            report.delivered += 1
+            index = bisect_right(schedule.fires, delivered_at) - 1
+            if index < 0:
+                report.outside_window += 1
+                continue
+            fire = schedule.fires[index]
+            lateness = delivered_at - fire
+            if lateness > window:
+                report.outside_window += 1
+                continue
+            per_fire[fire] += 1
+            report.lateness.append(lateness)
+
+        duplicates = sum(count - 1 for count in per_fire.values() if count > 1)
+        missed = sum(1 for fire in expected if not per_fire[fire])
+        report.expected += len(expected)
+        report.duplicates += duplicates
+        report.missed += missed
+        counts.update(expected=len(expected), duplicates=duplicates, missed=missed)
+
+
+async def run_simulation(guilds: int = 1000, days: int = 2, start: str = "2025-03-08",
+                         tick_seconds: int = 60, seed: int = 1,
+                         features: Optional[List[str]] = None,
+                         planner: Optional[SlotPlanner] = None) -> SimulationReport:
+    """
+    Run the scheduled loops over a virtual time span.
+
+    Args:
+        guilds: Number of synthetic guilds
+        days: Number of simulated days
+        start: First simulated UTC day ("YYYY-MM-DD")
+        tick_seconds: Virtual time between loop runs (production loops tick every 60s)
+        seed: Random seed for the synthetic schedules
+        features: Features to simulate (default: all)
+        planner: SlotPlanner to use (default: unshaped)
+
+    Returns:
+        SimulationReport with delivery statistics and CPU time per day
+    """
+    names = features or list(FEATURES)
+    start_ts = int(datetime.strptime(start, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+    end_ts = start_ts + days * scheduling.SECONDS_PER_DAY
+
+    schedules = build_schedules(guilds, start_ts, days, seed, names)
+    report = SimulationReport(guilds, len(schedules), days, tick_seconds)
+
+    connection = await aiosqlite.connect(":memory:")
+    try:
+        with open(os.path.join(ROOT, "database", "schema.sql"), encoding="utf-8") as file:
+            await connection.executescript(file.read())
+        database = DatabaseManager(connection=connection)
+        await seed_database(database, schedules, start_ts)
+
+        bot = SimulatedBot(database, planner or SlotPlanner())
+        cogs = load_cogs(bot, names)
+        deliveries: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        virtual_clock = VirtualClock(start_ts)
+        install_recorders(bot, cogs, virtual_clock, deliveries)
+
+        loops = [(getattr(cogs[name], FEATURES[name].loop), cogs[name]) for name in names]
+        cpu_per_day = [0.0] * days
+
+        with patch.object(scheduling, "utc_timestamp", virtual_clock):
+            while virtual_clock.now < end_ts:
+                started = clock.process_time()
+                for loop, cog in loops:
+                    await loop.coro(cog)
+                cpu_per_day[(virtual_clock.now - start_ts) // scheduling.SECONDS_PER_DAY] += (
+                    clock.process_time() - started
+                )
+                virtual_clock.now += tick_seconds
+
+        report.cpu_seconds_per_day = cpu_per_day
+        report.task_errors = bot.log_counter.counts[logging.ERROR]
+        analyse(report, schedules, deliveries, start_ts, end_ts)
+    finally:
+        await connection.close()
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate the daily scheduled loops over virtual time.")
+    parser.add_argument("--guilds", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--start", default="2025-03-08", help="first UTC day (default spans US DST start)")
+    parser.add_argument("--tick", type=int, default=60, help="virtual seconds between loop runs")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--features", nargs="*", choices=sorted(FEATURES))
+    parser.add_argument("--capacity", type=int, default=0, help="SlotPlanner starts per minute")
+    parser.add_argument("--jitter", type=int, default=0, help="SlotPlanner max jitter in minutes")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_simulation(
+        guilds=args.guilds, days=args.days, start=args.start, tick_seconds=args.tick,
+        seed=args.seed, features=args.features,
+        planner=SlotPlanner(capacity_per_minute=args.capacity, max_jitter_minutes=args.jitter),
+    ))
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
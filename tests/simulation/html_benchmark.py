@@ -0,0 +1,119 @@
+"""
+Benchmark of feed entry cleaning: the old regex + BeautifulSoup path against
+helpers/html_extract.py.
+
+For every entry the news cog needs the description as plain text and an
+image (media fields first, then the first <img> of the description). The
+old path stripped tags with a regex and then built a BeautifulSoup tree of
+the same HTML to look for an <img>; the new one does both in a single scan.
+
+By default it runs on tests/simulation/data/feed_entries.json, sample entries
+in the markup styles of the default news sources. Pass saved feed documents
+to measure real feeds instead:
+
+    curl -s https://techcrunch.com/feed/ -o techcrunch.xml
+    python -m tests.simulation.html_benchmark techcrunch.xml
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from typing import Callable, List, Tuple
+
+import feedparser
+from bs4 import BeautifulSoup
+
+from cogs.news import News
+from helpers import html_extract
+
+SAMPLES = os.path.join(os.path.dirname(__file__), "data", "feed_entries.json")
+
+
+def load_entries(paths: List[str]) -> list:
+    """Feed entries from saved feed documents, or the bundled samples."""
+    if not paths:
+        with open(SAMPLES, encoding="utf-8") as file:
+            return [feedparser.FeedParserDict(entry) for entry in json.load(file)]
+    entries = []
+    for path in paths:
+        with open(path, "rb") as file:
+            entries.extend(feedparser.parse(file.read()).entries)
+    return entries
+
+
+def legacy(entry) -> Tuple[str, str]:
+    """The cog's previous clean_html and extract_image_from_entry."""
+    text = " ".join(re.sub(re.compile("<.*?>"), "", entry.get("summary", entry.get("description", ""))).split())
+    image = News.media_image_from_entry(entry)
+    html_content = entry.get("description", entry.get("summary", ""))
+    if not image and html_content:
+        img = BeautifulSoup(html_content, "html.parser").find("img")
+        if img:
+            image = img.get("src") or img.get("data-src", "")
+            if not image and img.get("srcset"):
+                image = img.get("srcset", "").split(",")[0].strip().split()[0]
+            if image and image.startswith("/"):
+                from urllib.parse import urlparse
+                parsed = urlparse(entry.get("link", ""))
+                if parsed.scheme and parsed.netloc:
+                    image = f"{parsed.scheme}://{parsed.netloc}{image}"
+    return text, image
+
+
+def single_pass(entry) -> Tuple[str, str]:
+    """The cog's current path (see News.entry_to_article)."""
+    media_image = News.media_image_from_entry(entry)
+    text, html_image = html_extract.extract(
+        entry.get("summary", entry.get("description", "")), base_url=entry.get("link", ""), image=not media_image
+    )
+    return text, media_image or html_image
+
+
+def time_per_entry(function: Callable, entries: list, repeat: int) -> float:
+    """Best-of-three seconds per entry."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for entry in entries:
+                function(entry)
+        best = min(best, (time.perf_counter() - started) / (repeat * len(entries)))
+    return best
+
+
+def run(entries: list, repeat: int = 50) -> dict:
+    """
+    Time both paths on the entries.
+
+    Returns:
+        {"entries", "legacy_us", "single_pass_us", "speedup", "images_legacy", "images_single_pass"}
+    """
+    old = time_per_entry(legacy, entries, repeat)
+    new = time_per_entry(single_pass, entries, repeat)
+    return {
+        "entries": len(entries),
+        "legacy_us": old * 1e6,
+        "single_pass_us": new * 1e6,
+        "speedup": old / new,
+        "images_legacy": sum(1 for entry in entries if legacy(entry)[1]),
+        "images_single_pass": sum(1 for entry in entries if single_pass(entry)[1]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark feed entry HTML cleaning.")
+    parser.add_argument("feeds", nargs="*", help="saved RSS/Atom documents (default: bundled samples)")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    result = run(load_entries(args.feeds), args.repeat)
+    print(f"{result['entries']} entries")
+    print(f"regex + BeautifulSoup: {result['legacy_us']:8.1f} us/entry, {result['images_legacy']} images")
+    print(f"single pass:           {result['single_pass_us']:8.1f} us/entry, {result['images_single_pass']} images")
+    print(f"speedup:               {result['speedup']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Throughput and latency benchmark for the shared Claude client.
+
+Sends a mix of the bot's request types (streamed /ask answers, trivia
+batches and single questions, recipes, news digests, conversation summaries,
+vision stories and short text posts) through a real LLMClient, including its
+connection pool, per-model limits and request scheduler, to a fake Messages
+API. Reports requests per second and the latency distribution per request
+type, plus time to first token for streams.
+
+Without --base-url an in-process fake API (tests/simulation/fake_anthropic.py)
+is started with the given latency, speed and error rates.
+
+Usage:
+    python -m tests.simulation.llm_benchmark --requests 500 --concurrency 50 --rate-429 0.02
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from helpers import conversation_summary, trivia_bank
+from helpers.llm_client import LLMClient
+from helpers.llm_scheduler import LLMScheduler, Priority, request_context
+from tests.simulation.fake_anthropic import FakeAnthropic, FakeConfig
+
+HAIKU = "claude-3-5-haiku-20241022"
+SONNET = "claude-sonnet-4-5-20250929"
+
+# 1x1 transparent PNG
+PIXEL = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+
+
+def text_request(prompt: str, model: str = HAIKU, max_tokens: int = 300) -> Dict[str, Any]:
+    return {"model": model, "max_tokens": max_tokens, "messages": [{"role": "user", "content": prompt}]}
+
+
+def vision_request() -> Dict[str, Any]:
+    return {
+        "model": SONNET,
+        "max_tokens": 600,
+        "messages": [{"role": "user", "content": [
+            {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": PIXEL}},
+            {"type": "text", "text": "Write 2-3 short paragraphs about this artwork."},
+        ]}],
+    }
+
+
+def ask_request(rng: random.Random) -> Dict[str, Any]:
+    turns = [{"role": "user" if n % 2 == 0 else "assistant", "content": [{"type": "text", "text": f"turn {n}"}]}
+             for n in range(rng.randrange(1, 20, 2))]
+    turns[-1]["content"][0]["cache_control"] = {"type": "ephemeral"}
+    return {"model": HAIKU, "max_tokens": 2048, "messages": turns}
+
+
+# name: (share of requests, priority, streamed, request builder)
+WORKLOAD: Dict[str, Tuple[float, Priority, bool, Callable[[random.Random], Dict[str, Any]]]] = {
+    "ask": (0.35, Priority.INTERACTIVE, True, ask_request),
+    "trivia-question": (0.10, Priority.USER, False, lambda rng: text_request(
+        "Generate a medium difficulty trivia question.\n\nFormat your response EXACTLY like this:\nQUESTION: [the question text]")),
+    "trivia-batch": (0.05, Priority.BACKGROUND, False, lambda rng: text_request(
+        trivia_bank.build_batch_prompt("science", "easy"), max_tokens=4096)),
+    "recipe": (0.10, Priority.USER, False, lambda rng: text_request(
+        "Generate a easy difficulty any cuisine recipe.\n\nFormat your response EXACTLY like this:\nRECIPE_NAME: [name]\nDIFFICULTY: easy",
+        max_tokens=2000)),
+    "news": (0.05, Priority.BACKGROUND, False, lambda rng: text_request(
+        "\n".join(f"Article {n}:\nTitle: Headline {n}\n" for n in range(1, 11))
+        + "\nRespond in this exact format for each article:\nArticle X | Category: [category] | Summary: [summary]",
+        max_tokens=2000)),
+    "summary": (0.05, Priority.BACKGROUND, False, lambda rng: text_request(
+        conversation_summary.build_summary_prompt(None, [(1, "user", "Hello", None)]),
+        max_tokens=conversation_summary.SUMMARY_MAX_TOKENS)),
+    "vision": (0.05, Priority.BACKGROUND, False, lambda rng: vision_request()),
+    "post": (0.25, Priority.BACKGROUND, False, lambda rng: text_request(
+        "Write a short uplifting affirmation.", max_tokens=150)),
+}
+
+
+@dataclass
+class Results:
+    """Latencies per request type."""
+
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    first_token: List[float] = field(default_factory=list)
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))] if ordered else 0.0
+
+
+async def send(client: LLMClient, name: str, rng: random.Random, results: Results) -> None:
+    """Send one request of the given type and record its latency."""
+    _, priority, streamed, build = WORKLOAD[name]
+    request = build(rng)
+    started = time.perf_counter()
+    with request_context(priority, guild_id=rng.randrange(50)):
+        try:
+            if streamed:
+                first = None
+                async with client.messages.stream(**request) as stream:
+                    async for _ in stream.text_stream:
+                        if first is None:
+                            first = time.perf_counter() - started
+                    await stream.get_final_message()
+                if first is not None:
+                    results.first_token.append(first)
+            else:
+                await client.messages.create(**request)
+        except Exception as e:
+            results.errors[f"{name}: {type(e).__name__}"] += 1
+            return
+    results.latencies[name].append(time.perf_counter() - started)
+
+
+async def run_benchmark(requests: int, concurrency: int, base_url: Optional[str] = None,
+                        config: Optional[FakeConfig] = None, max_retries: int = 2,
+                        requests_per_minute: int = 0, seed: int = 1) -> Tuple[Results, float]:
+    """
+    Send a request mix through an LLMClient and time it.
+
+    Args:
+        requests: Total requests
+        concurrency: Requests in flight at once
+        base_url: Messages API to use; None starts an in-process fake API
+        config: Fake API behaviour when it is started here
+        max_retries: Client retries after 429/5xx
+        requests_per_minute: Scheduler rate limit (0 = unlimited)
+        seed: Random seed for the request mix
+
+    Returns:
+        Results and the wall time in seconds
+    """
+    runner = None
+    if base_url is None:
+        runner = web.AppRunner(FakeAnthropic(config or FakeConfig(seed=seed)).app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        base_url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+    client = LLMClient(
+        "fake", max_connections=max(concurrency, 1), default_concurrency=concurrency,
+        scheduler=LLMScheduler(requests_per_minute=requests_per_minute),
+        base_url=base_url, max_retries=max_retries,
+    )
+    rng = random.Random(seed)
+    names = list(WORKLOAD)
+    weights = [WORKLOAD[name][0] for name in names]
+    mix = rng.choices(names, weights, k=requests)
+    results = Results()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def worker(name: str) -> None:
+        async with gate:
+            await send(client, name, rng, results)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(name) for name in mix))
+    finally:
+        elapsed = time.perf_counter() - started
+        await client.close()
+        if runner is not None:
+            await runner.cleanup()
+    return results, elapsed
+
+
+def report(results: Results, elapsed: float) -> str:
+    done = sum(len(values) for values in results.latencies.values())
+    lines = [f"{done} requests in {elapsed:.1f}s ({done / elapsed:.1f}/s), {sum(results.errors.values())} failed", ""]
+    lines.append(f"{'type':<16}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for name, values in sorted(results.latencies.items()):
+        lines.append(
+            f"{name:<16}{len(values):>7}{percentile(values, 0.5):>8.2f}s{percentile(values, 0.95):>8.2f}s"
+            f"{percentile(values, 0.99):>8.2f}s{max(values):>8.2f}s"
+        )
+    if results.first_token:
+        lines.append(f"\nTime to first token (ask): p50 {percentile(results.first_token, 0.5):.2f}s, "
+                     f"p95 {percentile(results.first_token, 0.95):.2f}s")
+    for error, count in sorted(results.errors.items()):
+        lines.append(f"error {error}: {count}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the shared Claude client against a fake API.")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--base-url", help="use a running fake API instead of starting one")
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--tokens-per-second", type=float, default=100.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-529", type=float, default=0.0)
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--requests-per-minute", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        latency=args.latency, jitter=args.jitter, tokens_per_second=args.tokens_per_second,
+        rate_429=args.rate_429, rate_529=args.rate_529, retry_after=0.5, seed=args.seed,
+    )
+    results, elapsed = asyncio.run(run_benchmark(
+        args.requests, args.concurrency, args.base_url, config, args.max_retries,
+        args.requests_per_minute, args.seed,
+    ))
+    print(report(results, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark of the daily schedule check: per-row helpers against the batched
+NumPy evaluator (helpers/schedule_batch.py).
+
+Generates synthetic schedule rows spread over the seven scheduled features
+(mixed IANA zones and legacy offsets, random post times and last-post dates)
+and times one due check over all of them with:
+
+  * legacy     - should_post_today() + should_post_now() per row (offsets only)
+  * per-row    - parse_time_string() + resolve_zone_name() + get_due_slot() per row
+  * batch      - ScheduleBatch build + due_by_feature()
+  * evaluate   - due_by_feature() on an already built ScheduleBatch
+
+The per-row and batch results are compared before timing is reported.
+
+Usage:
+    python -m tests.simulation.schedule_batch_benchmark --rows 100000 --repeat 3
+"""
+
+import argparse
+import random
+import time as clock
+from datetime import datetime, timezone
+
+from helpers import scheduling
+from helpers.schedule_batch import ScheduleBatch
+
+FEATURE_WINDOWS = {
+    "affirmations": 15,
+    "news": 60,
+    "qotd": 15,
+    "trivia": 60,
+    "creative": 60,
+    "recipe": 15,
+    "art": 15,
+}
+
+ZONES = [
+    None, None, None,  # offset-only rows, as left behind by the migration
+    "America/New_York", "America/Los_Angeles", "America/Sao_Paulo",
+    "Europe/London", "Europe/Berlin", "Asia/Kolkata", "Asia/Tokyo",
+    "Australia/Sydney", "Pacific/Auckland",
+]
+
+
+def generate_rows(count: int, now: int, seed: int = 42) -> dict:
+    """Generate schedule rows per feature: (server_id, post_time, offset, timezone, last_post_date)."""
+    rng = random.Random(seed)
+    today = datetime.fromtimestamp(now, timezone.utc).date().toordinal()
+    features = list(FEATURE_WINDOWS)
+    rows = {feature: [] for feature in features}
+
+    for server_id in range(count):
+        last_post = rng.choice([None, today - 2, today - 1, today])
+        rows[features[server_id % len(features)]].append((
+            server_id,
+            f"{rng.randrange(24):02d}:{rng.choice([0, 0, 15, 30, 45, rng.randrange(60)]):02d}",
+            rng.randint(-12, 14),
+            rng.choice(ZONES),
+            scheduling.ordinal_to_date_str(last_post) if last_post else None,
+        ))
+    return rows
+
+
+def run_legacy(rows: dict) -> int:
+    """Original per-row check against integer offsets."""
+    due = 0
+    for feature, feature_rows in rows.items():
+        window = FEATURE_WINDOWS[feature]
+        for _, post_time, offset, _, last_post in feature_rows:
+            target = scheduling.parse_time_string(post_time)
+            if (target and scheduling.should_post_today(last_post, offset)
+                    and scheduling.should_post_now(target, offset, window_minutes=window)):
+                due += 1
+    return due
+
+
+def run_per_row(rows: dict, now: int) -> dict:
+    """Zone-aware check one row at a time."""
+    result = {}
+    for feature, feature_rows in rows.items():
+        window = FEATURE_WINDOWS[feature]
+        due = []
+        for index, (_, post_time, offset, zone, last_post) in enumerate(feature_rows):
+            target = scheduling.parse_time_string(post_time)
+            if not target:
+                continue
+            slot = scheduling.get_due_slot(
+                target, scheduling.resolve_zone_name(zone, offset), last_post, window, now
+            )
+            if slot:
+                due.append((index, slot))
+        result[feature] = due
+    return result
+
+
+def build_batch(rows: dict) -> ScheduleBatch:
+    """Load every feature into one combined batch."""
+    return ScheduleBatch.combine([
+        ScheduleBatch.from_rows(
+            feature_rows, post_time_col=1, timezone_offset_col=2,
+            last_post_col=4, timezone_col=3,
+            window_minutes=FEATURE_WINDOWS[feature], feature=feature
+        )
+        for feature, feature_rows in rows.items()
+    ])
+
+
+def best_of(repeat: int, func, *args):
+    """Return (best wall time in seconds, last result)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = clock.perf_counter()
+        result = func(*args)
+        best = min(best, clock.perf_counter() - start)
+    return best, result
+
+
+def run(count: int = 100_000, repeat: int = 3) -> dict:
+    """
+    Time one due check over `count` generated schedules every way.
+
+    Returns:
+        {"rows", "zones", "due", "matches", "legacy_ms", "per_row_ms", "batch_ms", "evaluate_ms"}
+    """
+    # Pick a moment where plenty of schedules are inside their window
+    now = int(datetime(2025, 3, 30, 9, 5, tzinfo=timezone.utc).timestamp())
+    rows = generate_rows(count, now)
+
+    legacy_time, _ = best_of(repeat, run_legacy, rows)
+    per_row_time, per_row = best_of(repeat, run_per_row, rows, now)
+    batch_time, batch_result = best_of(repeat, lambda: build_batch(rows).due_by_feature(now))
+    batch = build_batch(rows)
+    evaluate_time, _ = best_of(repeat, batch.due_by_feature, now)
+    return {
+        "rows": count,
+        "zones": len(batch.zones),
+        "due": sum(len(entries) for entries in batch_result.values()),
+        "matches": batch_result == per_row,
+        "legacy_ms": legacy_time * 1e3,
+        "per_row_ms": per_row_time * 1e3,
+        "batch_ms": batch_time * 1e3,
+        "evaluate_ms": evaluate_time * 1e3,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the daily schedule check.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    result = run(args.rows, args.repeat)
+    assert result["matches"], "batched evaluator disagrees with get_due_slot"
+    per_row = result["per_row_ms"]
+    print(f"{result['rows']:,} schedules in {result['zones']} distinct zones, {result['due']:,} due")
+    print(f"  legacy per-row (offsets) : {result['legacy_ms']:9.1f} ms")
+    print(f"  per-row get_due_slot     : {per_row:9.1f} ms")
+    print(f"  batch build + evaluate   : {result['batch_ms']:9.1f} ms  ({per_row / result['batch_ms']:.1f}x)")
+    print(f"  batch evaluate only      : {result['evaluate_ms']:9.1f} ms  ({per_row / result['evaluate_ms']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""Tests for the news digest delivery benchmark."""
+from tests.simulation.embed_benchmark import run
+
+
+class TestEmbedBenchmark:
+    """Tests for packed digest delivery against one message per article."""
+
+    def test_fewer_calls_and_faster(self):
+        """Test a 40-article digest needs a handful of messages and isn't held up by the rate limit."""
+        result = run(40)
+        assert result["legacy_messages"] == 42
+        assert result["batched_messages"] <= 8
+        assert result["batched_calls"] < result["legacy_calls"] / 4
+        assert result["batched_seconds"] < result["legacy_seconds"] / 10
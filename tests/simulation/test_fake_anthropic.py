@@ -0,0 +1,105 @@
+"""Tests running the real Claude client and cogs against the fake Messages API."""
+from unittest.mock import Mock, patch
+
+import anthropic
+import pytest
+from aiohttp import web
+from discord.ext import tasks
+
+from cogs.recipe import Recipe
+from helpers import trivia_bank
+from helpers.llm_client import LLMClient
+from tests.simulation.fake_anthropic import FakeAnthropic, FakeConfig
+from tests.simulation.llm_benchmark import run_benchmark
+
+HAIKU = "claude-3-5-haiku-20241022"
+
+
+@pytest.fixture
+async def fake_api():
+    """Fake API on a free local port, returning (server, base URL)."""
+    servers = []
+
+    async def start(**options):
+        server = FakeAnthropic(FakeConfig(latency=0, jitter=0, tokens_per_second=0, seed=3, **options))
+        runner = web.AppRunner(server.app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        servers.append(runner)
+        return server, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+    yield start
+    for runner in servers:
+        await runner.cleanup()
+
+
+class TestFakeAnthropic:
+    """End-to-end requests through LLMClient."""
+
+    @pytest.mark.filterwarnings("ignore::DeprecationWarning")
+    async def test_trivia_batch_parses(self, fake_api):
+        """Test a batch request returns a JSON array the trivia bank accepts."""
+        _, base_url = await fake_api()
+        client = LLMClient("fake", base_url=base_url, max_retries=0)
+        message = await client.messages.create(
+            model=HAIKU, max_tokens=4096,
+            messages=[{"role": "user", "content": trivia_bank.build_batch_prompt("science", "easy")}],
+        )
+        await client.close()
+        assert len(trivia_bank.parse_question_batch(message.content[0].text, "science", "easy")) == 20
+        assert message.usage.output_tokens > 0
+
+    @pytest.mark.filterwarnings("ignore::DeprecationWarning")
+    async def test_stream_and_cache_usage(self, fake_api):
+        """Test streaming yields text and a repeated cached prefix is reported as a cache read."""
+        server, base_url = await fake_api()
+        client = LLMClient("fake", base_url=base_url, max_retries=0)
+        request = {
+            "model": HAIKU, "max_tokens": 200,
+            "messages": [{"role": "user", "content": [
+                {"type": "text", "text": "Hello " * 100, "cache_control": {"type": "ephemeral"}},
+            ]}],
+        }
+        usages = []
+        for _ in range(2):
+            async with client.messages.stream(**request) as stream:
+                text = "".join([chunk async for chunk in stream.text_stream])
+                usages.append((await stream.get_final_message()).usage)
+        await client.close()
+
+        assert text
+        assert usages[0].cache_creation_input_tokens > 0
+        assert usages[1].cache_read_input_tokens == usages[0].cache_creation_input_tokens
+        assert server.stats.streams == 2
+
+    @pytest.mark.filterwarnings("ignore::DeprecationWarning")
+    async def test_injected_rate_limit(self, fake_api):
+        """Test injected 429s reach the client as rate limit errors."""
+        server, base_url = await fake_api(rate_429=1.0)
+        client = LLMClient("fake", base_url=base_url, max_retries=0)
+        with pytest.raises(anthropic.RateLimitError):
+            await client.messages.create(model=HAIKU, max_tokens=10, messages=[{"role": "user", "content": "hi"}])
+        await client.close()
+        assert server.stats.statuses == {429: 1}
+
+    @pytest.mark.filterwarnings("ignore::DeprecationWarning")
+    async def test_recipe_cog_parses_response(self, fake_api, mock_bot):
+        """Test the recipe cog parses the canned recipe instead of using its fallback."""
+        _, base_url = await fake_api()
+        mock_bot.llm_client = LLMClient("fake", base_url=base_url, max_retries=0)
+        with patch.object(tasks.Loop, "start", Mock()):
+            cog = Recipe(mock_bot)
+        recipe = await cog.generate_recipe(difficulty="easy")
+        await mock_bot.llm_client.close()
+        assert recipe["name"] == "Fake Garden Pasta"
+        assert len(recipe["instructions"]) == 3
+
+    @pytest.mark.filterwarnings("ignore::DeprecationWarning")
+    async def test_benchmark_runs(self):
+        """Test the benchmark sends the whole request mix without errors."""
+        results, elapsed = await run_benchmark(
+            40, 10, config=FakeConfig(latency=0, jitter=0, tokens_per_second=0, seed=1)
+        )
+        assert not results.errors
+        assert sum(len(values) for values in results.latencies.values()) == 40
+        assert results.first_token
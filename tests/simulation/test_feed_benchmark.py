@@ -0,0 +1,32 @@
+"""Tests for the feed parsing benchmark."""
+import feedparser
+
+from helpers import feed_stream
+from tests.simulation.feed_benchmark import fast_date, legacy_date, run, sample_feed
+
+
+class TestFeedBenchmark:
+    """Tests for the streaming parser and date fast path on the generated feed."""
+
+    def test_same_entries_as_feedparser(self):
+        """Test the streamed entries match feedparser's for the fields the news cog reads."""
+        feed = sample_feed(60)
+        streamed = feed_stream.parse(feed, 20)
+        full = feedparser.parse(feed)
+        assert streamed.feed.title == full.feed.title
+        assert len(streamed.entries) == 20
+        for ours, theirs in zip(streamed.entries, full.entries):
+            for key in ("id", "title", "link", "summary", "published", "media_thumbnail"):
+                assert ours.get(key) == theirs.get(key), key
+            if "published" not in theirs:
+                assert ours["updated"] == theirs["updated"]
+            assert fast_date(ours.get("published") or ours["updated"]) == legacy_date(
+                theirs.get("published") or theirs["updated"]
+            )
+
+    def test_faster(self):
+        """Test stopping early beats feedparser and the fast date path beats strptime."""
+        result = run([sample_feed(150)], limit=15, repeat=1)
+        assert result["streaming_ms"] < result["feedparser_ms"]
+        assert result["streaming_ms"] < result["streaming_all_ms"]
+        assert result["date_speedup"] > 1
@@ -0,0 +1,23 @@
+"""Tests for the feed HTML cleaning benchmark."""
+from tests.simulation.html_benchmark import legacy, load_entries, run, single_pass
+
+
+class TestHtmlBenchmark:
+    """Tests for the single-pass extractor on the sample feed entries."""
+
+    def test_same_text_as_before(self):
+        """Test the single pass keeps the old text, except for decoded entities, word breaks and scripts."""
+        for entry in load_entries([]):
+            html = entry.get("summary", entry.get("description", ""))
+            old, new = legacy(entry)[0], single_pass(entry)[0]
+            if "&" not in old and "><" not in html and "<script" not in html:
+                assert new == old
+
+    def test_faster_and_finds_usable_images(self):
+        """Test the single pass beats regex + BeautifulSoup and only returns http(s) images."""
+        entries = load_entries([])
+        result = run(entries, repeat=5)
+        assert result["speedup"] > 1
+        images = [single_pass(entry)[1] for entry in entries]
+        assert all(image.startswith("http") for image in images if image)
+        assert result["images_single_pass"] >= 6
@@ -0,0 +1,13 @@
+"""Tests for the daily schedule check benchmark."""
+from tests.simulation.schedule_batch_benchmark import run
+
+
+class TestScheduleBatchBenchmark:
+    """Tests for the batched evaluator on generated schedules."""
+
+    def test_same_result_and_faster(self):
+        """Test the batch finds exactly the per-row due slots, and evaluating a built batch is faster."""
+        result = run(20_000, repeat=1)
+        assert result["matches"]
+        assert result["due"] > 0
+        assert result["evaluate_ms"] < result["per_row_ms"]
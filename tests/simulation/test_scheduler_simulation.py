@@ -0,0 +1,75 @@
+"""Time-travel tests driving the real scheduled loops through the simulation harness."""
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+
+from helpers.load_shaping import SlotPlanner
+from tests.simulation.harness import (
+    Schedule,
+    SimulationReport,
+    analyse,
+    local_fire,
+    run_simulation,
+)
+
+# 2025-03-09 07:00 UTC is the US switch to daylight saving time
+DST_DAY = "2025-03-09"
+
+
+class TestSchedulerSimulation:
+    """End-to-end runs over a virtual clock."""
+
+    @pytest.mark.asyncio
+    async def test_every_feature_posts_once_across_dst(self):
+        """Test each schedule posts exactly once per day through a DST change."""
+        report = await run_simulation(guilds=60, days=1, start=DST_DAY, tick_seconds=300)
+
+        assert report.expected > 0
+        assert report.missed == 0
+        assert report.duplicates == 0
+        assert report.outside_window == 0
+        assert report.task_errors == 0
+        assert set(report.per_feature) == {
+            "affirmations", "news", "qotd", "art", "recipe", "trivia", "creative",
+        }
+        assert len(report.cpu_seconds_per_day) == 1
+
+    @pytest.mark.asyncio
+    async def test_capacity_limit_delays_within_window(self):
+        """Test a tight slot capacity delays posts but never drops them."""
+        report = await run_simulation(
+            guilds=80, days=1, start=DST_DAY, features=["news", "qotd"],
+            planner=SlotPlanner(capacity_per_minute=2, max_jitter_minutes=5),
+        )
+
+        assert report.missed == 0
+        assert report.duplicates == 0
+        assert report.outside_window == 0
+        assert max(report.lateness) > 0
+
+
+class TestAnalyse:
+    """Tests for matching deliveries to expected fire instants."""
+
+    def test_missed_duplicate_and_late(self):
+        """Test the oracle flags missing, repeated and out-of-window posts."""
+        fires = [local_fire("America/New_York", day, "09:00") for day in _days("2025-03-08", 3)]
+        schedule = Schedule("qotd", 1, "09:00", -5, "America/New_York", fires)
+        deliveries = defaultdict(list)
+        deliveries[("qotd", 1)] = [fires[0] + 60, fires[0] + 120, fires[1] + 3600]
+        report = SimulationReport(guilds=1, schedules=1, days=3, tick_seconds=60)
+
+        analyse(report, [schedule], deliveries, fires[0] - 60, fires[2] + 3600)
+
+        assert report.expected == 3
+        assert report.duplicates == 1
+        assert report.outside_window == 1
+        assert report.missed == 2
+        assert report.lateness == [60, 120]
+
+
+def _days(start, count):
+    """Consecutive dates starting at a "YYYY-MM-DD" string."""
+    first = date.fromisoformat(start)
+    return [first + timedelta(days=delta) for delta in range(count)]
@@ -0,0 +1,49 @@
+"""Unit tests for helpers/bloom.py Bloom filters."""
+from helpers.bloom import BloomFilter, KeyedBloomFilters
+
+
+class TestBloomFilter:
+    """Tests for BloomFilter."""
+
+    def test_no_false_negatives(self):
+        """Test every added item is reported as possibly present."""
+        bloom = BloomFilter(capacity=500)
+        items = [f"https://example.org/story-{number}" for number in range(500)]
+        for item in items:
+            bloom.add(item)
+        assert all(item in bloom for item in items)
+        assert bloom.full
+
+    def test_false_positive_rate(self):
+        """Test unseen items are rarely reported present at capacity."""
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for number in range(2000):
+            bloom.add(f"posted-{number}")
+        false_positives = sum(f"unseen-{number}" in bloom for number in range(10000))
+        assert false_positives < 250
+        assert "anything" not in BloomFilter()
+
+
+class TestKeyedBloomFilters:
+    """Tests for KeyedBloomFilters."""
+
+    def test_keys_are_separate(self):
+        """Test an item added under one key isn't reported under another."""
+        filters = KeyedBloomFilters()
+        assert filters.add("1", "a1")
+        assert filters.might_contain("1", "a1")
+        assert not filters.might_contain("2", "a1")
+        assert not filters.add("1", "a1")
+        assert len(filters) == 1
+
+        filters.clear()
+        assert not filters.might_contain("1", "a1")
+
+    def test_grows_past_capacity(self):
+        """Test a key that outgrows its filter keeps every item, and all its stages together stay near 1%."""
+        filters = KeyedBloomFilters(capacity=100, error_rate=0.01)
+        for number in range(2000):
+            filters.add("1", f"posted-{number}")
+        assert len(filters._filters["1"]) == 5
+        assert all(filters.might_contain("1", f"posted-{number}") for number in range(2000))
+        assert sum(filters.might_contain("1", f"unseen-{number}") for number in range(10000)) < 150
@@ -0,0 +1,131 @@
+"""Unit tests for helpers/conversation_actor.py conversation serialisation."""
+import asyncio
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import aiosqlite
+import pytest
+
+from database import DatabaseManager
+from helpers.conversation_actor import IDLE_SECONDS, ConversationActors, ConversationBusy
+
+SCHEMA = os.path.join(os.path.dirname(__file__), "..", "..", "database", "schema.sql")
+CHANNEL = 555
+
+
+@pytest.fixture
+async def database():
+    """In-memory database with the full schema."""
+    connection = await aiosqlite.connect(":memory:")
+    with open(SCHEMA, encoding="utf-8") as file:
+        await connection.executescript(file.read())
+    yield DatabaseManager(connection=connection)
+    await connection.close()
+
+
+@pytest.fixture
+def actors(database):
+    """Actor registry on the in-memory database."""
+    return ConversationActors(SimpleNamespace(database=database), queue_limit=2)
+
+
+async def ask(actors, order, name, user_id=None):
+    """Run one question-and-answer turn."""
+    actor = await actors.acquire(CHANNEL, user_id)
+    try:
+        order.append(f"{name} start")
+        await actors.add(CHANNEL, user_id or 7, "user", name)
+        await asyncio.sleep(0.01)
+        await actors.add(CHANNEL, user_id or 0, "assistant", f"answer to {name}")
+        order.append(f"{name} end")
+    finally:
+        actor.release()
+
+
+class TestConversationActors:
+    """Tests for ConversationActors."""
+
+    async def test_turns_run_in_order(self, actors):
+        """Test concurrent questions in one conversation never interleave."""
+        order = []
+        await asyncio.gather(*(ask(actors, order, name) for name in ("a", "b", "c")))
+        assert order == ["a start", "a end", "b start", "b end", "c start", "c end"]
+        roles = [row[1] for row in actors.get(CHANNEL).history()]
+        assert roles == ["user", "assistant"] * 3
+
+    async def test_busy_when_queue_full(self, actors):
+        """Test questions beyond the queue limit are turned away."""
+        first = await actors.acquire(CHANNEL)
+        waiting = [asyncio.create_task(actors.acquire(CHANNEL)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(ConversationBusy):
+            await actors.acquire(CHANNEL)
+
+        first.release()
+        for task in waiting:
+            (await task).release()
+
+    async def test_history_matches_database(self, actors, database):
+        """Test buffered history is what the database query returns, without reading it."""
+        await database.add_claude_message(CHANNEL, 7, "user", "before", 3)
+        shared = await actors.acquire(CHANNEL)
+        shared.release()
+        personal = await actors.acquire(CHANNEL, 42)
+        personal.release()
+        await ask(actors, [], "personal question", user_id=42)
+        await ask(actors, [], "shared question")
+
+        with patch.object(database, "get_conversation_window", side_effect=AssertionError("read")):
+            buffered_shared = shared.history()
+            buffered_personal = personal.history()
+        assert buffered_shared == await database.get_conversation_window(CHANNEL)
+        assert buffered_personal == await database.get_conversation_window(CHANNEL, user_id=42)
+        assert shared.questions == await database.get_total_messages(CHANNEL) == 3
+        assert shared.history(start_id=4)[0][2] == "shared question"
+
+    async def test_messages_written_while_loading_are_kept(self, actors, database):
+        """Test a message stored by another conversation during the first load isn't lost."""
+        actor = actors.get(CHANNEL)
+        actor.append((99, "user", "written during load", 4))
+        await actor.load(database)
+        assert actor.history() == [(99, "user", "written during load", 4)]
+        assert actor.questions == 1
+
+    async def test_out_of_order_messages_kept(self, actors):
+        """Test a message arriving after a newer one is inserted in row ID order, not dropped."""
+        actor = actors.get(CHANNEL)
+        actor.append((1, "user", "first", 1))
+        actor.append((3, "user", "third", 1))
+        actor.append((2, "assistant", "second", 1))
+        actor.append((2, "assistant", "second", 1))
+        assert [row[0] for row in actor.history()] == [1, 2, 3]
+        assert actor.questions == 2
+
+        with patch("helpers.conversation_actor.BUFFER_ROWS", 3):
+            full = ConversationActors(actors.bot, queue_limit=2).get(CHANNEL + 1)
+        for row_id in (2, 4, 6):
+            full.append((row_id, "user", str(row_id), 1))
+        full.append((1, "user", "too old", 1))
+        full.append((5, "assistant", "late", 1))
+        assert [row[0] for row in full.history()] == [4, 5, 6]
+
+    async def test_invalidate_reloads(self, actors, database):
+        """Test clearing history makes the next turn reload from the database."""
+        await ask(actors, [], "question")
+        await database.clear_conversation(CHANNEL)
+        actors.invalidate(CHANNEL)
+
+        actor = await actors.acquire(CHANNEL)
+        actor.release()
+        assert actor.history() == []
+        assert actor.questions == 0
+
+    async def test_idle_actors_dropped(self, database):
+        """Test conversations unused for a long time are removed from memory."""
+        now = [0.0]
+        actors = ConversationActors(SimpleNamespace(database=database), clock=lambda: now[0])
+        first = actors.get(CHANNEL)
+        now[0] += IDLE_SECONDS + 1
+        actors.get(CHANNEL + 1)
+        assert actors.get(CHANNEL) is not first
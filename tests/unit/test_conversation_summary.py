@@ -0,0 +1,129 @@
+"""Unit tests for the running summary of long Claude conversations."""
+import os
+from unittest.mock import AsyncMock, Mock
+
+import aiosqlite
+import pytest
+
+from cogs.claude import Claude
+from database import DatabaseManager
+from helpers.conversation_summary import build_summary_prompt, select_turns
+from helpers.prompt_cache import ConversationCache
+
+SCHEMA = os.path.join(os.path.dirname(__file__), "..", "..", "database", "schema.sql")
+CHANNEL = 555
+
+
+@pytest.fixture
+async def database():
+    """In-memory database with the full schema."""
+    connection = await aiosqlite.connect(":memory:")
+    with open(SCHEMA, encoding="utf-8") as file:
+        await connection.executescript(file.read())
+    yield DatabaseManager(connection=connection)
+    await connection.close()
+
+
+async def add_turns(database, count, user_id=7, tokens=10):
+    """Store count alternating questions and answers."""
+    for n in range(count):
+        role = "user" if n % 2 == 0 else "assistant"
+        await database.add_claude_message(CHANNEL, user_id, role, f"turn {n + 1}", tokens)
+
+
+class TestSelectTurns:
+    """Tests for select_turns function."""
+
+    def test_keeps_newest_within_budget(self):
+        """Test the oldest turns are dropped once the budget is full."""
+        rows = [(n, "user", f"turn {n}", 40) for n in range(1, 6)]
+        assert [row[0] for row in select_turns(rows, budget=100)] == [4, 5]
+
+    def test_oversized_turn_kept(self):
+        """Test the newest turn is kept even when it alone is over budget."""
+        assert select_turns([(1, "user", "big", 500)], budget=100) == [(1, "user", "big", 500)]
+
+    def test_prompt_includes_previous_summary(self):
+        """Test the existing summary and the transcript are both in the prompt."""
+        prompt = build_summary_prompt("Alice likes tea.", [(1, "user", "What about coffee?", None)])
+        assert "Current summary:\nAlice likes tea." in prompt
+        assert "User: What about coffee?" in prompt
+        assert "Current summary" not in build_summary_prompt(None, [(1, "assistant", "Hi", None)])
+
+
+class TestSummaryDatabase:
+    """Tests for the claude_summaries database methods."""
+
+    async def test_save_and_replace(self, database):
+        """Test a conversation keeps one summary that is replaced on refresh."""
+        assert await database.get_claude_summary(CHANNEL) is None
+        await database.save_claude_summary(CHANNEL, None, "first", 4, 2)
+        await database.save_claude_summary(CHANNEL, None, "second", 9, 3)
+        await database.save_claude_summary(CHANNEL, 7, "personal", 2, 1)
+
+        assert await database.get_claude_summary(CHANNEL) == {"summary": "second", "through_id": 9, "token_count": 3}
+        assert (await database.get_claude_summary(CHANNEL, 7))["summary"] == "personal"
+
+    async def test_range_and_clear(self, database):
+        """Test the range excludes both ends and clearing removes the summary."""
+        await add_turns(database, 6)
+        rows = await database.get_conversation_range(CHANNEL, after_id=1, before_id=5)
+        assert [row[0] for row in rows] == [2, 3, 4]
+
+        await database.save_claude_summary(CHANNEL, None, "summary", 4, 1)
+        assert await database.clear_conversation(CHANNEL) == 6
+        assert await database.get_claude_summary(CHANNEL) is None
+
+
+@pytest.fixture
+def claude_cog(mock_bot, database):
+    """Claude cog on a real database with a small history budget."""
+    mock_bot.database = database
+    mock_bot.llm_client = Mock()
+    cog = Claude(mock_bot)
+    cog.prompt_cache = ConversationCache(window_tokens=40, max_window_tokens=80)
+    cog.client.messages.create = AsyncMock(return_value=Mock(content=[Mock(text=" Updated summary ")]))
+    return cog
+
+
+class TestRefreshSummary:
+    """Tests for folding older turns into the running summary."""
+
+    async def test_folds_turns_before_window(self, claude_cog, database):
+        """Test turns older than the window are summarised up to the window start."""
+        await add_turns(database, 10)
+        history = await database.get_conversation_window(CHANNEL)
+        claude_cog.prompt_cache.build_messages(CHANNEL, None, history)
+        assert claude_cog.prompt_cache.window_start(CHANNEL) == 7
+
+        assert await claude_cog.refresh_summary(CHANNEL) is True
+        prompt = claude_cog.client.messages.create.await_args.kwargs["messages"][0]["content"]
+        assert "turn 6" in prompt and "turn 7" not in prompt
+        assert await database.get_claude_summary(CHANNEL) == {
+            "summary": "Updated summary", "through_id": 6, "token_count": 4,
+        }
+
+        # Already up to date: no second call
+        assert await claude_cog.refresh_summary(CHANNEL) is False
+        assert claude_cog.client.messages.create.await_count == 1
+
+    async def test_only_new_turns_are_read(self, claude_cog, database):
+        """Test a refresh passes the previous summary plus the turns it doesn't cover."""
+        await add_turns(database, 10)
+        await database.save_claude_summary(CHANNEL, None, "Earlier summary", 4, 3)
+        claude_cog.prompt_cache.build_messages(CHANNEL, None, await database.get_conversation_window(CHANNEL))
+
+        await claude_cog.refresh_summary(CHANNEL)
+        prompt = claude_cog.client.messages.create.await_args.kwargs["messages"][0]["content"]
+        assert "Earlier summary" in prompt
+        assert "turn 4" not in prompt and "turn 5" in prompt
+
+    async def test_failed_refresh_keeps_summary(self, claude_cog, database):
+        """Test an API error leaves the stored summary unchanged."""
+        await add_turns(database, 10)
+        await database.save_claude_summary(CHANNEL, None, "Earlier summary", 4, 3)
+        claude_cog.prompt_cache.build_messages(CHANNEL, None, await database.get_conversation_window(CHANNEL))
+        claude_cog.client.messages.create.side_effect = RuntimeError("overloaded")
+
+        assert await claude_cog.refresh_summary(CHANNEL) is False
+        assert (await database.get_claude_summary(CHANNEL))["through_id"] == 4
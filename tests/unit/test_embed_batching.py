@@ -0,0 +1,77 @@
+"""Unit tests for helpers/embed_batching.py embed packing and sending."""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import discord
+import pytest
+
+from helpers.embed_batching import MAX_CHARACTERS, MAX_EMBEDS, EmbedSender, pack
+
+
+def embed(size, number=0):
+    """Embed with `size` characters of text."""
+    return discord.Embed(title=str(number), description="x" * (size - len(str(number))))
+
+
+def rate_limited(retry_after=2.0):
+    """The exception discord.py raises for a 429 response."""
+    response = SimpleNamespace(status=429, reason="Too Many Requests", headers={"Retry-After": str(retry_after)})
+    return discord.HTTPException(response, "rate limited")
+
+
+class TestPack:
+    """Tests for pack()."""
+
+    def test_ten_embeds_per_message(self):
+        """Test small embeds fill messages ten at a time, in order."""
+        embeds = [embed(100, number) for number in range(25)]
+        messages = pack(embeds)
+        assert [len(message) for message in messages] == [MAX_EMBEDS, MAX_EMBEDS, 5]
+        assert [item for message in messages for item in message] == embeds
+
+    def test_total_characters(self):
+        """Test a message never carries more than MAX_CHARACTERS of embed text."""
+        embeds = [embed(1500, number) for number in range(9)]
+        messages = pack(embeds)
+        assert [len(message) for message in messages] == [4, 4, 1]
+        assert all(sum(len(item) for item in message) <= MAX_CHARACTERS for message in messages)
+
+    def test_oversized_embed_alone(self):
+        """Test an embed over the limit on its own still gets sent, alone."""
+        assert [len(message) for message in pack([embed(100), embed(7000), embed(100)])] == [1, 1, 1]
+        assert pack([]) == []
+
+
+class TestEmbedSender:
+    """Tests for EmbedSender."""
+
+    async def test_progress_per_message(self):
+        """Test each message is reported with how many embeds it carried."""
+        destination = Mock(send=AsyncMock(side_effect=lambda **kwargs: Mock(embeds=kwargs["embeds"])))
+        sender = EmbedSender(destination)
+        sent = [count async for _, count in sender.send([embed(100, number) for number in range(12)])]
+        assert sent == [10, 2]
+        assert sender.messages == destination.send.await_count == 2
+
+    async def test_rate_limit_retried(self):
+        """Test a 429 waits for Retry-After and sends the same message again."""
+        message = Mock()
+        destination = Mock(send=AsyncMock(side_effect=[rate_limited(1.5), message]))
+        sleep = AsyncMock()
+        sender = EmbedSender(destination, sleep=sleep)
+        assert await sender.send_all([embed(100)]) == [message]
+        sleep.assert_awaited_once_with(1.5)
+        assert sender.retries == 1
+        assert destination.send.await_args_list[0] == destination.send.await_args_list[1]
+
+    async def test_other_errors_raised(self):
+        """Test errors that aren't rate limits, and rate limits that don't clear, are raised."""
+        not_found = discord.HTTPException(SimpleNamespace(status=404, reason="Not Found"), "gone")
+        sender = EmbedSender(Mock(send=AsyncMock(side_effect=not_found)), sleep=AsyncMock())
+        with pytest.raises(discord.HTTPException):
+            await sender.send_all([embed(100)])
+
+        sender = EmbedSender(Mock(send=AsyncMock(side_effect=rate_limited())), attempts=2, sleep=AsyncMock())
+        with pytest.raises(discord.HTTPException):
+            await sender.send_all([embed(100)])
+        assert sender.retries == 1
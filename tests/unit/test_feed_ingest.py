@@ -0,0 +1,286 @@
+"""Unit tests for background feed ingestion (helpers/feed_ingest.py and the articles table)."""
+import asyncio
+import os
+import time
+from email.utils import formatdate
+from unittest.mock import AsyncMock, Mock, patch
+
+import aiosqlite
+import feedparser
+import pytest
+from discord.ext import tasks
+
+from cogs import news
+from cogs.news import News
+from database import DatabaseManager
+from helpers.feed_ingest import MAX_BACKOFF, MAX_INTERVAL, MIN_INTERVAL, START_INTERVAL, PollSchedule
+from helpers.feeds import FeedError
+
+SCHEMA = os.path.join(os.path.dirname(__file__), "..", "..", "database", "schema.sql")
+FEED_A = "https://example.org/a.rss"
+FEED_B = "https://example.org/b.rss"
+
+
+class Clock:
+    """Settable monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def rss(*items):
+    """Parsed feed with (guid, title, age in seconds) items."""
+    body = "".join(
+        f"<item><guid>{guid}</guid><title>{title}</title><link>https://example.org/{guid}</link>"
+        f"<description>&lt;p&gt;About {title}&lt;/p&gt;</description>"
+        f"<pubDate>{formatdate(time.time() - age, usegmt=True)}</pubDate></item>"
+        for guid, title, age in items
+    )
+    return feedparser.parse(f"<rss version='2.0'><channel><title>Example</title>{body}</channel></rss>")
+
+
+def article(guid, age=0, feed_title="Example"):
+    return {
+        "id": guid, "title": guid, "link": "", "description": "", "image": None,
+        "source": feed_title, "published": "", "published_at": int(time.time()) - age,
+    }
+
+
+@pytest.fixture
+async def database():
+    """In-memory database with the full schema."""
+    connection = await aiosqlite.connect(":memory:")
+    with open(SCHEMA, encoding="utf-8") as file:
+        await connection.executescript(file.read())
+    yield DatabaseManager(connection=connection)
+    await connection.close()
+
+
+class FakeCache:
+    """Feed cache returning canned feeds (or raising canned errors) after an optional delay."""
+
+    def __init__(self, feeds, delays=None, modified=None):
+        self.feeds = feeds
+        self.delays = delays or {}
+        self.modified = modified or {}
+        self.requested = []
+
+    async def get(self, url, max_age=None, allow_stale=True):
+        self.requested.append(url)
+        await asyncio.sleep(self.delays.get(url, 0))
+        if isinstance(self.feeds[url], Exception):
+            raise self.feeds[url]
+        return self.feeds[url]
+
+    def last_modified(self, url):
+        return self.modified.get(url)
+
+
+class TestPollSchedule:
+    """Tests for PollSchedule."""
+
+    def test_new_feeds_due(self):
+        """Test feeds never polled are due, polled ones wait for their interval."""
+        clock = Clock()
+        schedule = PollSchedule(clock=clock)
+        assert schedule.due([FEED_A, FEED_B, FEED_A]) == [FEED_A, FEED_B]
+        schedule.record(FEED_A, 3)
+        assert schedule.due([FEED_A, FEED_B]) == [FEED_B]
+        assert schedule.seen(FEED_A) and not schedule.seen(FEED_B)
+        clock.now += START_INTERVAL
+        assert schedule.due([FEED_A]) == [FEED_A]
+
+    def test_interval_adapts(self):
+        """Test busy feeds are polled more often and quiet ones less, within bounds."""
+        schedule = PollSchedule(clock=Clock())
+        for _ in range(10):
+            schedule.record(FEED_A, 2)
+            schedule.record(FEED_B, 0)
+        assert schedule.feeds[FEED_A].interval == MIN_INTERVAL
+        assert schedule.feeds[FEED_B].interval == MAX_INTERVAL
+
+    def test_failing_feed_backs_off(self):
+        """Test each failure doubles the interval up to the backoff limit, and a success resets it."""
+        schedule = PollSchedule(clock=Clock())
+        intervals = [schedule.record(FEED_A, 0, error="HTTP 404") for _ in range(8)]
+        assert intervals[:3] == [START_INTERVAL * 2, START_INTERVAL * 4, START_INTERVAL * 8]
+        assert intervals[-1] == MAX_BACKOFF
+        poll = schedule.feeds[FEED_A]
+        assert (poll.status, poll.failures, poll.errors, poll.last_error) == ("failing", 8, 8, "HTTP 404")
+
+        assert schedule.record(FEED_A, 1, latency=0.2) == MAX_INTERVAL
+        assert (poll.status, poll.failures, poll.error_rate) == ("ok", 0, 8 / 9)
+
+    def test_update_cadence(self):
+        """Test Last-Modified times of polls with new articles give the update cadence, which caps the interval."""
+        schedule = PollSchedule(clock=Clock())
+        schedule.record(FEED_A, 2, last_modified=1000.0)
+        schedule.record(FEED_A, 0, last_modified=5000.0)  # no new articles: not an update
+        schedule.record(FEED_A, 1, last_modified=1600.0)
+        poll = schedule.feeds[FEED_A]
+        assert poll.update_interval == 600.0
+        for _ in range(10):
+            schedule.record(FEED_A, 0)
+        assert poll.interval == 600.0
+
+    def test_slow_feed_status(self):
+        """Test a feed averaging over SLOW_FEED_SECONDS is reported slow."""
+        schedule = PollSchedule(clock=Clock())
+        schedule.record(FEED_A, 0, latency=0.1)
+        assert schedule.feeds[FEED_A].status == "ok"
+        for _ in range(5):
+            schedule.record(FEED_A, 0, latency=20.0)
+        assert schedule.feeds[FEED_A].status == "slow"
+
+    def test_forget_removed_feeds(self):
+        """Test feeds no longer configured are dropped."""
+        schedule = PollSchedule(clock=Clock())
+        schedule.record(FEED_A, 0)
+        schedule.record(FEED_B, 0)
+        schedule.forget([FEED_B])
+        assert list(schedule.feeds) == [FEED_B]
+
+
+class TestArticlesTable:
+    """Tests for storing and reading ingested articles."""
+
+    async def test_add_articles_deduplicates(self, database):
+        """Test an article already stored for a feed is not stored again."""
+        assert await database.add_articles(FEED_A, [article("1"), article("2")]) == 2
+        assert await database.add_articles(FEED_A, [article("2"), article("3")]) == 1
+        assert await database.get_known_article_ids(FEED_A, ["1", "3", "9"]) == {"1", "3"}
+
+    async def test_recent_articles_per_feed(self, database):
+        """Test the newest articles in the window are returned, a few per feed."""
+        await database.add_articles(FEED_A, [article("old", age=5 * 86400), article("a1", 60), article("a2", 30),
+                                             article("a3", 10)])
+        await database.add_articles(FEED_B, [article("b1", 20)])
+        recent = await database.get_recent_articles([FEED_A, FEED_B], int(time.time()) - 86400, per_feed=2)
+        assert [(row["feed_url"], row["id"]) for row in recent] == [(FEED_A, "a3"), (FEED_A, "a2"), (FEED_B, "b1")]
+
+        assert await database.cleanup_ingested_articles(int(time.time()) - 86400) == 1
+
+
+class TestNewsIngest:
+    """Tests for the news cog building digests from ingested articles."""
+
+    @pytest.fixture
+    def cog(self, mock_bot, database):
+        mock_bot.database = database
+        with patch.object(tasks.Loop, "start", Mock()):
+            cog = News(mock_bot)
+        return cog
+
+    async def test_ingest_and_digest(self, cog, database):
+        """Test new feeds are ingested on first use and posted stories are skipped."""
+        cog.feed_cache = FakeCache({
+            FEED_A: rss(("a1", "First", 60), ("a2", "Second", 120), ("a3", "Third", 180)),
+            FEED_B: rss(("b1", "Other", 60), ("old", "Old", 5 * 86400)),
+        })
+        await database.mark_article_posted(1, "a1")
+
+        articles = await cog.gather_recent_articles(1, [("Alpha", FEED_A), ("Beta", FEED_B)])
+        assert [(item["source"], item["id"], item["article_type"]) for item in articles] == [
+            ("Alpha", "a2", "📰 Recent"), ("Alpha", "a3", "⭐ Popular"), ("Beta", "b1", "📰 Recent"),
+        ]
+        assert articles[0]["description"] == "About Second"
+
+        # Already ingested feeds are read from the table without polling them again
+        cog.feed_cache.requested.clear()
+        await cog.gather_recent_articles(2, [("Alpha", FEED_A)])
+        assert cog.feed_cache.requested == []
+
+    async def test_posted_filter_skips_queries(self, cog, database):
+        """Test only articles a guild's posted filter may hold are looked up in the database."""
+        cog.feed_cache = FakeCache({FEED_A: rss(("a1", "First", 60), ("a2", "Second", 120))})
+        await database.mark_article_posted(1, "a1")
+        await cog.gather_recent_articles(1, [("Alpha", FEED_A)])
+
+        with patch.object(database, "get_posted_article_ids", wraps=database.get_posted_article_ids) as lookup:
+            articles = await cog.gather_recent_articles(1, [("Alpha", FEED_A)])
+            assert [item["id"] for item in articles] == ["a2"]
+            assert lookup.await_args.args == (1, ["a1"])
+
+            lookup.reset_mock()
+            assert len(await cog.gather_recent_articles(2, [("Alpha", FEED_A)])) == 2
+            lookup.assert_not_awaited()
+
+    async def test_posted_articles_task(self, cog, database):
+        """Test the leader removes old posted records and the filters pick up other replicas' posts."""
+        await database.connection.execute(
+            "INSERT INTO posted_articles (server_id, article_id, posted_at) VALUES (1, 'old', datetime('now', '-40 days'))"
+        )
+        await database.mark_article_posted(1, "kept")
+        cog.bot.is_scheduler_leader = Mock(return_value=True)
+
+        await cog.posted_articles_task()
+        assert await database.get_posted_article_ids(1, ["old", "kept"]) == {"kept"}
+        assert cog.posted_filters.might_contain("1", "kept")
+        assert not cog.posted_filters.might_contain("1", "old")
+        assert cog.posted_rebuild_due > time.time()
+
+        # Between rebuilds, posts made elsewhere are loaded incrementally
+        await database.mark_article_posted(2, "elsewhere")
+        await cog.posted_articles_task()
+        assert cog.posted_filters.might_contain("2", "elsewhere")
+
+    async def test_reingest_only_new_entries(self, cog):
+        """Test a second poll only normalises and stores entries it hasn't seen."""
+        cog.feed_cache = FakeCache({FEED_A: rss(("a1", "First", 60))})
+        assert await cog.ingest_feeds([FEED_A]) == 1
+
+        cog.feed_cache.feeds[FEED_A] = rss(("a1", "First", 60), ("a2", "Second", 30))
+        with patch.object(cog, "entry_to_article", wraps=cog.entry_to_article) as normalise:
+            assert await cog.ingest_feeds([FEED_A]) == 1
+        assert normalise.call_count == 1
+
+    async def test_slow_feed_does_not_hold_up_digest(self, cog, database):
+        """Test a digest is built from the fast feeds while a slow first poll finishes in the background."""
+        cog.feed_cache = FakeCache(
+            {FEED_A: rss(("a1", "First", 60)), FEED_B: rss(("b1", "Other", 60))}, delays={FEED_B: 0.5}
+        )
+        with patch.object(news, "FIRST_INGEST_TIMEOUT", 0.1):
+            articles = await cog.gather_recent_articles(1, [("Alpha", FEED_A), ("Beta", FEED_B)])
+        assert [item["id"] for item in articles] == ["a1"]
+        assert len(cog.pending_ingests) == 1
+
+        await asyncio.gather(*cog.pending_ingests)
+        assert not cog.pending_ingests
+        assert await database.get_known_article_ids(FEED_B, ["b1"]) == {"b1"}
+
+    async def test_feed_health_recorded(self, cog, database):
+        """Test each poll stores the feed's statistics, including failures."""
+        cog.feed_cache = FakeCache(
+            {FEED_A: rss(("a1", "First", 60)), FEED_B: FeedError("HTTP 404")},
+            modified={FEED_A: "Mon, 01 Jan 2024 10:00:00 GMT"},
+        )
+        for _ in range(3):
+            await cog.ingest_feeds([FEED_A, FEED_B])
+
+        health = await database.get_feed_health([FEED_A, FEED_B])
+        assert health[FEED_A]["status"] == "ok"
+        assert health[FEED_A]["polls"] == 3
+        assert health[FEED_A]["latency_ms"] is not None
+        assert health[FEED_B]["status"] == "failing"
+        assert (health[FEED_B]["errors"], health[FEED_B]["last_error"]) == (3, "HTTP 404")
+        assert health[FEED_B]["next_poll_at"] > health[FEED_A]["next_poll_at"]
+        assert await database.count_recent_articles([FEED_A, FEED_B], int(time.time()) - 86400) == {FEED_A: 1}
+
+    async def test_admin_feeds_view(self, cog):
+        """Test /news-admin feeds lists each source with its health."""
+        cog.feed_cache = FakeCache({FEED_A: rss(("a1", "First", 60)), FEED_B: FeedError("HTTP 404")})
+        await cog.ingest_feeds([FEED_A, FEED_B])
+        await cog.bot.database.add_news_source(1, "Alpha", FEED_A)
+        await cog.bot.database.add_news_source(1, "Beta", FEED_B)
+        await cog.bot.database.add_news_source(1, "Gamma", "https://example.org/c.rss")
+        ctx = Mock(guild=Mock(id=1), send=AsyncMock())
+
+        await cog._admin_feeds(ctx)
+        lines = ctx.send.await_args.kwargs["embed"].description.splitlines()
+        assert lines[0].startswith("✅ **Alpha** - ") and "0% errors" in lines[0]
+        assert lines[1].startswith("⚠️ **Beta** - no successful poll • 100% errors")
+        assert lines[2] == "   └─ 1 failed polls in a row: HTTP 404"
+        assert lines[3] == "⏳ **Gamma** - not polled yet"
@@ -0,0 +1,92 @@
+"""Unit tests for helpers/feed_stream.py streaming feed parsing."""
+from datetime import datetime, timedelta, timezone
+
+import feedparser
+import pytest
+
+from helpers.feed_stream import StreamParseError, parse, parse_date
+
+RSS = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel><title>News &amp; More</title>
+<item><title>First &amp; best</title><link>/stories/1</link><guid isPermaLink="false">1</guid>
+<description>&lt;p&gt;Hello&lt;/p&gt;</description><pubDate>Mon, 06 Jan 2025 14:30:00 GMT</pubDate>
+<media:group><media:content url="https://example.org/1.jpg" medium="image"/></media:group>
+<enclosure url="https://example.org/1.mp3" type="audio/mpeg" length="10"/></item>
+<item><title>Second</title><guid>https://example.org/stories/2</guid></item>
+ITEMS</channel></rss>"""
+
+ATOM = b"""<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom News</title>
+<entry><id>tag:example.org,2025:1</id><title>One</title>
+<link rel="enclosure" type="image/png" href="https://example.org/1.png"/><link href="https://example.org/1"/>
+<content type="html">&lt;b&gt;Body&lt;/b&gt;</content><updated>2025-01-06T14:30:00+01:00</updated></entry>
+</feed>"""
+
+
+def rss(extra=b""):
+    return RSS.replace(b"ITEMS", extra)
+
+
+class TestParse:
+    """Tests for parse()."""
+
+    def test_rss_entries_match_feedparser(self):
+        """Test RSS entries have the values feedparser gives them."""
+        url = "https://example.org/feed.xml"
+        ours = parse(rss(), 10, url)
+        theirs = feedparser.parse(rss(), response_headers={"content-location": url})
+
+        assert (ours.feed.title, ours.version, ours.bozo) == ("News & More", "rss20", False)
+        assert len(ours.entries) == len(theirs.entries) == 2
+        for mine, reference in zip(ours.entries, theirs.entries):
+            for key in ("id", "title", "link", "summary", "published", "media_content", "enclosures"):
+                assert mine.get(key) == reference.get(key), key
+        assert ours.entries[1].link == "https://example.org/stories/2"
+
+    def test_atom_entries(self):
+        """Test Atom entries get their alternate link, content as summary and enclosure links."""
+        feed = parse(ATOM, 10)
+        entry = feed.entries[0]
+        assert (feed.feed.title, feed.version) == ("Atom News", "atom10")
+        assert (entry.id, entry.link, entry.summary, entry.updated) == (
+            "tag:example.org,2025:1", "https://example.org/1", "<b>Body</b>", "2025-01-06T14:30:00+01:00"
+        )
+        assert entry.enclosures[0].href == "https://example.org/1.png"
+
+    def test_stops_after_limit(self):
+        """Test the rest of the document isn't read once enough entries are parsed."""
+        feed = parse(rss(b"<item><title>Third</title></item><this is not XML"), 2)
+        assert [entry.title for entry in feed.entries] == ["First & best", "Second"]
+
+        with pytest.raises(StreamParseError):
+            parse(rss(b"<item><title>Third</title></item><this is not XML"), 4)
+
+    def test_rejects_what_feedparser_should_handle(self):
+        """Test HTML, unknown entities and other documents are left to feedparser."""
+        for body in (b"<html><body>Not a feed</body></html>", b"<rss><channel><title>&nbsp;</title></channel></rss>",
+                     b"", b"<rss version='2.0'></rss>"):
+            with pytest.raises(StreamParseError):
+                parse(body, 10)
+
+
+class TestParseDate:
+    """Tests for parse_date()."""
+
+    def test_rfc822(self):
+        """Test RFC 822 dates with numeric and named zones."""
+        assert parse_date("Mon, 06 Jan 2025 14:30:00 GMT") == datetime(2025, 1, 6, 14, 30, tzinfo=timezone.utc)
+        assert parse_date("6 Jan 2025 09:30:00 -0500") == datetime(2025, 1, 6, 14, 30, tzinfo=timezone.utc)
+        assert parse_date("Mon, 06 Jan 2025 09:30 EST").utcoffset() == timedelta(hours=-5)
+        assert parse_date("Mon, 06 Jan 2025 14:30:00").tzinfo is None
+
+    def test_iso8601(self):
+        """Test ISO 8601 dates with and without time, fraction and zone."""
+        assert parse_date("2025-01-06T14:30:00Z") == datetime(2025, 1, 6, 14, 30, tzinfo=timezone.utc)
+        assert parse_date("2025-01-06T15:30:00.5+01:00") == datetime(2025, 1, 6, 14, 30, 0, 500000,
+                                                                     tzinfo=timezone.utc)
+        assert parse_date("2025-01-06") == datetime(2025, 1, 6)
+
+    def test_other_formats_left_to_fallback(self):
+        """Test strings the fast path doesn't know return None."""
+        for value in ("Mon, 06 Jan 25 14:30:00 GMT", "Mon, 06 Jan 2025 14:30:00 CEST", "yesterday",
+                      "2025-02-30T00:00:00Z"):
+            assert parse_date(value) is None
@@ -0,0 +1,205 @@
+"""Unit tests for helpers/feeds.py non-blocking feed fetching."""
+import asyncio
+import threading
+from email.utils import formatdate
+from unittest.mock import Mock, patch
+
+import pytest
+from aiohttp import web
+from discord.ext import tasks
+
+from cogs.news import News
+from helpers import feeds
+from helpers.feeds import FeedCache, FeedError, FeedFetcher
+
+RSS = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0"><channel><title>Test Feed</title>
+<item><title>First story</title><link>https://example.org/1</link><guid>1</guid>
+<description>&lt;p&gt;Hello &lt;b&gt;world&lt;/b&gt;&lt;/p&gt;</description>
+<pubDate>PUBDATE</pubDate></item>
+<item><title>Old story</title><link>https://example.org/2</link><guid>2</guid>
+<pubDate>Mon, 01 Jan 2001 00:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+def rss_now() -> bytes:
+    return RSS.replace(b"PUBDATE", formatdate(usegmt=True).encode())
+
+
+@pytest.fixture
+async def feed_server():
+    """Local feed server that records how many requests were open at once."""
+    state = {"open": 0, "peak": 0, "delay": 0.0, "requests": 0, "status": 200}
+
+    async def feed(request):
+        state["requests"] += 1
+        state["open"] += 1
+        state["peak"] = max(state["peak"], state["open"])
+        try:
+            await asyncio.sleep(state["delay"])
+            if state["status"] != 200:
+                return web.Response(status=state["status"])
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.Response(body=rss_now(), content_type="application/rss+xml", headers={"ETag": '"v1"'})
+        finally:
+            state["open"] -= 1
+
+    async def missing(request):
+        return web.Response(status=404)
+
+    async def slow(request):
+        await asyncio.sleep(1)
+        return web.Response(body=rss_now())
+
+    app = web.Application()
+    app.router.add_get("/feed/{name}", feed)
+    app.router.add_get("/missing", missing)
+    app.router.add_get("/slow", slow)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    state["url"] = f"http://127.0.0.1:{runner.addresses[0][1]}"
+    yield state
+    await runner.cleanup()
+
+
+class TestFeedFetcher:
+    """Tests for FeedFetcher."""
+
+    async def test_fetch_parses_off_the_loop(self, feed_server):
+        """Test a feed is downloaded and parsed in a worker thread."""
+        fetcher = FeedFetcher()
+        threads = []
+        parse = feeds.feed_stream.parse
+
+        def recording_parse(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return parse(*args, **kwargs)
+
+        with patch.object(feeds.feed_stream, "parse", recording_parse):
+            feed = await fetcher.fetch(f"{feed_server['url']}/feed/a")
+        await fetcher.close()
+
+        assert feed.feed.title == "Test Feed"
+        assert [entry.title for entry in feed.entries] == ["First story", "Old story"]
+        assert threads and threads[0] is not threading.main_thread()
+
+    async def test_malformed_feed_falls_back_to_feedparser(self):
+        """Test a document the streaming parser rejects is still parsed."""
+        fetcher = FeedFetcher()
+        feed = await fetcher.parse(b"<rss><channel><title>Broken &nbsp; feed</title><item><title>Hi</title></item>")
+        await fetcher.close()
+
+        assert feed.bozo
+        assert [entry.title for entry in feed.entries] == ["Hi"]
+
+    async def test_per_host_limit(self, feed_server):
+        """Test concurrent fetches to one host stay under the per-host limit."""
+        feed_server["delay"] = 0.05
+        fetcher = FeedFetcher(connections_per_host=2)
+        results = await fetcher.fetch_many(f"{feed_server['url']}/feed/{n}" for n in range(6))
+        await fetcher.close()
+
+        assert len(results) == 6
+        assert all(not isinstance(result, Exception) for result in results.values())
+        assert feed_server["peak"] == 2
+
+    async def test_errors_raise_feed_error(self, feed_server):
+        """Test HTTP errors and timeouts become FeedError."""
+        fetcher = FeedFetcher(timeout=0.2)
+        with pytest.raises(FeedError, match="404"):
+            await fetcher.fetch(f"{feed_server['url']}/missing")
+        with pytest.raises(FeedError, match="timed out"):
+            await fetcher.fetch(f"{feed_server['url']}/slow")
+        await fetcher.close()
+
+
+class Clock:
+    """Settable monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFeedCache:
+    """Tests for FeedCache."""
+
+    async def test_served_from_cache_within_ttl(self, feed_server):
+        """Test guilds asking for the same feed share one download."""
+        cache = FeedCache(FeedFetcher(), ttl=600, clock=Clock())
+        url = f"{feed_server['url']}/feed/a"
+        first = await cache.get(url)
+        second = await cache.get(url.replace("http://", "HTTP://"))
+        await cache.fetcher.close()
+
+        assert second is first
+        assert feed_server["requests"] == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_conditional_refresh(self, feed_server):
+        """Test an expired feed is revalidated with its ETag and a 304 keeps the cached copy."""
+        clock = Clock()
+        cache = FeedCache(FeedFetcher(), ttl=600, clock=clock)
+        url = f"{feed_server['url']}/feed/a"
+        first = await cache.get(url)
+        clock.now += 601
+        second = await cache.get(url)
+        await cache.fetcher.close()
+
+        assert second is first
+        assert feed_server["requests"] == 2
+        stats = cache.stats()
+        assert stats["not_modified"] == 1
+        assert stats["bytes_saved"] == stats["bytes_downloaded"] > 0
+
+    async def test_concurrent_refreshes_coalesce(self, feed_server):
+        """Test simultaneous requests for an uncached feed download it once."""
+        feed_server["delay"] = 0.05
+        cache = FeedCache(FeedFetcher(), clock=Clock())
+        url = f"{feed_server['url']}/feed/a"
+        results = await cache.get_many([url, url + "#top"])
+        await asyncio.gather(*(cache.get(f"{feed_server['url']}/feed/b") for _ in range(5)))
+        await cache.fetcher.close()
+
+        assert len(results) == 2
+        assert feed_server["requests"] == 2
+
+    async def test_stale_copy_when_refresh_fails(self, feed_server):
+        """Test the last good copy is served while the source is failing."""
+        clock = Clock()
+        cache = FeedCache(FeedFetcher(), ttl=600, clock=clock)
+        url = f"{feed_server['url']}/feed/a"
+        first = await cache.get(url)
+        feed_server["status"] = 503
+        clock.now += 601
+        assert await cache.get(url) is first
+        assert cache.stale == 1
+        with pytest.raises(FeedError):
+            await cache.get(f"{feed_server['url']}/feed/new")
+        await cache.fetcher.close()
+
+
+class TestNewsFetching:
+    """Tests for the news cog reading feeds through the fetcher."""
+
+    async def test_fetch_news_from_rss(self, mock_bot, feed_server):
+        """Test recent articles are returned cleaned and old ones skipped."""
+        with patch.object(tasks.Loop, "start", Mock()):
+            cog = News(mock_bot)
+        articles = await cog.fetch_news_from_rss(f"{feed_server['url']}/feed/a", limit=5)
+        await cog.feeds.close()
+
+        assert [article["title"] for article in articles] == ["First story"]
+        assert articles[0]["description"] == "Hello world"
+        assert articles[0]["source"] == "Test Feed"
+
+    async def test_unreachable_feed_returns_nothing(self, mock_bot, feed_server):
+        """Test a failing source gives no articles instead of an exception."""
+        with patch.object(tasks.Loop, "start", Mock()):
+            cog = News(mock_bot)
+        assert await cog.fetch_news_from_rss(f"{feed_server['url']}/missing") == []
+        await cog.feeds.close()
@@ -0,0 +1,75 @@
+"""Unit tests for helpers/html_extract.py feed HTML extraction."""
+import time
+
+from helpers.html_extract import extract, image_url
+
+LINK = "https://news.example.org/world/story.html"
+
+
+class TestExtract:
+    """Tests for extract function."""
+
+    def test_text_and_image_together(self):
+        """Test tags are stripped, entities decoded and the first image returned."""
+        text, image = extract(
+            '<p>Talks &amp; deals</p><p><img src="/img/a.jpg" alt="A"> Second&nbsp;line</p><img src="/img/b.jpg">',
+            base_url=LINK,
+        )
+        assert text == "Talks & deals Second line"
+        assert image == "https://news.example.org/img/a.jpg"
+
+    def test_inline_tags_keep_words_together(self):
+        """Test inline tags don't split words but block tags separate them."""
+        assert extract("<b>wor</b>ld<br/>next")[0] == "world next"
+
+    def test_hidden_content_skipped(self):
+        """Test scripts, styles and comments are not part of the text."""
+        text, _ = extract("<p>Visible</p><script>var x = '<p>';</script><style>p{}</style><!-- note -->text")
+        assert text == "Visible text"
+
+    def test_plain_text(self):
+        """Test text without tags is only normalised."""
+        assert extract("  Plain   text &gt; more ") == ("Plain text > more", "")
+        assert extract("") == ("", "")
+
+    def test_quoted_angle_brackets(self):
+        """Test a ">" inside an attribute value doesn't end the tag."""
+        assert extract('<a title="a > b" href="x">Link</a> text') == ("Link text", "")
+
+    def test_unterminated_tag(self):
+        """Test a fragment cut off mid-tag is kept as text and scanned quickly."""
+        started = time.perf_counter()
+        assert extract("Officials said <a href=" + "x" * 22) == ("Officials said <a href=" + "x" * 22, "")
+        assert extract('Read <a href="https://news.example.org/2025/a-long-story-that-was-cut')[1] == ""
+        assert extract("<b>Bold</b> " + "<a " * 5000)[0].startswith("Bold <a <a")
+        assert time.perf_counter() - started < 1.0
+
+    def test_image_only_stops_at_first_image(self):
+        """Test asking only for the image skips the text."""
+        assert extract('<p>Text</p><img src="https://cdn.example.org/a.jpg">', text=False) == (
+            "", "https://cdn.example.org/a.jpg"
+        )
+
+    def test_image_disabled(self):
+        """Test no image is returned when not asked for."""
+        assert extract('<img src="https://cdn.example.org/a.jpg">Text', image=False) == ("Text", "")
+
+
+class TestImageUrl:
+    """Tests for image_url function."""
+
+    def test_lazy_loaded_placeholder_skipped(self):
+        """Test a data: placeholder falls through to data-src."""
+        assert image_url(
+            {"src": "data:image/gif;base64,R0lGOD", "data-src": "https://cdn.example.org/real.jpg"}
+        ) == "https://cdn.example.org/real.jpg"
+
+    def test_srcset_and_relative_paths(self):
+        """Test the first srcset URL is used and relative paths resolved."""
+        assert image_url({"srcset": "small.jpg 300w, big.jpg 1200w"}, LINK) == "https://news.example.org/world/small.jpg"
+        assert image_url({"src": "//cdn.example.org/a.jpg"}, LINK) == "https://cdn.example.org/a.jpg"
+        assert image_url({"src": "relative.jpg"}) == ""
+
+    def test_tracking_pixel_skipped(self):
+        """Test 1x1 images are not used."""
+        assert image_url({"src": "https://example.org/pixel.gif", "width": "1", "height": "1"}) == ""
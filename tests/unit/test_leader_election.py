@@ -0,0 +1,150 @@
+"""Unit tests for helpers/leader_election.py scheduler lease."""
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import time
+
+import aiosqlite
+import pytest
+
+from helpers.leader_election import SchedulerLease
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+NOW = 1_750_000_000
+
+LEASE_TABLE = """CREATE TABLE IF NOT EXISTS `scheduler_lease` (
+  `name` varchar(50) NOT NULL PRIMARY KEY,
+  `holder` varchar(100) NOT NULL,
+  `expires_at` int NOT NULL,
+  `acquired_at` int NOT NULL
+)"""
+
+
+@pytest.fixture
+async def connections(tmp_path):
+    """Two connections to one SQLite file, as two bot processes would have."""
+    path = str(tmp_path / "lease.db")
+    first = await aiosqlite.connect(path)
+    await first.execute(LEASE_TABLE)
+    await first.commit()
+    second = await aiosqlite.connect(path)
+    yield first, second
+    await first.close()
+    await second.close()
+
+
+class TestSchedulerLease:
+    """Tests for SchedulerLease between two processes sharing a database."""
+
+    async def test_only_one_leader(self, connections):
+        """Test the second process cannot take a live lease."""
+        first = SchedulerLease(connections[0], holder="a", lease_seconds=15)
+        second = SchedulerLease(connections[1], holder="b", lease_seconds=15)
+
+        assert await first.heartbeat(NOW) is True
+        assert await second.heartbeat(NOW + 1) is False
+        assert first.is_leader and not second.is_leader
+        assert await second.current_holder() == ("a", NOW + 15, NOW)
+
+    async def test_renewal_keeps_lease(self, connections):
+        """Test heartbeats extend the lease without changing when it was acquired."""
+        lease = SchedulerLease(connections[0], holder="a", lease_seconds=15)
+        await lease.heartbeat(NOW)
+        assert await lease.heartbeat(NOW + 10) is True
+        assert await lease.current_holder() == ("a", NOW + 25, NOW)
+
+    async def test_follower_takes_over_expired_lease(self, connections):
+        """Test a follower acquires the lease once the leader stops renewing."""
+        first = SchedulerLease(connections[0], holder="a", lease_seconds=15)
+        second = SchedulerLease(connections[1], holder="b", lease_seconds=15)
+        await first.heartbeat(NOW)
+
+        assert await second.heartbeat(NOW + 14) is False
+        assert await second.heartbeat(NOW + 15) is True
+        assert await first.heartbeat(NOW + 16) is False
+        assert not first.is_leader
+
+    async def test_release_hands_over_immediately(self, connections):
+        """Test a released lease is free before it expires."""
+        first = SchedulerLease(connections[0], holder="a", lease_seconds=15)
+        second = SchedulerLease(connections[1], holder="b", lease_seconds=15)
+        await first.heartbeat(NOW)
+        await first.release()
+
+        assert not first.is_leader
+        assert await second.heartbeat(NOW + 1) is True
+
+    async def test_leadership_ends_before_stored_expiry(self, connections):
+        """Test the local deadline runs out ahead of the database expiry."""
+        lease = SchedulerLease(connections[0], holder="a", lease_seconds=3)
+        await lease.heartbeat()
+        assert lease.is_leader
+        lease._valid_until -= 1.01
+        assert not lease.is_leader
+
+    def test_from_env(self, monkeypatch):
+        """Test instance ID and lease length come from the environment."""
+        monkeypatch.setenv("SCHEDULER_INSTANCE_ID", "replica-1")
+        monkeypatch.setenv("SCHEDULER_LEASE_SECONDS", "30")
+        lease = SchedulerLease.from_env(connection=None)
+        assert lease.holder == "replica-1"
+        assert lease.lease_seconds == 30
+
+
+# Heartbeats every 0.2s with a 3s lease and prints its leadership changes
+CHILD = textwrap.dedent("""
+    import asyncio, sys
+    import aiosqlite
+    sys.path.insert(0, {root!r})
+    from helpers.leader_election import SchedulerLease
+
+    async def main():
+        async with aiosqlite.connect({path!r}) as db:
+            await db.execute("PRAGMA busy_timeout=5000")
+            lease = SchedulerLease(db, holder=sys.argv[1], lease_seconds=3)
+            state = None
+            while True:
+                leader = await lease.heartbeat()
+                if leader != state:
+                    state = leader
+                    print("leader" if leader else "follower", flush=True)
+                await asyncio.sleep(0.2)
+
+    asyncio.run(main())
+""")
+
+
+class TestTwoProcesses:
+    """Failover between two real processes sharing one SQLite file."""
+
+    def test_follower_takes_over_when_leader_dies(self, tmp_path):
+        """Test killing the leader hands the lease to the other process within seconds."""
+        path = str(tmp_path / "lease.db")
+        with sqlite3.connect(path) as db:
+            db.execute(LEASE_TABLE)
+
+        script = CHILD.format(root=ROOT, path=path)
+        first = subprocess.Popen([sys.executable, "-c", script, "first"],
+                                 stdout=subprocess.PIPE, text=True)
+        try:
+            assert first.stdout.readline().strip() == "leader"
+            second = subprocess.Popen([sys.executable, "-c", script, "second"],
+                                      stdout=subprocess.PIPE, text=True)
+            try:
+                assert second.stdout.readline().strip() == "follower"
+                first.kill()
+                first.wait()
+                killed_at = time.monotonic()
+
+                assert second.stdout.readline().strip() == "leader"
+                assert time.monotonic() - killed_at < 5
+            finally:
+                second.kill()
+                second.wait()
+        finally:
+            if first.poll() is None:
+                first.kill()
+                first.wait()
+
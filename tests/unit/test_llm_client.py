@@ -0,0 +1,132 @@
+"""Unit tests for helpers/llm_client.py shared Anthropic client."""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from helpers.claude_cog import ClaudeAICog
+from helpers.llm_client import LLMClient, parse_model_limits
+from helpers.llm_scheduler import LLMScheduler
+
+HAIKU = "claude-3-5-haiku-20241022"
+
+
+@pytest.fixture
+async def llm_client():
+    """LLMClient with a slow fake messages.create that records concurrency."""
+    client = LLMClient("test-key", default_concurrency=2, model_concurrency={HAIKU: 3})
+    client.peak = {}
+    running = {}
+
+    async def fake_create(**kwargs):
+        model = kwargs["model"]
+        running[model] = running.get(model, 0) + 1
+        client.peak[model] = max(client.peak.get(model, 0), running[model])
+        await asyncio.sleep(0.01)
+        running[model] -= 1
+        return Mock(content=[Mock(text="ok")])
+
+    client.anthropic.messages.create = fake_create
+    yield client
+    await client.close()
+
+
+class TestParseModelLimits:
+    """Tests for parse_model_limits function."""
+
+    def test_default_and_overrides(self):
+        """Test a bare number sets the default and pairs override it."""
+        assert parse_model_limits(f"4,{HAIKU}=16") == (4, {HAIKU: 16})
+
+    def test_malformed_entries_ignored(self):
+        """Test bad values fall back to the defaults."""
+        assert parse_model_limits("lots,model=0,other=x") == (8, {})
+        assert parse_model_limits(None) == (8, {})
+
+
+class TestLLMClient:
+    """Tests for LLMClient."""
+
+    async def test_per_model_concurrency(self, llm_client):
+        """Test each model is capped at its own limit."""
+        await asyncio.gather(*(
+            llm_client.messages.create(model=model, max_tokens=10, messages=[])
+            for model in ["claude-sonnet-4-5"] * 6 + [HAIKU] * 6
+        ))
+        assert llm_client.peak == {"claude-sonnet-4-5": 2, HAIKU: 3}
+        assert llm_client.stats()[HAIKU] == {"in_flight": 0, "waiting": 0, "limit": 3}
+
+    async def test_stream_holds_slot(self, llm_client):
+        """Test a stream keeps its model slot until it is closed."""
+        stream = Mock(text_stream=["a", "b"])
+
+        @asynccontextmanager
+        async def fake_stream(**kwargs):
+            yield stream
+
+        llm_client.anthropic.messages.stream = fake_stream
+        async with llm_client.messages.stream(model=HAIKU, max_tokens=10, messages=[]) as result:
+            assert result is stream
+            assert llm_client.stats()[HAIKU]["in_flight"] == 1
+        assert llm_client.stats()[HAIKU]["in_flight"] == 0
+
+    async def test_stream_settles_usage(self):
+        """Test a finished stream refunds the unused part of its token estimate."""
+        scheduler = LLMScheduler(tokens_per_minute=100_000, clock=lambda: 0.0)
+        client = LLMClient("test-key", scheduler=scheduler)
+        usage = SimpleNamespace(input_tokens=40, output_tokens=60)
+        stream = Mock(text_stream=["a"], current_message_snapshot=SimpleNamespace(usage=usage))
+
+        @asynccontextmanager
+        async def fake_stream(**kwargs):
+            yield stream
+
+        client.anthropic.messages.stream = fake_stream
+        async with client.messages.stream(model=HAIKU, max_tokens=4000, messages=[]):
+            assert scheduler.token_bucket.tokens <= 100_000 - 4000
+        assert scheduler.token_bucket.tokens == 100_000 - 100
+        await client.close()
+
+    async def test_close_is_idempotent(self):
+        """Test closing twice only closes the pool once."""
+        client = LLMClient("test-key")
+        client.anthropic.close = AsyncMock()
+        await client.close()
+        await client.close()
+        assert client.is_closed
+        client.anthropic.close.assert_awaited_once()
+
+    def test_from_env_without_key(self, monkeypatch):
+        """Test no client is created without an API key."""
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        assert LLMClient.from_env() is None
+
+    def test_from_env_settings(self, monkeypatch):
+        """Test pool and concurrency settings are read from the environment."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        monkeypatch.setenv("LLM_MODEL_CONCURRENCY", f"5,{HAIKU}=12")
+        client = LLMClient.from_env()
+        assert client.limit_for("claude-sonnet-4-5") == 5
+        assert client.limit_for(HAIKU) == 12
+
+
+class TestClaudeAICogSharedClient:
+    """Tests for ClaudeAICog using the bot's client."""
+
+    def test_cogs_share_bot_client(self, mock_bot):
+        """Test every cog gets a view of the same client, metered under its name."""
+        mock_bot.llm_client = LLMClient("test-key")
+        first = ClaudeAICog(mock_bot, cog_name="First cog")
+        second = ClaudeAICog(mock_bot, cog_name="Second cog")
+        assert first.client.anthropic is second.client.anthropic is mock_bot.llm_client.anthropic
+        assert first.client.scheduler is mock_bot.llm_client.scheduler
+        assert first.client.feature == "ClaudeAICog"
+
+    def test_no_client_without_key(self, mock_bot):
+        """Test cogs warn and get None when the bot has no client."""
+        mock_bot.llm_client = None
+        cog = ClaudeAICog(mock_bot, cog_name="Art cog")
+        assert cog.client is None
+        mock_bot.logger.warning.assert_called_once()
@@ -0,0 +1,188 @@
+"""Unit tests for helpers/llm_metering.py usage metering and quotas."""
+import os
+from contextlib import asynccontextmanager
+from unittest.mock import Mock
+
+import aiosqlite
+import pytest
+
+from database import DatabaseManager
+from helpers.llm_client import LLMClient
+from helpers.llm_metering import ERROR, OK, QUOTA, LLMQuotaExceeded, UsageMeter, percentile, rollup
+from helpers.llm_scheduler import Priority, request_context
+
+SCHEMA = os.path.join(os.path.dirname(__file__), "..", "..", "database", "schema.sql")
+HAIKU = "claude-3-5-haiku-20241022"
+
+
+class Clock:
+    """Settable wall clock."""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def usage(input_tokens=100, output_tokens=50, cache_read=0):
+    return Mock(input_tokens=input_tokens, output_tokens=output_tokens,
+                cache_read_input_tokens=cache_read, cache_creation_input_tokens=0)
+
+
+@pytest.fixture
+async def database():
+    """In-memory database with the full schema."""
+    connection = await aiosqlite.connect(":memory:")
+    with open(SCHEMA, encoding="utf-8") as file:
+        await connection.executescript(file.read())
+    yield DatabaseManager(connection=connection)
+    await connection.close()
+
+
+class TestUsageMeter:
+    """Tests for UsageMeter."""
+
+    def test_percentile(self):
+        """Test percentiles pick the value at the rank and handle empty lists."""
+        values = [float(n) for n in range(1, 101)]
+        assert percentile(values, 0.5) == 51.0
+        assert percentile(values, 0.95) == 96.0
+        assert percentile([], 0.95) == 0.0
+
+    def test_summary_per_feature(self):
+        """Test summaries group by feature and only count the window."""
+        clock = Clock()
+        meter = UsageMeter(clock=clock)
+        meter.record(HAIKU, "news", 1, usage(), 0.5, 5.0, OK)
+        clock.now += 7200
+        for latency in (1.0, 2.0, 3.0):
+            meter.record(HAIKU, "claude", 1, usage(cache_read=10), 0.2, latency, OK)
+        meter.record(HAIKU, "claude", 1, None, None, 9.0, ERROR)
+
+        summary = meter.summary(3600)
+        assert list(summary) == ["claude"]
+        assert summary["claude"]["requests"] == 4
+        assert summary["claude"]["errors"] == 1
+        assert summary["claude"]["p50"] == 2.0
+        assert summary["claude"]["p95"] == 3.0
+        assert summary["claude"]["cached_tokens"] == 30
+        assert "news" in meter.summary(86400)
+
+    def test_ring_buffer_bounded(self):
+        """Test only the newest requests are kept."""
+        meter = UsageMeter(capacity=3)
+        for _ in range(5):
+            meter.record(HAIKU, "art", None, usage(), 0.1, 0.1, OK)
+        assert len(meter.records) == 3
+
+    def test_rollup_by_period(self):
+        """Test rollups sum tokens per period, feature, guild and model."""
+        clock = Clock(1_700_000_000.0)
+        meter = UsageMeter(clock=clock)
+        meter.record(HAIKU, "news", 7, usage(), 0.1, 1.0, OK)
+        meter.record(HAIKU, "news", 7, usage(), 0.1, 3.0, ERROR)
+        clock.now += 300
+        meter.record(HAIKU, "news", 7, usage(), 0.1, 2.0, OK)
+
+        rows = sorted(rollup(meter.records))
+        assert len(rows) == 2
+        assert rows[0][1:] == ("news", 7, HAIKU, 2, 1, 200, 100, 0, 0, 4000, 3000)
+
+    def test_background_quota(self):
+        """Test a guild's background requests stop at the quota but its commands don't."""
+        clock = Clock()
+        meter = UsageMeter(guild_daily_tokens=200, clock=clock)
+        meter.record(HAIKU, "news", 1, usage(), 0.1, 1.0, OK, background=True)
+        meter.check_quota(1, background=True)
+        meter.record(HAIKU, "news", 1, usage(), 0.1, 1.0, OK, background=True)
+
+        with pytest.raises(LLMQuotaExceeded):
+            meter.check_quota(1, background=True)
+        meter.check_quota(1, background=False)
+        meter.check_quota(2, background=True)
+
+        clock.now += 86400
+        meter.check_quota(1, background=True)
+
+    def test_from_env(self, monkeypatch):
+        """Test settings are read from the environment."""
+        monkeypatch.setenv("LLM_USAGE_BUFFER", "10")
+        monkeypatch.setenv("LLM_GUILD_DAILY_TOKENS", "5000")
+        meter = UsageMeter.from_env()
+        assert meter.records.maxlen == 10
+        assert meter.guild_daily_tokens == 5000
+
+
+class TestUsageStorage:
+    """Tests for storing rollups in llm_usage."""
+
+    async def test_flush_merges_rows(self, database):
+        """Test repeated flushes of the same period add up instead of overwriting."""
+        clock = Clock()
+        meter = UsageMeter(clock=clock)
+        for latency in (1.0, 4.0):
+            meter.record(HAIKU, "recipe", 9, usage(), 0.1, latency, OK)
+            count, rows = meter.pending_rollup()
+            await database.add_llm_usage(rows)
+            meter.flushed(count)
+
+        assert meter.pending_rollup() == (0, [])
+        totals = await database.get_llm_usage_totals(int(clock.now) - 3600)
+        assert totals["recipe"]["requests"] == 2
+        assert totals["recipe"]["input_tokens"] == 200
+        async with database.connection.execute("SELECT latency_ms_max FROM llm_usage") as cursor:
+            assert (await cursor.fetchone())[0] == 4000
+
+
+class TestClientMetering:
+    """Tests for LLMClient recording requests."""
+
+    async def test_create_recorded_under_feature(self):
+        """Test a request is recorded with its feature, guild and tokens."""
+        client = LLMClient("test-key")
+
+        async def fake_create(**kwargs):
+            return Mock(usage=usage(input_tokens=30, output_tokens=20))
+
+        client.anthropic.messages.create = fake_create
+        with request_context(Priority.USER, guild_id=42):
+            await client.for_feature("trivia").messages.create(model=HAIKU, max_tokens=10, messages=[])
+        await client.close()
+
+        record = client.meter.records[-1]
+        assert (record.feature, record.guild_id, record.input_tokens, record.output_tokens) == ("trivia", 42, 30, 20)
+        assert record.outcome == OK
+
+    async def test_stream_failure_recorded(self):
+        """Test a stream that fails is recorded as an error."""
+        client = LLMClient("test-key")
+
+        @asynccontextmanager
+        async def failing_stream(**kwargs):
+            raise RuntimeError("overloaded")
+            yield
+
+        client.anthropic.messages.stream = failing_stream
+        with pytest.raises(RuntimeError):
+            async with client.messages.stream(model=HAIKU, max_tokens=10, messages=[]):
+                pass
+        await client.close()
+
+        assert client.meter.records[-1].outcome == ERROR
+        assert client.meter.records[-1].feature == "other"
+
+    async def test_quota_refuses_before_sending(self):
+        """Test a guild over its quota gets no background requests sent."""
+        client = LLMClient("test-key", meter=UsageMeter(guild_daily_tokens=1))
+        client.meter.record(HAIKU, "news", 5, usage(), 0.1, 1.0, OK, background=True)
+        client.anthropic.messages.create = Mock()
+
+        with request_context(Priority.BACKGROUND, guild_id=5):
+            with pytest.raises(LLMQuotaExceeded):
+                await client.messages.create(model=HAIKU, max_tokens=10, messages=[])
+        await client.close()
+
+        client.anthropic.messages.create.assert_not_called()
+        assert client.meter.records[-1].outcome == QUOTA
+        assert client.meter.rejected == 1
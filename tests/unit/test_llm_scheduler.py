@@ -0,0 +1,195 @@
+"""Unit tests for helpers/llm_scheduler.py request scheduling."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from helpers.llm_scheduler import (
+    LLMRequestExpired,
+    LLMScheduler,
+    Priority,
+    Ticket,
+    TokenBucket,
+    current_context,
+    estimate_tokens,
+    request_context,
+)
+
+
+class FakeClock:
+    """Monotonic clock moved by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+async def request(scheduler, order, name, priority=Priority.BACKGROUND, guild_id=None, tokens=0):
+    """Wait for a turn and record when it was granted."""
+    with request_context(priority, guild_id):
+        async with scheduler.turn(tokens):
+            order.append(name)
+
+
+async def start(scheduler, order, *requests):
+    """Queue requests as separate tasks, in order."""
+    tasks = []
+    for name, priority, guild_id in requests:
+        tasks.append(asyncio.create_task(request(scheduler, order, name, priority, guild_id)))
+        await asyncio.sleep(0)
+    return tasks
+
+
+def refill(scheduler, clock, seconds):
+    """Advance the fake clock and let the scheduler release what it can."""
+    clock.now += seconds
+    scheduler._on_timer()
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_delay_and_refill(self):
+        """Test the wait for tokens shrinks as the bucket refills."""
+        clock = FakeClock()
+        bucket = TokenBucket(600, clock)
+        bucket.take(600)
+        assert bucket.delay(100) == pytest.approx(10.0)
+        clock.now += 5
+        assert bucket.delay(100) == pytest.approx(5.0)
+
+    def test_oversized_request_capped(self):
+        """Test a request bigger than the bucket only waits for a full bucket."""
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock)
+        assert bucket.delay(1000) == 0.0
+        bucket.take(1000)
+        assert bucket.tokens == 0
+
+    def test_settle_corrects_estimate(self):
+        """Test actual usage refunds an overestimate."""
+        scheduler = LLMScheduler(tokens_per_minute=1000, clock=FakeClock())
+        scheduler.token_bucket.take(500)
+        Ticket(scheduler, 500).settle(SimpleNamespace(input_tokens=100, output_tokens=50))
+        assert scheduler.token_bucket.tokens == 850
+
+
+class TestLLMScheduler:
+    """Tests for LLMScheduler."""
+
+    async def test_unlimited_passes_through(self):
+        """Test requests are released at once without rate limits."""
+        scheduler = LLMScheduler()
+        order = []
+        await request(scheduler, order, "a")
+        assert order == ["a"]
+        assert scheduler.stats()["background"]["released"] == 1
+
+    async def test_priority_order(self):
+        """Test interactive requests are released before queued background work."""
+        clock = FakeClock()
+        scheduler = LLMScheduler(requests_per_minute=1, clock=clock)
+        order = []
+        tasks = await start(scheduler, order,
+                            ("first", Priority.BACKGROUND, None),
+                            ("background", Priority.BACKGROUND, None),
+                            ("user", Priority.USER, None),
+                            ("interactive", Priority.INTERACTIVE, None))
+        assert order == ["first"]
+        assert scheduler.stats()["background"]["queued"] == 1
+
+        for _ in range(3):
+            refill(scheduler, clock, 60)
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        assert order == ["first", "interactive", "user", "background"]
+        assert scheduler.stats()["interactive"]["max_wait"] == 60
+
+    async def test_guilds_take_turns(self):
+        """Test one guild's burst doesn't delay another guild's request."""
+        clock = FakeClock()
+        scheduler = LLMScheduler(requests_per_minute=1, clock=clock)
+        order = []
+        tasks = await start(scheduler, order,
+                            ("a1", Priority.USER, 1), ("a2", Priority.USER, 1),
+                            ("a3", Priority.USER, 1), ("b1", Priority.USER, 2))
+        for _ in range(3):
+            refill(scheduler, clock, 60)
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        assert order == ["a1", "a2", "b1", "a3"]
+
+    async def test_token_budget(self):
+        """Test large requests wait for the token bucket."""
+        clock = FakeClock()
+        scheduler = LLMScheduler(tokens_per_minute=1000, clock=clock)
+        order = []
+        first = asyncio.create_task(request(scheduler, order, "big", tokens=800))
+        second = asyncio.create_task(request(scheduler, order, "next", tokens=400))
+        await asyncio.sleep(0)
+        assert order == ["big"]
+
+        refill(scheduler, clock, 12)
+        await asyncio.gather(first, second)
+        assert order == ["big", "next"]
+
+    async def test_deadline_expires_in_queue(self):
+        """Test a request is dropped when its deadline passes while queued."""
+        scheduler = LLMScheduler(requests_per_minute=1)
+        await request(scheduler, [], "uses the only token")
+
+        with request_context(Priority.INTERACTIVE, deadline=time.time() + 0.05):
+            with pytest.raises(LLMRequestExpired):
+                async with scheduler.turn():
+                    pass
+        stats = scheduler.stats()["interactive"]
+        assert stats["expired"] == 1
+        assert stats["queued"] == 0
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test a cancelled request gives up its place."""
+        clock = FakeClock()
+        scheduler = LLMScheduler(requests_per_minute=1, clock=clock)
+        order = []
+        tasks = await start(scheduler, order,
+                            ("first", Priority.USER, None), ("cancelled", Priority.USER, None),
+                            ("kept", Priority.USER, None))
+        tasks[1].cancel()
+        await asyncio.sleep(0)
+        refill(scheduler, clock, 60)
+        await tasks[2]
+        assert order == ["first", "kept"]
+        assert scheduler.stats()["user"]["queued"] == 0
+
+
+class TestRequestContext:
+    """Tests for the request context variable."""
+
+    def test_default_is_background(self):
+        """Test requests outside any context are background work."""
+        assert current_context().priority == Priority.BACKGROUND
+
+    def test_context_is_restored(self):
+        """Test the previous context comes back after the block."""
+        with request_context(Priority.INTERACTIVE, guild_id=5):
+            assert current_context().guild_id == 5
+        assert current_context().priority == Priority.BACKGROUND
+
+
+class TestEstimateTokens:
+    """Tests for estimate_tokens function."""
+
+    def test_counts_text_and_max_tokens(self):
+        """Test system, string and block contents are counted."""
+        request = {
+            "system": "x" * 40,
+            "max_tokens": 100,
+            "messages": [
+                {"role": "user", "content": "y" * 80},
+                {"role": "user", "content": [{"type": "text", "text": "z" * 40}, {"type": "image"}]},
+            ],
+        }
+        assert estimate_tokens(request) == 140
@@ -0,0 +1,121 @@
+"""Unit tests for helpers/load_shaping.py jitter and slot capacity."""
+from datetime import datetime, timezone
+
+from helpers.load_shaping import SlotPlanner, guild_jitter
+from helpers.schedule_batch import ScheduleBatch
+
+
+def ts(value: str) -> int:
+    """Convert a UTC "YYYY-MM-DD HH:MM" string to a Unix timestamp."""
+    return int(datetime.strptime(value, "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc).timestamp())
+
+
+FIRE = ts("2025-01-15 09:00")
+
+
+class TestGuildJitter:
+    """Tests for guild_jitter function."""
+
+    def test_deterministic_and_bounded(self):
+        """Test the same guild always gets the same bounded delay."""
+        delays = [guild_jitter(guild_id, 600) for guild_id in range(1000)]
+        assert delays == [guild_jitter(guild_id, 600) for guild_id in range(1000)]
+        assert all(0 <= delay <= 600 for delay in delays)
+        # Spread over the range rather than clustered
+        assert len({delay // 60 for delay in delays}) >= 10
+
+    def test_disabled(self):
+        """Test a zero bound means no jitter."""
+        assert guild_jitter(123456789, 0) == 0
+
+    def test_feature_salt(self):
+        """Test features get independent delays for the same guild."""
+        delays = {guild_jitter(42, 3600, feature) for feature in ("news", "qotd", "art", "trivia")}
+        assert len(delays) > 1
+
+
+class TestSlotPlanner:
+    """Tests for SlotPlanner."""
+
+    def test_unshaped_starts_immediately(self):
+        """Test a planner without settings starts posts when first seen."""
+        planner = SlotPlanner()
+        assert planner.enabled is False
+        assert planner.plan([("news", 1, FIRE, 3600)], FIRE + 30) == [FIRE + 30]
+        assert planner.slot_metrics()[0]["planned"] == 1
+
+    def test_assignment_is_stable(self):
+        """Test a schedule keeps its start time on later ticks."""
+        planner = SlotPlanner(max_jitter_minutes=30)
+        first = planner.plan([("news", 7, FIRE, 3600)], FIRE)
+        assert planner.plan([("news", 7, FIRE, 3600)], FIRE + 60) == first
+        assert planner.summary()["planned"] == 1
+
+    def test_jitter_stays_inside_window(self):
+        """Test jitter is capped so one tick remains before the window closes."""
+        planner = SlotPlanner(max_jitter_minutes=60)
+        starts = planner.plan([("qotd", guild_id, FIRE, 15 * 60) for guild_id in range(200)], FIRE)
+        assert all(FIRE <= start <= FIRE + 14 * 60 for start in starts)
+        assert len(set(starts)) > 1
+
+    def test_capacity_spreads_hot_minute(self):
+        """Test a capacity limit spreads starts over following minutes."""
+        planner = SlotPlanner(capacity_per_minute=10)
+        starts = planner.plan([("news", guild_id, FIRE, 3600) for guild_id in range(35)], FIRE)
+
+        per_minute = {}
+        for start in starts:
+            per_minute[start // 60] = per_minute.get(start // 60, 0) + 1
+        assert sorted(per_minute.values()) == [5, 10, 10, 10]
+        assert max(starts) < FIRE + 3600
+        assert planner.summary() == {
+            "minutes": 4, "planned": 35, "peak": 10, "overflow": 0, "peak_fill": 1.0,
+        }
+
+    def test_capacity_shared_across_features(self):
+        """Test all features draw from the same per-minute capacity."""
+        planner = SlotPlanner(capacity_per_minute=1)
+        starts = planner.plan([("news", 1, FIRE, 3600), ("qotd", 1, FIRE, 900)], FIRE)
+        assert sorted(starts) == [FIRE, FIRE + 60]
+
+    def test_full_window_overflows_inside_window(self):
+        """Test posts are never pushed past their window when capacity runs out."""
+        planner = SlotPlanner(capacity_per_minute=1)
+        starts = planner.plan([("qotd", guild_id, FIRE, 5 * 60) for guild_id in range(8)], FIRE)
+        assert all(FIRE <= start <= FIRE + 4 * 60 for start in starts)
+        metrics = planner.slot_metrics()
+        assert sum(slot["overflow"] for slot in metrics) == 3
+        assert max(slot["fill"] for slot in metrics) == 2.0
+
+    def test_expired_assignments_are_pruned(self):
+        """Test assignments are dropped once their window has passed."""
+        planner = SlotPlanner(max_jitter_minutes=5)
+        planner.plan([("news", 1, FIRE, 3600)], FIRE)
+        planner.plan([], FIRE + 2 * 3600)
+        assert planner._assignments == {}
+
+    def test_from_env(self, monkeypatch):
+        """Test settings are read from the environment."""
+        monkeypatch.setenv("SCHEDULE_SLOT_CAPACITY", "25")
+        monkeypatch.setenv("SCHEDULE_JITTER_MINUTES", "not-a-number")
+        planner = SlotPlanner.from_env()
+        assert planner.capacity == 25
+        assert planner.max_jitter_seconds == 0
+
+
+class TestScheduleBatchWithPlanner:
+    """Tests for ScheduleBatch.due with a SlotPlanner."""
+
+    def test_rows_wait_for_their_start(self):
+        """Test rows become due at their planned start, still inside the window."""
+        rows = [(guild_id, "09:00", 0, None, None) for guild_id in range(30)]
+        batch = ScheduleBatch.from_rows(
+            rows, post_time_col=1, timezone_offset_col=2, last_post_col=4,
+            timezone_col=3, window_minutes=15, feature="qotd", guild_id_col=0
+        )
+        planner = SlotPlanner(capacity_per_minute=10)
+
+        assert len(batch.due(FIRE, planner=planner)) == 10
+        assert len(batch.due(FIRE + 60, planner=planner)) == 20
+        assert len(batch.due(FIRE + 120, planner=planner)) == 30
+        assert batch.due(FIRE + 16 * 60, planner=planner) == []
@@ -0,0 +1,80 @@
+"""Unit tests for helpers/near_duplicates.py headline clustering."""
+import random
+import time
+
+from cogs.news import News
+from helpers.near_duplicates import cluster, jaccard, shingles, signature
+
+
+def story(feed, guid, title, image=None, description=""):
+    return {"feed_url": feed, "id": guid, "title": title, "image": image, "description": description,
+            "source": feed.upper()}
+
+
+class TestShingles:
+    """Tests for headline shingles and signatures."""
+
+    def test_reworded_headlines_share_shingles(self):
+        """Test stop words, punctuation, case and word endings don't matter."""
+        first = shingles("Earthquake kills at least 100 in Turkey")
+        second = shingles("Turkey earthquake: at least 100 killed")
+        assert first == second == {"earthquake", "kill", "least", "100", "turkey"}
+
+    def test_signature_estimates_similarity(self):
+        """Test matching signature values track the Jaccard similarity."""
+        first = shingles("Fed raises interest rates by quarter point")
+        second = shingles("Federal Reserve raises interest rates by a quarter point")
+        matches = sum(a == b for a, b in zip(signature(first), signature(second))) / len(signature(first))
+        assert abs(matches - jaccard(first, second)) < 0.25
+        assert signature(first) == signature(frozenset(first))
+
+
+class TestCluster:
+    """Tests for cluster()."""
+
+    def test_same_story_grouped(self):
+        """Test the same story from different outlets is grouped and different stories aren't."""
+        titles = [
+            "SpaceX Starship explodes minutes after launch",
+            "Trump says tariffs will rise",
+            "SpaceX's Starship rocket exploded minutes after launch",
+            "Trump says he will run again",
+            "Biden signs bill to avert government shutdown",
+            "Biden signs stopgap bill, averting government shutdown",
+        ]
+        assert cluster(titles) == [[0, 2], [1], [3], [4, 5]]
+
+    def test_empty_titles_not_grouped(self):
+        """Test headlines with no words left are never grouped together."""
+        assert cluster(["", "The", ""]) == [[0], [1], [2]]
+
+    def test_well_under_a_millisecond_per_title(self):
+        """Test clustering a large candidate set stays far below 1 ms per headline."""
+        rng = random.Random(1)
+        words = [f"word{number}" for number in range(3000)]
+        titles = [" ".join(rng.choice(words) for _ in range(9)) for _ in range(500)]
+        start = time.perf_counter()
+        cluster(titles)
+        assert (time.perf_counter() - start) / len(titles) < 0.001
+
+
+class TestMergeDuplicateStories:
+    """Tests for the news cog keeping one article per story."""
+
+    def test_best_copy_kept(self):
+        """Test the highest ranked copy with an image is kept and lists the other sources."""
+        by_feed = {
+            "bbc": [story("bbc", "b1", "SpaceX Starship explodes minutes after launch"),
+                    story("bbc", "b2", "Markets rally on rate hopes")],
+            "ap": [story("ap", "a1", "SpaceX's Starship rocket exploded minutes after launch", image="x.jpg")],
+            "cnn": [story("cnn", "c1", "Flooding closes schools"),
+                    story("cnn", "c2", "Starship explodes minutes after SpaceX launch")],
+        }
+        removed = News.merge_duplicate_stories(by_feed, {"bbc": "BBC", "ap": "AP", "cnn": "CNN"})
+
+        assert removed == 2
+        assert [[article["id"] for article in articles] for articles in by_feed.values()] == [["b2"], ["a1"], ["c1"]]
+        kept = by_feed["ap"][0]
+        assert kept["also_covered_by"] == ["BBC", "CNN"]
+        assert kept["duplicate_ids"] == ["b1", "c2"]
+        assert "also_covered_by" not in by_feed["bbc"][0]
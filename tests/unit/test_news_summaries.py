@@ -0,0 +1,93 @@
+"""Unit tests for the news cog's cross-guild article summary cache."""
+import os
+import re
+from unittest.mock import AsyncMock, Mock, patch
+
+import aiosqlite
+import pytest
+from discord.ext import tasks
+
+from cogs.news import SUMMARY_BATCH, News
+from database import DatabaseManager
+
+SCHEMA = os.path.join(os.path.dirname(__file__), "..", "..", "database", "schema.sql")
+
+
+def article(guid, description="Something happened"):
+    return {"id": guid, "title": f"Story {guid}", "description": description, "source": "Example"}
+
+
+async def fake_create(**kwargs):
+    """Summarise every article in the prompt."""
+    prompt = kwargs["messages"][0]["content"]
+    titles = re.findall(r"Article (\d+):\nTitle: (.*)", prompt)
+    text = "\n".join(f"Article {number} | Category: World News | Summary: About {title}" for number, title in titles)
+    return Mock(content=[Mock(text=text)])
+
+
+@pytest.fixture
+async def cog(mock_bot):
+    """News cog with an in-memory database and a fake Claude client."""
+    connection = await aiosqlite.connect(":memory:")
+    with open(SCHEMA, encoding="utf-8") as file:
+        await connection.executescript(file.read())
+    mock_bot.database = DatabaseManager(connection=connection)
+    with patch.object(tasks.Loop, "start", Mock()):
+        cog = News(mock_bot)
+    cog.client = Mock()
+    cog.client.messages.create = AsyncMock(side_effect=fake_create)
+    yield cog
+    await connection.close()
+
+
+class TestArticleSummaryCache:
+    """Tests for caching summaries across servers."""
+
+    async def test_only_uncached_articles_sent(self, cog):
+        """Test a second server's digest only summarises articles the first didn't have."""
+        first = await cog._summarize_and_categorize_articles([article("1"), article("2")])
+        assert first[0]["summary"] == "About Story 1"
+        assert first[0]["category"] == "World News"
+
+        second = await cog._summarize_and_categorize_articles([article("2"), article("3")])
+        assert [item["summary"] for item in second] == ["About Story 2", "About Story 3"]
+        assert cog.client.messages.create.await_count == 2
+        prompt = cog.client.messages.create.await_args.kwargs["messages"][0]["content"]
+        assert "Story 3" in prompt and "Story 2" not in prompt
+
+        await cog._summarize_and_categorize_articles([article("1"), article("3")])
+        assert cog.client.messages.create.await_count == 2
+
+    async def test_custom_source_names_share_request(self, cog):
+        """Test guilds that name a feed differently send the same prompt, so they share one request."""
+        one = dict(article("1"), source="My News", feed_source="Example")
+        other = dict(article("1"), source="Their News", feed_source="Example")
+        await cog._request_summaries([one])
+        await cog._request_summaries([other])
+        prompts = [call.kwargs["messages"][0]["content"] for call in cog.client.messages.create.await_args_list]
+        assert prompts[0] == prompts[1]
+        assert "Source: Example" in prompts[0]
+
+    async def test_changed_article_summarised_again(self, cog):
+        """Test an article whose text changed gets a new summary."""
+        await cog._summarize_and_categorize_articles([article("1")])
+        await cog._summarize_and_categorize_articles([article("1", "Updated: more happened")])
+        assert cog.client.messages.create.await_count == 2
+
+    async def test_failures_fall_back_uncached(self, cog):
+        """Test a failed request falls back to descriptions and is retried next time."""
+        cog.client.messages.create.side_effect = RuntimeError("overloaded")
+        result = await cog._summarize_and_categorize_articles([article("1")])
+        assert result[0]["summary"] == "Something happened"
+        assert result[0]["category"] == "Other"
+
+        cog.client.messages.create.side_effect = fake_create
+        result = await cog._summarize_and_categorize_articles([article("1")])
+        assert result[0]["summary"] == "About Story 1"
+
+    async def test_large_digest_batched(self, cog):
+        """Test uncached articles are sent in batches."""
+        articles = [article(str(number)) for number in range(SUMMARY_BATCH + 5)]
+        result = await cog._summarize_and_categorize_articles(articles)
+        assert cog.client.messages.create.await_count == 2
+        assert all(item["summary"] == f"About {item['title']}" for item in result)
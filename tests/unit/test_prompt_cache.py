@@ -0,0 +1,132 @@
+"""Unit tests for helpers/prompt_cache.py conversation prompt caching."""
+import os
+from types import SimpleNamespace
+
+import aiosqlite
+import pytest
+
+from database import DatabaseManager
+from helpers.prompt_cache import ConversationCache, count_tokens
+
+SCHEMA = os.path.join(os.path.dirname(__file__), "..", "..", "database", "schema.sql")
+CHANNEL = 555
+
+
+def rows(first, last, tokens=10):
+    """History rows with IDs first..last, alternating user/assistant."""
+    return [(row_id, "user" if row_id % 2 else "assistant", f"message {row_id}", tokens)
+            for row_id in range(first, last + 1)]
+
+
+def breakpoints(messages):
+    """Texts of the messages marked as cache breakpoints."""
+    return [
+        message["content"][0]["text"] for message in messages
+        if "cache_control" in message["content"][0]
+    ]
+
+
+class TestConversationCache:
+    """Tests for ConversationCache."""
+
+    def test_first_request_keeps_latest_window(self):
+        """Test a new conversation starts from the latest messages."""
+        cache = ConversationCache(window_tokens=40, max_window_tokens=80)
+        messages = cache.build_messages(CHANNEL, None, rows(1, 6))
+        assert [m["content"][0]["text"] for m in messages] == [f"message {n}" for n in range(3, 7)]
+        assert breakpoints(messages) == ["message 6"]
+        assert cache.window_start(CHANNEL) == 3
+
+    def test_prefix_stays_stable_as_turns_are_added(self):
+        """Test later turns keep the same start and read the previous breakpoint."""
+        cache = ConversationCache(window_tokens=40, max_window_tokens=80)
+        first = cache.build_messages(CHANNEL, None, rows(3, 6))
+        second = cache.build_messages(CHANNEL, None, rows(3, 8))
+
+        # Same leading messages, and the old breakpoint is still marked for the cache read
+        assert second[:4] == first
+        assert breakpoints(second) == ["message 6", "message 8"]
+
+    def test_window_moves_forward_when_full(self):
+        """Test the window restarts from the latest messages once it is too long."""
+        cache = ConversationCache(window_tokens=40, max_window_tokens=80)
+        cache.build_messages(CHANNEL, None, rows(3, 6))
+        messages = cache.build_messages(CHANNEL, None, rows(3, 11))
+        assert messages[0]["content"][0]["text"] == "message 8"
+        assert breakpoints(messages) == ["message 11"]
+        assert cache.window_start(CHANNEL) == 8
+
+    def test_scopes_are_separate(self):
+        """Test personal and shared conversations keep their own windows."""
+        cache = ConversationCache(window_tokens=40, max_window_tokens=80)
+        cache.build_messages(CHANNEL, None, rows(1, 4))
+        cache.build_messages(CHANNEL, 42, rows(10, 12))
+        assert cache.window_start(CHANNEL) == 1
+        assert cache.window_start(CHANNEL, 42) == 10
+
+        cache.reset(CHANNEL, 42)
+        assert cache.window_start(CHANNEL, 42) is None
+        assert cache.window_start(CHANNEL) == 1
+
+    def test_deleted_start_restarts_window(self):
+        """Test a window whose first message is gone (cleared history) starts over."""
+        cache = ConversationCache(window_tokens=40, max_window_tokens=80)
+        cache.build_messages(CHANNEL, None, rows(1, 4))
+        messages = cache.build_messages(CHANNEL, None, rows(20, 21))
+        assert breakpoints(messages) == ["message 21"]
+        assert cache.window_start(CHANNEL) == 20
+
+    def test_long_messages_shrink_the_window(self):
+        """Test the window is bounded by tokens, not by message count."""
+        cache = ConversationCache(window_tokens=50, max_window_tokens=80)
+        history = rows(1, 3) + [(4, "assistant", "long answer", 35), (5, "user", "message 5", 10)]
+        messages = cache.build_messages(CHANNEL, None, history)
+        assert [m["content"][0]["text"] for m in messages] == ["long answer", "message 5"]
+
+        # A single message over the budget is still sent
+        cache.reset(CHANNEL)
+        assert len(cache.build_messages(CHANNEL, None, [(9, "user", "huge", 500)])) == 1
+
+    def test_missing_counts_are_estimated(self):
+        """Test rows stored before token counts existed are estimated from their length."""
+        assert count_tokens("x" * 400) == 101
+        cache = ConversationCache(window_tokens=250, max_window_tokens=500)
+        history = [(n, "user", "x" * 400, None) for n in range(1, 5)]
+        messages = cache.build_messages(CHANNEL, None, history)
+        assert cache.window_start(CHANNEL) == 3
+        assert len(messages) == 2
+
+    def test_usage_per_channel(self):
+        """Test cache reads and writes are totalled per channel."""
+        cache = ConversationCache()
+        cache.record_usage(CHANNEL, SimpleNamespace(
+            input_tokens=10, cache_read_input_tokens=0, cache_creation_input_tokens=2000, output_tokens=50))
+        cache.record_usage(CHANNEL, SimpleNamespace(
+            input_tokens=10, cache_read_input_tokens=2000, cache_creation_input_tokens=80, output_tokens=40))
+
+        usage = cache.usage(CHANNEL)
+        assert (usage.requests, usage.cache_read_tokens, usage.cache_write_tokens) == (2, 2000, 2080)
+        assert usage.hit_ratio == pytest.approx(2000 / 4100)
+        assert cache.usage(1).requests == 0
+
+
+class TestGetConversationWindow:
+    """Tests for DatabaseManager.get_conversation_window."""
+
+    async def test_window_from_start(self):
+        """Test messages are returned from the start ID, newest capped by the limit."""
+        connection = await aiosqlite.connect(":memory:")
+        with open(SCHEMA, encoding="utf-8") as file:
+            await connection.executescript(file.read())
+        database = DatabaseManager(connection=connection)
+        for n in range(6):
+            await database.add_claude_message(CHANNEL, 7 if n % 2 else 8, "user", f"q{n}", n)
+
+        window = await database.get_conversation_window(CHANNEL, start_id=3, limit=10)
+        assert [row[2] for row in window] == ["q2", "q3", "q4", "q5"]
+        assert [row[3] for row in window] == [2, 3, 4, 5]
+        latest = await database.get_conversation_window(CHANNEL, limit=2)
+        assert [row[0] for row in latest] == [5, 6]
+        personal = await database.get_conversation_window(CHANNEL, start_id=1, limit=10, user_id=7)
+        assert [row[2] for row in personal] == ["q1", "q3", "q5"]
+        await connection.close()
@@ -0,0 +1,130 @@
+"""Unit tests for helpers/schedule_batch.py batched due evaluation."""
+import random
+from datetime import datetime, timezone
+
+from freezegun import freeze_time
+
+from helpers.scheduling import get_due_slot, parse_time_string, resolve_zone_name
+from helpers.schedule_batch import ScheduleBatch, get_steady_offset
+
+
+def ts(value: str) -> int:
+    """Convert a UTC "YYYY-MM-DD HH:MM" string to a Unix timestamp."""
+    return int(datetime.strptime(value, "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc).timestamp())
+
+
+def make_batch(rows, window_minutes=15, feature="default"):
+    """Build a batch from (post_time, offset, zone, last_post_date) rows."""
+    return ScheduleBatch.from_rows(
+        rows, post_time_col=0, timezone_offset_col=1,
+        last_post_col=3, timezone_col=2,
+        window_minutes=window_minutes, feature=feature
+    )
+
+
+class TestScheduleBatchDue:
+    """Tests for ScheduleBatch.due."""
+
+    def test_due_rows_and_slot_dates(self):
+        """Test only rows inside an unused window are returned."""
+        rows = [
+            ("09:00", -5, None, None),                   # 14:00 UTC, due
+            ("09:00", 0, "America/New_York", "2025-01-14"),  # 14:00 UTC, due
+            ("09:00", 0, "America/New_York", "2025-01-15"),  # already posted
+            ("10:00", -5, None, None),                   # not yet
+            ("08:30", -5, None, None),                   # window closed
+        ]
+        batch = make_batch(rows)
+        assert batch.due(ts("2025-01-15 14:05")) == [(0, "2025-01-15"), (1, "2025-01-15")]
+
+    def test_invalid_post_times(self):
+        """Test unparseable post times are reported and never due."""
+        batch = make_batch([("25:00", 0, None, None), (None, 0, None, None), ("00:00", 0, None, None)])
+        assert batch.invalid_indices == [0, 1]
+        assert batch.due(ts("2025-01-15 00:00")) == [(2, "2025-01-15")]
+
+    def test_empty_batch(self):
+        """Test a batch with no rows."""
+        batch = make_batch([])
+        assert len(batch) == 0
+        assert batch.due(ts("2025-01-15 00:00")) == []
+
+    @freeze_time("2025-01-15 14:05:00")
+    def test_uses_current_time_by_default(self):
+        """Test the current clock is used when no timestamp is given."""
+        assert make_batch([("09:00", -5, None, None)]).due() == [(0, "2025-01-15")]
+
+
+class TestScheduleBatchMatchesPerRow:
+    """The batch must agree with get_due_slot, including around DST changes."""
+
+    ZONES = [None, "America/New_York", "Europe/London", "Asia/Kolkata",
+             "Australia/Lord_Howe", "America/Sao_Paulo", "Not/AZone"]
+
+    def test_matches_get_due_slot(self):
+        """Test random schedules against the per-row helper on DST weekends."""
+        rng = random.Random(7)
+        rows = [
+            (
+                f"{rng.randrange(24):02d}:{rng.randrange(60):02d}",
+                rng.randint(-12, 14),
+                rng.choice(self.ZONES),
+                rng.choice([None, "2025-03-08", "2025-03-09", "2025-03-29", "2025-03-30", "2025-04-05"]),
+            )
+            for _ in range(400)
+        ]
+        batch = make_batch(rows, window_minutes=60)
+
+        for start in ("2025-03-08 00:00", "2025-03-29 12:00", "2025-04-05 00:00"):
+            for step in range(0, 48 * 3600, 2711):
+                now = ts(start) + step
+                expected = []
+                for index, (post_time, offset, zone, last_post) in enumerate(rows):
+                    slot = get_due_slot(
+                        parse_time_string(post_time), resolve_zone_name(zone, offset),
+                        last_post, window_minutes=60, now=now
+                    )
+                    if slot:
+                        expected.append((index, slot))
+                assert batch.due(now) == expected
+
+
+class TestScheduleBatchCombine:
+    """Tests for evaluating several features in one pass."""
+
+    def test_due_by_feature(self):
+        """Test rows are grouped per feature with their own windows and indices."""
+        news = make_batch([("09:00", -5, None, None), ("09:00", 0, "America/Chicago", None)],
+                          window_minutes=60, feature="news")
+        qotd = make_batch([("08:30", 0, "America/New_York", None)], window_minutes=15, feature="qotd")
+        combined = ScheduleBatch.combine([news, qotd])
+
+        assert len(combined) == 3
+        # 14:40 UTC: 09:40 in New York, 08:40 in Chicago
+        assert combined.due_by_feature(ts("2025-01-15 14:40")) == {
+            "news": [(0, "2025-01-15")],
+            "qotd": [],
+        }
+        assert combined.due_by_feature(ts("2025-01-15 15:10")) == {
+            "news": [(1, "2025-01-15")],
+            "qotd": [],
+        }
+
+    def test_zones_shared_across_features(self):
+        """Test the same zone is only listed once after combining."""
+        first = make_batch([("09:00", -5, None, None)], feature="a")
+        second = make_batch([("10:00", 0, "Etc/GMT+5", None)], feature="b")
+        assert ScheduleBatch.combine([first, second]).zones == ["Etc/GMT+5"]
+
+
+class TestGetSteadyOffset:
+    """Tests for get_steady_offset."""
+
+    def test_fixed_zone(self):
+        """Test zones without DST always report their offset."""
+        assert get_steady_offset("Asia/Kolkata", ts("2025-03-09 00:00") // 86400) == 19800
+
+    def test_transition_nearby(self):
+        """Test a DST change within the span disables the fast path."""
+        assert get_steady_offset("America/New_York", ts("2025-03-09 00:00") // 86400) is None
+        assert get_steady_offset("America/New_York", ts("2025-06-01 00:00") // 86400) == -4 * 3600
@@ -1,6 +1,6 @@
 """Unit tests for helpers/scheduling.py time parsing and scheduling logic."""
 import pytest
-from datetime import time, datetime
+from datetime import time, datetime, timezone
 from freezegun import freeze_time
 
 from helpers.scheduling import (
@@ -9,10 +9,23 @@ from helpers.scheduling import (
     get_server_date,
     get_server_time,
     should_post_now,
-    should_post_today
+    should_post_today,
+    offset_to_zone_name,
+    is_valid_timezone,
+    resolve_zone_name,
+    format_zone_label,
+    get_fire_schedule,
+    get_due_slot,
+    get_next_fire_time,
+    get_local_date
 )
 
 
+def ts(value: str) -> int:
+    """Convert a UTC "YYYY-MM-DD HH:MM" string to a Unix timestamp."""
+    return int(datetime.strptime(value, "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc).timestamp())
+
+
 class TestParseTimeString:
     """Tests for parse_time_string function."""
 
@@ -188,6 +201,12 @@ class TestShouldPostNow:
         # 15 minute window - 10 minutes after target
         assert should_post_now(target, -5, window_minutes=15) is True
 
+    @freeze_time("2025-01-15 00:05:00")  # 12:05am UTC
+    def test_window_wraps_past_midnight(self):
+        """Test a late-night target is still matched just after midnight."""
+        assert should_post_now(time(23, 55), 0, window_minutes=15) is True
+        assert should_post_now(time(23, 30), 0, window_minutes=15) is False
+
 
 class TestShouldPostToday:
     """Tests for should_post_today function."""
@@ -234,3 +253,119 @@ class TestShouldPostToday:
         """Test when last post was weeks ago."""
         assert should_post_today("2025-01-01", 0) is True
         assert should_post_today("2024-12-25", 0) is True
+
+
+class TestZoneNames:
+    """Tests for IANA zone name helpers."""
+
+    def test_offset_to_zone_name(self):
+        """Test legacy offsets map to inverted Etc/GMT names."""
+        assert offset_to_zone_name(0) == "UTC"
+        assert offset_to_zone_name(-5) == "Etc/GMT+5"
+        assert offset_to_zone_name(9) == "Etc/GMT-9"
+        assert offset_to_zone_name(14) == "Etc/GMT-14"
+
+    def test_is_valid_timezone(self):
+        """Test zone name validation."""
+        assert is_valid_timezone("America/New_York") is True
+        assert is_valid_timezone("Asia/Kolkata") is True
+        assert is_valid_timezone("Mars/Olympus_Mons") is False
+        assert is_valid_timezone("") is False
+        assert is_valid_timezone(None) is False
+
+    def test_resolve_zone_name(self):
+        """Test stored names win and legacy offsets are the fallback."""
+        assert resolve_zone_name("Europe/London", -5) == "Europe/London"
+        assert resolve_zone_name(None, -5) == "Etc/GMT+5"
+        assert resolve_zone_name("Not/AZone", 3) == "Etc/GMT-3"
+        assert resolve_zone_name(" America/New_York ", 0) == "America/New_York"
+        assert resolve_zone_name(None, None) == "UTC"
+
+    def test_format_zone_label(self):
+        """Test display labels match the old UTC offset format."""
+        assert format_zone_label("UTC") == "UTC+0"
+        assert format_zone_label("Etc/GMT+5") == "UTC-5"
+        assert format_zone_label("Etc/GMT-9") == "UTC+9"
+        assert format_zone_label("America/New_York") == "America/New_York"
+
+
+class TestFireSchedule:
+    """Tests for get_fire_schedule precomputation."""
+
+    def test_instants_sorted_and_daily(self):
+        """Test fixed-offset zones fire exactly once every 24 hours."""
+        instants, _ = get_fire_schedule("Etc/GMT+5", 9 * 60, ts("2025-01-15 00:00") // 86400)
+        assert list(instants) == sorted(instants)
+        assert all(b - a == 86400 for a, b in zip(instants, instants[1:]))
+        assert ts("2025-01-15 14:00") in instants
+
+    def test_dst_transition_shifts_utc_instant(self):
+        """Test a New York schedule moves one UTC hour across spring forward."""
+        instants, _ = get_fire_schedule("America/New_York", 9 * 60, ts("2025-03-09 00:00") // 86400)
+        assert ts("2025-03-08 14:00") in instants  # EST
+        assert ts("2025-03-09 13:00") in instants  # EDT
+
+    def test_dst_gap_resolves_forward(self):
+        """Test a post time inside the spring-forward gap still fires once."""
+        instants, _ = get_fire_schedule("America/New_York", 2 * 60 + 30, ts("2025-03-09 00:00") // 86400)
+        assert ts("2025-03-09 07:30") in instants  # 02:30 EST == 03:30 EDT
+        assert len(instants) == len(set(instants))
+
+
+class TestGetDueSlot:
+    """Tests for get_due_slot function."""
+
+    def test_due_at_scheduled_instant(self):
+        """Test the slot is due from the fire instant to the end of the window."""
+        now = ts("2025-01-15 14:00")
+        assert get_due_slot(time(9, 0), "America/New_York", None, now=now) == "2025-01-15"
+        assert get_due_slot(time(9, 0), "America/New_York", None, now=now + 15 * 60) == "2025-01-15"
+
+    def test_not_due_before_or_after_window(self):
+        """Test times outside the window are not due."""
+        assert get_due_slot(time(9, 0), "America/New_York", None, now=ts("2025-01-15 13:55")) is None
+        assert get_due_slot(time(9, 0), "America/New_York", None, now=ts("2025-01-15 14:16")) is None
+
+    def test_already_posted_slot(self):
+        """Test a slot that was already recorded is not due again."""
+        now = ts("2025-01-15 14:05")
+        assert get_due_slot(time(9, 0), "America/New_York", "2025-01-15", now=now) is None
+        assert get_due_slot(time(9, 0), "America/New_York", "2025-01-14", now=now) == "2025-01-15"
+
+    def test_follows_daylight_saving(self):
+        """Test 9am New York is due at 13:00 UTC in summer and 14:00 UTC in winter."""
+        assert get_due_slot(time(9, 0), "America/New_York", None, now=ts("2025-07-01 13:05")) == "2025-07-01"
+        assert get_due_slot(time(9, 0), "America/New_York", None, now=ts("2025-07-01 14:05")) is None
+
+    def test_half_hour_zone(self):
+        """Test zones with non-hour offsets."""
+        # 09:00 IST == 03:30 UTC
+        assert get_due_slot(time(9, 0), "Asia/Kolkata", None, now=ts("2025-01-15 03:30")) == "2025-01-15"
+        assert get_due_slot(time(9, 0), "Asia/Kolkata", None, now=ts("2025-01-15 03:00")) is None
+
+    def test_slot_date_across_midnight(self):
+        """Test a late-night window that crosses UTC midnight keeps its local date."""
+        now = ts("2025-01-16 00:05")
+        assert get_due_slot(time(23, 55), "UTC", None, now=now) == "2025-01-15"
+        assert get_due_slot(time(23, 55), "UTC", "2025-01-15", now=now) is None
+
+    @freeze_time("2025-01-15 14:05:00")
+    def test_uses_current_time_by_default(self):
+        """Test the current clock is used when no timestamp is given."""
+        assert get_due_slot(time(9, 0), "Etc/GMT+5", None) == "2025-01-15"
+
+
+class TestNextFireAndLocalDate:
+    """Tests for get_next_fire_time and get_local_date."""
+
+    def test_next_fire_time(self):
+        """Test the next fire instant is strictly in the future."""
+        now = ts("2025-01-15 14:00")
+        assert get_next_fire_time(time(9, 0), "America/New_York", now=now - 60) == now
+        assert get_next_fire_time(time(9, 0), "America/New_York", now=now) == now + 86400
+
+    def test_local_date(self):
+        """Test local dates for zones either side of UTC."""
+        now = ts("2025-01-15 20:00")
+        assert get_local_date("Asia/Tokyo", now=now) == "2025-01-16"
+        assert get_local_date("America/Los_Angeles", now=now) == "2025-01-15"
@@ -0,0 +1,153 @@
+"""Unit tests for helpers/singleflight.py request deduplication."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from discord.ext import tasks
+
+from cogs.art import Art
+from helpers.llm_client import LLMClient
+from helpers.llm_metering import UsageMeter
+from helpers.llm_scheduler import Priority, current_context, request_context
+from helpers.singleflight import SingleFlight, group, make_key, normalize_url, stats
+
+
+class Gate:
+    """Call that blocks until released and counts how often it ran."""
+
+    def __init__(self, result="done"):
+        self.calls = 0
+        self.result = result
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class TestKeys:
+    """Tests for make_key and normalize_url functions."""
+
+    def test_equivalent_urls_match(self):
+        """Test case of scheme and host, whitespace and fragments are ignored."""
+        assert normalize_url(" HTTPS://Images.Example.org/a/B.jpg#zoom ") == "https://images.example.org/a/B.jpg"
+
+    def test_key_depends_on_all_parts(self):
+        """Test keys are stable and differ when any part differs."""
+        assert make_key("url", "general") == make_key("url", "general")
+        assert make_key("url", "general") != make_key("url", "beginner")
+        assert make_key({"b": 1, "a": 2}) == make_key({"a": 2, "b": 1})
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    async def test_concurrent_calls_share_result(self):
+        """Test callers with the same key share one call."""
+        flight = SingleFlight("test")
+        gate = Gate()
+        waiters = [asyncio.create_task(flight.do("key", gate)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert flight.in_flight == 1
+
+        gate.release.set()
+        assert await asyncio.gather(*waiters) == ["done"] * 5
+        assert gate.calls == 1
+        assert flight.stats() == {"started": 1, "coalesced": 4, "failed": 0, "in_flight": 0}
+
+    async def test_finished_call_not_reused(self):
+        """Test a call that has finished is not cached for later requests."""
+        flight = SingleFlight("test")
+        gate = Gate()
+        gate.release.set()
+        await flight.do("key", gate)
+        await flight.do("key", gate)
+        assert gate.calls == 2
+
+    async def test_exception_shared(self):
+        """Test every caller gets the shared call's exception."""
+        flight = SingleFlight("test")
+        gate = Gate(RuntimeError("overloaded"))
+        waiters = [asyncio.create_task(flight.do("key", gate)) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert flight.failed == 1
+
+    async def test_cancelled_caller_keeps_call_running(self):
+        """Test one caller giving up does not cancel the call for the others."""
+        flight = SingleFlight("test")
+        gate = Gate()
+        first = asyncio.create_task(flight.do("key", gate))
+        second = asyncio.create_task(flight.do("key", gate))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+
+        gate.release.set()
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    async def test_shared_call_not_tied_to_first_guild(self):
+        """Test an over-quota first caller neither fails nor is charged for the guilds that join it."""
+        meter = UsageMeter(guild_daily_tokens=100)
+        meter.record("model", None, 1, SimpleNamespace(input_tokens=150, output_tokens=0), 0.1, 0.1, "ok",
+                     background=True)
+        client = LLMClient("test-key", meter=meter)
+        response = Mock(usage=SimpleNamespace(input_tokens=30, output_tokens=20))
+        client.anthropic.messages.create = AsyncMock(return_value=response)
+        flight = SingleFlight("test")
+        gate = asyncio.Event()
+        contexts = []
+
+        async def summarise():
+            await gate.wait()
+            contexts.append(current_context())
+            return await client.messages.create(model="claude-3-5-haiku-20241022", max_tokens=10, messages=[])
+
+        async def ask(guild_id):
+            with request_context(Priority.BACKGROUND, guild_id):
+                return await flight.do("key", summarise)
+
+        waiters = [asyncio.create_task(ask(guild_id)) for guild_id in (1, 2)]
+        await asyncio.sleep(0)
+        gate.set()
+        assert await asyncio.gather(*waiters) == [response, response]
+        assert (contexts[0].priority, contexts[0].guild_id) == (Priority.BACKGROUND, None)
+        assert (meter.guild_tokens_today(1), meter.guild_tokens_today(2)) == (150, 0)
+        await client.close()
+
+    def test_named_groups_shared(self):
+        """Test groups are shared by name and reported in stats."""
+        assert group("test-shared") is group("test-shared")
+        assert "test-shared" in stats()
+
+
+class TestArtSingleFlight:
+    """Tests for shared artwork story generation."""
+
+    async def test_same_artwork_generated_once(self, mock_bot):
+        """Test guilds posting the same artwork at once share one story."""
+        with patch.object(tasks.Loop, "start", Mock()):
+            cog = Art(mock_bot)
+        cog.story_flights = SingleFlight("art-story")
+
+        async def slow_story(artwork):
+            await asyncio.sleep(0.01)
+            return ("story", True)
+
+        cog._generate_art_story = AsyncMock(side_effect=slow_story)
+        artwork = {"object_url": "https://www.metmuseum.org/art/collection/search/1", "title": "Test"}
+        same_artwork = dict(artwork, object_url="HTTPS://www.metmuseum.org/art/collection/search/1")
+        results = await asyncio.gather(
+            cog.generate_art_story(artwork), cog.generate_art_story(same_artwork), cog.generate_art_story(artwork)
+        )
+        assert results == [("story", True)] * 3
+        assert cog._generate_art_story.await_count == 1
+        assert cog.story_flights.coalesced == 2
@@ -0,0 +1,148 @@
+"""Unit tests for helpers/stream_editor.py paced message edits."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import discord
+import pytest
+
+from helpers.stream_editor import (
+    EDIT_INTERVAL,
+    ChannelPacer,
+    EditPacers,
+    StreamEditor,
+    rate_limit_delay,
+)
+
+
+class FakeClock:
+    """Monotonic clock moved by the fake sleep."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+def rate_limited(retry_after=2.0):
+    """The exception discord.py raises for a 429 response."""
+    response = SimpleNamespace(status=429, reason="Too Many Requests", headers={"Retry-After": str(retry_after)})
+    return discord.HTTPException(response, "rate limited")
+
+
+def make_editor(clock, edit=None):
+    """Editor for a mock message with its own pacer."""
+    message = Mock()
+    message.channel.id = 1
+    message.edit = edit or AsyncMock()
+    return StreamEditor(message, pacer=ChannelPacer(clock=clock), sleep=clock.sleep), message
+
+
+class TestChannelPacer:
+    """Tests for ChannelPacer."""
+
+    def test_slots_are_spaced(self):
+        """Test edits in one channel are spaced by the interval, whoever makes them."""
+        clock = FakeClock()
+        pacer = ChannelPacer(clock=clock)
+        assert [pacer.reserve() for _ in range(3)] == [0, EDIT_INTERVAL, 2 * EDIT_INTERVAL]
+
+    def test_backs_off_and_recovers(self):
+        """Test the interval doubles after a rate limit and shrinks after fast edits."""
+        clock = FakeClock()
+        pacer = ChannelPacer(clock=clock)
+        pacer.slow_down(retry_after=5)
+        assert pacer.interval == 2 * EDIT_INTERVAL
+        assert pacer.reserve() == 5
+        for _ in range(10):
+            pacer.edited(0.1)
+        assert pacer.interval == EDIT_INTERVAL
+
+    def test_slow_edit_counts_as_rate_limited(self):
+        """Test an edit held back by discord.py slows the channel down."""
+        pacer = ChannelPacer(clock=FakeClock())
+        pacer.edited(3.0)
+        assert pacer.rate_limited == 1
+
+    def test_idle_channels_forgotten(self):
+        """Test pacers of channels without recent edits are dropped."""
+        clock = FakeClock()
+        pacers = EditPacers(clock=clock)
+        first = pacers.get(1)
+        assert pacers.get(1) is first
+        clock.now += 3600
+        pacers.get(2)
+        assert list(pacers.stats()) == [2]
+
+
+class TestRateLimitDelay:
+    """Tests for rate_limit_delay function."""
+
+    def test_delays(self):
+        """Test 429 responses use Retry-After and other errors aren't rate limits."""
+        assert rate_limit_delay(rate_limited(3.5)) == 3.5
+        assert rate_limit_delay(discord.RateLimited(7.0)) == 7.0
+        not_found = discord.HTTPException(SimpleNamespace(status=404, reason="Not Found"), "gone")
+        assert rate_limit_delay(not_found) is None
+
+
+class TestStreamEditor:
+    """Tests for StreamEditor."""
+
+    async def test_updates_are_coalesced(self):
+        """Test a burst of updates sends the first and the latest state only."""
+        clock = FakeClock()
+        editor, message = make_editor(clock)
+        for n in range(50):
+            editor.update(content=f"text {n}")
+            await asyncio.sleep(0)
+        await editor._task
+
+        sent = [call.kwargs["content"] for call in message.edit.await_args_list]
+        assert sent[0] == "text 0"
+        assert sent[-1] == "text 49"
+        assert editor.coalesced > 0
+        assert editor.sent == len(sent) < 50
+
+    async def test_finish_sends_final_state_last(self):
+        """Test the final edit comes after the edit in flight and replaces pending states."""
+        clock = FakeClock()
+        editor, message = make_editor(clock)
+        editor.update(content="partial")
+        await asyncio.sleep(0)
+        editor.update(content="never sent")
+        await editor.finish(content="final")
+
+        sent = [call.kwargs["content"] for call in message.edit.await_args_list]
+        assert sent == ["partial", "final"]
+
+    async def test_rate_limited_update_is_skipped(self):
+        """Test a rate-limited progress edit is dropped and the channel slows down."""
+        clock = FakeClock()
+        editor, message = make_editor(clock, AsyncMock(side_effect=[rate_limited(4.0), None]))
+        editor.update(content="partial")
+        await editor._task
+        assert editor.failed == 1
+        assert editor.pacer.interval == 2 * EDIT_INTERVAL
+
+        started = clock.now
+        await editor.finish(content="final")
+        assert clock.now - started >= 4.0
+        assert message.edit.await_args.kwargs["content"] == "final"
+
+    async def test_final_edit_retried(self):
+        """Test the final edit is retried after rate limits and other errors are raised."""
+        clock = FakeClock()
+        editor, message = make_editor(clock, AsyncMock(side_effect=[rate_limited(), rate_limited(), None]))
+        await editor.finish(content="final")
+        assert message.edit.await_count == 3
+
+        not_found = discord.HTTPException(SimpleNamespace(status=404, reason="Not Found"), "gone")
+        editor, _ = make_editor(clock, AsyncMock(side_effect=not_found))
+        with pytest.raises(discord.HTTPException):
+            await editor.finish(content="final")
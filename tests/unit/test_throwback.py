@@ -0,0 +1,69 @@
+"""Unit tests for the vibes cog's daily throwback schedule."""
+import os
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import aiosqlite
+import pytest
+from discord.ext import tasks
+
+from cogs import vibes
+from cogs.vibes import THROWBACK_INTERVAL, Vibes
+from database import DatabaseManager
+
+SCHEMA = os.path.join(os.path.dirname(__file__), "..", "..", "database", "schema.sql")
+GUILD = 1
+
+
+@pytest.fixture
+async def database():
+    """In-memory database with the full schema and one server with an old memory."""
+    connection = await aiosqlite.connect(":memory:")
+    with open(SCHEMA, encoding="utf-8") as file:
+        await connection.executescript(file.read())
+    await connection.execute("INSERT INTO vibes_config (server_id) VALUES (?)", (GUILD,))
+    await connection.execute(
+        """INSERT INTO memories (server_id, message_id, channel_id, author_id, saved_by_id, content, created_at)
+           VALUES (?, '10', '20', '30', '30', 'Remember this?', datetime('now', '-60 days'))""",
+        (GUILD,),
+    )
+    await connection.commit()
+    yield DatabaseManager(connection=connection)
+    await connection.close()
+
+
+@pytest.fixture
+def cog(mock_bot, database):
+    mock_bot.database = database
+    channel = Mock(send=AsyncMock())
+    channel.permissions_for.return_value.send_messages = True
+    mock_bot.get_guild = Mock(return_value=Mock(id=GUILD, text_channels=[channel]))
+    mock_bot.fetch_user = AsyncMock(return_value=Mock(display_name="Ann", avatar=None))
+    with patch.object(tasks.Loop, "start", Mock()):
+        cog = Vibes(mock_bot)
+    cog.channel = channel
+    return cog
+
+
+class TestThrowbackTask:
+    """Tests for throwback_task."""
+
+    async def test_new_leader_posts_when_due(self, cog):
+        """Test a replica that becomes leader posts on its next tick, then not again for a day."""
+        cog.bot.is_scheduler_leader = Mock(return_value=False)
+        await cog.throwback_task()
+        cog.channel.send.assert_not_awaited()
+
+        cog.bot.is_scheduler_leader = Mock(return_value=True)
+        await cog.throwback_task()
+        await cog.throwback_task()
+        assert cog.channel.send.await_count == 1
+
+        with patch.object(vibes.time, "time", return_value=time.time() + THROWBACK_INTERVAL + 60):
+            await cog.throwback_task()
+        assert cog.channel.send.await_count == 2
+
+    async def test_disabled_servers_skipped(self, cog, database):
+        """Test servers with throwbacks turned off are never due."""
+        await database.connection.execute("UPDATE vibes_config SET throwback_enabled = 0")
+        assert await database.get_servers_needing_throwback(int(time.time())) == []
@@ -0,0 +1,158 @@
+"""Unit tests for the trivia question bank."""
+import json
+import os
+from unittest.mock import AsyncMock, Mock, patch
+
+import aiosqlite
+import pytest
+from discord.ext import tasks
+
+from cogs.trivia import Trivia
+from database import DatabaseManager
+from helpers.trivia_bank import (
+    LOW_WATER_MARK,
+    build_batch_prompt,
+    normalize_question,
+    parse_question_batch,
+    question_hash,
+)
+
+SCHEMA = os.path.join(os.path.dirname(__file__), "..", "..", "database", "schema.sql")
+
+
+def make_item(question, correct="B"):
+    """A batch entry as Claude returns it."""
+    return {
+        "question": question,
+        "options": {"A": "Venus", "B": "Mars", "C": "Jupiter", "D": "Saturn"},
+        "correct": correct,
+        "explanation": "Iron oxide makes it red.",
+    }
+
+
+@pytest.fixture
+async def database():
+    """In-memory database with the full schema."""
+    connection = await aiosqlite.connect(":memory:")
+    with open(SCHEMA, encoding="utf-8") as file:
+        await connection.executescript(file.read())
+    yield DatabaseManager(connection=connection)
+    await connection.close()
+
+
+class TestQuestionHash:
+    """Tests for question normalisation and hashing."""
+
+    def test_normalize(self):
+        """Test case, punctuation and spacing are ignored."""
+        assert normalize_question("  Which planet is   the 'Red Planet'? ") == "which planet is the red planet"
+
+    def test_equivalent_questions_share_hash(self):
+        """Test rewordings that only differ in formatting collide."""
+        assert question_hash("Which planet is the Red Planet?") == question_hash("which planet is the red planet")
+        assert question_hash("Which planet is the Red Planet?") != question_hash("Which planet is largest?")
+
+
+class TestParseQuestionBatch:
+    """Tests for parse_question_batch function."""
+
+    def test_parses_wrapped_array(self):
+        """Test the JSON array is found inside surrounding prose."""
+        response = "Here you go:\n" + json.dumps([make_item("Which planet is red?"), make_item("Which is biggest?", "C")])
+        questions = parse_question_batch(response, "science", "easy")
+        assert [q["correct"] for q in questions] == ["B", "C"]
+        assert questions[0]["options"]["B"] == "Mars"
+        assert questions[0]["category"] == "science"
+        assert questions[0]["question_hash"] == question_hash("Which planet is red?")
+
+    def test_drops_invalid_and_repeated(self):
+        """Test malformed entries and duplicates inside a batch are skipped."""
+        bad_options = make_item("Missing option?")
+        del bad_options["options"]["D"]
+        items = [
+            make_item("Which planet is red?"),
+            make_item("which planet is RED"),
+            make_item("Bad letter?", correct="E"),
+            bad_options,
+            "not an object",
+        ]
+        assert len(parse_question_batch(json.dumps(items), "science", "easy")) == 1
+
+    def test_unparseable(self):
+        """Test a response without a JSON array yields nothing."""
+        assert parse_question_batch("QUESTION: What?", "science", "easy") == []
+        assert parse_question_batch("[not json]", "science", "easy") == []
+
+    def test_prompt_lists_existing_questions(self):
+        """Test existing questions are passed along to avoid repeats."""
+        prompt = build_batch_prompt("science", "hard", count=20, avoid=["Which planet is red?"])
+        assert "20 different hard" in prompt
+        assert "- Which planet is red?" in prompt
+
+
+class TestTriviaBankDatabase:
+    """Tests for the trivia_bank database methods."""
+
+    async def test_add_deduplicates(self, database):
+        """Test questions already in the bank, served or not, are not stored again."""
+        batch = parse_question_batch(json.dumps([make_item("Q one?"), make_item("Q two?")]), "science", "easy")
+        assert await database.add_trivia_bank_questions(batch) == 2
+        await database.pop_trivia_bank_question("science", "easy")
+        assert await database.add_trivia_bank_questions(batch) == 0
+        assert await database.count_trivia_bank() == {("science", "easy"): 1}
+        assert await database.count_trivia_bank_pool("science", "easy") == 1
+        assert await database.count_trivia_bank_pool("science", "hard") == 0
+
+    async def test_pop_oldest_first(self, database):
+        """Test questions are served in insertion order and only once."""
+        batch = parse_question_batch(json.dumps([make_item("Q one?"), make_item("Q two?")]), "science", "easy")
+        await database.add_trivia_bank_questions(batch)
+
+        first = await database.pop_trivia_bank_question("science", "easy")
+        second = await database.pop_trivia_bank_question("science", "easy")
+        assert [first["question"], second["question"]] == ["Q one?", "Q two?"]
+        assert first["options"]["B"] == "Mars"
+        assert await database.pop_trivia_bank_question("science", "easy") is None
+        assert await database.pop_trivia_bank_question("history", "easy") is None
+
+
+@pytest.fixture
+def trivia_cog(mock_bot, database):
+    """Trivia cog on a real database, with background loops not started."""
+    mock_bot.database = database
+    mock_bot.llm_client = Mock()
+    with patch.object(tasks.Loop, "start", Mock()):
+        cog = Trivia(mock_bot)
+    cog.client.messages.create = AsyncMock(return_value=Mock(content=[Mock(text=json.dumps(
+        [make_item(f"Generated question {n}?") for n in range(20)]
+    ))]))
+    return cog
+
+
+class TestTriviaCogBank:
+    """Tests for serving questions from the bank."""
+
+    async def test_empty_bank_falls_back_and_refills(self, trivia_cog):
+        """Test an empty pool uses direct generation and starts one batch refill."""
+        trivia_cog.generate_question = AsyncMock(return_value={"question": "fallback"})
+
+        assert await trivia_cog.get_question("science", "easy") == {"question": "fallback"}
+        trivia_cog.schedule_bank_refill("science", "easy")  # already running: no second call
+        await trivia_cog.bank_refills[("science", "easy")]
+
+        assert trivia_cog.client.messages.create.await_count == 1
+        assert await trivia_cog.bot.database.count_trivia_bank() == {("science", "easy"): 20}
+
+    async def test_serves_from_bank_until_low(self, trivia_cog):
+        """Test banked questions are served without a refill until the low-water mark."""
+        await trivia_cog.fill_bank_pool("history", "hard")
+        trivia_cog.client.messages.create.reset_mock()
+
+        for _ in range(20 - LOW_WATER_MARK):
+            question = await trivia_cog.get_question("history", "hard")
+            assert question["question"].startswith("Generated question")
+        assert ("history", "hard") not in trivia_cog.bank_refills
+
+        await trivia_cog.get_question("history", "hard")
+        assert ("history", "hard") in trivia_cog.bank_refills
+        await trivia_cog.bank_refills[("history", "hard")]